@@ -0,0 +1,106 @@
+"""
+Document triage benchmark
+
+10KB/100KB/1MB 문서에서 triage() 한 번, 문서 모드(청크 스캔 + 섹션 집계), routing_only 조기 종료의
+소요 시간과 tracemalloc 최대 메모리를 비교. 크기가 10배 늘 때 시간·메모리도 약 10배(선형)인지 확인
+
+문서는 합성 설명문을 섹션 제목·페이지 구분(\\f) 사이사이에 이어 붙여 만들고, critical flag 키워드는
+routing_only가 일찍 멈출 수 있도록 문서 앞쪽 10% 지점에 한 번 넣습니다.
+
+Usage:
+    python benchmarks/bench_document.py
+    python benchmarks/bench_document.py --sizes 1000000 --chunk-chars 16384
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "web"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_triage import synthetic_corpus  # noqa: E402
+from document import DEFAULT_CHUNK_CHARS, triage_document  # noqa: E402
+from triage_engine import TriageEngine, TriageInput  # noqa: E402
+
+SIZES = (10_000, 100_000, 1_000_000)
+SECTION_CHARS = 2_000
+CRITICAL_KEYWORD = "시술 전후사진"
+
+
+def synthetic_document(rubric, size, seed=0):
+    """About size characters of ko/en sections, with one critical keyword early on"""
+    rng = random.Random(f"{seed}:{size}")
+    paragraphs = (
+        synthetic_corpus(rubric, "ko", 400, count=64) + synthetic_corpus(rubric, "en", 400, count=64)
+    )
+    parts = []
+    length = 0
+    section = 0
+    while length < size:
+        section += 1
+        heading = f"## {section}. 캠페인 세부 안내\n"
+        if section % 3 == 0:
+            heading = "\f" + heading  # page break
+        body = "\n".join(rng.choice(paragraphs) for _ in range(SECTION_CHARS // 400)) + "\n"
+        parts.append(heading + body)
+        length += len(heading) + len(body)
+    text = "".join(parts)[:size]
+    at = text.find("\n", size // 10) + 1
+    return text[:at] + CRITICAL_KEYWORD + " " + text[at:]
+
+
+def measure(fn, repeat):
+    """Best wall time over repeat calls, and peak traced allocation of one call"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--chunk-chars", type=int, default=DEFAULT_CHUNK_CHARS)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = TriageEngine()
+    rubric = engine.get_rubric()
+    modes = {
+        "triage": lambda data: engine.triage(data),
+        "document": lambda data: triage_document(engine, data, args.chunk_chars),
+        "routing_only": lambda data: triage_document(
+            engine, data, args.chunk_chars, routing_only=True
+        ),
+    }
+
+    print(f"{'chars':>9} {'mode':>13} {'ms':>9} {'us/KB':>7} {'peak MB':>8} "
+          f"{'chunks':>7} {'sections':>8} {'scanned':>8}")
+    for size in args.sizes:
+        data = TriageInput(synthetic_document(rubric, size), exposure="public")
+        engine.triage(data)  # compile the rubric outside the timings
+        for mode, fn in modes.items():
+            seconds, peak = measure(lambda: fn(data), args.repeat)
+            result = fn(data)
+            chunks = sections = scanned = ""
+            if mode != "triage":
+                assert result.output.routing == "TYPE_1"
+                chunks, sections = result.chunks, len(result.sections)
+                scanned = f"{result.scanned_chars / len(data.description):.0%}"
+            print(f"{size:>9} {mode:>13} {seconds * 1000:>9.1f} {seconds * 1e6 / (size / 1000):>7.1f} "
+                  f"{peak / 2**20:>8.1f} {chunks:>7} {sections:>8} {scanned:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Rubric impact benchmark
+
+합성 과거 입력 코퍼스(10만/100만 건)에서 코퍼스 n-gram 색인 생성 시간과, 키워드 몇 개를 추가하는 제안의
+영향 시뮬레이션(후보 조회 + 두 루브릭 재평가) 시간을 전체 재생 추정치와 비교
+
+Usage:
+    python benchmarks/bench_impact.py                    # 100k
+    python benchmarks/bench_impact.py --sizes 1000000 --workers 8
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "web"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_triage import synthetic_corpus  # noqa: E402
+from regression import apply_proposal  # noqa: E402
+from rubric_impact import CorpusIndex, simulate  # noqa: E402
+from triage_engine import TriageEngine, TriageInput  # noqa: E402
+
+PROPOSAL = {
+    "modified_red_flags": [{"code": "PROCEDURE_MENTION", "added_keywords": ["리프팅 시술", "필러 시술"]}],
+    "new_red_flags": [
+        {"code": "REVIEW_INCENTIVE", "keywords": ["후기 이벤트", "리뷰 적립금"],
+         "reason": "리뷰 대가 제공", "severity": "high"},
+    ],
+}
+TEMPLATES = 2000
+
+
+def write_corpus(path, rubric, size):
+    """size JSONL records cycling through synthetic ko/en descriptions of 50-400 chars"""
+    descriptions = []
+    for length in (50, 150, 400):
+        descriptions += synthetic_corpus(rubric, "ko", length, count=TEMPLATES // 4, seed=length)
+        descriptions += synthetic_corpus(rubric, "en", length, count=TEMPLATES // 12, seed=length)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(size):
+            description = descriptions[i % len(descriptions)]
+            if i % 997 == 0:
+                description += " 후기 이벤트 참여 시 리뷰 적립금"
+            f.write(json.dumps({"id": i, "description": description}, ensure_ascii=False) + "\n")
+    return descriptions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000])
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    import yaml
+
+    engine = TriageEngine()
+    rubric = engine.get_rubric()
+    with tempfile.TemporaryDirectory() as tmp:
+        proposed_path = os.path.join(tmp, "proposed.yaml")
+        with open(proposed_path, "w", encoding="utf-8") as f:
+            yaml.safe_dump(apply_proposal(rubric, PROPOSAL), f, allow_unicode=True, sort_keys=False)
+
+        print(f"{'inputs':>9} {'index s':>8} {'index MB':>9} {'candidates':>11} "
+              f"{'simulate s':>11} {'full replay s (est.)':>21}")
+        for size in args.sizes:
+            corpus_path = os.path.join(tmp, f"history-{size}.jsonl")
+            descriptions = write_corpus(corpus_path, rubric, size)
+
+            start = time.perf_counter()
+            corpus = CorpusIndex(corpus_path)
+            corpus.update(workers=args.workers)
+            index_seconds = time.perf_counter() - start
+            index_bytes = sum(
+                os.path.getsize(os.path.join(corpus.index_dir, name))
+                for name in os.listdir(corpus.index_dir)
+            )
+
+            start = time.perf_counter()
+            report = simulate(corpus, proposed_path, workers=args.workers)
+            simulate_seconds = time.perf_counter() - start
+
+            # Full replay: both rubrics over every input, extrapolated from a sample
+            sample = [TriageInput(d) for d in descriptions[:1000]]
+            proposed = TriageEngine(proposed_path)
+            start = time.perf_counter()
+            for input_data in sample:
+                engine.triage(input_data)
+                proposed.triage(input_data)
+            full_seconds = (time.perf_counter() - start) / len(sample) * size
+            workers = args.workers or os.cpu_count() or 1
+
+            print(f"{size:>9} {index_seconds:>8.1f} {index_bytes / 2**20:>9.1f} "
+                  f"{report.candidates:>11} {simulate_seconds:>11.2f} "
+                  f"{full_seconds / workers:>21.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
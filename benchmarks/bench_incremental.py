@@ -0,0 +1,67 @@
+"""
+Incremental triage benchmark - full re-run vs IncrementalSession
+
+문서 크기별로 한 글자 입력 후 재트리아지 지연시간 비교
+
+Usage:
+    python benchmarks/bench_incremental.py [--edits 200]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR / "web"))
+
+from incremental import IncrementalSession  # noqa: E402
+from triage_engine import TriageEngine, TriageInput  # noqa: E402
+
+PARAGRAPH = (
+    "이번 캠페인은 인스타그램과 유튜브에서 진행되며, 시술 전후사진 없이 "
+    "의료진 인터뷰 중심으로 구성합니다. 할인 문구는 사용하지 않습니다. "
+)
+
+
+def run(engine, size, edits, rng):
+    base = (PARAGRAPH * (size // len(PARAGRAPH) + 1))[:size]
+    texts = []
+    text = base
+    for _ in range(edits):
+        position = rng.randint(0, len(text))
+        text = text[:position] + rng.choice("가나다 라마") + text[position:]
+        texts.append(text)
+
+    start = time.perf_counter()
+    for text in texts:
+        engine._triage(TriageInput(description=text), engine.compiled)
+    full = (time.perf_counter() - start) / edits
+
+    session = IncrementalSession(engine)
+    session.triage(TriageInput(description=base))
+    start = time.perf_counter()
+    for text in texts:
+        session.triage(TriageInput(description=text))
+    incremental = (time.perf_counter() - start) / edits
+
+    return full, incremental
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--edits", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = TriageEngine()
+    rng = random.Random(0)
+    print(f"{'chars':>8} {'full (us)':>12} {'incremental (us)':>18} {'speedup':>9}")
+    for size in (2_000, 5_000, 20_000, 100_000):
+        full, incremental = run(engine, size, args.edits, rng)
+        print(f"{size:>8} {full * 1e6:>12.1f} {incremental * 1e6:>18.1f} "
+              f"{full / incremental:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
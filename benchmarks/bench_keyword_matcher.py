@@ -0,0 +1,79 @@
+"""
+Keyword matcher micro-benchmark
+
+설명문 1건당 red flag 탐지 지연시간을 키워드 수에 따라 측정
+(기존 키워드별 substring 루프 vs Aho-Corasick 오토마톤)
+
+Usage:
+    python benchmarks/bench_keyword_matcher.py [--repeat 200]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "web"))
+
+from keyword_matcher import KeywordAutomaton  # noqa: E402
+from triage_engine import TriageEngine  # noqa: E402
+
+DESCRIPTIONS = [
+    "인스타그램에서 보톡스 시술 50% 할인 이벤트를 진행하려고 합니다. 선착순 100명 한정입니다.",
+    "블로그에 쌍커풀 수술 종류에 대한 정보성 콘텐츠를 제작하려고 합니다. "
+    "특정 병원 언급 없이 일반적인 정보만 제공합니다.",
+    "앱 내에서 리프팅 시술 전후사진을 비교해서 보여주는 기능을 추가하려고 합니다. 환자 동의는 받았습니다.",
+    "Simple UI button color change on the settings page for internal testing only.",
+]
+
+
+def scaled_keywords(base_keywords, factor):
+    """Synthetic keyword set: base keywords plus (factor - 1) suffixed variants"""
+    keywords = list(base_keywords)
+    for i in range(1, factor):
+        keywords.extend(f"{keyword}{i}" for keyword in base_keywords)
+    return keywords
+
+
+def time_per_call(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for description in DESCRIPTIONS:
+            fn(description)
+    return (time.perf_counter() - start) / (repeat * len(DESCRIPTIONS))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rubric = TriageEngine().get_rubric()
+    base_keywords = [
+        keyword.lower()
+        for flag in rubric["red_flags"]
+        for keyword in flag["keywords"]
+    ]
+
+    print(f"{'keywords':>10} {'loop (us)':>12} {'automaton (us)':>16} {'speedup':>9}")
+    for factor in (1, 3, 10, 30, 100):
+        keywords = scaled_keywords(base_keywords, factor)
+        automaton = KeywordAutomaton(keywords)
+
+        def loop(description):
+            normalized = description.lower()
+            return [k for k in keywords if k in normalized]
+
+        def single_pass(description):
+            return automaton.search(description.lower())
+
+        loop_us = time_per_call(loop, args.repeat) * 1e6
+        automaton_us = time_per_call(single_pass, args.repeat) * 1e6
+        print(
+            f"{len(keywords):>10} {loop_us:>12.1f} {automaton_us:>16.1f} "
+            f"{loop_us / automaton_us:>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Batch result memory benchmark
+
+triage_many 결과를 TriageOutput 리스트로 들고 있을 때와 compact 모드(ResultBatch)로 들고 있을 때의
+최대 RSS를 입력 10만/100만 건에서 비교. 각 측정은 별도 프로세스에서 수행
+
+결과는 워커 풀에서 돌아오는 것처럼 청크 단위 pickle을 거쳐 쌓이며(청크마다 rubric 문자열 사본이 생김),
+실제 triage 대신 합성 설명문 몇백 개의 결과를 입력마다 새 타임스탬프/해시로 복제해 시간을 아낍니다.
+
+Usage:
+    python benchmarks/bench_memory.py                     # 100k, 1M
+    python benchmarks/bench_memory.py --sizes 100000 --chunksize 500
+"""
+
+import argparse
+import json
+import pickle
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "web"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_triage import synthetic_corpus  # noqa: E402
+from compact_results import ResultBatch, encode  # noqa: E402
+from triage_engine import DetectedRedFlag, TriageEngine, TriageInput, TriageOutput  # noqa: E402
+
+MODES = ("list", "compact")
+TEMPLATES = 256
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def template_results(engine):
+    """Results for varied inputs: ko/en descriptions with and without optional fields"""
+    rubric = engine.get_rubric()
+    descriptions = (
+        synthetic_corpus(rubric, "ko", 400, count=TEMPLATES // 2)
+        + synthetic_corpus(rubric, "en", 400, count=TEMPLATES // 2)
+    )
+    return [
+        engine.triage(TriageInput(d, exposure="public" if i % 2 else None))
+        for i, d in enumerate(descriptions)
+    ]
+
+
+def fresh_copy(result, n):
+    """A distinct result object, as a worker would build for another input"""
+    return TriageOutput(
+        routing=result.routing,
+        confidence=result.confidence,
+        red_flags=[
+            DetectedRedFlag(
+                f.code, f.reason, list(f.matched_keywords), f.severity,
+                [(s, e, k) for s, e, k in f.matched_spans],
+            )
+            for f in result.red_flags
+        ],
+        missing_info_questions=list(result.missing_info_questions),
+        safe_guardrails=list(result.safe_guardrails),
+        recommended_next_step=result.recommended_next_step,
+        timestamp=f"2026-01-01T00:00:{n % 60:02d}.{n % 1_000_000:06d}",
+        input_hash=f"{n:016x}",
+        rubric_version=result.rubric_version,
+        rubric_digest=result.rubric_digest,
+    )
+
+
+def measure(mode, size, chunksize):
+    """Runs in a child process: build one batch, report peak RSS growth"""
+    engine = TriageEngine()
+    compiled = engine.compiled
+    templates = template_results(engine)
+    held = ResultBatch(compiled) if mode == "compact" else []
+    baseline = peak_rss_mb()
+
+    start = time.perf_counter()
+    for chunk_start in range(0, size, chunksize):
+        chunk = [
+            fresh_copy(templates[n % len(templates)], n)
+            for n in range(chunk_start, min(size, chunk_start + chunksize))
+        ]
+        if mode == "compact":  # workers send encode() fields
+            for fields in pickle.loads(pickle.dumps([encode(r, compiled) for r in chunk])):
+                held.append_fields(fields)
+        else:
+            held.extend(pickle.loads(pickle.dumps(chunk)))
+        del chunk
+    elapsed = time.perf_counter() - start
+
+    assert len(held) == size
+    return {"peak_mb": peak_rss_mb() - baseline, "seconds": elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--chunksize", type=int, default=1000,
+                        help="results per pickled chunk (one worker task)")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, size = args.child
+        print(json.dumps(measure(mode, int(size), args.chunksize)))
+        return 0
+
+    print(f"{'inputs':>9} {'mode':>8} {'peak RSS +MB':>13} {'bytes/result':>13} {'seconds':>8}")
+    for size in args.sizes:
+        peaks = {}
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, __file__, "--chunksize", str(args.chunksize),
+                 "--child", mode, str(size)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output)
+            peaks[mode] = result["peak_mb"]
+            print(f"{size:>9} {mode:>8} {result['peak_mb']:>13.1f} "
+                  f"{result['peak_mb'] * 2**20 / size:>13.0f} {result['seconds']:>8.1f}")
+        if peaks["compact"] > 0:
+            print(f"{'':>9} {'':>8} {peaks['list'] / peaks['compact']:>12.1f}x smaller")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
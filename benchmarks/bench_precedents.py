@@ -0,0 +1,69 @@
+"""
+Precedent index benchmark - 유사 케이스 검색 지연시간
+
+합성 케이스 10k/100k건으로 색인한 뒤 질의 p50/p99 지연시간과 색인 시간 측정
+
+Usage:
+    python benchmarks/bench_precedents.py [--sizes 10000 100000] [--queries 200]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "web"))
+
+from precedents import CaseDocument, PrecedentIndex  # noqa: E402
+
+WORDS = (
+    "보톡스 필러 리프팅 쌍커풀 시술 수술 전후사진 할인 이벤트 선착순 인스타그램 유튜브 블로그 "
+    "후기 체험단 개인정보 수집 해외 이전 구독 환불 약관 변경 앱 배너 푸시 알림 병원 의료진 "
+    "인터뷰 효과 보장 부작용 안내 심의 광고 캠페인 콘텐츠 정보성 비교 최고 유일 무료 상담"
+).split()
+
+
+def synthetic_case(rng, i):
+    text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120)))
+    return CaseDocument(
+        case_id=f"case-{i}", path=f"2026-01-01_case-{i}", title=f"케이스 {i}",
+        date="2026-01-01", decision=rng.choice(["TYPE_1", "TYPE_2"]), rule_codes=[],
+        text=text, signature=[0, 0, 0, 0],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    queries = [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(10, 60)))
+        for _ in range(args.queries)
+    ]
+    print(f"{'cases':>8} {'index (s)':>10} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as index_dir:
+            index = PrecedentIndex(index_dir)
+            start = time.perf_counter()
+            index.add([synthetic_case(rng, i) for i in range(size)])
+            build = time.perf_counter() - start
+
+            index = PrecedentIndex(index_dir)  # query through fresh mmaps
+            latencies = []
+            for query in queries:
+                start = time.perf_counter()
+                index.search(query, k=5)
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+            p50 = latencies[len(latencies) // 2]
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            print(f"{size:>8} {build:>10.1f} {p50 * 1e3:>10.2f} {p99 * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
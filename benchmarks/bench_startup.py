@@ -0,0 +1,66 @@
+"""
+Startup benchmark - import + first triage
+
+새 프로세스에서 triage_engine import부터 첫 triage() 완료까지의 시간을
+YAML 로드(PyYAML)와 사전 컴파일 스냅샷 로드로 비교
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 10]
+"""
+
+import argparse
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+WEB_DIR = ROOT_DIR / "web"
+
+sys.path.insert(0, str(WEB_DIR))
+
+from rubric_snapshot import write_snapshot  # noqa: E402
+
+CHILD = """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, {web_dir!r})
+from triage_engine import TriageEngine, TriageInput
+TriageEngine({rubric_path!r}).triage(TriageInput(description="보톡스 50% 할인 이벤트"))
+print(time.perf_counter() - start)
+"""
+
+
+def measure(rubric_path, runs):
+    code = CHILD.format(web_dir=str(WEB_DIR), rubric_path=str(rubric_path))
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", code], check=True, capture_output=True, text=True
+        ).stdout
+        samples.append(float(output.strip()) * 1000)
+    return statistics.median(samples), min(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        rubric_path = Path(tmp_dir) / "rubric.yaml"
+        shutil.copy(ROOT_DIR / "rubric.yaml", rubric_path)
+
+        print(f"{'mode':<10} {'median (ms)':>12} {'min (ms)':>10}")
+        median, best = measure(rubric_path, args.runs)
+        print(f"{'yaml':<10} {median:>12.1f} {best:>10.1f}")
+
+        write_snapshot(str(rubric_path))
+        median, best = measure(rubric_path, args.runs)
+        print(f"{'snapshot':<10} {median:>12.1f} {best:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Submission store benchmark
+
+합성 제출 건(10만/100만 건)을 트리아지 경로(큐 → 기록·색인 스레드)로 쌓는 처리량과, 부분 문자열/키워드
+묶음 검색 지연을 읽기 전용 인스턴스에서 측정
+
+Usage:
+    python benchmarks/bench_submission_store.py                # 100k
+    python benchmarks/bench_submission_store.py --sizes 1000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "web"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_triage import synthetic_corpus  # noqa: E402
+from submission_store import SubmissionStore  # noqa: E402
+from triage_engine import TriageEngine, TriageInput  # noqa: E402
+
+QUERIES = [
+    ("rare phrase", ["내돈내산 공구"], True),
+    ("common keyword", ["전후사진"], True),
+    ("keyword set (all)", ["전후사진", "시술"], True),
+    ("keyword set (any)", ["리뷰 적립금", "협찬"], False),
+    ("one syllable", ["피"], True),
+]
+TEMPLATES = 2000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000])
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    engine = TriageEngine()
+    rubric = engine.get_rubric()
+    descriptions = []
+    for length in (50, 150, 400):
+        descriptions += synthetic_corpus(rubric, "ko", length, count=TEMPLATES // 4, seed=length)
+        descriptions += synthetic_corpus(rubric, "en", length, count=TEMPLATES // 12, seed=length)
+    results = [engine.triage(TriageInput(d)) for d in descriptions]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            store_dir = os.path.join(tmp, f"store-{size}")
+            store = SubmissionStore(store_dir, queue_size=size)
+            start = time.perf_counter()
+            for i in range(size):
+                j = i % len(descriptions)
+                description = descriptions[j]
+                if i % 997 == 0:
+                    description += " 내돈내산 공구 후기"
+                store.add(TriageInput(description), results[j])
+            store.close()
+            append_seconds = time.perf_counter() - start
+            store_bytes = sum(
+                os.path.getsize(os.path.join(root, name))
+                for root, _, names in os.walk(store_dir) for name in names
+            )
+            print(f"{size} submissions: appended in {append_seconds:.1f}s "
+                  f"({size / append_seconds:,.0f}/s, dropped {store.dropped}), "
+                  f"{store_bytes / 2**20:.0f} MB on disk")
+
+            reader = SubmissionStore(store_dir, writable=False)
+            print(f"  {'query':<20} {'results':>8} {'ms':>8}")
+            for name, terms, match_all in QUERIES:
+                start = time.perf_counter()
+                found = reader.search(terms, match_all=match_all, limit=args.limit)
+                print(f"  {name:<20} {len(found):>8} {(time.perf_counter() - start) * 1000:>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""
+Triage hot path benchmark suite
+
+설명문 길이(한국어/영어 합성 코퍼스)와 루브릭 규모(키워드·질문·가드레일 1x/10x/100x)에 따라
+단계별(scan, red flag 탐지, 누락 정보 질문, 가드레일, 라우팅)·전체 triage 지연시간을 측정하고
+JSON으로 저장, 기준 결과 대비 회귀 여부를 판정
+
+Usage:
+    python benchmarks/bench_triage.py run -o bench-results.json [--quick]
+    python benchmarks/bench_triage.py compare baseline.json bench-results.json [--threshold 0.25]
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "web"))
+
+import yaml  # noqa: E402
+
+from triage_engine import TriageEngine, TriageInput  # noqa: E402
+
+STAGES = ("scan", "detect_red_flags", "missing_info_questions", "guardrails", "routing", "end_to_end")
+RUBRIC_FACTORS = (1, 10, 100)
+CORPUS_SIZES = (200, 2_000, 20_000)  # characters per description
+DESCRIPTIONS_PER_CORPUS = 8
+
+FILLER = {
+    "ko": "이번 캠페인은 앱 홈 배너와 푸시 알림으로 노출되며 고객 상담 예약을 유도하는 콘텐츠입니다 "
+          "담당 부서는 마케팅팀이고 일정은 다음 달 초로 예정되어 있습니다 세부 문구는 검토 중입니다".split(),
+    "en": "this campaign runs on the app home banner and push notifications to drive consultation "
+          "bookings the marketing team owns the copy and the launch is planned for early next month".split(),
+}
+
+
+def scaled_rubric(rubric, factor):
+    """Rubric with every keyword list, question template and guardrail repeated factor times
+
+    Copies carry suffixed keywords and texts, so the automaton, the
+    template loop and the guardrail loop all grow by the same factor.
+    """
+    rubric = json.loads(json.dumps(rubric))
+    for flag in rubric["red_flags"]:
+        base = list(flag["keywords"])
+        for i in range(1, factor):
+            flag["keywords"].extend(f"{keyword}{i}" for keyword in base)
+    templates = rubric.get("question_templates") or []
+    guardrails = rubric.get("safe_guardrails") or []
+    rubric["question_templates"] = templates + [
+        dict(template, question=f"{template['question']} ({i})",
+             trigger_if_contains=[f"{k}{i}" for k in template.get("trigger_if_contains") or []])
+        for i in range(1, factor) for template in templates
+    ]
+    rubric["safe_guardrails"] = guardrails + [
+        dict(guardrail, text=f"{guardrail['text']} ({i})")
+        for i in range(1, factor) for guardrail in guardrails
+    ]
+    return rubric
+
+
+def synthetic_corpus(rubric, language, size, count=DESCRIPTIONS_PER_CORPUS, seed=0):
+    """Descriptions of about size characters, roughly one rubric keyword per 25 words"""
+    rng = random.Random(f"{seed}:{language}:{size}")
+    keywords = [k for flag in rubric["red_flags"] for k in flag["keywords"]]
+    keywords = [k for k in keywords if k.isascii() == (language == "en")] or keywords
+    descriptions = []
+    for _ in range(count):
+        words = []
+        length = 0
+        while length < size:
+            word = rng.choice(keywords) if rng.random() < 0.04 else rng.choice(FILLER[language])
+            words.append(word)
+            length += len(word) + 1
+        descriptions.append(" ".join(words)[:size])
+    return descriptions
+
+
+def _calibration_workload(words=tuple(FILLER["ko"] + FILLER["en"])):
+    """Fixed pure-Python work (dict/str churn like the hot path)"""
+    counts = {}
+    for word in words:
+        key = word.lower()
+        counts[key] = counts.get(key, 0) + len(key)
+    return sorted(counts.items())
+
+
+def _time_calls(fn, args_list, seconds):
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        for args in args_list:
+            fn(*args)
+        calls += len(args_list)
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return elapsed / calls * 1e6
+
+
+def time_stage(fn, args_list, min_time):
+    """(best us per call, best calibration us per call) over 5 rounds
+
+    Each round times a fixed calibration workload right before the stage,
+    so ``compare`` can factor out machine speed at the moment of
+    measuring. GC is paused while timing, like timeit.
+    """
+    stage_rounds = []
+    calibration_rounds = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(5):
+            calibration_rounds.append(_time_calls(_calibration_workload, [()], min_time / 25))
+            stage_rounds.append(_time_calls(fn, args_list, min_time / 5))
+    finally:
+        gc.enable()
+    return min(stage_rounds), min(calibration_rounds)
+
+
+def bench_engine(engine, descriptions, min_time):
+    """Per-stage timings for one rubric over one corpus (same calls triage() makes)"""
+    compiled = engine.compiled
+    inputs = [TriageInput(description=d) for d in descriptions]
+    hits = [compiled.scan(d) for d in descriptions]
+    flags = [engine._detect_red_flags(d, compiled, h) for d, h in zip(descriptions, hits)]
+    questions = [
+        engine._generate_missing_info_questions(i, compiled, h) for i, h in zip(inputs, hits)
+    ]
+
+    calls = {
+        "scan": (compiled.scan, [(d,) for d in descriptions]),
+        "detect_red_flags": (
+            engine._detect_red_flags, [(d, compiled, h) for d, h in zip(descriptions, hits)]
+        ),
+        "missing_info_questions": (
+            engine._generate_missing_info_questions, [(i, compiled, h) for i, h in zip(inputs, hits)]
+        ),
+        "guardrails": (
+            engine._determine_guardrails,
+            [(i, f, compiled, h) for i, f, h in zip(inputs, flags, hits)],
+        ),
+        "routing": (
+            engine._calculate_routing,
+            [(f, q, i, compiled) for f, q, i in zip(flags, questions, inputs)],
+        ),
+        "end_to_end": (engine._triage, [(i, compiled) for i in inputs]),
+    }
+    return {stage: time_stage(*calls[stage], min_time) for stage in STAGES}
+
+
+def run(args):
+    base = TriageEngine().get_rubric()
+    factors = RUBRIC_FACTORS[:2] if args.quick else RUBRIC_FACTORS
+    sizes = CORPUS_SIZES[:2] if args.quick else CORPUS_SIZES
+    results = {}
+
+    print(f"{'rubric':>7} {'corpus':>9} " + " ".join(f"{s[:12]:>12}" for s in STAGES) + "   (us/call)")
+    with tempfile.TemporaryDirectory() as tmp:
+        for factor in factors:
+            rubric = scaled_rubric(base, factor)
+            rubric_path = Path(tmp) / f"rubric-x{factor}.yaml"
+            rubric_path.write_text(yaml.safe_dump(rubric, allow_unicode=True), encoding="utf-8")
+            engine = TriageEngine(str(rubric_path))
+            for language in ("ko", "en"):
+                for size in sizes:
+                    corpus = f"{language}-{size}"
+                    timings = bench_engine(engine, synthetic_corpus(base, language, size), args.min_time)
+                    for stage, (us, calibration_us) in timings.items():
+                        results[f"x{factor}/{corpus}/{stage}"] = {
+                            "us": round(us, 2), "calibration_us": round(calibration_us, 3),
+                        }
+                    print(f"{'x' + str(factor):>7} {corpus:>9} "
+                          + " ".join(f"{timings[s][0]:>12.1f}" for s in STAGES))
+
+    payload = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "unit": "us_per_call",
+        },
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(payload, indent=1, sort_keys=True) + "\n")
+        print(f"wrote {args.output}", file=sys.stderr)
+    return 0
+
+
+def compare(args):
+    """Exit 1 when any shared benchmark got slower than baseline by more than threshold"""
+    baseline = json.loads(Path(args.baseline).read_text())["results"]
+    current = json.loads(Path(args.current).read_text())["results"]
+    regressions = []
+
+    print(f"{'benchmark':<40} {'baseline':>10} {'current':>10} {'change':>8}"
+          + ("" if args.raw else "   (current in baseline machine time)"))
+    for key in sorted(baseline.keys() & current.keys()):
+        old, new = baseline[key]["us"], current[key]["us"]
+        if not args.raw:
+            new *= baseline[key]["calibration_us"] / current[key]["calibration_us"]
+        change = new / old - 1 if old else 0.0
+        regressed = change > args.threshold and new - old >= args.min_us
+        if regressed:
+            regressions.append(key)
+        print(f"{key:<40} {old:>10.1f} {new:>10.1f} {change:>+7.0%}{'  REGRESSION' if regressed else ''}")
+    for key in sorted(baseline.keys() - current.keys()):
+        print(f"{key:<40} (missing from current run)")
+
+    print(f"\n{len(regressions)} regressions beyond {args.threshold:.0%} "
+          f"(ignoring changes under {args.min_us} us)")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run the suite")
+    run_parser.add_argument("-o", "--output", default=None, help="JSON results file")
+    run_parser.add_argument("--min-time", type=float, default=0.5,
+                            help="seconds spent per benchmark (split over 5 rounds)")
+    run_parser.add_argument("--quick", action="store_true",
+                            help="skip the 100x rubric and the 20k-char corpora")
+
+    compare_parser = subparsers.add_parser("compare", help="fail on stage regressions")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.25,
+                                help="allowed slowdown ratio (default: 0.25 = 25%%)")
+    compare_parser.add_argument("--raw", action="store_true",
+                                help="compare raw timings, without calibration scaling")
+    compare_parser.add_argument("--min-us", type=float, default=2.0,
+                                help="ignore absolute changes smaller than this")
+
+    args = parser.parse_args()
+    return run(args) if args.command == "run" else compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
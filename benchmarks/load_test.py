@@ -0,0 +1,141 @@
+"""
+Load test - triage HTTP 서비스 지연시간/처리량
+
+keep-alive 연결 N개로 POST /triage를 반복 호출하여 p50/p99 지연시간과 RPS 측정
+--port를 지정하지 않으면 서비스를 하위 프로세스로 띄워서 측정
+
+Usage:
+    python benchmarks/load_test.py [--concurrency 64] [--duration 10] [--workers 4]
+    python benchmarks/load_test.py --port 8080  # already running service
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+
+DESCRIPTIONS = [
+    "인스타그램에서 보톡스 시술 50% 할인 이벤트를 진행하려고 합니다.",
+    "버튼 색상을 파란색에서 초록색으로 변경합니다.",
+    "사용자의 주민등록번호를 수집하여 본인인증에 사용합니다.",
+    "유명 인플루언서가 시술 전후사진과 후기를 공유하는 캠페인",
+    "팀 내부에서 사용하는 일정 관리 도구입니다. 외부 공개 없음.",
+]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_healthy(host, port, deadline):
+    while time.perf_counter() < deadline:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            await asyncio.sleep(0.1)
+            continue
+        writer.write(b"GET /healthz HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return json.loads(response.partition(b"\r\n\r\n")[2])
+    raise TimeoutError("service did not become healthy")
+
+
+async def client(host, port, stop_at, index, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    sent = index
+    try:
+        while time.perf_counter() < stop_at:
+            body = json.dumps(
+                {"description": DESCRIPTIONS[sent % len(DESCRIPTIONS)]}, ensure_ascii=False
+            ).encode()
+            sent += 1
+            start = time.perf_counter()
+            writer.write(
+                b"POST /triage HTTP/1.1\r\nHost: x\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            lines = head.decode("latin-1").split("\r\n")
+            headers = dict(line.split(": ", 1) for line in lines[1:] if ": " in line)
+            await reader.readexactly(int(headers["Content-Length"]))
+            latencies.append(time.perf_counter() - start)
+            statuses[int(lines[0].split()[1])] += 1
+            if headers.get("Connection") == "close":
+                writer.close()
+                reader, writer = await asyncio.open_connection(host, port)
+    finally:
+        writer.close()
+
+
+async def run(args):
+    health = await wait_until_healthy(args.host, args.port, time.perf_counter() + 30)
+    print(f"rubric {health['rubric_version']} ({health['rubric_digest'][:12]})")
+
+    latencies, statuses = [], Counter()
+    start = time.perf_counter()
+    stop_at = start + args.duration
+    await asyncio.gather(*(
+        client(args.host, args.port, stop_at, i, latencies, statuses)
+        for i in range(args.concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    print(f"requests     {len(latencies)} in {elapsed:.1f}s, concurrency {args.concurrency}")
+    print(f"throughput   {len(latencies) / elapsed:.0f} req/s")
+    print(f"latency p50  {quantiles[49] * 1000:.2f} ms")
+    print(f"latency p99  {quantiles[98] * 1000:.2f} ms")
+    print("status       " + ", ".join(f"{code}: {n}" for code, n in sorted(statuses.items())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None,
+                        help="existing service port (default: spawn one)")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="worker processes for the spawned service")
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--max-delay-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    server = None
+    if args.port is None:
+        args.port = free_port()
+        server = subprocess.Popen(
+            [
+                sys.executable, "-m", "web.triage_engine", "serve",
+                "--host", args.host, "--port", str(args.port),
+                "--workers", str(args.workers),
+                "--max-batch", str(args.max_batch),
+                "--max-delay-ms", str(args.max_delay_ms),
+            ],
+            cwd=ROOT_DIR,
+        )
+    try:
+        asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
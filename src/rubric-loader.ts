@@ -46,9 +46,13 @@ function validateRubric(data: Record<string, unknown>): Rubric {
     if (!f.code || !f.keywords || !f.reason || !f.severity) {
       throw new Error(`Invalid red_flag at index ${index}`);
     }
+    if (f.exclude_phrases !== undefined && f.exclude_phrases !== null && !Array.isArray(f.exclude_phrases)) {
+      throw new Error(`Invalid red_flag at index ${index}: exclude_phrases must be an array`);
+    }
     return {
       code: String(f.code),
       keywords: f.keywords as string[],
+      exclude_phrases: (f.exclude_phrases as string[] | null | undefined) || [],
       reason: String(f.reason),
       severity: f.severity as RedFlag['severity'],
     };
@@ -0,0 +1,148 @@
+/**
+ * Text Index - 한국어 인지 정규화 및 키워드 매칭 규칙
+ *
+ * web/text_index.py, web/compiled_rubric.py(match_allowed)와 같은 규칙을 사용하여
+ * 두 엔진이 같은 설명에 같은 red flag를 내도록 함
+ *
+ * 정규화 단계:
+ *   1. Unicode NFKC (전각 문자, 호환 자모, NFD 한글 조합형 -> 완성형)
+ *   2. 소문자화
+ *   3. 공백·구분 기호 제거 ("전 후 사진", "전후-사진", "before/after" -> 붙여 쓰기)
+ *
+ * 매칭 규칙 (길이는 구분 기호를 제거한 키워드 기준):
+ *   - 2자 이하 키워드는 제거된 구분 기호에 걸치면 안 됨 ("이 가 장점"의 "가장")
+ *   - 4자 이하 ASCII 키워드는 단어 경계에 있어야 함 ("commonly"의 "only", 복수형 "s"는 허용)
+ *   - red flag의 exclude_phrases 안에 포함된 일치는 무시 ("인스타그램"의 "스타")
+ */
+
+// Separators folded away between keyword characters (same set as text_index.py).
+// '%', '+', '.' are kept: they carry meaning in keywords like "100%", "1+1", "No.1".
+const WHITESPACE =
+  '\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680' +
+  '\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a' +
+  '\u2028\u2029\u202f\u205f\u3000';
+const SEPARATOR_CHARS =
+  WHITESPACE + '_/&\u00b7\u30fb-\u2010\u2011\u2012\u2013\u2014\u2015\u2212';
+const SEPARATOR_SET = new Set(SEPARATOR_CHARS);
+
+const SHORT_KEYWORD_LEN = 2;
+const WORD_KEYWORD_LEN = 4;
+
+export type Span = [number, number];
+
+function normalize(text: string): string {
+  return text.normalize('NFKC').toLowerCase();
+}
+
+function removeSeparators(text: string): string {
+  let compact = '';
+  for (const ch of text) {
+    if (!SEPARATOR_SET.has(ch)) {
+      compact += ch;
+    }
+  }
+  return compact;
+}
+
+/**
+ * 키워드를 TextIndex.compact와 같은 형태로 변환
+ */
+export function compactKeyword(keyword: string): string {
+  return removeSeparators(normalize(keyword));
+}
+
+function isWordChar(ch: string | undefined): boolean {
+  return ch !== undefined && /^[a-z0-9]$/i.test(ch);
+}
+
+function onWordBoundary(text: string, start: number, end: number): boolean {
+  if (start > 0 && isWordChar(text[start - 1])) {
+    return false;
+  }
+  if (end < text.length && isWordChar(text[end])) {
+    if (text[end] !== 's') {
+      return false;
+    }
+    return end + 1 === text.length || !isWordChar(text[end + 1]);
+  }
+  return true;
+}
+
+/**
+ * 설명문 1건의 정규화 결과 (normalized: NFKC + 소문자, compact: 구분 기호 제거)
+ */
+export class TextIndex {
+  readonly normalized: string;
+  readonly compact: string;
+  // compact index -> normalized index
+  private readonly compactPos: number[];
+  private readonly cache = new Map<string, Span[]>();
+
+  constructor(text: string) {
+    this.normalized = normalize(text);
+    this.compactPos = [];
+    let compact = '';
+    for (let i = 0; i < this.normalized.length; i++) {
+      const ch = this.normalized[i];
+      if (!SEPARATOR_SET.has(ch)) {
+        compact += ch;
+        this.compactPos.push(i);
+      }
+    }
+    this.compact = compact;
+  }
+
+  /**
+   * 키워드의 모든 허용된 일치 위치 (normalized 기준 [start, end))
+   */
+  spans(keyword: string): Span[] {
+    const pattern = compactKeyword(keyword);
+    const cached = this.cache.get(pattern);
+    if (cached) {
+      return cached;
+    }
+
+    const spans: Span[] = [];
+    if (pattern.length > 0) {
+      const noStraddle = pattern.length <= SHORT_KEYWORD_LEN;
+      const wordBoundary =
+        pattern.length <= WORD_KEYWORD_LEN && /^[a-z0-9]+$/i.test(pattern);
+      let start = this.compact.indexOf(pattern);
+      while (start !== -1) {
+        const end = start + pattern.length;
+        const spanStart = this.compactPos[start];
+        const spanEnd = this.compactPos[end - 1] + 1;
+        const allowed =
+          !(noStraddle && spanEnd - spanStart !== end - start) &&
+          !(wordBoundary && !onWordBoundary(this.normalized, spanStart, spanEnd));
+        if (allowed) {
+          spans.push([spanStart, spanEnd]);
+        }
+        start = this.compact.indexOf(pattern, start + 1);
+      }
+    }
+    this.cache.set(pattern, spans);
+    return spans;
+  }
+
+  /**
+   * 키워드가 한 번이라도 허용된 위치에 나타나는지
+   */
+  contains(keyword: string): boolean {
+    return this.spans(keyword).length > 0;
+  }
+
+  /**
+   * 제외 구절 안에 포함되지 않은 키워드 일치 위치
+   */
+  spansOutside(keyword: string, excludePhrases: string[]): Span[] {
+    const spans = this.spans(keyword);
+    if (excludePhrases.length === 0 || spans.length === 0) {
+      return spans;
+    }
+    const excluded = excludePhrases.flatMap((phrase) => this.spans(phrase));
+    return spans.filter(
+      ([start, end]) => !excluded.some(([exStart, exEnd]) => exStart <= start && end <= exEnd)
+    );
+  }
+}
@@ -15,6 +15,7 @@ import {
   QuestionTemplate,
 } from './types';
 import { loadRubric } from './rubric-loader';
+import { TextIndex } from './text-index';
 
 export class TriageEngine {
   private rubric: Rubric;
@@ -29,15 +30,17 @@ export class TriageEngine {
   public triage(input: TriageInput): TriageOutput {
     const timestamp = new Date().toISOString();
     const inputHash = this.hashInput(input.description);
+    // 설명문은 한 번만 정규화하여 Step 1-3이 공유
+    const index = new TextIndex(input.description);
 
     // Step 1: Red flag 프리필터
-    const detectedFlags = this.detectRedFlags(input.description);
+    const detectedFlags = this.detectRedFlags(index);
 
     // Step 2: 누락된 정보 질문 생성
-    const missingQuestions = this.generateMissingInfoQuestions(input);
+    const missingQuestions = this.generateMissingInfoQuestions(input, index);
 
     // Step 3: 가드레일 결정
-    const guardrails = this.determineGuardrails(input, detectedFlags);
+    const guardrails = this.determineGuardrails(input, detectedFlags, index);
 
     // Step 4: 최종 라우팅 결정 (보수적 원칙 적용)
     const { routing, confidence } = this.calculateRouting(
@@ -62,17 +65,17 @@ export class TriageEngine {
   }
 
   /**
-   * Red flag 탐지 - 키워드 매칭
+   * Red flag 탐지 - 키워드 매칭 (exclude_phrases 안의 일치는 무시)
    */
-  private detectRedFlags(description: string): DetectedRedFlag[] {
-    const normalizedDesc = description.toLowerCase();
+  private detectRedFlags(index: TextIndex): DetectedRedFlag[] {
     const detected: DetectedRedFlag[] = [];
 
     for (const flag of this.rubric.red_flags) {
       const matchedKeywords: string[] = [];
+      const excludePhrases = flag.exclude_phrases || [];
 
       for (const keyword of flag.keywords) {
-        if (normalizedDesc.includes(keyword.toLowerCase())) {
+        if (index.spansOutside(keyword, excludePhrases).length > 0) {
           matchedKeywords.push(keyword);
         }
       }
@@ -93,9 +96,8 @@ export class TriageEngine {
   /**
    * 누락된 정보에 대한 질문 생성
    */
-  private generateMissingInfoQuestions(input: TriageInput): string[] {
+  private generateMissingInfoQuestions(input: TriageInput, index: TextIndex): string[] {
     const questions: string[] = [];
-    const normalizedDesc = input.description.toLowerCase();
 
     for (const template of this.rubric.question_templates) {
       let shouldAsk = false;
@@ -108,7 +110,7 @@ export class TriageEngine {
       // trigger_if_contains: 설명에 특정 키워드가 있으면 질문
       if (template.trigger_if_contains) {
         for (const keyword of template.trigger_if_contains) {
-          if (normalizedDesc.includes(keyword.toLowerCase())) {
+          if (index.contains(keyword)) {
             shouldAsk = true;
             break;
           }
@@ -146,10 +148,10 @@ export class TriageEngine {
    */
   private determineGuardrails(
     input: TriageInput,
-    detectedFlags: DetectedRedFlag[]
+    detectedFlags: DetectedRedFlag[],
+    index: TextIndex
   ): string[] {
     const guardrails: string[] = [];
-    const normalizedDesc = input.description.toLowerCase();
     const flagCodes = detectedFlags.map((f) => f.code);
 
     for (const guardrail of this.rubric.safe_guardrails) {
@@ -166,27 +168,27 @@ export class TriageEngine {
 
         case 'marketing':
           shouldInclude =
-            normalizedDesc.includes('마케팅') ||
-            normalizedDesc.includes('광고') ||
-            normalizedDesc.includes('marketing') ||
+            index.contains('마케팅') ||
+            index.contains('광고') ||
+            index.contains('marketing') ||
             flagCodes.includes('EXAGGERATED_AD') ||
             flagCodes.includes('CELEBRITY_ENDORSEMENT');
           break;
 
         case 'user_content':
           shouldInclude =
-            normalizedDesc.includes('ugc') ||
-            normalizedDesc.includes('사용자 생성') ||
-            normalizedDesc.includes('댓글') ||
-            normalizedDesc.includes('리뷰') ||
+            index.contains('ugc') ||
+            index.contains('사용자 생성') ||
+            index.contains('댓글') ||
+            index.contains('리뷰') ||
             flagCodes.includes('USER_CONTENT_LIABILITY');
           break;
 
         case 'terms_update':
           shouldInclude =
-            normalizedDesc.includes('약관') ||
-            normalizedDesc.includes('정책 변경') ||
-            normalizedDesc.includes('terms');
+            index.contains('약관') ||
+            index.contains('정책 변경') ||
+            index.contains('terms');
           break;
 
         case 'refund':
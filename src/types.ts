@@ -21,6 +21,7 @@ export interface TriageInput {
 export interface RedFlag {
   code: string;
   keywords: string[];
+  exclude_phrases?: string[];
   reason: string;
   severity: Severity;
 }
@@ -0,0 +1,14 @@
+"""
+pytest configuration for the Python engine (web/)
+
+web/ 모듈은 streamlit_app.py와 동일하게 최상위 모듈로 import 합니다.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+WEB_DIR = ROOT_DIR / "web"
+
+if str(WEB_DIR) not in sys.path:
+    sys.path.insert(0, str(WEB_DIR))
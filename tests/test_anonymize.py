@@ -0,0 +1,113 @@
+"""
+Anonymization check tests
+
+프리필터 후보 줄 검사가 패턴별 전체 스캔(anonymize.ts의 checkFile)과 같은 결과를 내는지,
+청크 스트리밍, 해시 캐시, 프로세스 풀 결과 검증
+"""
+
+import json
+import random
+import shutil
+from pathlib import Path
+
+import anonymize
+from anonymize import AnonymizationScanner, check_case, check_file, check_text, format_results
+
+CASES_DIR = Path(__file__).parent.parent / "data" / "cases"
+
+PIECES = [
+    "010-1234-5678", "02-123-4567", "a.b@ex.com", "900101-1234567", "이름: 홍길동",
+    "담당： 김철", "강남미래성형외과", "청담클리닉_A", "병원_B", "성형외과", "서울 강남구 역삼동 123",
+    "HTTP://X.COM/a.PNG", "https://cdn.x.com/p", "[REDACTED]", "법무_1", " ", "\t", "　",
+    "\r", "\n", "\n", "😀", "가", "나다", "K", "3", "-", "/", "구", "로", "동", "abc",
+]
+
+
+def full_scan(text):
+    """checkFile() as written: every pattern over every line"""
+    issues = []
+    for number, line in enumerate(text.split("\n"), 1):
+        issues.extend(anonymize.check_line(line, number))
+    return issues
+
+
+def random_text(rng, size):
+    return "".join(rng.choice(PIECES) for _ in range(size))
+
+
+def test_prefilter_matches_full_scan():
+    rng = random.Random(7)
+    for _ in range(300):
+        text = random_text(rng, rng.randint(0, 60))
+        assert check_text(text) == full_scan(text)
+
+
+def test_findings_match_ts_checker():
+    text = "연락처\n이름: 홍길동 010-1234-5678\n😀 a@b.co 병원_A 강남미래의원 강남성형외과\n"
+    issues = check_text(text)
+
+    assert [(i.line, i.column, i.type, i.matched) for i in issues] == [
+        (2, 9, "phone", "010-1234-5678"),
+        (2, 1, "name", "이름: 홍길동"),
+        (3, 4, "email", "a@b.co"),  # UTF-16 column: the emoji counts twice
+        (3, 16, "hospital", "강남미래의원"),
+    ]  # same as anonymize.ts; "강남성형외과" ends with an allowed term and is skipped there too
+
+
+def test_chunked_file_scan_matches_whole_text(tmp_path):
+    rng = random.Random(3)
+    text = random_text(rng, 5000)
+    path = tmp_path / "request.md"
+    path.write_text(text, encoding="utf-8", newline="")
+
+    expected = full_scan(text)
+    assert expected
+    for chunk in (7, 64, 1 << 20):
+        assert check_file(str(path), chunk_chars=chunk).issues == expected
+
+
+def test_sample_case_passes():
+    results = check_case(str(CASES_DIR / "2026-01-07_sns-campaign-botox"))
+    assert [Path(r.file).name for r in results] == ["request.md", "response.md", "case.yaml"]
+    assert all(r.passed for r in results)
+
+
+def test_scanner_caches_unchanged_files(tmp_path):
+    cases_dir = tmp_path / "cases"
+    shutil.copytree(CASES_DIR, cases_dir, ignore=shutil.ignore_patterns(".*"))
+    scanner = AnonymizationScanner(str(cases_dir), workers=1)
+
+    first = scanner.check_all()
+    assert scanner.scanned == 3
+    assert scanner.check_all() == first and scanner.scanned == 0
+
+    request = cases_dir / "2026-01-07_sns-campaign-botox" / "request.md"
+    request.write_text(request.read_text() + "\n담당: 김영희\n")
+    results = scanner.check_all()
+    assert scanner.scanned == 1
+    (failed,) = [r for r in results["2026-01-07_sns-campaign-botox"] if not r.passed]
+    assert [i.matched for i in failed.issues] == ["담당: 김영희"]
+    assert any(line.startswith("[FAIL]") for line in format_results(results))
+
+    cache = json.loads((cases_dir / ".anonymize-cache.json").read_text())
+    cache["patterns"] = "stale"
+    (cases_dir / ".anonymize-cache.json").write_text(json.dumps(cache))
+    scanner.check_all()
+    assert scanner.scanned == 3
+
+
+def test_process_pool_matches_serial(tmp_path):
+    cases_dir = tmp_path / "cases"
+    shutil.copytree(CASES_DIR, cases_dir, ignore=shutil.ignore_patterns(".*"))
+    case_dir = cases_dir / "2026-01-07_sns-campaign-botox"
+    index = (cases_dir / "index.jsonl").read_text()
+    for n in range(3):
+        name = f"2026-01-0{n + 1}_copy"
+        shutil.copytree(case_dir, cases_dir / name)
+        (cases_dir / name / "request.md").write_text(f"이름: 홍길{n}동\n")
+        index += index.splitlines()[0].replace("2026-01-07_sns-campaign-botox", name) + "\n"
+    (cases_dir / "index.jsonl").write_text(index)
+
+    serial = AnonymizationScanner(str(cases_dir), cache_path=str(tmp_path / "a.json"), workers=1)
+    pooled = AnonymizationScanner(str(cases_dir), cache_path=str(tmp_path / "b.json"), workers=2)
+    assert pooled.check_all() == serial.check_all()
@@ -0,0 +1,106 @@
+"""
+Audit analytics tests
+
+컬럼형 집계가 엔트리 단위 계산과 일치하는지, 캐시/증분 갱신이 중복 없이 동작하는지 검증
+"""
+
+import random
+from collections import Counter
+
+from audit_analytics import AuditAnalytics, read_columns
+from audit_logger import AuditLogger, read_entries, segment_paths
+
+CODES = ["PII_COLLECTION", "BEFORE_AFTER_PHOTO", "PRICE_DISCOUNT", "CROSS_BORDER"]
+
+
+def write_entries(logger, count, seed):
+    rng = random.Random(seed)
+    for i in range(count):
+        flags = rng.sample(CODES, rng.randint(0, 2))
+        logger.log_dict({
+            "timestamp": f"2026-03-01T00:00:{i % 60:02d}",
+            "input_hash": f"{i:016x}",
+            "routing": "TYPE_1" if flags or rng.random() < 0.2 else "TYPE_2",
+            "confidence": rng.choice([0.55, 0.7, 0.85, 0.9, 0.95]),
+            "red_flags": [{"code": code} for code in flags],
+            "missing_info_questions": ["q"] * rng.randint(0, 3),
+            "safe_guardrails": ["g"] * rng.randint(0, 4),
+        })
+
+
+def test_summary_matches_entry_by_entry_counts(tmp_path):
+    logger = AuditLogger(str(tmp_path), max_bytes=20_000)
+    write_entries(logger, 800, seed=1)
+    logger.close()
+
+    summary = AuditAnalytics(str(tmp_path)).summary()
+    entries = list(read_entries(str(tmp_path)))
+
+    assert summary["total"] == len(entries) == 800
+    assert summary["type1"] == sum(e["routing"] == "TYPE_1" for e in entries)
+    flags = Counter(code for e in entries for code in e["red_flag_codes"])
+    flag_type1 = Counter(
+        code for e in entries if e["routing"] == "TYPE_1" for code in e["red_flag_codes"]
+    )
+    assert {f["code"]: (f["count"], f["type1"]) for f in summary["flags"]} == {
+        code: (n, flag_type1[code]) for code, n in flags.items()
+    }
+    assert summary["guardrails"]["distribution"] == dict(
+        sorted(Counter(e["guardrail_count"] for e in entries).items())
+    )
+    assert abs(summary["confidence"]["mean"] -
+               sum(e["confidence"] for e in entries) / 800) < 1e-9
+
+
+def test_refresh_reads_only_new_entries_across_rotation(tmp_path):
+    logger = AuditLogger(str(tmp_path), max_bytes=20_000)
+    write_entries(logger, 300, seed=2)
+    logger.close()
+
+    analytics = AuditAnalytics(str(tmp_path))
+    assert analytics.summary()["total"] == 300
+    assert AuditAnalytics(str(tmp_path)).summary()["total"] == 300  # from the cache file
+
+    logger = AuditLogger(str(tmp_path), max_bytes=20_000)
+    write_entries(logger, 200, seed=3)
+    logger.close()
+
+    fresh = AuditAnalytics(str(tmp_path))
+    assert fresh.summary()["total"] == 500
+    assert fresh.entries_read < 500
+    assert analytics.summary()["total"] == 500
+
+
+def test_partial_trailing_line_is_left_for_later(tmp_path):
+    path = tmp_path / "audit-2026-03-01.jsonl"
+    path.write_text(
+        '{"timestamp": "t", "input_hash": "h", "routing": "TYPE_2", "confidence": 0.9, '
+        '"red_flag_codes": [], "missing_info_count": 0, "guardrail_count": 1}\n{"timest'
+    )
+    columns, offset = read_columns(str(path))
+    assert len(columns) == 1
+    assert offset == path.read_text().index("\n") + 1
+    assert segment_paths(str(tmp_path)) == [str(path)]
+
+
+def test_rewritten_segment_with_same_name_and_inode_is_reread(tmp_path):
+    line = (
+        '{"timestamp": "t", "input_hash": "h", "routing": "%s", "confidence": 0.9, '
+        '"red_flag_codes": [], "missing_info_count": 0, "guardrail_count": 1}\n'
+    )
+    path = tmp_path / "audit-2026-03-01.jsonl"
+    path.write_text(line % "TYPE_2" * 2)
+    analytics = AuditAnalytics(str(tmp_path))
+    assert analytics.summary()["type1"] == 0
+
+    # Truncated and rewritten in place: the name and inode are reused and the
+    # file is no shorter than the cached offset
+    inode = path.stat().st_ino
+    with open(path, "r+") as f:
+        f.truncate(0)
+        f.write(line % "TYPE_1" * 3)
+    assert path.stat().st_ino == inode
+
+    assert AuditAnalytics(str(tmp_path)).summary()["type1"] == 3  # from the cache file
+    summary = analytics.summary()
+    assert (summary["total"], summary["type1"]) == (3, 3)
@@ -0,0 +1,90 @@
+"""
+Audit logger tests
+
+AuditLogEntry 스키마, 배치 기록, 크기/날짜 교체 + gzip 압축, 과부하 시 drop 검증
+"""
+
+import gzip
+import json
+import os
+
+from audit_logger import ENTRY_FIELDS, AuditLogger, read_entries, segment_paths
+from triage_engine import TriageEngine, TriageInput
+
+DESCRIPTIONS = [
+    "인스타그램에서 보톡스 시술 50% 할인 이벤트",
+    "회원 개인정보를 수집해 맞춤 광고에 활용",
+    "사내 테스트용 계산기 기능",
+]
+
+
+def test_entries_follow_audit_log_schema(tmp_path):
+    logger = AuditLogger(str(tmp_path))
+    engine = TriageEngine(audit_log=logger)
+    results = [engine.triage(TriageInput(description=d)) for d in DESCRIPTIONS]
+    logger.close()
+
+    entries = list(read_entries(str(tmp_path)))
+    assert [tuple(entry) for entry in entries] == [ENTRY_FIELDS] * len(DESCRIPTIONS)
+    for entry, result in zip(entries, results):
+        assert entry["input_hash"] == result.input_hash
+        assert entry["routing"] == result.routing
+        assert entry["red_flag_codes"] == [f.code for f in result.red_flags]
+        assert entry["guardrail_count"] == len(result.safe_guardrails)
+    raw = "".join(open(path, encoding="utf-8").read() for path in segment_paths(str(tmp_path)))
+    assert "보톡스" not in raw  # never the description itself
+
+
+def test_size_rotation_compresses_closed_segments(tmp_path):
+    logger = AuditLogger(str(tmp_path), max_bytes=2_000, batch_size=4)
+    engine = TriageEngine(audit_log=logger)
+    for i in range(60):
+        engine.triage(TriageInput(description=f"{DESCRIPTIONS[i % 3]} #{i}"))
+    logger.close()
+
+    paths = segment_paths(str(tmp_path))
+    closed = [path for path in paths if path.endswith(".gz")]
+    assert logger.segments == len(closed) >= 2
+    with gzip.open(closed[0], "rt", encoding="utf-8") as f:
+        json.loads(f.readline())
+    assert len(list(read_entries(str(tmp_path)))) == 60
+    assert logger.dropped == 0
+
+
+def test_date_change_seals_previous_day(tmp_path):
+    logger = AuditLogger(str(tmp_path), flush_interval=0.01)
+    logger._today = lambda: "2026-01-01"
+    engine = TriageEngine(audit_log=logger)
+    engine.triage(TriageInput(description=DESCRIPTIONS[0]))
+    logger.close()
+    assert os.path.exists(tmp_path / "audit-2026-01-01.jsonl")
+
+    # A logger started on a later day seals the leftover active segment
+    AuditLogger(str(tmp_path)).close()
+    assert sorted(os.listdir(tmp_path)) == ["audit-2026-01-01.001.jsonl.gz"]
+
+
+def test_overload_drops_instead_of_blocking(tmp_path):
+    logger = AuditLogger(str(tmp_path), queue_size=1)
+    engine = TriageEngine(audit_log=logger)
+    result = engine.triage(TriageInput(description=DESCRIPTIONS[0]))
+
+    for _ in range(2_000):
+        logger.log(result)
+    logger.close()
+
+    assert logger.dropped > 0
+    assert logger.written + logger.dropped == 2_001
+
+
+def test_segments_use_the_utc_date_and_spare_later_ones(tmp_path):
+    import time
+
+    logger = AuditLogger(str(tmp_path))
+    assert logger._today() == time.strftime("%Y-%m-%d", time.gmtime())  # like logger.ts
+    logger.close()
+
+    # A file dated after this process's today (another writer's clock) is left alone
+    (tmp_path / "audit-2999-01-01.jsonl").write_text("{}\n", encoding="utf-8")
+    AuditLogger(str(tmp_path)).close()
+    assert os.listdir(tmp_path) == ["audit-2999-01-01.jsonl"]
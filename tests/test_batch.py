@@ -0,0 +1,63 @@
+"""
+Batch triage tests
+
+triage_many 결과가 입력 순서를 유지하고 단건 triage와 동일한지 검증
+"""
+
+import json
+
+import pytest
+
+from triage_engine import TriageEngine, TriageInput, main, output_to_dict
+
+DESCRIPTIONS = [
+    '사용자의 주민등록번호를 수집하여 본인인증에 사용합니다.',
+    '버튼 색상을 파란색에서 초록색으로 변경합니다.',
+    '인플루언서 협찬을 통해 제품을 홍보합니다.',
+    '인스타그램에서 보톡스 시술 50% 할인 이벤트를 진행하려고 합니다.',
+    '팀 내부에서 사용하는 일정 관리 도구입니다. 외부 공개 없음.',
+]
+
+
+def comparable(result):
+    payload = output_to_dict(result)
+    payload.pop('timestamp')
+    return payload
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return TriageEngine()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_triage_many_matches_triage_in_order(engine, workers):
+    inputs = [TriageInput(description=d) for d in DESCRIPTIONS * 4]
+
+    results = engine.triage_many(inputs, workers=workers, chunksize=3)
+
+    assert [comparable(r) for r in results] == \
+        [comparable(engine.triage(i)) for i in inputs]
+    assert engine.last_batch_stats.count == len(inputs)
+    assert engine.last_batch_stats.workers == workers
+
+
+def test_triage_many_empty(engine):
+    assert engine.triage_many([], workers=4) == []
+
+
+def test_batch_cli(tmp_path, capsys):
+    src = tmp_path / "inputs.jsonl"
+    dst = tmp_path / "outputs.jsonl"
+    src.write_text(
+        "\n".join(json.dumps({"description": d, "exposure": "public"}, ensure_ascii=False)
+                  for d in DESCRIPTIONS) + "\n",
+        encoding="utf-8",
+    )
+
+    assert main(["batch", str(src), "-o", str(dst), "-w", "2"]) == 0
+
+    lines = dst.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == len(DESCRIPTIONS)
+    assert json.loads(lines[0])["routing"] == "TYPE_1"
+    assert "inputs/s" in capsys.readouterr().err
@@ -0,0 +1,116 @@
+"""
+Case ingest tests
+
+manifest 기반 증분 인제스트(추가는 append, 수정/삭제는 바뀐 줄부터), 날짜 없는 케이스, CaseCatalog 조회 검증
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import case_ingest
+from case_ingest import CaseCatalog, CaseIngestor
+
+CASES_DIR = Path(__file__).parent.parent / "data" / "cases"
+CASE_ID = "2026-01-07_sns-campaign-botox"
+
+
+def add_case(cases_dir, name, date, rule_codes, title="케이스"):
+    case_dir = cases_dir / name
+    shutil.copytree(CASES_DIR / CASE_ID, case_dir)
+    text = (case_dir / "case.yaml").read_text()
+    text = text.replace(CASE_ID, name).replace('date: "2026-01-07"', f'date: "{date}"')
+    text = text.replace("보톡스 시술 SNS 캠페인 검토", title)
+    text = text.replace("  - EFFECT_GUARANTEE\n", "".join(f"  - {c}\n" for c in rule_codes))
+    (case_dir / "case.yaml").write_text(text)
+    return case_dir
+
+
+def read_index(cases_dir):
+    return [json.loads(line) for line in (cases_dir / "index.jsonl").read_text().splitlines()]
+
+
+def test_existing_index_is_kept_byte_for_byte(tmp_path):
+    shutil.copytree(CASES_DIR, tmp_path / "cases", ignore=shutil.ignore_patterns(".*"))
+    before = (tmp_path / "cases" / "index.jsonl").read_bytes()
+
+    result = CaseIngestor(str(tmp_path / "cases")).ingest()
+
+    assert result.unchanged == 1 and not result.changed
+    assert (tmp_path / "cases" / "index.jsonl").read_bytes() == before
+
+
+def test_only_changed_cases_are_parsed(tmp_path, monkeypatch):
+    cases_dir = tmp_path / "cases"
+    add_case(cases_dir, "2026-01-01_a", "2026-01-01", ["PII_COLLECTION"])
+    add_case(cases_dir, "2026-01-02_b", "2026-01-02", [])
+    ingestor = CaseIngestor(str(cases_dir), workers=4)
+    assert ingestor.ingest().added == ["2026-01-01_a", "2026-01-02_b"]
+
+    parsed = []
+    parse = case_ingest.parse_case_entry
+    monkeypatch.setattr(case_ingest, "parse_case_entry", lambda d: parsed.append(d) or parse(d))
+
+    # Touching a file without changing it re-hashes but does not re-parse
+    (cases_dir / "2026-01-01_a" / "request.md").touch()
+    assert not ingestor.ingest().changed
+    assert parsed == []
+
+    # New, later case: appended after the untouched lines
+    size = (cases_dir / "index.jsonl").stat().st_size
+    add_case(cases_dir, "2026-02-01_c", "2026-02-01", [])
+    result = ingestor.ingest()
+    assert result.added == ["2026-02-01_c"]
+    assert result.rewritten_from == size
+    assert [Path(d).name for d in parsed] == ["2026-02-01_c"]
+
+    # Edited middle case: rewritten from its line on
+    first_line = (cases_dir / "index.jsonl").read_text().splitlines()[0]
+    case_yaml = cases_dir / "2026-01-02_b" / "case.yaml"
+    case_yaml.write_text(case_yaml.read_text().replace("decision: TYPE_1", "decision: TYPE_2"))
+    result = ingestor.ingest()
+    assert result.updated == ["2026-01-02_b"]
+    assert result.rewritten_from == len(first_line.encode()) + 1
+    assert [e["decision"] for e in read_index(cases_dir)] == ["TYPE_1", "TYPE_2", "TYPE_1"]
+
+    shutil.rmtree(cases_dir / "2026-01-01_a")
+    assert ingestor.ingest().removed == ["2026-01-01_a"]
+    assert [e["case_id"] for e in read_index(cases_dir)] == ["2026-01-02_b", "2026-02-01_c"]
+
+
+def test_catalog_lookups(tmp_path):
+    cases_dir = tmp_path / "cases"
+    add_case(cases_dir, "2026-01-01_a", "2026-01-01", ["PII_COLLECTION"])
+    add_case(cases_dir, "2026-03-01_b", "2026-03-01", ["PII_COLLECTION", "CROSS_BORDER"])
+    add_case(cases_dir, "2026-05-01_c", "2026-05-01", [])
+    CaseIngestor(str(cases_dir)).ingest()
+
+    catalog = CaseCatalog.load(str(cases_dir / "index.jsonl"))
+
+    assert catalog.get("2026-03-01_b")["date"] == "2026-03-01"
+    assert [e["case_id"] for e in catalog.with_rule("PII_COLLECTION")] == [
+        "2026-01-01_a", "2026-03-01_b",
+    ]
+    assert [e["case_id"] for e in catalog.between("2026-02-01", "2026-05-01")] == [
+        "2026-03-01_b", "2026-05-01_c",
+    ]
+    assert catalog.rule_codes()[0] == ("BEFORE_AFTER_PHOTO", 3)
+
+
+def test_undated_cases_are_indexed_like_ts_and_cataloged(tmp_path):
+    cases_dir = tmp_path / "cases"
+    add_case(cases_dir, "2026-01-01_a", "2026-01-01", [])
+    case_dir = add_case(cases_dir, "2026-02-01_b", "", ["PII_COLLECTION"])  # folder name only
+    text = (case_dir / "case.yaml").read_text()
+    text = text.replace('date: ""\n', "").replace('team: "마케팅팀"\n', "")
+    (case_dir / "case.yaml").write_text(text)
+    CaseIngestor(str(cases_dir)).ingest()
+
+    entry = next(e for e in read_index(cases_dir) if e["case_id"] == "2026-02-01_b")
+    assert "date" not in entry and "team" not in entry  # JSON.stringify drops undefined
+
+    catalog = CaseCatalog.load(str(cases_dir / "index.jsonl"))
+    assert [e["case_id"] for e in catalog.entries] == ["2026-02-01_b", "2026-01-01_a"]
+    assert "PII_COLLECTION" in catalog.get("2026-02-01_b")["rule_codes"]
+    assert [e["case_id"] for e in catalog.between()] == ["2026-01-01_a"]
+    assert len(CaseCatalog([{"path": "no-id"}])) == 0
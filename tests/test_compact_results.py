@@ -0,0 +1,92 @@
+"""
+Compact result tests
+
+정수 ID 인코딩이 TriageOutput을 그대로 복원하는지, ResultBatch 열 저장·워커 풀 compact 모드가
+리스트 모드와 같은 결과를 내는지 검증
+"""
+
+import pickle
+
+from compact_results import CompactTriageOutput, ResultBatch, encode
+from triage_engine import TriageEngine, TriageInput, output_to_dict
+
+INPUTS = [
+    TriageInput('인스타그램 보톡스 시술 전후사진 50% 할인, 주민등록번호 수집', exposure='public'),
+    TriageInput('버튼 색상을 파란색에서 초록색으로 변경합니다.'),
+    TriageInput('We collect email addresses for a members-only newsletter', data_usage='collects'),
+    TriageInput(
+        '사내 점심 메뉴 안내', exposure='internal_test', data_usage='no_collection',
+        revenue_model='free', external_communication='internal', cross_border='domestic_only',
+    ),
+]
+
+
+def test_compact_output_resolves_to_the_original():
+    engine = TriageEngine()
+    for input_data in INPUTS:
+        result = engine.triage(input_data)
+        compact = CompactTriageOutput.from_output(result, engine.compiled)
+
+        assert not hasattr(compact, '__dict__')
+        assert compact.to_output() == result
+        assert compact.routing == result.routing
+        assert compact.flag_codes == [flag.code for flag in result.red_flags]
+        assert all(isinstance(i, int) for i in compact.question_ids + compact.guardrail_ids)
+
+
+def test_result_batch_round_trip_and_odd_fields():
+    engine = TriageEngine()
+    results = [engine.triage(input_data) for input_data in INPUTS]
+    results[1].timestamp = '2026-01-07T09:00:00+09:00'  # tz-aware: kept as text
+    results[2].input_hash = ''
+    results[3].trace = {'total': 0.001}
+
+    batch = ResultBatch(engine.compiled)
+    batch.extend(results)
+    batch.append(CompactTriageOutput.from_output(results[0], engine.compiled))
+
+    assert len(batch) == 5
+    assert [item.to_output() for item in batch] == results + results[:1]
+    assert batch[-1].to_dict() == output_to_dict(results[0])
+    assert batch.routing_counts() == {
+        routing: sum(r.routing == routing for r in results + results[:1])
+        for routing in {r.routing for r in results}
+    }
+    assert 0 < batch.nbytes < 1000
+
+
+def test_encode_rejects_another_rubric(tmp_path):
+    edited = tmp_path / 'rubric.yaml'
+    edited.write_text(
+        open(TriageEngine().rubric_path, encoding='utf-8').read() + '\n# edited\n', encoding='utf-8'
+    )
+    result = TriageEngine(str(edited)).triage(INPUTS[0])
+    try:
+        encode(result, TriageEngine().compiled)
+    except ValueError as error:
+        assert 'rubric' in str(error)
+    else:
+        raise AssertionError('expected ValueError')
+
+
+def test_compact_batch_matches_list_mode_across_the_pool():
+    engine = TriageEngine()
+    inputs = INPUTS * 5
+    expected = [output_to_dict(r) for r in engine.triage_many(inputs, workers=1)]
+    for payload in expected:
+        payload.pop('timestamp')
+    for workers in (1, 2):
+        batch = engine.triage_many(inputs, workers=workers, chunksize=3, compact=True)
+        assert isinstance(batch, ResultBatch)
+        got = [item.to_dict() for item in batch]
+        for payload in got:
+            payload.pop('timestamp')
+        assert got == expected
+
+
+def test_compact_fields_are_much_smaller_to_pickle():
+    engine = TriageEngine()
+    result = engine.triage(INPUTS[0])
+    full = len(pickle.dumps(result))
+    compact = len(pickle.dumps(encode(result, engine.compiled)))
+    assert compact * 4 < full
@@ -0,0 +1,60 @@
+"""
+Compiled rubric tests
+
+CompiledRubric 사전 계산 결과와 가드레일 조건 디스패치 검증
+"""
+
+import pytest
+
+from compiled_rubric import GUARDRAIL_PREDICATES, CompiledRubric
+from triage_engine import TriageEngine, TriageInput
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return TriageEngine()
+
+
+def test_every_rubric_condition_has_predicate(engine):
+    conditions = {g['condition'] for g in engine.rubric['safe_guardrails']}
+    assert conditions <= set(GUARDRAIL_PREDICATES)
+    assert all(g.predicate is not None for g in engine.compiled.guardrails)
+
+
+def test_trigger_keywords_are_normalized():
+    compiled = CompiledRubric({
+        'question_templates': [
+            {'category': 'cross_border', 'question': 'Q', 'trigger_if_contains': ['Global']},
+        ],
+    })
+    assert compiled.questions[0].trigger_ids == (compiled.automaton.pattern_id('global'),)
+    assert compiled.questions[0].unknown_field is None
+
+
+def test_unknown_condition_never_fires():
+    compiled = CompiledRubric({
+        'safe_guardrails': [{'condition': 'not_a_condition', 'text': 'T'}],
+    })
+    assert compiled.guardrails[0].predicate is None
+
+
+def test_data_collection_guardrail(engine):
+    result = engine.triage(TriageInput(
+        description='사용자 이름과 이메일을 수집합니다.',
+        data_usage='collects',
+    ))
+    assert any('개인정보 수집' in g for g in result.safe_guardrails)
+
+
+def test_refund_guardrail_for_paid_services(engine):
+    result = engine.triage(TriageInput(
+        description='유료 구독 서비스입니다.',
+        revenue_model='subscription',
+    ))
+    assert any('환불' in g for g in result.safe_guardrails)
+
+
+def test_medical_ad_guardrails_follow_flags(engine):
+    result = engine.triage(TriageInput(description='보톡스 시술 안내'))
+    assert any('의료광고임을' in g for g in result.safe_guardrails)
+    assert any('시술' in q for q in result.missing_info_questions)
@@ -0,0 +1,94 @@
+"""
+Document triage tests
+
+청크 크기·경계 위치와 무관하게 문서 모드 결과가 triage()와 동일한지, 섹션별 flag 귀속과
+routing_only 조기 종료가 맞는지 검증
+"""
+
+import random
+
+import pytest
+
+import document
+from document import DocumentScanner, result_to_dict, triage_document, triage_document_file
+from test_incremental import SNIPPETS, comparable
+from triage_engine import TriageEngine, TriageInput
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return TriageEngine()
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(document, 'MIN_CHUNK_CHARS', 1)
+
+
+def test_matches_triage_for_any_chunk_size(engine, small_chunks):
+    rng = random.Random(5)
+    for round_ in range(30):
+        text = "".join(rng.choice(SNIPPETS + ["이 가", "ﬁ", "é"]) for _ in range(60))
+        if round_ % 3 == 0:
+            text = text.replace("\n", "")  # cut at spaces
+        elif round_ % 3 == 1:
+            text = text.replace("\n", "").replace(" ", "")  # cut anywhere
+        input_data = TriageInput(text, exposure='public' if round_ % 2 else None)
+        expected = comparable(engine.triage(input_data))
+        for chunk_chars in (8, 13, 40, 200):
+            result = triage_document(engine, input_data, chunk_chars=chunk_chars)
+            assert comparable(result.output) == expected, (text, chunk_chars)
+            assert result.scanned_chars == len(text)
+
+
+def test_sections_attribute_flags_with_document_offsets(engine, tmp_path):
+    text = (
+        "캠페인 개요입니다.\n"
+        "# 광고 문구\n보톡스 시술 전후사진 공개\n"
+        "\f슬라이드 3 개인정보\n이벤트 응모 시 주민등록번호 수집\n"
+        "\f마무리 인사\n"
+    )
+    path = tmp_path / 'brief.txt'
+    path.write_text(text, encoding='utf-8')
+
+    result = triage_document_file(engine, str(path), exposure='public')
+    titles = [section.title for section in result.sections]
+    assert titles == ['', '# 광고 문구', '슬라이드 3 개인정보', 'page 3']
+    assert comparable(result.output) == comparable(engine.triage(TriageInput(text, exposure='public')))
+
+    for section in result.sections:
+        for flag in section.red_flags:
+            for start, end, keyword in flag.matched_spans:
+                assert section.start <= start < section.end
+                assert keyword in flag.matched_keywords
+    photo = [f for f in result.sections[1].red_flags if f.code == 'BEFORE_AFTER_PHOTO']
+    assert photo and text[slice(*photo[0].matched_spans[0][:2])] in ('전후사진', '시술 전후')
+    assert 'PII_COLLECTION' in [f.code for f in result.sections[2].red_flags]
+    assert result_to_dict(result)['document']['sections'][3]['red_flags'] == []
+
+
+def test_routing_only_stops_at_a_confirmed_critical_flag(engine, small_chunks):
+    filler = "버튼 색상과 여백을 조정합니다. " * 200
+    text = filler + "보톡스 시술 전후사진" + filler * 20
+    input_data = TriageInput(text)
+
+    full = triage_document(engine, input_data, chunk_chars=512)
+    fast = triage_document(engine, input_data, chunk_chars=512, routing_only=True)
+    assert fast.stopped_early and not full.stopped_early
+    assert fast.output.routing == full.output.routing == engine.triage(input_data).routing
+    assert fast.scanned_chars < len(text) // 10
+    assert fast.output.input_hash == engine.triage(input_data).input_hash
+
+
+def test_routing_only_waits_out_exclusions(engine, small_chunks):
+    filler = " 안내 문구를 정리합니다." * 100
+    text = filler + "인스타그램 피부 관리 팁" + filler  # "스타", "피" fall inside exclude phrases
+    input_data = TriageInput(text)
+
+    for chunk_chars in (16, 64, 1024):
+        scanner = DocumentScanner(engine, chunk_chars=chunk_chars, routing_only=True)
+        for start in range(0, len(text), 7):
+            scanner.feed(text[start:start + 7])
+        result = scanner.finish(TriageInput(''))
+        assert not result.stopped_early
+        assert comparable(result.output) == comparable(engine.triage(input_data))
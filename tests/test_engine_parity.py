@@ -0,0 +1,78 @@
+"""
+Python/TypeScript engine parity tests
+
+케이스 코퍼스(data/cases)와 매칭 규칙 경계 예시(exclude_phrases, 짧은 키워드, ASCII 단어 경계)에서
+두 엔진의 red flag 코드 집합이 같은지 검증 (ts-node가 설치된 경우에만 실행, npm install 필요)
+"""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from regression import load_cases
+from triage_engine import TriageEngine, TriageInput
+
+ROOT = Path(__file__).parent.parent
+TS_NODE = ROOT / "node_modules" / ".bin" / "ts-node"
+
+PROBES = [
+    "인스타그램 채널에서 신규 기능 소개",
+    "스타 강사가 추천하는 피부 관리 시술",
+    "피드에 올라가는 피부과 이벤트",
+    "수술 장면에서 피가 보이는 영상",
+    "이 가 장점인 서비스",
+    "Commonly used tips for PPL campaigns",
+    "Only for members: free trial ads",
+    "전 후 사진 비교, before/after 게시",
+    "ＰＰＬ 협찬 광고",
+]
+
+TS_SCRIPT = """
+const { TriageEngine } = require(%s);
+const descriptions = JSON.parse(require('fs').readFileSync(0, 'utf-8'));
+const engine = new TriageEngine(%s);
+const codes = descriptions.map((description) =>
+  engine.triage({ description }).red_flags.map((flag) => flag.code).sort()
+);
+process.stdout.write(JSON.stringify(codes));
+"""
+
+
+@pytest.mark.skipif(
+    shutil.which("node") is None or not TS_NODE.exists(),
+    reason="TypeScript engine needs node and npm install",
+)
+def test_red_flag_codes_match_typescript_engine():
+    descriptions = [item.input.description for item in load_cases()] + PROBES
+    for case_dir in sorted((ROOT / "data" / "cases").iterdir()):
+        for name in ("request.md", "response.md"):
+            if (case_dir / name).exists():
+                descriptions.append((case_dir / name).read_text(encoding="utf-8"))
+
+    engine = TriageEngine()
+    expected = [
+        sorted(flag.code for flag in engine.triage(TriageInput(d)).red_flags)
+        for d in descriptions
+    ]
+
+    script = TS_SCRIPT % (
+        json.dumps(str(ROOT / "src" / "triage-engine")),
+        json.dumps(str(ROOT / "rubric.yaml")),
+    )
+    completed = subprocess.run(
+        [str(TS_NODE), "--transpile-only", "-e", script],
+        input=json.dumps(descriptions, ensure_ascii=False),
+        capture_output=True, text=True, encoding="utf-8", cwd=ROOT, timeout=120, check=True,
+    )
+    actual = json.loads(completed.stdout)
+
+    mismatches = [
+        (description[:60], py_codes, ts_codes)
+        for description, py_codes, ts_codes in zip(descriptions, expected, actual)
+        if py_codes != ts_codes
+    ]
+    assert len(actual) == len(descriptions)
+    assert mismatches == []
@@ -0,0 +1,96 @@
+"""
+Import-time regression tests
+
+triage_engine import 경로가 가볍게 유지되는지 (python -X importtime 기준),
+스냅샷/캐시 경로에서 PyYAML을 import 하지 않는지, 결과 타입이 dataclass로 유지되는지 검증
+"""
+
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from rubric_snapshot import write_snapshot
+
+ROOT_DIR = Path(__file__).parent.parent
+WEB_DIR = ROOT_DIR / "web"
+
+# Cumulative import time budget for `import triage_engine` (microseconds).
+# Measured ~35ms on a dev laptop (dataclasses included); the budget leaves
+# room for slow CI hosts.
+IMPORT_BUDGET_US = 80_000
+
+HEAVY_MODULES = (
+    "yaml", "sqlite3", "concurrent.futures", "multiprocessing", "argparse",
+    "datetime", "hashlib", "json",
+)
+
+
+def run_python(code, *args):
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        cwd=WEB_DIR, check=True, capture_output=True, text=True,
+    )
+
+
+def import_time_us():
+    stderr = run_python("import triage_engine", "-X", "importtime").stderr
+    for line in reversed(stderr.splitlines()):
+        _, _, cumulative, name = (part.strip() for part in line.replace(":", "|", 1).split("|"))
+        if name == "triage_engine":
+            return int(cumulative)
+    raise AssertionError("triage_engine missing from -X importtime output")
+
+
+def test_import_time_budget():
+    # 가장 빠른 측정값 사용 (첫 실행의 .pyc 생성 등 노이즈 제거)
+    assert min(import_time_us() for _ in range(3)) < IMPORT_BUDGET_US
+
+
+def test_import_does_not_load_heavy_modules():
+    code = (
+        "import sys, triage_engine\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    assert run_python(code).stdout.strip() == ""
+
+
+def test_snapshot_path_never_imports_yaml(tmp_path):
+    rubric_path = tmp_path / "rubric.yaml"
+    shutil.copy(ROOT_DIR / "rubric.yaml", rubric_path)
+    write_snapshot(str(rubric_path))
+
+    code = (
+        "import sys\n"
+        "from triage_engine import TriageEngine, TriageInput\n"
+        f"TriageEngine({str(rubric_path)!r}).triage(TriageInput(description='보톡스 할인'))\n"
+        "print('yaml' in sys.modules)"
+    )
+    assert run_python(code).stdout.strip() == "False"
+
+
+def test_cache_hit_never_imports_yaml(tmp_path):
+    rubric_path = tmp_path / "rubric.yaml"  # no snapshot next to it
+    shutil.copy(ROOT_DIR / "rubric.yaml", rubric_path)
+    db_path = str(tmp_path / "cache.sqlite")
+    code = (
+        "import sys\n"
+        "from result_cache import ResultCache\n"
+        "from triage_engine import TriageEngine, TriageInput\n"
+        f"engine = TriageEngine({str(rubric_path)!r}, cache=ResultCache(path={db_path!r}))\n"
+        "engine.triage(TriageInput(description='보톡스 할인'))\n"
+        "print('yaml' in sys.modules, engine.cache.hits)"
+    )
+    assert run_python(code).stdout.split() == ["True", "0"]  # miss: parses YAML
+    assert run_python(code).stdout.split() == ["False", "1"]  # hit: no PyYAML
+
+
+def test_result_types_stay_dataclasses():
+    import dataclasses
+
+    from triage_engine import BatchStats, DetectedRedFlag, SimilarCase, TriageInput, TriageOutput
+
+    for cls in (DetectedRedFlag, SimilarCase, TriageInput, TriageOutput, BatchStats):
+        assert dataclasses.is_dataclass(cls)
+    assert dataclasses.asdict(TriageInput("x"))["description"] == "x"
+    assert dataclasses.replace(TriageInput("x"), exposure="public").exposure == "public"
@@ -0,0 +1,81 @@
+"""
+Incremental triage tests
+
+무작위 편집 시퀀스마다 증분 결과가 전체 재실행과 동일한지 검증
+"""
+
+import random
+
+import pytest
+
+from incremental import IncrementalSession
+from triage_engine import TriageEngine, TriageInput, output_to_dict
+
+SNIPPETS = [
+    "보톡스 시술 전후사진", "50% 할인 이벤트", "인스타그램", "스타 협찬", "the only clinic",
+    "commonly", "개인정보 수집", "전 후 사진", "리뷰 이벤트", "이 가 장점", "ＰＩＩ", "피부과",
+    "해외 진출", "약관 변경", " ", "-", "\n",
+]
+
+
+def comparable(result):
+    payload = output_to_dict(result)
+    payload.pop('timestamp')
+    return payload
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return TriageEngine()
+
+
+def test_random_edits_match_full_triage(engine):
+    rng = random.Random(3)
+    session = IncrementalSession(engine)
+    text = "".join(rng.choice(SNIPPETS) for _ in range(40))
+
+    for _ in range(300):
+        start = rng.randint(0, len(text))
+        end = min(len(text), start + rng.choice([0, 0, 1, 3, 10]))
+        insert = rng.choice(SNIPPETS + ["", "", "스", "타", "o"])
+        text = text[:start] + insert + text[end:]
+
+        input_data = TriageInput(description=text, exposure="public")
+        assert comparable(session.triage(input_data)) == \
+            comparable(engine._triage(input_data, engine.compiled))
+
+
+def test_small_edit_rescans_a_window_only(engine):
+    session = IncrementalSession(engine)
+    text = "캠페인 문구입니다. " * 500
+    session.triage(TriageInput(description=text))
+
+    edited = text[:2500] + "전후사진" + text[2500:]
+    result = session.triage(TriageInput(description=edited))
+
+    assert session.rescanned_chars < 100
+    assert any(flag.code == "BEFORE_AFTER_PHOTO" for flag in result.red_flags)
+
+
+def test_session_uses_cache_metrics_and_store_like_triage(tmp_path):
+    from metrics import TriageMetrics
+    from result_cache import ResultCache
+    from submission_store import SubmissionStore
+
+    cache = ResultCache(maxsize=16)
+    metrics = TriageMetrics()
+    store = SubmissionStore(str(tmp_path / "store"))
+    engine = TriageEngine(cache=cache, metrics=metrics, submissions=store)
+    session = IncrementalSession(engine)
+
+    first = TriageInput(description="보톡스 시술 전후사진 공개")
+    session.triage(first)
+    session.triage(TriageInput(description="보톡스 시술 전후사진 비공개"))
+    result = session.triage(first)
+
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert result.trace['cache'] == 'hit'
+    assert metrics.seconds.count() == 3
+    assert metrics.stage_seconds.count(('scan',)) == 2  # the hit skips the scan
+    store.close()
+    assert len(SubmissionStore(str(tmp_path / "store"), writable=False)) == 3
@@ -0,0 +1,154 @@
+"""
+Keyword matcher parity tests
+
+Aho-Corasick 단일 패스 결과가 키워드별 루프(정규화된 TextIndex 위에서
+str.find + 동일한 매칭 규칙)와 동일한지 케이스 코퍼스 전체에 대해 검증
+"""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from compiled_rubric import match_allowed
+from keyword_matcher import KeywordAutomaton
+from text_index import TextIndex, compact_keyword
+from triage_engine import DetectedRedFlag, TriageEngine
+
+ROOT_DIR = Path(__file__).parent.parent
+CASES_DIR = ROOT_DIR / "data" / "cases"
+
+
+def find_spans(index, keyword):
+    """Accepted normalized spans of one keyword, found with str.find"""
+    pattern = compact_keyword(keyword)
+    spans = []
+    if not pattern:
+        return spans
+    start = index.compact.find(pattern)
+    while start != -1:
+        span = match_allowed(index, pattern, start, start + len(pattern))
+        if span is not None:
+            spans.append(span)
+        start = index.compact.find(pattern, start + 1)
+    return spans
+
+
+def reference_detect_red_flags(rubric, description):
+    """Per-keyword loop with the same normalization and matching rules"""
+    index = TextIndex(description)
+    detected = []
+
+    for flag in rubric.get('red_flags', []):
+        excluded = [
+            span for phrase in flag.get('exclude_phrases') or []
+            for span in find_spans(index, phrase)
+        ]
+        matched_keywords = []
+        matched_spans = []
+
+        for keyword in flag.get('keywords', []):
+            spans = [
+                (s, e) for s, e in find_spans(index, keyword)
+                if not any(xs <= s and e <= xe for xs, xe in excluded)
+            ]
+            if spans:
+                matched_keywords.append(keyword)
+                matched_spans.extend(index.original_span(s, e) + (keyword,) for s, e in spans)
+
+        if matched_keywords:
+            detected.append(DetectedRedFlag(
+                code=flag['code'],
+                reason=flag['reason'],
+                matched_keywords=matched_keywords,
+                severity=flag['severity'],
+                matched_spans=sorted(matched_spans),
+            ))
+
+    return detected
+
+
+def case_corpus():
+    """Whole documents plus individual lines of every case file"""
+    texts = []
+    for path in sorted(CASES_DIR.rglob("*")):
+        if path.suffix not in (".md", ".yaml"):
+            continue
+        content = path.read_text(encoding="utf-8")
+        texts.append(content)
+        texts.extend(line for line in content.splitlines() if line.strip())
+    return texts
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return TriageEngine()
+
+
+def test_parity_over_case_corpus(engine):
+    corpus = case_corpus()
+    assert corpus
+
+    for text in corpus:
+        assert engine._detect_red_flags(text) == \
+            reference_detect_red_flags(engine.rubric, text)
+
+
+def test_parity_over_keyword_mixtures(engine):
+    keywords = [
+        keyword
+        for flag in engine.rubric['red_flags']
+        for keyword in flag['keywords']
+    ]
+    rng = random.Random(7)
+
+    for _ in range(300):
+        parts = rng.sample(keywords, rng.randint(0, 6))
+        # 일부 키워드는 잘라서 부분 일치만 남기고, 대소문자를 섞음
+        parts = [p[:rng.randint(1, len(p))] if rng.random() < 0.3 else p for p in parts]
+        text = rng.choice([" ", "", "-", "그리고 "]).join(parts)
+        if rng.random() < 0.5:
+            text = text.upper()
+        assert engine._detect_red_flags(text) == \
+            reference_detect_red_flags(engine.rubric, text)
+
+
+def test_automaton_overlapping_patterns():
+    automaton = KeywordAutomaton(["he", "she", "his", "hers", "리뷰", "리뷰 이벤트"])
+    found = {automaton.patterns[i] for i in automaton.search("ushers 리뷰 이벤트")}
+    assert found == {"he", "she", "hers", "리뷰", "리뷰 이벤트"}
+
+
+def test_automaton_empty_pattern_always_matches():
+    automaton = KeywordAutomaton(["", "abc"])
+    assert automaton.search("xyz") == {automaton.pattern_id("")}
+
+
+def test_iter_matches_finds_every_occurrence():
+    patterns = ["a", "ab", "bab", "b", "리뷰", "리"]
+    automaton = KeywordAutomaton(patterns)
+    rng = random.Random(11)
+
+    for _ in range(200):
+        text = "".join(rng.choice("ab리뷰x") for _ in range(rng.randint(0, 30)))
+        expected = sorted(
+            (i + len(p), automaton.pattern_id(p))
+            for p in patterns
+            for i in range(len(text))
+            if text.startswith(p, i)
+        )
+        assert sorted(automaton.iter_matches(text)) == expected
+
+
+def test_rebuild_after_add_does_not_duplicate_matches():
+    automaton = KeywordAutomaton()
+    automaton.add("ab")
+    automaton.add("b")
+    automaton.build()
+    automaton.add("c")
+    automaton.build()
+    assert list(automaton.iter_matches("abc")) == [(2, 0), (2, 1), (3, 2)]
+
+    restored = KeywordAutomaton.from_tables(KeywordAutomaton(["ab", "b"]).to_tables())
+    restored.add("c")
+    assert list(restored.iter_matches("abc")) == [(2, 0), (2, 1), (3, 2)]
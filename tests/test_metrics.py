@@ -0,0 +1,143 @@
+"""
+Triage metrics tests
+
+단계별 trace·레지스트리 집계, Prometheus text 출력, 캐시 적중 기록, 워커 trace 합산,
+샘플링 프로파일, /metrics 엔드포인트 검증
+"""
+
+import asyncio
+import pstats
+
+from metrics import STAGES, MetricsRegistry, TriageMetrics
+from result_cache import ResultCache
+from triage_engine import TriageEngine, TriageInput, output_from_dict, output_to_dict
+from triage_service import TriageService
+
+BOTOX = TriageInput(description='인스타그램에서 보톡스 시술 전후사진과 50% 할인 이벤트', exposure='public')
+BENIGN = TriageInput(description='버튼 색상을 파란색에서 초록색으로 변경합니다.')
+
+
+def test_trace_covers_pipeline_stages_and_registry_totals():
+    metrics = TriageMetrics()
+    engine = TriageEngine(metrics=metrics)
+    plain = TriageEngine().triage(BOTOX)
+    result = engine.triage(BOTOX)
+    engine.triage(BENIGN)
+
+    trace = result.trace
+    assert ['rubric', 'hash', 'scan', 'red_flags', 'questions', 'guardrails', 'routing'] == [
+        stage for stage in STAGES if stage in trace['stages']
+    ]
+    assert trace['cache'] == 'off'
+    assert trace['keyword_hits'] >= 3
+    assert trace['keyword_checks'] == engine.compiled.keyword_checks
+    assert sum(trace['stages'].values()) <= trace['total']
+
+    result.trace, plain.timestamp = None, result.timestamp
+    assert result == plain  # instrumentation does not change the decision
+
+    assert metrics.requests.value(('TYPE_1',)) == 2  # BENIGN lacks the optional fields
+    assert metrics.stage_seconds.count(('scan',)) == 2
+    assert metrics.seconds.count() == 2
+
+
+def test_disabled_metrics_leave_output_untouched():
+    result = TriageEngine().triage(BOTOX)
+    assert result.trace is None
+    assert 'trace' not in output_to_dict(result)
+
+
+def test_prometheus_text_format():
+    registry = MetricsRegistry()
+    counter = registry.counter('jobs_total', 'Jobs done', ('kind',))
+    histogram = registry.histogram('job_seconds', 'Job time', buckets=(0.1, 1.0))
+    counter.inc(labels=('a"b',))
+    counter.inc(2, ('c',))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(3)
+
+    assert registry.render().splitlines() == [
+        '# HELP job_seconds Job time',
+        '# TYPE job_seconds histogram',
+        'job_seconds_bucket{le="0.1"} 1',
+        'job_seconds_bucket{le="1.0"} 2',
+        'job_seconds_bucket{le="+Inf"} 3',
+        'job_seconds_sum 3.55',
+        'job_seconds_count 3',
+        '# HELP jobs_total Jobs done',
+        '# TYPE jobs_total counter',
+        'jobs_total{kind="a\\"b"} 1',
+        'jobs_total{kind="c"} 2',
+    ]
+
+
+def test_cache_hits_are_traced_and_trace_is_not_cached(tmp_path):
+    metrics = TriageMetrics()
+    engine = TriageEngine(cache=ResultCache(path=str(tmp_path / 'cache.sqlite')), metrics=metrics)
+    first = engine.triage(BOTOX)
+    second = engine.triage(BOTOX)
+
+    assert first.trace['cache'] == 'miss' and 'cache_store' in first.trace['stages']
+    assert second.trace['cache'] == 'hit' and 'scan' not in second.trace['stages']
+    assert second.trace['keyword_checks'] == 0
+    assert metrics.cache_lookups.value(('hit',)) == 1
+    assert metrics.cache_lookups.value(('miss',)) == 1
+
+    cached = TriageEngine(cache=engine.cache).triage(BOTOX)
+    assert cached.trace is None
+
+
+def test_worker_traces_fold_into_parent_registry():
+    metrics = TriageMetrics()
+    engine = TriageEngine(metrics=metrics)
+    results = engine.triage_many([BOTOX, BENIGN] * 4, workers=2, chunksize=2)
+
+    assert all(result.trace is not None for result in results)
+    assert metrics.seconds.count() == 8
+    assert metrics.stage_seconds.count(('scan',)) == 8
+    assert output_from_dict(output_to_dict(results[0])).trace == results[0].trace
+
+
+def test_sampled_calls_are_profiled(tmp_path):
+    captured = []
+    metrics = TriageMetrics(
+        profile_every=2, profile_dir=str(tmp_path), on_profile=lambda p, r: captured.append(r)
+    )
+    engine = TriageEngine(metrics=metrics)
+    results = [engine.triage(BENIGN) for _ in range(5)]
+
+    assert len(metrics.profile_paths) == 2 == len(captured)
+    assert [bool(result.trace.get('profile')) for result in results] == [
+        False, True, False, True, False
+    ]
+    stats = pstats.Stats(metrics.profile_paths[0])
+    assert any(name == '_triage' for _, _, name in stats.stats)
+    assert metrics.profiles.value() == 2
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    async def get(port, path):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(f'GET {path} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n'.encode())
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return response.decode()
+
+    async def main(engine):
+        service = TriageService(engine, watch_interval=None)
+        await service.start(port=0)
+        try:
+            await service.submit(BOTOX)
+            return await get(service.port, '/metrics')
+        finally:
+            await service.close()
+
+    response = asyncio.run(main(TriageEngine(metrics=TriageMetrics())))
+    assert 'Content-Type: text/plain; version=0.0.4' in response
+    assert 'legal_triage_requests_total{routing="TYPE_1"} 1' in response
+    assert 'legal_triage_stage_seconds_count{stage="scan"} 1' in response
+
+    response = asyncio.run(main(TriageEngine()))
+    assert response.startswith('HTTP/1.1 404')
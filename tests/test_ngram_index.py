@@ -0,0 +1,53 @@
+"""
+N-gram index tests
+
+후보 검색이 부분 문자열을 포함하는 문서를 빠짐없이 돌려주는지(한 글자·끝 글자 포함), 세그먼트 추가·병합·
+재오픈 후에도 같은지 검증
+"""
+
+import random
+
+import ngram_index
+from ngram_index import NgramIndex
+
+ALPHABET = "피부관리스타인전후사진ab"
+
+
+def containing(texts, pattern):
+    return [doc for doc, text in enumerate(texts) if pattern in text]
+
+
+def test_candidates_cover_every_containing_document(tmp_path, monkeypatch):
+    monkeypatch.setattr(ngram_index, 'MAX_SEGMENTS', 3)
+    rng = random.Random(2)
+    texts = ["".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 12))) for _ in range(400)]
+    patterns = ["피", "b", "스타", "인스타", "전후사진", "a" * 3, ""] + [
+        text[i:i + n] for text in texts[:30] for i in range(len(text)) for n in (1, 2, 4)
+    ]
+
+    index = NgramIndex(str(tmp_path / "ngrams"))
+    for start in range(0, len(texts), 50):
+        index.add(texts[start:start + 50])
+        if start % 100 == 0:
+            index.flush()  # leave every other batch pending
+        for pattern in patterns:
+            expected = containing(texts[:start + 50], pattern)
+            found = index.candidates(pattern)
+            assert found == sorted(set(found))
+            assert set(expected) <= set(found), pattern
+    assert len(index.segments) <= 3
+
+    index.flush()
+    reopened = NgramIndex(str(tmp_path / "ngrams"))
+    assert len(reopened) == len(texts)
+    assert reopened.lookup(patterns[:6]) == index.lookup(patterns[:6])
+    assert reopened.candidates("전후사진") == index.candidates("전후사진")
+
+
+def test_clear_drops_segments(tmp_path):
+    index = NgramIndex(str(tmp_path / "ngrams"))
+    index.add(["보톡스", "전후사진"])
+    index.flush()
+    index.clear()
+    assert len(index) == 0 and index.candidates("보톡스") == []
+    assert len(NgramIndex(str(tmp_path / "ngrams"))) == 0
@@ -0,0 +1,103 @@
+"""
+Streaming pipeline tests
+
+JSONL 스트리밍 트리아지와 체크포인트 재개 검증
+"""
+
+import json
+
+import pytest
+
+from pipeline import StreamCheckpoint, run_stream
+from triage_engine import TriageEngine
+
+RECORDS = [
+    {"request_id": "r-1", "title": "보톡스 이벤트", "body": "50% 할인 이벤트를 진행합니다."},
+    {"description": "버튼 색상을 파란색에서 초록색으로 변경합니다."},
+    {"description": "사용자의 주민등록번호를 수집합니다.", "data_usage": "collects"},
+    {"request_id": "r-4", "title": "인플루언서 협찬", "body": "협찬 콘텐츠"},
+]
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return TriageEngine()
+
+
+@pytest.fixture
+def input_path(tmp_path):
+    path = tmp_path / "inputs.jsonl"
+    lines = [json.dumps(r, ensure_ascii=False) for r in RECORDS]
+    lines.insert(2, "")  # blank lines are skipped
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def read_outputs(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_stream_writes_one_output_per_record(engine, input_path, tmp_path):
+    output_path = tmp_path / "out.jsonl"
+
+    assert run_stream(engine, str(input_path), str(output_path)) == len(RECORDS)
+
+    outputs = read_outputs(output_path)
+    assert [o.get("request_id") for o in outputs] == ["r-1", None, None, "r-4"]
+    assert outputs[0]["routing"] == "TYPE_1"
+    assert any(f["code"] == "PRICE_DISCOUNT_EVENT" for f in outputs[0]["red_flags"])
+
+
+def test_resume_from_checkpoint_does_not_duplicate(engine, input_path, tmp_path):
+    output_path = tmp_path / "out.jsonl"
+    checkpoint_path = tmp_path / "ckpt.json"
+    run_stream(engine, str(input_path), str(output_path), str(checkpoint_path),
+               checkpoint_every=1)
+
+    # 두 번째 레코드 이후 크래시: 출력에 체크포인트 이후의 부분 기록이 남은 상태
+    full = output_path.read_bytes()
+    first_two = b"".join(full.splitlines(keepends=True)[:2])
+    with open(input_path, "rb") as f:
+        offset = len(f.readline()) + len(f.readline())
+    StreamCheckpoint(line=2, input_offset=offset, output_offset=len(first_two)) \
+        .save(str(checkpoint_path))
+    output_path.write_bytes(first_two + b'{"partial": ')
+
+    written = run_stream(engine, str(input_path), str(output_path), str(checkpoint_path),
+                         checkpoint_every=1, resume=True)
+
+    assert written == 2
+    outputs = read_outputs(output_path)
+    assert len(outputs) == len(RECORDS)
+    assert [o.get("request_id") for o in outputs] == ["r-1", None, None, "r-4"]
+    assert StreamCheckpoint.load(str(checkpoint_path)).line == len(RECORDS) + 1
+
+
+def test_start_line_skips_lines_of_a_file(engine, input_path, tmp_path):
+    output_path = tmp_path / "out.jsonl"
+    output_path.write_text('{"stale": true}\n', encoding="utf-8")
+    checkpoint_path = tmp_path / "ckpt.json"
+
+    written = run_stream(engine, str(input_path), str(output_path), str(checkpoint_path),
+                         start_line=3)
+
+    assert written == 2  # line 3 is the blank one
+    assert [o.get("request_id") for o in read_outputs(output_path)] == [None, "r-4"]
+    checkpoint = StreamCheckpoint.load(str(checkpoint_path))
+    assert checkpoint.line == len(RECORDS) + 1
+    assert checkpoint.input_offset == input_path.stat().st_size
+
+
+def test_start_line_on_redirected_stdin(input_path, tmp_path):
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    root = Path(__file__).parent.parent
+    with open(input_path, "rb") as stdin:
+        done = subprocess.run(
+            [sys.executable, "-m", "web.triage_engine", "stream", "--start-line", "3"],
+            stdin=stdin, capture_output=True, cwd=root, check=True,
+        )
+    outputs = [json.loads(line) for line in done.stdout.splitlines()]
+    assert [o.get("request_id") for o in outputs] == [None, "r-4"]
@@ -0,0 +1,76 @@
+"""
+Precedent index tests
+
+유사 케이스 검색, 증분 색인(추가/변경/삭제), TriageOutput.similar_cases 검증
+"""
+
+import shutil
+from pathlib import Path
+
+from precedents import CaseDocument, PrecedentIndex
+from triage_engine import TriageEngine, TriageInput, output_from_dict, output_to_dict
+
+CASES_DIR = Path(__file__).parent.parent / "data" / "cases"
+CASE_ID = "2026-01-07_sns-campaign-botox"
+
+
+def document(case_id, text, decision="TYPE_2"):
+    return CaseDocument(
+        case_id=case_id, path=case_id, title=case_id, date="2026-02-01",
+        decision=decision, rule_codes=[], text=text, signature=[0, 0, 0, 0],
+    )
+
+
+def test_most_similar_case_ranks_first(tmp_path):
+    index = PrecedentIndex(str(tmp_path))
+    index.add([
+        document("botox", "보톡스 시술 전후사진과 50% 할인 이벤트 인스타그램 캠페인", "TYPE_1"),
+        document("calculator", "사내 테스트용 칼로리 계산기 이벤트 기능 추가"),
+        document("overseas", "해외 고객 개인정보를 수집해 해외 서버로 이전"),
+    ])
+
+    results = index.search("인스타그램 보톡스 할인 이벤트 진행", k=2)
+    assert [case["case_id"] for _, case in results][0] == "botox"
+    assert results[0][0] > results[1][0]
+    assert PrecedentIndex(str(tmp_path)).search("인스타그램 보톡스 할인 이벤트 진행", k=2) == results
+
+
+def test_update_indexes_only_new_and_changed_cases(tmp_path):
+    cases_dir = tmp_path / "cases"
+    shutil.copytree(CASES_DIR / CASE_ID, cases_dir / CASE_ID)
+    index = PrecedentIndex(str(tmp_path / "index"))
+
+    assert index.update(str(cases_dir)) == 1
+    assert index.update(str(cases_dir)) == 0
+
+    copy = cases_dir / "2026-02-01_copy"
+    shutil.copytree(cases_dir / CASE_ID, copy)
+    (copy / "case.yaml").write_text(
+        (copy / "case.yaml").read_text().replace(CASE_ID, "2026-02-01_copy")
+    )
+    assert index.update(str(cases_dir)) == 1
+    assert len(index) == 2
+
+    shutil.rmtree(copy)
+    index.update(str(cases_dir))
+    assert [case["case_id"] for _, case in index.search("보톡스 전후사진", k=5)] == [CASE_ID]
+
+
+def test_segments_are_merged(tmp_path):
+    index = PrecedentIndex(str(tmp_path))
+    for i in range(12):
+        index.add([document(f"case-{i}", f"케이스 {i}번 보톡스 할인 {'가나다라'[i % 4]}")])
+    assert len(index._snapshot.segments) <= 8
+    assert len(index.search("보톡스 할인", k=20)) == 12
+
+
+def test_triage_output_lists_similar_cases(tmp_path):
+    index = PrecedentIndex(str(tmp_path))
+    index.update(str(CASES_DIR))
+    engine = TriageEngine(precedents=index)
+
+    result = engine.triage(TriageInput(description="인스타그램 보톡스 시술 전후사진 할인 캠페인"))
+
+    assert [case.case_id for case in result.similar_cases] == [CASE_ID]
+    assert result.similar_cases[0].decision == "TYPE_1"
+    assert output_from_dict(output_to_dict(result)) == result
@@ -0,0 +1,103 @@
+"""
+Regression harness tests
+
+케이스/라벨 세트 재생, false negative 판정, 기준선 대비 routing flip·flag diff, 제안 적용 검증
+"""
+
+import json
+from pathlib import Path
+
+import regression
+from regression import LabeledItem, apply_proposal, compare, load_cases, load_labeled, replay
+from triage_engine import DEFAULT_RUBRIC_PATH, TriageEngine, TriageInput
+
+BOTOX = "보톡스 시술 전후사진과 50% 할인 이벤트, 확실한 효과 보장"
+BENIGN = "사내 점심 메뉴 안내 공지"
+KNOWN = {
+    "exposure": "internal_test", "data_usage": "no_collection", "revenue_model": "free",
+    "external_communication": "internal", "cross_border": "domestic_only",
+}
+
+
+def write_set(path, records):
+    path.write_text("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+    return str(path)
+
+
+def test_cases_replay_like_generated_ts_tests():
+    (item,) = load_cases()
+    assert item.item_id == "case:2026-01-07_sns-campaign-botox"
+    assert item.input.description.endswith("(키워드: 전후사진, 비포애프터, 50% 할인)")
+
+    outcomes, stats = replay([item], workers=1)
+    report = compare([item], outcomes, stats)
+    assert stats.count == 1
+    assert not report.false_negatives and not report.missing_codes
+    assert report.passed(strict=True)
+
+
+def test_labeled_false_negative_fails_the_gate(tmp_path):
+    items = load_labeled(write_set(tmp_path / "labeled.jsonl", [
+        {"id": "botox", "description": BOTOX, "expected_routing": "TYPE_1",
+         "expected_codes": ["BEFORE_AFTER_PHOTO", "NOT_A_CODE"]},
+        {"description": BENIGN, **KNOWN, "expected_routing": "TYPE_1"},
+        {"description": BENIGN},
+    ]))
+    assert [item.item_id for item in items] == ["labeled.jsonl:botox", "labeled.jsonl:2", "labeled.jsonl:3"]
+
+    outcomes, stats = replay(items, workers=1)
+    report = compare(items, outcomes, stats)
+
+    assert report.labeled == 2
+    assert report.false_negatives == ["labeled.jsonl:2"]
+    assert report.missing_codes == [("labeled.jsonl:botox", ["NOT_A_CODE"])]
+    assert not report.passed()
+
+
+def test_baseline_diff_reports_flips_and_flag_diffs(tmp_path):
+    items = [LabeledItem("a", TriageInput(BOTOX)), LabeledItem("b", TriageInput(BENIGN))]
+    outcomes, stats = replay(items, workers=1)
+    baseline_path = str(tmp_path / "baseline.json")
+    regression.write_baseline(items, outcomes, TriageEngine(), baseline_path)
+
+    baseline = regression.read_baseline(baseline_path)
+    assert compare(items, outcomes, stats, baseline).passed(strict=True)
+
+    rubric = Path(DEFAULT_RUBRIC_PATH).read_text(encoding="utf-8")
+    edited = tmp_path / "rubric.yaml"
+    edited.write_text(rubric.replace('code: "BEFORE_AFTER_PHOTO"', 'code: "BEFORE_AFTER"', 1), encoding="utf-8")
+    outcomes, stats = replay(items + [LabeledItem("c", TriageInput(BENIGN))], str(edited), workers=1)
+    report = compare(items + [LabeledItem("c", TriageInput(BENIGN))], outcomes, stats, baseline)
+
+    assert [item_id for item_id, _, removed in report.flag_diffs] == ["a"]
+    assert report.flag_diffs[0][1:] == (["BEFORE_AFTER"], ["BEFORE_AFTER_PHOTO"])
+    assert report.new_items == 1 and report.dropped_items == 0
+    assert report.passed() and not report.passed(strict=True)
+    assert any(line.startswith("flag diffs: 1") for line in regression.format_report(report))
+
+
+def test_process_pool_matches_serial(tmp_path):
+    items = [
+        LabeledItem(str(n), TriageInput(BOTOX if n % 3 else BENIGN, exposure="public"))
+        for n in range(40)
+    ]
+    serial, _ = replay(items, workers=1)
+    pooled, stats = replay(items, workers=2, chunksize=7)
+    assert pooled == serial and stats.workers == 2
+
+
+def test_apply_proposal_extends_rubric_and_bumps_version():
+    rubric = TriageEngine().get_rubric()
+    proposal = {
+        "modified_red_flags": [{"code": "BEFORE_AFTER_PHOTO", "added_keywords": ["비교컷"], "reason": ""}],
+        "new_red_flags": [{"code": "NEW_FLAG", "keywords": ["신규"], "reason": "r", "severity": "medium"}],
+        "new_guardrails": [],
+    }
+    proposed = apply_proposal(rubric, proposal)
+
+    flags = {flag["code"]: flag for flag in proposed["red_flags"]}
+    assert "비교컷" in flags["BEFORE_AFTER_PHOTO"]["keywords"]
+    assert "NEW_FLAG" in flags
+    assert "비교컷" not in {k for f in rubric["red_flags"] for k in f["keywords"]}
+    major, minor = str(rubric["version"]).split(".")[:2]
+    assert proposed["version"] == f"{major}.{int(minor) + 1}"
@@ -0,0 +1,77 @@
+"""
+Result cache tests
+
+입력 해시 + 선택 필드 + rubric 버전/다이제스트 기반 캐시 검증
+"""
+
+import shutil
+import time
+from pathlib import Path
+
+from result_cache import ResultCache
+from triage_engine import TriageEngine, TriageInput, output_to_dict
+
+RUBRIC_PATH = Path(__file__).parent.parent / "rubric.yaml"
+
+
+def comparable(result):
+    payload = output_to_dict(result)
+    payload.pop('timestamp')
+    return payload
+
+
+def test_hit_returns_same_result_with_fresh_timestamp():
+    engine = TriageEngine(cache=ResultCache())
+    input_data = TriageInput(description='보톡스 시술 50% 할인 이벤트')
+
+    first = engine.triage(input_data)
+    time.sleep(0.001)
+    second = engine.triage(input_data)
+
+    assert comparable(first) == comparable(second)
+    assert second.timestamp != first.timestamp
+    assert second.red_flags is not first.red_flags
+    assert engine.cache.stats()['hits'] == 1
+    assert engine.cache.stats()['misses'] == 1
+
+
+def test_optional_fields_are_part_of_key():
+    engine = TriageEngine(cache=ResultCache())
+
+    engine.triage(TriageInput(description='유료 구독 서비스입니다.'))
+    result = engine.triage(TriageInput(
+        description='유료 구독 서비스입니다.', revenue_model='subscription'
+    ))
+
+    assert engine.cache.hits == 0
+    assert any('환불' in g for g in result.safe_guardrails)
+
+
+def test_lru_eviction():
+    cache = ResultCache(maxsize=2)
+    for key in ('a', 'b', 'c'):
+        cache.put(key, 'digest', {'key': key})
+
+    assert cache.get('a', 'digest') is None
+    assert cache.get('c', 'digest') == {'key': 'c'}
+
+
+def test_disk_backend_survives_restart_and_evicts_on_rubric_change(tmp_path):
+    db_path = str(tmp_path / "cache.sqlite")
+    rubric_path = tmp_path / "rubric.yaml"
+    shutil.copy(RUBRIC_PATH, rubric_path)
+    input_data = TriageInput(description='전후사진 비교 기능')
+
+    TriageEngine(str(rubric_path), cache=ResultCache(path=db_path)).triage(input_data)
+
+    restarted = TriageEngine(str(rubric_path), cache=ResultCache(path=db_path))
+    restarted.triage(input_data)
+    assert restarted.cache.hits == 1
+
+    rubric_path.write_text(
+        rubric_path.read_text(encoding='utf-8') + "\n# changed\n", encoding='utf-8'
+    )
+    changed = TriageEngine(str(rubric_path), cache=ResultCache(path=db_path))
+    changed.triage(input_data)
+    assert changed.cache.hits == 0
+    assert changed.cache._db.execute('SELECT COUNT(*) FROM results').fetchone()[0] == 1
@@ -0,0 +1,137 @@
+"""
+Rubric impact simulator tests
+
+n-gram 후보만 재평가한 결과가 코퍼스 전체를 두 루브릭으로 재생한 routing flip·flag diff와 같은지,
+루브릭 차이 판정(키워드/severity/routing_policy)과 코퍼스 증분 색인을 검증
+"""
+
+import json
+
+import yaml
+
+from compiled_rubric import CompiledRubric
+from regression import apply_proposal, load_labeled, replay
+from rubric_impact import CorpusIndex, rubric_delta, simulate
+from text_index import compact_keyword
+from triage_engine import DEFAULT_RUBRIC_PATH, TriageEngine
+
+DESCRIPTIONS = [
+    "보톡스 시술 전후사진과 50% 할인 이벤트",
+    "버튼 색상을 파란색에서 초록색으로 변경합니다.",
+    "사내 점심 메뉴 안내 공지",
+    "피부 관리 팁을 블로그에 공유합니다",
+    "인스타그램 후기 이벤트로 리뷰 작성 시 사은품 증정",
+    "회원 대상 사진 촬영 서비스 소개",
+    "We collect email addresses for a members-only newsletter",
+]
+KNOWN = {
+    "exposure": "internal_test", "data_usage": "no_collection", "revenue_model": "free",
+    "external_communication": "internal", "cross_border": "domestic_only",
+}
+PROPOSAL = {
+    "modified_red_flags": [{"code": "PROCEDURE_MENTION", "added_keywords": ["관리", "촬영"]}],
+    "new_red_flags": [
+        {"code": "REVIEW_INCENTIVE", "keywords": ["후기", "리뷰 작성"], "reason": "test",
+         "severity": "high"},
+    ],
+}
+
+
+def rubric():
+    with open(DEFAULT_RUBRIC_PATH, encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def write_rubric(path, data):
+    path.write_text(yaml.safe_dump(data, allow_unicode=True, sort_keys=False), encoding="utf-8")
+    return str(path)
+
+
+def write_corpus(path, count, start=0, mode="w"):
+    with open(path, mode, encoding="utf-8") as f:
+        for i in range(start, start + count):
+            record = {"id": f"r{i}", "description": DESCRIPTIONS[i % len(DESCRIPTIONS)]}
+            if i % 2:
+                record.update(KNOWN)
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            if i % 5 == 0:
+                f.write("\n")
+    return str(path)
+
+
+def full_diff(corpus_path, proposed_path):
+    items = load_labeled(corpus_path)
+    before, _ = replay(items, DEFAULT_RUBRIC_PATH, workers=1)
+    after, _ = replay(items, proposed_path, workers=1)
+    flips, diffs = [], []
+    for item, (old, _, old_codes), (new, _, codes) in zip(items, before, after):
+        if old != new:
+            flips.append((item.item_id, old, new))
+        added = [c for c in codes if c not in old_codes]
+        removed = [c for c in old_codes if c not in codes]
+        if added or removed:
+            diffs.append((item.item_id, added, removed))
+    return flips, diffs
+
+
+def test_simulation_matches_a_full_replay(tmp_path):
+    corpus_path = write_corpus(tmp_path / "history.jsonl", 70)
+    proposed_path = write_rubric(tmp_path / "proposed.yaml", apply_proposal(rubric(), PROPOSAL))
+
+    corpus = CorpusIndex(corpus_path)
+    assert corpus.update(workers=1) == 70
+    for workers in (1, 2):
+        report = simulate(corpus, proposed_path, workers=workers, chunksize=7)
+        assert report.candidates < len(corpus)
+        assert (report.flips, report.flag_diffs) == full_diff(corpus_path, proposed_path)
+    assert report.flips and report.flip_counts() == {"TYPE_2 -> TYPE_1": len(report.flips)}
+    assert report.flag_deltas()["REVIEW_INCENTIVE"] == [10, 0]
+
+
+def test_delta_scope():
+    current = TriageEngine().compiled
+
+    def delta(edit):
+        data = rubric()
+        edit(data)
+        return rubric_delta(current, CompiledRubric(data))
+
+    assert delta(lambda data: None) == ((), None)
+
+    def add_keyword(data):
+        data["red_flags"][0]["keywords"].append("새 키워드")
+    assert delta(add_keyword).terms == ("새키워드",)
+
+    def reweigh(data):
+        data["red_flags"][0]["severity"] = "low"
+    keywords = {compact_keyword(k) for k in rubric()["red_flags"][0]["keywords"]}
+    assert set(delta(reweigh).terms) == keywords
+
+    def guardrail_only(data):
+        data["safe_guardrails"].append({"condition": "always", "text": "new"})
+    assert delta(guardrail_only) == ((), None)
+
+    def policy(data):
+        data["routing_policy"]["confidence_threshold"] = 0.8
+    assert delta(policy).everything
+
+
+def test_corpus_index_appends_and_rebuilds(tmp_path):
+    corpus_path = write_corpus(tmp_path / "history.jsonl", 10)
+    corpus = CorpusIndex(corpus_path, str(tmp_path / "index"))
+    assert corpus.update(workers=1) == 10
+    assert corpus.update(workers=1) == 0
+
+    write_corpus(corpus_path, 5, start=10, mode="a")
+    with open(corpus_path, "a", encoding="utf-8") as f:
+        f.write('{"description": "unfinished')  # still being written
+    reopened = CorpusIndex(corpus_path, str(tmp_path / "index"))
+    assert reopened.update(workers=1) == 5
+    items = reopened.read(range(len(reopened)))
+    assert [item.item_id for item in items] == [f"history.jsonl:r{i}" for i in range(15)]
+    assert [item.input for item in items] == [
+        item.input for item in load_labeled(write_corpus(tmp_path / "same.jsonl", 15))
+    ]
+
+    write_corpus(corpus_path, 3)  # rewritten
+    assert CorpusIndex(corpus_path, str(tmp_path / "index")).update(workers=1) == 3
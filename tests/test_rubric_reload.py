@@ -0,0 +1,93 @@
+"""
+Rubric hot-reload tests
+
+rubric.yaml 변경 시 원자적 교체, 잘못된 rubric 거부 검증
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from rubric_watcher import RubricWatcher
+from triage_engine import TriageEngine, TriageInput
+
+RUBRIC_PATH = Path(__file__).parent.parent / "rubric.yaml"
+NEW_KEYWORD_RUBRIC = '''
+  - code: "NEW_TEST_FLAG"
+    keywords:
+      - "새로운금지어"
+    reason: "테스트용"
+    severity: "critical"
+'''
+
+
+@pytest.fixture
+def rubric_path(tmp_path):
+    path = tmp_path / "rubric.yaml"
+    shutil.copy(RUBRIC_PATH, path)
+    return path
+
+
+def add_flag(path):
+    content = path.read_text(encoding="utf-8")
+    path.write_text(
+        content.replace("red_flags:\n", "red_flags:" + NEW_KEYWORD_RUBRIC, 1),
+        encoding="utf-8",
+    )
+
+
+def test_output_records_rubric_version_and_digest(rubric_path):
+    engine = TriageEngine(str(rubric_path))
+    result = engine.triage(TriageInput(description="버튼 색상 변경"))
+
+    assert result.rubric_version == "2.0"
+    assert result.rubric_digest == engine.rubric_digest
+    assert len(result.rubric_digest) == 64
+
+
+def test_watcher_swaps_in_changed_rubric(rubric_path):
+    engine = TriageEngine(str(rubric_path))
+    watcher = RubricWatcher(engine)
+    old = engine.compiled
+    input_data = TriageInput(description="새로운금지어 포함")
+
+    assert watcher.check() is False
+    add_flag(rubric_path)
+    assert watcher.check() is True
+
+    result = engine.triage(input_data)
+    assert engine.compiled is not old
+    assert [f.code for f in result.red_flags] == ["NEW_TEST_FLAG"]
+    assert result.rubric_digest != old.digest
+    # 교체 전에 시작된 호출은 이전 rubric으로 끝까지 처리됨
+    assert engine._triage(input_data, old).red_flags == []
+
+
+def test_malformed_rubric_is_rejected(rubric_path):
+    engine = TriageEngine(str(rubric_path))
+    watcher = RubricWatcher(engine)
+    old = engine.compiled
+
+    rubric_path.write_text("version: '2.1'\nred_flags: [oops\n", encoding="utf-8")
+    assert watcher.check() is False
+    assert engine.compiled is old
+    assert engine.last_reload_error
+
+    rubric_path.write_text("version: '2.1'\nred_flags: []\n", encoding="utf-8")
+    assert engine.reload_rubric() is False
+    assert "question_templates" in engine.last_reload_error
+    assert engine.compiled is old
+
+
+def test_constructor_and_reload_agree_on_digest(rubric_path):
+    import hashlib
+
+    engine = TriageEngine(str(rubric_path))
+    digest = hashlib.sha256(rubric_path.read_bytes()).hexdigest()
+    assert engine.rubric_digest == digest  # lazily compiled: digest known up front
+    old = engine.compiled
+    assert old.digest == digest
+
+    assert engine.reload_rubric() is True
+    assert engine.compiled is old  # same content: nothing swapped
@@ -0,0 +1,65 @@
+"""
+Rubric snapshot tests
+
+사전 컴파일 스냅샷 로드 결과가 YAML 로드와 동일한지, 오래된 스냅샷은 무시되는지 검증
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from rubric_snapshot import load_snapshot, snapshot_path_for, write_snapshot
+from triage_engine import TriageEngine, TriageInput, output_to_dict
+
+RUBRIC_PATH = Path(__file__).parent.parent / "rubric.yaml"
+DESCRIPTIONS = [
+    '인스타그램에서 보톡스 시술 50% 할인 이벤트를 진행하려고 합니다.',
+    '앱 내에서 리프팅 시술 전후사진을 비교해서 보여주는 기능을 추가하려고 합니다.',
+    'This feature involves BIOMETRIC data collection.',
+]
+
+
+@pytest.fixture
+def rubric_path(tmp_path):
+    path = tmp_path / "rubric.yaml"
+    shutil.copy(RUBRIC_PATH, path)
+    return path
+
+
+def comparable(result):
+    payload = output_to_dict(result)
+    payload.pop('timestamp')
+    return payload
+
+
+def test_snapshot_engine_matches_yaml_engine(rubric_path):
+    from_yaml = TriageEngine(str(rubric_path))
+    write_snapshot(str(rubric_path))
+    from_snapshot = TriageEngine(str(rubric_path))
+
+    assert from_snapshot.rubric == from_yaml.rubric
+    assert from_snapshot.rubric_digest == from_yaml.rubric_digest
+    for description in DESCRIPTIONS:
+        input_data = TriageInput(description=description)
+        assert comparable(from_snapshot.triage(input_data)) == \
+            comparable(from_yaml.triage(input_data))
+
+
+def test_stale_snapshot_is_ignored(rubric_path):
+    write_snapshot(str(rubric_path))
+    rubric_path.write_text(
+        rubric_path.read_text(encoding="utf-8").replace('version: "2.0"', 'version: "2.1"'),
+        encoding="utf-8",
+    )
+
+    engine = TriageEngine(str(rubric_path))
+    assert engine.compiled.version == "2.1"
+
+
+def test_corrupt_snapshot_is_ignored(rubric_path):
+    engine = TriageEngine(str(rubric_path))
+    Path(snapshot_path_for(str(rubric_path))).write_bytes(b"not a snapshot")
+
+    assert load_snapshot(snapshot_path_for(str(rubric_path)), engine.rubric_digest) is None
+    assert TriageEngine(str(rubric_path)).compiled.version == "2.0"
@@ -0,0 +1,109 @@
+"""
+Submission store tests
+
+트리아지 경로에서 쌓인 입력을 부분 문자열·키워드 묶음으로 찾아 당시 결과와 함께 돌려주는지, 읽기 전용
+인스턴스가 새 기록을 보는지, 권한이 열린 폴더를 거부하는지, 비정상 종료 뒤 복구되는지 검증
+"""
+
+import json
+import os
+
+import pytest
+
+from submission_store import SubmissionStore
+from triage_engine import TriageEngine, TriageInput, output_to_dict
+
+DESCRIPTIONS = [
+    "내돈내산 후기 이벤트로 피부과 시술 홍보",
+    "Free newsletter for the internal team",
+    "협찬 광고 없이 내돈 내산 리뷰 모음",
+    "인스타 전후사진 비교 게시",
+]
+
+
+def triaged_store(tmp_path, **kwargs):
+    store = SubmissionStore(str(tmp_path / "store"), **kwargs)
+    engine = TriageEngine(submissions=store)
+    results = [engine.triage(TriageInput(d, exposure="public")) for d in DESCRIPTIONS]
+    store.sync()
+    return store, results
+
+
+def test_search_joins_inputs_to_their_outputs(tmp_path):
+    store, results = triaged_store(tmp_path)
+
+    found = store.search("내돈내산")
+    assert [item.doc for item in found] == [2, 0]  # newest first, spacing ignored
+    assert found[1].input == TriageInput(DESCRIPTIONS[0], exposure="public")
+    assert output_to_dict(found[1].output) == output_to_dict(results[0])
+    start, end = found[0].spans[0]
+    assert DESCRIPTIONS[2][start:end] == "내돈 내산"
+
+    assert [item.doc for item in store.search(["내돈내산", "피부"])] == [0]
+    assert [item.doc for item in store.search(["협찬", "FREE"], match_all=False)] == [2, 1]
+    assert store.search("없는표현") == []
+    assert len(store.search("내", limit=1)) == 1
+    with pytest.raises(ValueError):
+        store.search(["전후", " \t"])
+    store.close()
+
+
+def test_reader_sees_flushed_and_unflushed_records(tmp_path):
+    store, _ = triaged_store(tmp_path, flush_every=3)
+    reader = SubmissionStore(str(tmp_path / "store"), writable=False)
+    assert [item.doc for item in reader.search("전후")] == [3]
+
+    engine = TriageEngine(submissions=store)
+    engine.triage(TriageInput("전후사진 추가 게시"))
+    store.sync()
+    assert [item.doc for item in reader.search("전후사진")] == [4, 3]
+    store.close()
+    assert [item.doc for item in reader.search("전후사진")] == [4, 3]
+
+
+def test_batch_pool_path_records_every_input(tmp_path):
+    store = SubmissionStore(str(tmp_path / "store"))
+    engine = TriageEngine(submissions=store)
+    inputs = [TriageInput(d) for d in DESCRIPTIONS * 3]
+    engine.triage_many(inputs, workers=2)
+    engine.triage_many(inputs, workers=2, compact=True)
+    store.close()
+    reader = SubmissionStore(str(tmp_path / "store"), writable=False)
+    assert len(reader) == 2 * len(inputs)
+    assert all(item.input.description == DESCRIPTIONS[3] for item in reader.search("인스타"))
+
+
+def test_refuses_store_other_users_can_read(tmp_path):
+    store_dir = tmp_path / "store"
+    store_dir.mkdir(mode=0o755)
+    os.chmod(store_dir, 0o755)
+    with pytest.raises(PermissionError):
+        SubmissionStore(str(store_dir))
+
+    os.chmod(store_dir, 0o700)
+    store = SubmissionStore(str(store_dir))
+    assert os.stat(store_dir / "records.jsonl").st_mode & 0o077 == 0
+    with pytest.raises(RuntimeError):  # one writer at a time
+        SubmissionStore(str(store_dir))
+    store.close()
+
+
+def test_recovers_from_torn_write(tmp_path):
+    store, _ = triaged_store(tmp_path, flush_every=1)
+    store.close()
+    store_dir = tmp_path / "store"
+    output = output_to_dict(TriageEngine().triage(TriageInput("전후사진 복구")))
+    with open(store_dir / "records.jsonl", "ab") as f:  # crash: one lost offset, one torn line
+        record = {"input": {"description": "전후사진 복구"}, "output": output}
+        f.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+        f.write(b'{"input": {"descr')
+
+    store = SubmissionStore(str(store_dir))
+    assert len(store) == len(DESCRIPTIONS) + 1
+    assert [item.doc for item in store.search("전후사진")] == [4, 3]
+    TriageEngine(submissions=store).triage(TriageInput("전후사진 이후"))
+    store.close()
+
+    reader = SubmissionStore(str(store_dir), writable=False)
+    assert [item.doc for item in reader.search("전후사진")] == [5, 4, 3]
+    assert len(reader.index) == 6
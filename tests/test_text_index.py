@@ -0,0 +1,89 @@
+"""
+Text index tests
+
+NFKC/공백·구분 기호 정규화, 오프셋 역매핑, 짧은 키워드 경계 규칙 검증
+"""
+
+import unicodedata
+
+import pytest
+
+from text_index import TextIndex, compact_keyword
+from triage_engine import TriageEngine, TriageInput
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return TriageEngine()
+
+
+def flag_codes(engine, description):
+    return {flag.code for flag in engine._detect_red_flags(description)}
+
+
+def test_compact_folds_spacing_and_full_width():
+    index = TextIndex("ＢＥＦＯＲＥ／ＡＦＴＥＲ 전 후-사진")
+    assert index.compact == "beforeafter전후사진"
+    assert compact_keyword("전후 사진") == "전후사진"
+
+
+def test_offsets_map_back_to_original_text():
+    text = "이벤트: ＰＩＩ 수집"
+    index = TextIndex(text)
+    start = index.compact.index("pii")
+    span = index.original_span(*index.normalized_span(start, start + 3))
+    assert text[span[0]:span[1]] == "ＰＩＩ"
+
+
+def test_decomposed_hangul_is_composed():
+    text = unicodedata.normalize("NFD", "전후사진 공개")
+    index = TextIndex(text)
+    assert index.compact.startswith("전후사진")
+    span = index.original_span(*index.normalized_span(0, 4))
+    assert unicodedata.normalize("NFC", text[span[0]:span[1]]) == "전후사진"
+
+
+@pytest.mark.parametrize("description", ["전 후 사진 공개", "전후-사진 공개", "Before / After 공개"])
+def test_spacing_variants_match(engine, description):
+    assert "BEFORE_AFTER_PHOTO" in flag_codes(engine, description)
+
+
+def test_short_ascii_keywords_need_word_boundaries(engine):
+    assert "COMPARATIVE_SUPERIORITY" not in flag_codes(engine, "commonly used layout")
+    assert "COMPARATIVE_SUPERIORITY" in flag_codes(engine, "the only clinic")
+    assert "CHILDREN_TARGET" in flag_codes(engine, "an app for kids")
+
+
+def test_short_keywords_do_not_straddle_separators(engine):
+    index_hits = engine.compiled.scan("이 가 장점")
+    assert engine.compiled.automaton.pattern_id("가장") not in index_hits
+
+
+def test_exclude_phrases_cancel_contained_hits(engine):
+    assert "CELEBRITY_MEDICAL_ENDORSEMENT" not in flag_codes(engine, "인스타그램 이벤트")
+    assert "CELEBRITY_MEDICAL_ENDORSEMENT" in flag_codes(engine, "인스타그램에 스타 출연")
+
+
+def test_triggers_and_guardrails_share_normalization(engine):
+    result = engine.triage(TriageInput(
+        description="이용 정책-변경 안내", exposure="public", data_usage="no_collection",
+        revenue_model="free", external_communication="internal",
+        cross_border="domestic_only",
+    ))
+    assert any("약관 변경" in text for text in result.safe_guardrails)
+
+
+def test_matched_spans_point_into_description(engine):
+    description = "ＳＮＳ에 전 후 사진과 50% 할인 이벤트 공개"
+    flags = engine._detect_red_flags(description)
+    spans = [span for flag in flags for span in flag.matched_spans]
+    assert spans
+    for start, end, keyword in spans:
+        assert compact_keyword(description[start:end]) == compact_keyword(keyword)
+
+
+def test_matched_spans_survive_json_round_trip(engine):
+    from triage_engine import output_from_dict, output_to_dict
+
+    result = engine.triage(TriageInput(description="전후사진 리뷰 이벤트"))
+    assert output_from_dict(output_to_dict(result)) == result
@@ -323,6 +323,26 @@ describe('Red Flag Detection', () => {
     const result = engine.triage(input);
     expect(result.red_flags.some((f) => f.code === 'PII_COLLECTION')).toBe(true);
   });
+
+  test('should ignore keywords inside exclude_phrases', () => {
+    const codes = (description: string) =>
+      engine.triage({ description }).red_flags.map((f) => f.code);
+
+    // "인스타그램"의 "스타", "피부"의 "피"는 일치로 보지 않음 (web/compiled_rubric.py와 동일)
+    expect(codes('인스타그램 채널 소개')).not.toContain('CELEBRITY_MEDICAL_ENDORSEMENT');
+    expect(codes('스타 강사가 추천하는 시술')).toContain('CELEBRITY_MEDICAL_ENDORSEMENT');
+    expect(codes('피부 관리 이벤트')).not.toContain('PROCEDURE_VISUAL');
+    expect(codes('수술 장면에서 피가 보이는 영상')).toContain('PROCEDURE_VISUAL');
+  });
+
+  test('should fold separators and respect keyword boundaries', () => {
+    const codes = (description: string) =>
+      engine.triage({ description }).red_flags.map((f) => f.code);
+
+    expect(codes('전 후 사진 비교')).toContain('BEFORE_AFTER_PHOTO');
+    expect(codes('apples only')).toContain('COMPARATIVE_SUPERIORITY');
+    expect(codes('commonly used apples')).not.toContain('COMPARATIVE_SUPERIORITY');
+  });
 });
 
 describe('Guardrails', () => {
@@ -0,0 +1,417 @@
+"""
+Anonymization Check - 케이스 파일 개인정보 검사 (Python)
+src/cases/anonymize.ts와 같은 패턴·같은 결과, 미리 컴파일한 프리필터로 후보 줄만 검사
+
+패턴마다 매치가 반드시 포함하는 줄 내부 조각(prefilter)으로 청크 전체를 훑어 후보 줄을 모은 뒤,
+그 줄에서만 TS와 같은 패턴별 검사를 수행합니다. 큰 파일은 줄 경계 단위 청크로 스트리밍하고,
+케이스는 프로세스 풀로 분산, 내용 해시가 같은 파일은 캐시된 결과를 재사용합니다.
+
+Usage:
+    python -m web.triage_engine check-anonymization [case_dir]
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+try:  # imported as part of the ``web`` package (python -m web.triage_engine)
+    from .case_ingest import DEFAULT_CASES_DIR, INDEX_NAME
+except ImportError:  # imported from web/ directly (streamlit run, tests)
+    from case_ingest import DEFAULT_CASES_DIR, INDEX_NAME
+
+CASE_FILES = ('request.md', 'response.md', 'case.yaml')  # checkCase() order
+CACHE_NAME = '.anonymize-cache.json'
+CHUNK_CHARS = 1 << 20
+
+# (JS source, JS flags, type, suggestion, prefilter), copied verbatim in
+# PII_PATTERNS order. The prefilter is a piece every match contains on the
+# same line (None: the pattern itself); it only needs to be cheap to search.
+PII_PATTERNS: List[Tuple[str, str, str, str, Optional[str]]] = [
+    # 전화번호 (한국)
+    (r'01[0-9]-?\d{3,4}-?\d{4}', 'g', 'phone',
+     '[전화번호 삭제] 또는 "010-****-****"', None),
+    (r'02-?\d{3,4}-?\d{4}', 'g', 'phone',
+     '[전화번호 삭제] 또는 "02-***-****"', None),
+    # 이메일
+    (r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', 'g', 'email',
+     '[이메일 삭제] 또는 "***@***.com"',
+     r'@(?<=[a-zA-Z0-9._%+-]@)[a-zA-Z0-9.-]+\.[a-zA-Z]{2}'),
+    # 주민등록번호
+    (r'\d{6}-?[1-4]\d{6}', 'g', 'id_number',
+     '[주민등록번호 삭제] - 절대 저장하지 마세요!', None),
+    # 한국 실명 패턴 (이름: XXX 또는 담당: XXX)
+    (r'(?:이름|담당|작성자|연락처\s*이름)(?::|：)\s*([가-힣]{2,4})', 'g', 'name',
+     '"PM_A", "법무_1", "환자_A" 등 역할명으로 대체', None),
+    # 구체적인 병원명 패턴 ("성형외과", "피부과" 단독은 허용)
+    (r'([가-힣]{2,})(성형외과|피부과|의원|클리닉|한의원|병원)(?![_])', 'g', 'hospital',
+     '"병원_A", "클리닉_B" 등으로 익명화',
+     r'성형외과|피부과|의원|클리닉|병원'),
+    # 구체적 주소 패턴 (번지수 포함된 경우만)
+    (r'(서울|부산|대구|인천|광주|대전|울산|세종|경기|강원|충북|충남|전북|전남|경북|경남|제주)'
+     r'[^\s]{0,10}(구|시|군)[^\s]{0,15}(동|로|길)\s*\d+', 'g', 'address',
+     '[구체적 주소 삭제] - 시/구 수준까지만 표기', None),
+    # 이미지 URL/경로
+    (r'https?:\/\/[^\s<>"]+\.(jpg|jpeg|png|gif|webp|bmp)', 'gi', 'image_ref',
+     '[이미지 URL 삭제] - "[이미지: 설명]"으로 대체', r'https?:\/\/'),
+    # S3/CDN URL
+    (r'https?:\/\/[^\/\s]*(?:s3|cdn|storage|blob)[^\/\s]*\/[^\s<>"]+', 'gi', 'image_ref',
+     '[CDN URL 삭제]', r'https?:\/\/'),
+]
+
+# 익명화 예외 패턴 (이미 익명화된 것으로 간주)
+ANONYMIZED_PATTERNS = (
+    r'병원_[A-Z]', r'클리닉_[A-Z]', r'PM_[A-Z]', r'마케터_[A-Z]', r'법무_\d',
+    r'환자_[A-Z]', r'의사_[A-Z]', r'\[REDACTED\]', r'\[삭제됨\]', r'\[익명화\]',
+)
+
+# 허용되는 일반 용어 (false positive 방지)
+ALLOWED_TERMS = ('성형외과', '피부과', '정형외과', '내과', '외과', '치과', '한의원')
+
+# JS \s (WhiteSpace + LineTerminator); Python's \s differs (\x1c-\x1f, \x85, no \ufeff)
+_JS_SPACE = '\\t\\n\\x0b\\x0c\\r \\xa0\\u1680\\u2000-\\u200a\\u2028\\u2029\\u202f\\u205f\\u3000\\ufeff'
+
+
+def _from_js(source: str, line_local: bool = False) -> str:
+    """Python spelling of a JS (non-unicode) regex source
+
+    \\d and \\s become explicit classes, so the result is compiled with
+    re.ASCII, which also keeps the ``i`` flag to ASCII case folding as in
+    JS (no Kelvin sign for 'k'). With ``line_local``, positive \\s never
+    matches a newline.
+    """
+    out = []
+    in_class = negated = False
+    i = 0
+    while i < len(source):
+        char = source[i]
+        if char == '\\':
+            escape = source[i:i + 2]
+            if escape == '\\d':
+                out.append('0-9' if in_class else '[0-9]')
+            elif escape == '\\s':
+                space = _JS_SPACE
+                if line_local and not negated:
+                    space = space.replace('\\n', '')
+                out.append(space if in_class else f'[{space}]')
+            else:
+                out.append(escape)
+            i += 2
+            continue
+        if char == '[' and not in_class:
+            in_class = True
+            negated = source.startswith('[^', i)
+        elif char == ']' and in_class:
+            in_class = negated = False
+        out.append(char)
+        i += 1
+    return ''.join(out)
+
+
+def _compile(source: str, flags: str) -> 're.Pattern[str]':
+    return re.compile(_from_js(source), re.ASCII | (re.IGNORECASE if 'i' in flags else 0))
+
+
+_PATTERNS = [
+    (_compile(source, flags), kind, suggestion)
+    for source, flags, kind, suggestion, _ in PII_PATTERNS
+]
+_ANONYMIZED = re.compile('|'.join(_from_js(source) for source in ANONYMIZED_PATTERNS), re.ASCII)
+
+# Separate passes rather than one alternation: re backtracks through every
+# branch at every position, while a literal-led pattern is searched in C.
+# Prefilters never cross a newline, so each match marks its own line.
+_PREFILTERS = list({
+    (prefilter or source, flags): re.compile(
+        _from_js(prefilter or source, line_local=True),
+        re.ASCII | (re.IGNORECASE if 'i' in flags else 0),
+    )
+    for source, flags, _, _, prefilter in PII_PATTERNS
+}.values())
+
+PATTERNS_DIGEST = hashlib.sha256(repr(
+    (PII_PATTERNS, ANONYMIZED_PATTERNS, ALLOWED_TERMS)
+).encode()).hexdigest()
+
+
+class AnonymizationIssue(NamedTuple):
+    line: int  # 1-based
+    column: int  # 1-based, in UTF-16 code units like the TS checker
+    type: str  # 'phone' | 'email' | 'name' | 'hospital' | 'address' | 'image_ref' | 'id_number'
+    matched: str
+    suggestion: str
+
+
+class AnonymizationCheckResult(NamedTuple):
+    passed: bool
+    file: str
+    issues: List[AnonymizationIssue]
+
+
+def is_already_anonymized(text: str) -> bool:
+    if _ANONYMIZED.search(text):
+        return True
+    return any(text == term or text.endswith(term) for term in ALLOWED_TERMS)
+
+
+def _utf16_units(text: str) -> str:
+    """Text with astral characters split into surrogate pairs, as JS sees it"""
+    return ''.join(map(chr, memoryview(text.encode('utf-16-le')).cast('H')))
+
+
+def check_line(line: str, line_number: int) -> List[AnonymizationIssue]:
+    """Per-pattern scan of one line, exactly as checkFile() does it"""
+    astral = not line.isascii() and max(line) > '\uffff'
+    if astral:  # quantifiers and match.index count UTF-16 units in JS
+        line = _utf16_units(line)
+    issues = []
+    for pattern, kind, suggestion in _PATTERNS:
+        for match in pattern.finditer(line):
+            matched = match.group()
+            if astral:
+                matched = matched.encode('utf-16-le', 'surrogatepass').decode('utf-16-le', 'replace')
+            if is_already_anonymized(matched):
+                continue
+            issues.append(AnonymizationIssue(line_number, match.start() + 1, kind, matched, suggestion))
+    return issues
+
+
+def candidate_lines(text: str) -> List[int]:
+    """Offsets of the lines in text that some pattern could match, in order"""
+    starts = set()
+    for prefilter in _PREFILTERS:
+        search = prefilter.search
+        position = 0
+        while True:
+            match = search(text, position)
+            if match is None:
+                break
+            line_start = text.rfind('\n', 0, match.start()) + 1
+            starts.add(line_start)
+            position = text.find('\n', match.start()) + 1
+            if position == 0:
+                break
+    return sorted(starts)
+
+
+def check_text(text: str, first_line: int = 1) -> List[AnonymizationIssue]:
+    """Issues in text (lines split on '\\n'), visiting only candidate lines"""
+    issues: List[AnonymizationIssue] = []
+    line_number = first_line
+    counted = 0  # text[:counted] is accounted for in line_number
+    for line_start in candidate_lines(text):
+        line_end = text.find('\n', line_start)
+        if line_end < 0:
+            line_end = len(text)
+        line_number += text.count('\n', counted, line_start)
+        counted = line_start
+        issues.extend(check_line(text[line_start:line_end], line_number))
+    return issues
+
+
+def iter_chunks(path: str, chunk_chars: int = CHUNK_CHARS) -> Iterator[Tuple[str, int]]:
+    """(text, first line number) pieces of a file, each ending on a line boundary
+
+    Every pattern is line-scoped, so the overlap carried between chunks is
+    just the trailing partial line.
+    """
+    # newline='' keeps '\r' like fs.readFileSync; bad bytes become U+FFFD too
+    with open(path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        carry = ''
+        line_number = 1
+        while True:
+            block = f.read(chunk_chars)
+            if not block:
+                break
+            text = carry + block
+            cut = text.rfind('\n') + 1
+            if cut == 0:
+                carry = text
+                continue
+            yield text[:cut], line_number
+            line_number += text.count('\n', 0, cut)
+            carry = text[cut:]
+        yield carry, line_number
+
+
+def check_file(path: str, chunk_chars: int = CHUNK_CHARS) -> AnonymizationCheckResult:
+    issues: List[AnonymizationIssue] = []
+    for text, first_line in iter_chunks(path, chunk_chars):
+        issues.extend(check_text(text, first_line))
+    return AnonymizationCheckResult(not issues, path, issues)
+
+
+def check_case(case_dir: str) -> List[AnonymizationCheckResult]:
+    return [
+        check_file(os.path.join(case_dir, name)) for name in CASE_FILES
+        if os.path.exists(os.path.join(case_dir, name))
+    ]
+
+
+# ============================================================
+# All cases: content-hash cache + process pool
+# ============================================================
+
+# path -> [mtime_ns, size, sha256, issues]
+CacheEntry = List[object]
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _check_files(
+    tasks: Sequence[Tuple[str, Optional[str]]]
+) -> List[Tuple[str, List[int], str, Optional[List[AnonymizationIssue]]]]:
+    """Worker: (path, cached sha256) -> (path, stat, sha256, issues or None if cached)"""
+    results = []
+    for path, cached_digest in tasks:
+        st = os.stat(path)
+        digest = _file_digest(path)
+        issues = None if digest == cached_digest else check_file(path).issues
+        results.append((path, [st.st_mtime_ns, st.st_size], digest, issues))
+    return results
+
+
+class AnonymizationScanner:
+    """checkAllCases() over the case index with caching and a process pool
+
+    Files whose mtime and size match the cache are not read at all; others
+    are hashed and only rescanned when their content changed. The cache
+    (``.anonymize-cache.json`` in the cases directory) is dropped whenever
+    the pattern set changes.
+    """
+
+    def __init__(
+        self,
+        cases_dir: str = DEFAULT_CASES_DIR,
+        cache_path: Optional[str] = None,
+        workers: Optional[int] = None,
+    ):
+        self.cases_dir = cases_dir
+        self.cache_path = cache_path or os.path.join(cases_dir, CACHE_NAME)
+        self.workers = workers
+        self.scanned = 0  # files rescanned by the last check_all()
+
+    def case_paths(self) -> List[Tuple[str, str]]:
+        """(case_id, folder) in index.jsonl order, as checkAllCases() walks them"""
+        paths = []
+        try:
+            with open(os.path.join(self.cases_dir, INDEX_NAME), 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        paths.append((entry['case_id'], os.path.join(self.cases_dir, entry['path'])))
+        except FileNotFoundError:
+            pass
+        return paths
+
+    def check_all(self) -> Dict[str, List[AnonymizationCheckResult]]:
+        cache = self._read_cache()
+        cases = self.case_paths()
+        files = {
+            case_id: [os.path.join(case_dir, name) for name in CASE_FILES
+                      if os.path.exists(os.path.join(case_dir, name))]
+            for case_id, case_dir in cases
+        }
+
+        tasks: List[List[Tuple[str, Optional[str]]]] = []
+        for case_files in files.values():
+            case_tasks = []
+            for path in case_files:
+                entry = cache.get(path)
+                st = os.stat(path)
+                if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                    continue
+                case_tasks.append((path, entry[2] if entry is not None else None))
+            if case_tasks:
+                tasks.append(case_tasks)
+
+        self.scanned = 0
+        for path, stat, digest, issues in self._run(tasks):
+            if issues is None:  # same content, new stat
+                issues = cache[path][3]
+            else:
+                self.scanned += 1
+            cache[path] = [stat[0], stat[1], digest, [list(issue) for issue in issues]]
+
+        live = {path for case_files in files.values() for path in case_files}
+        self._write_cache({path: entry for path, entry in cache.items() if path in live})
+
+        return {
+            case_id: [self._result(path, cache[path]) for path in case_files]
+            for case_id, case_files in files.items()
+        }
+
+    def _run(self, tasks: List[List[Tuple[str, Optional[str]]]]) -> Iterable[tuple]:
+        workers = self.workers if self.workers is not None else (os.cpu_count() or 1)
+        workers = max(1, min(workers, len(tasks)))
+        if workers == 1:
+            for case_tasks in tasks:
+                yield from _check_files(case_tasks)
+            return
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for results in pool.map(_check_files, tasks):
+                yield from results
+
+    @staticmethod
+    def _result(path: str, entry: CacheEntry) -> AnonymizationCheckResult:
+        issues = [AnonymizationIssue(*issue) for issue in entry[3]]
+        return AnonymizationCheckResult(not issues, path, issues)
+
+    def _read_cache(self) -> Dict[str, CacheEntry]:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        if payload.get('patterns') != PATTERNS_DIGEST:
+            return {}
+        return payload['files']
+
+    def _write_cache(self, files: Dict[str, CacheEntry]) -> None:
+        tmp_path = f"{self.cache_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'patterns': PATTERNS_DIGEST, 'files': files}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
+
+
+def format_results(results: Dict[str, List[AnonymizationCheckResult]]) -> Iterator[str]:
+    """printResults() output"""
+    for case_id, file_results in results.items():
+        failed = [result for result in file_results if not result.passed]
+        if not failed:
+            yield f"[OK] {case_id}"
+            continue
+        yield ''
+        yield f"[FAIL] {case_id}"
+        for result in failed:
+            yield f"  File: {os.path.basename(result.file)}"
+            for issue in result.issues:
+                yield f'    Line {issue.line}, Col {issue.column}: [{issue.type}] "{issue.matched}"'
+                yield f"      → {issue.suggestion}"
+
+
+def format_case(case_path: str, results: List[AnonymizationCheckResult]) -> Iterator[str]:
+    """validateCase() output"""
+    if all(result.passed for result in results):
+        yield f"[OK] Anonymization check passed: {case_path}"
+        return
+    yield f"[FAIL] Anonymization check failed for: {case_path}"
+    for result in results:
+        if not result.passed:
+            yield f"  File: {os.path.basename(result.file)}"
+            for issue in result.issues:
+                yield f'    Line {issue.line}: [{issue.type}] "{issue.matched}"'
+                yield f"      → {issue.suggestion}"
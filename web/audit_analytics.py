@@ -0,0 +1,379 @@
+"""
+Audit Analytics - 감사 로그 컬럼형 집계
+audit-*.jsonl(.gz) 세그먼트를 컬럼(array)으로 읽어 TYPE_1 비율/신뢰도 분포/가드레일 수 등 집계
+
+세그먼트별 부분 집계를 캐시 파일에 보관하고, 새 세그먼트와 활성 세그먼트에
+추가된 줄만 읽어 갱신합니다 (닫힌 .gz 세그먼트는 불변).
+"""
+
+import gzip
+import json
+import os
+import zlib
+from array import array
+from collections import Counter
+from itertools import compress
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+try:  # imported as part of the ``web`` package (python -m web.triage_engine)
+    from .audit_logger import DEFAULT_LOG_DIR, _SEGMENT_NAME, segment_paths
+except ImportError:  # imported from web/ directly (streamlit run, tests)
+    from audit_logger import DEFAULT_LOG_DIR, _SEGMENT_NAME, segment_paths
+
+CACHE_NAME = 'analytics-cache.json'
+CACHE_FORMAT = 2
+
+
+class AuditColumns:
+    """One segment's entries as typed columns
+
+    Confidence is stored in whole percent. Flag codes are dictionary
+    encoded: ``flag_rows[i]`` is the entry the i-th flag occurrence belongs
+    to and ``flag_ids[i]`` indexes ``codes``.
+    """
+
+    __slots__ = ('type1', 'confidence', 'missing_info', 'guardrails',
+                 'flag_rows', 'flag_ids', 'codes', '_code_ids')
+
+    def __init__(self) -> None:
+        self.type1 = array('B')
+        self.confidence = array('B')
+        self.missing_info = array('H')
+        self.guardrails = array('H')
+        self.flag_rows = array('I')
+        self.flag_ids = array('H')
+        self.codes: List[str] = []
+        self._code_ids: Dict[str, int] = {}
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        row = len(self.type1)
+        self.type1.append(entry['routing'] == 'TYPE_1')
+        self.confidence.append(round(entry['confidence'] * 100))
+        self.missing_info.append(min(entry['missing_info_count'], 0xFFFF))
+        self.guardrails.append(min(entry['guardrail_count'], 0xFFFF))
+        for code in entry['red_flag_codes']:
+            code_id = self._code_ids.get(code)
+            if code_id is None:
+                code_id = self._code_ids[code] = len(self.codes)
+                self.codes.append(code)
+            self.flag_rows.append(row)
+            self.flag_ids.append(code_id)
+
+    def __len__(self) -> int:
+        return len(self.type1)
+
+    def aggregate(self) -> 'AuditAggregate':
+        """Counts over every column (C-level counting, no per-entry Python loop)"""
+        codes = self.codes
+        flag_type1 = compress(self.flag_ids, map(self.type1.__getitem__, self.flag_rows))
+        return AuditAggregate(
+            count=len(self.type1),
+            type1=sum(self.type1),
+            confidence=Counter(self.confidence),
+            missing_info=Counter(self.missing_info),
+            guardrails=Counter(self.guardrails),
+            flags=Counter({codes[i]: n for i, n in Counter(self.flag_ids).items()}),
+            flag_type1=Counter({codes[i]: n for i, n in Counter(flag_type1).items()}),
+        )
+
+
+class AuditAggregate:
+    """Mergeable partial aggregate (one segment, one day or a whole range)"""
+
+    __slots__ = ('count', 'type1', 'confidence', 'missing_info', 'guardrails',
+                 'flags', 'flag_type1')
+
+    def __init__(
+        self,
+        count: int = 0,
+        type1: int = 0,
+        confidence: Optional[Counter] = None,  # percent -> entries
+        missing_info: Optional[Counter] = None,  # question count -> entries
+        guardrails: Optional[Counter] = None,  # guardrail count -> entries
+        flags: Optional[Counter] = None,  # code -> entries
+        flag_type1: Optional[Counter] = None,  # code -> TYPE_1 entries
+    ):
+        self.count = count
+        self.type1 = type1
+        self.confidence = confidence if confidence is not None else Counter()
+        self.missing_info = missing_info if missing_info is not None else Counter()
+        self.guardrails = guardrails if guardrails is not None else Counter()
+        self.flags = flags if flags is not None else Counter()
+        self.flag_type1 = flag_type1 if flag_type1 is not None else Counter()
+
+    def merge(self, other: 'AuditAggregate') -> 'AuditAggregate':
+        self.count += other.count
+        self.type1 += other.type1
+        self.confidence.update(other.confidence)
+        self.missing_info.update(other.missing_info)
+        self.guardrails.update(other.guardrails)
+        self.flags.update(other.flags)
+        self.flag_type1.update(other.flag_type1)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'type1': self.type1,
+            'confidence': _pairs(self.confidence),
+            'missing_info': _pairs(self.missing_info),
+            'guardrails': _pairs(self.guardrails),
+            'flags': dict(self.flags),
+            'flag_type1': dict(self.flag_type1),
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> 'AuditAggregate':
+        return cls(
+            count=payload['count'],
+            type1=payload['type1'],
+            confidence=Counter(dict(payload['confidence'])),
+            missing_info=Counter(dict(payload['missing_info'])),
+            guardrails=Counter(dict(payload['guardrails'])),
+            flags=Counter(payload['flags']),
+            flag_type1=Counter(payload['flag_type1']),
+        )
+
+    def summary(self) -> Dict[str, Any]:
+        """The compliance rollups"""
+        count = self.count
+        return {
+            'total': count,
+            'type1': self.type1,
+            'type2': count - self.type1,
+            'type1_rate': _rate(self.type1, count),
+            'flags': [
+                {
+                    'code': code,
+                    'count': n,
+                    'type1': self.flag_type1[code],
+                    'type1_rate': _rate(self.flag_type1[code], n),
+                }
+                for code, n in sorted(self.flags.items(), key=lambda item: (-item[1], item[0]))
+            ],
+            'confidence': {
+                'mean': _mean(self.confidence) / 100,
+                'p50': _quantile(self.confidence, 0.5) / 100,
+                'p90': _quantile(self.confidence, 0.9) / 100,
+                'histogram': _decile_histogram(self.confidence),
+            },
+            'guardrails': {
+                'mean': _mean(self.guardrails),
+                'distribution': dict(sorted(self.guardrails.items())),
+            },
+            'missing_info': {
+                'mean': _mean(self.missing_info),
+                'distribution': dict(sorted(self.missing_info.items())),
+            },
+        }
+
+
+def _pairs(counter: Counter) -> List[List[int]]:
+    return sorted([key, n] for key, n in counter.items())
+
+
+def _rate(part: int, total: int) -> float:
+    return part / total if total else 0.0
+
+
+def _mean(histogram: Counter) -> float:
+    total = sum(histogram.values())
+    return sum(value * n for value, n in histogram.items()) / total if total else 0.0
+
+
+def _quantile(histogram: Counter, q: float) -> int:
+    total = sum(histogram.values())
+    if not total:
+        return 0
+    rank = q * (total - 1)
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen > rank:
+            return value
+    return max(histogram)
+
+
+def _decile_histogram(confidence: Counter) -> Dict[str, int]:
+    """Entries per 0.1-wide confidence bucket ('0.9-1.0' includes 1.0)"""
+    buckets = Counter()
+    for percent, n in confidence.items():
+        buckets[min(percent // 10, 9)] += n
+    return {f'{b / 10:.1f}-{(b + 1) / 10:.1f}': buckets[b] for b in range(10)}
+
+
+def read_columns(path: str, offset: int = 0) -> Tuple[AuditColumns, int]:
+    """Columns of the complete lines from offset on, plus the offset after them"""
+    columns = AuditColumns()
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                break  # partial line still being written: pick it up next time
+            offset += len(line)
+            if line.strip():
+                columns.append(json.loads(line))
+    return columns, offset
+
+
+_TAIL_BYTES = 4096  # bytes before the read offset checksummed to notice a reused file
+
+
+class _SegmentState(NamedTuple):
+    """What was read from one segment file, and how the file looked then"""
+    inode: int
+    size: int  # st_size / st_mtime_ns when it was last read
+    mtime_ns: int
+    offset: int  # read up to here (complete lines)
+    tail_crc: int  # CRC-32 of the _TAIL_BYTES before offset (plain segments)
+    aggregate: 'AuditAggregate'
+
+
+def _tail_crc(path: str, offset: int) -> int:
+    if path.endswith('.gz'):
+        return 0  # closed segments are never appended to
+    with open(path, 'rb') as f:
+        f.seek(max(0, offset - _TAIL_BYTES))
+        return zlib.crc32(f.read(min(offset, _TAIL_BYTES)))
+
+
+class AuditAnalytics:
+    """Cached per-segment aggregates over an audit log directory
+
+    ``refresh()`` reads only what is new since the last call (in this or an
+    earlier process, via the cache file): unseen segments, and lines
+    appended to the active segment. Rotated-away active segments drop out
+    and reappear under their closed name, so nothing is counted twice.
+
+    A cached segment is reused only while its inode, size and mtime are
+    unchanged; an active segment that grew is read on from the cached
+    offset only if the bytes before that offset are still the same. A
+    file that reuses a rotated segment's name (and freed inode) is read
+    from the start.
+    """
+
+    def __init__(self, log_dir: Optional[str] = None, cache_path: Optional[str] = None):
+        self.log_dir = log_dir or DEFAULT_LOG_DIR
+        self.cache_path = cache_path or os.path.join(self.log_dir, CACHE_NAME)
+        self.entries_read = 0  # entries parsed by the last refresh()
+        self._segments: Dict[str, _SegmentState] = {}  # by segment file name
+        self._load_cache()
+
+    def refresh(self) -> None:
+        self.entries_read = 0
+        segments = {}
+        for path in segment_paths(self.log_dir):
+            name = os.path.basename(path)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:  # rotated away since listing
+                continue
+            state = self._segments.get(name)
+            if state is not None and (
+                state.inode, state.size, state.mtime_ns
+            ) == (st.st_ino, st.st_size, st.st_mtime_ns):
+                segments[name] = state  # untouched since it was read
+                continue
+
+            offset, aggregate = 0, None
+            if (
+                state is not None and state.inode == st.st_ino
+                and not name.endswith('.gz') and st.st_size >= state.offset
+                and _tail_crc(path, state.offset) == state.tail_crc
+            ):
+                offset, aggregate = state.offset, state.aggregate  # appended to
+            columns, offset = read_columns(path, offset)
+            self.entries_read += len(columns)
+            partial = columns.aggregate()
+            aggregate = partial if aggregate is None else aggregate.merge(partial)
+            segments[name] = _SegmentState(
+                st.st_ino, st.st_size, st.st_mtime_ns, offset, _tail_crc(path, offset), aggregate,
+            )
+
+        changed = segments != self._segments
+        self._segments = segments
+        if changed:
+            self._save_cache()
+
+    def days(self) -> Dict[str, AuditAggregate]:
+        """Per-day aggregates (UTC date of the segment)"""
+        days: Dict[str, AuditAggregate] = {}
+        for name, state in self._segments.items():
+            day = _SEGMENT_NAME.match(name).group(1)
+            days.setdefault(day, AuditAggregate()).merge(state.aggregate)
+        return dict(sorted(days.items()))
+
+    def aggregate(self, since: Optional[str] = None, until: Optional[str] = None) -> AuditAggregate:
+        """Merged aggregate of days in [since, until] (YYYY-MM-DD, inclusive)"""
+        total = AuditAggregate()
+        for day, aggregate in self.days().items():
+            if (since is None or day >= since) and (until is None or day <= until):
+                total.merge(aggregate)
+        return total
+
+    def summary(self, since: Optional[str] = None, until: Optional[str] = None) -> Dict[str, Any]:
+        self.refresh()
+        return self.aggregate(since, until).summary()
+
+    def _load_cache(self) -> None:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return
+        if payload.get('format') != CACHE_FORMAT:
+            return
+        self._segments = {
+            name: _SegmentState(*fields[:-1], AuditAggregate.from_dict(fields[-1]))
+            for name, fields in payload['segments'].items()
+        }
+
+    def _save_cache(self) -> None:
+        """Write the cache atomically (tmp file + rename); best effort"""
+        payload = {
+            'format': CACHE_FORMAT,
+            'segments': {
+                name: [*state[:-1], state.aggregate.to_dict()]
+                for name, state in self._segments.items()
+            },
+        }
+        tmp_path = f"{self.cache_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
+
+
+def format_summary(summary: Dict[str, Any], top: int = 10) -> Iterable[str]:
+    """Text report in the style of the TypeScript `stats` command"""
+    total = summary['total']
+    yield '=== Legal Triage Statistics ==='
+    yield ''
+    yield f"Total triages: {total}"
+    yield f"TYPE_1 (Legal Review): {summary['type1']} ({_percent(summary['type1'], total)})"
+    yield f"TYPE_2 (Proceed): {summary['type2']} ({_percent(summary['type2'], total)})"
+    yield ''
+    yield 'Top Red Flags (TYPE_1 rate):'
+    for flag in summary['flags'][:top]:
+        yield f"  - {flag['code']}: {flag['count']} ({_percent(flag['type1'], flag['count'])})"
+    confidence = summary['confidence']
+    yield ''
+    yield (f"Confidence: mean {confidence['mean']:.2f}, "
+           f"p50 {confidence['p50']:.2f}, p90 {confidence['p90']:.2f}")
+    for bucket, n in confidence['histogram'].items():
+        if n:
+            yield f"  {bucket}: {n}"
+    yield ''
+    yield f"Guardrails per triage: mean {summary['guardrails']['mean']:.1f}"
+    for count, n in summary['guardrails']['distribution'].items():
+        yield f"  {count}: {n}"
+
+
+def _percent(value: int, total: int) -> str:
+    if total == 0:
+        return '0%'
+    return f'{round(value / total * 100)}%'
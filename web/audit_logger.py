@@ -0,0 +1,294 @@
+"""
+Audit Logger - 프라이버시 안전 감사 로그 (Python)
+src/logger.ts와 동일한 AuditLogEntry 스키마 (원문 없이 해시/라벨/개수만 기록)
+
+백그라운드 스레드가 bounded queue에서 모아 한 번에 기록하고, 크기/날짜(UTC, logger.ts와 동일) 단위로
+세그먼트를 교체하며 닫힌 세그먼트는 gzip 압축합니다. triage()는 절대 대기하지 않음:
+큐가 가득 차면 엔트리를 버리고 ``dropped``만 증가시킵니다.
+"""
+
+import atexit
+import gzip
+import json
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_LOG_DIR = os.path.join(os.getcwd(), '.legal-triage-logs')
+
+# audit-YYYY-MM-DD.jsonl (active) / audit-YYYY-MM-DD.NNN.jsonl.gz (closed)
+_SEGMENT_NAME = re.compile(r'^audit-(\d{4}-\d{2}-\d{2})(?:\.(\d+))?\.jsonl(\.gz)?$')
+
+# (timestamp, input_hash, routing, confidence, red_flag_codes,
+#  missing_info_count, guardrail_count) in AuditLogEntry field order
+Entry = Tuple[str, str, str, float, List[str], int, int]
+
+ENTRY_FIELDS = (
+    'timestamp', 'input_hash', 'routing', 'confidence', 'red_flag_codes',
+    'missing_info_count', 'guardrail_count',
+)
+
+_STOP = object()
+
+
+def entry_from_output(result: Any) -> Entry:
+    """AuditLogEntry fields of a TriageOutput"""
+    return (
+        result.timestamp,
+        result.input_hash or 'unknown',
+        result.routing,
+        result.confidence,
+        [flag.code for flag in result.red_flags],
+        len(result.missing_info_questions),
+        len(result.safe_guardrails),
+    )
+
+
+def entry_from_dict(payload: Dict[str, Any]) -> Entry:
+    """AuditLogEntry fields of an output_to_dict() payload"""
+    return (
+        payload['timestamp'],
+        payload.get('input_hash') or 'unknown',
+        payload['routing'],
+        payload['confidence'],
+        [flag['code'] for flag in payload['red_flags']],
+        len(payload['missing_info_questions']),
+        len(payload['safe_guardrails']),
+    )
+
+
+class AuditLogger:
+    """Buffered, rotating JSONL audit log written by a background thread
+
+    ``log()`` only enqueues a tuple; JSON encoding, file I/O, rotation and
+    compression all happen on the writer thread, which drains up to
+    ``batch_size`` entries per ``write`` call. Segments roll over when
+    they exceed ``max_bytes`` or the UTC date changes (segment names use
+    the UTC date like src/logger.ts, so both engines share a day's file);
+    closed segments are gzip-compressed. Pending entries are flushed by ``close()``, which
+    is also registered to run at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        log_dir: Optional[str] = None,
+        max_bytes: int = 64 << 20,
+        queue_size: int = 10_000,
+        batch_size: int = 512,
+        flush_interval: float = 0.5,
+        compress: bool = True,
+    ):
+        self.log_dir = log_dir or DEFAULT_LOG_DIR
+        self.max_bytes = max_bytes
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compress = compress
+        self.enabled = True
+
+        self.written = 0
+        self.dropped = 0
+        self.segments = 0  # segments closed by this logger
+        self.last_error: Optional[str] = None
+
+        self._queue: 'queue.Queue[Any]' = queue.Queue(maxsize=queue_size)
+        self._drop_lock = threading.Lock()
+        self._file = None
+        self._date = ''
+        self._size = 0
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name='audit-logger', daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ----------------------------------------------------------
+    # Producer side (called from triage paths, never blocks)
+    # ----------------------------------------------------------
+
+    def log(self, result: Any) -> bool:
+        """Queue one TriageOutput; False if it was dropped"""
+        if not self.enabled or self._closed:
+            return False
+        return self._offer(entry_from_output(result))
+
+    def log_dict(self, payload: Dict[str, Any]) -> bool:
+        """Queue one output_to_dict() payload; False if it was dropped"""
+        if not self.enabled or self._closed:
+            return False
+        return self._offer(entry_from_dict(payload))
+
+    def _offer(self, entry: Entry) -> bool:
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            with self._drop_lock:
+                self.dropped += 1
+            return False
+        return True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'written': self.written,
+            'dropped': self.dropped,
+            'pending': self._queue.qsize(),
+            'segments': self.segments,
+        }
+
+    def close(self) -> None:
+        """Flush everything queued so far and close the active segment
+
+        The active segment stays uncompressed so a later logger for the
+        same directory keeps appending to it.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(_STOP)  # may wait for room: entries ahead of it get written
+        self._thread.join()
+
+    def active_path(self) -> str:
+        return os.path.join(self.log_dir, f'audit-{self._date or self._today()}.jsonl')
+
+    # ----------------------------------------------------------
+    # Writer thread
+    # ----------------------------------------------------------
+
+    def _run(self) -> None:
+        self._compress_leftovers()
+        get = self._queue.get
+        get_nowait = self._queue.get_nowait
+        stop = False
+        while not stop:
+            try:
+                batch = [get(timeout=self.flush_interval)]
+            except queue.Empty:
+                self._roll_date()
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(get_nowait())
+                except queue.Empty:
+                    break
+            if _STOP in batch:
+                del batch[batch.index(_STOP):]
+                stop = True
+            if batch:
+                self._write(batch)
+        self._close_file()
+
+    def _write(self, batch: List[Entry]) -> None:
+        try:
+            self._roll_date()
+            data = ''.join(
+                json.dumps(dict(zip(ENTRY_FIELDS, entry)), ensure_ascii=False) + '\n'
+                for entry in batch
+            ).encode('utf-8')
+            if self._file is None:
+                self._open()
+            self._file.write(data)
+            self._file.flush()
+            self._size += len(data)
+            self.written += len(batch)
+            if self._size >= self.max_bytes:
+                self._rotate()
+        except Exception as error:  # disk full, permissions: never reach triage()
+            self.last_error = f"{type(error).__name__}: {error}"
+            with self._drop_lock:
+                self.dropped += len(batch)
+
+    def _today(self) -> str:
+        return time.strftime('%Y-%m-%d', time.gmtime())
+
+    def _open(self) -> None:
+        os.makedirs(self.log_dir, exist_ok=True)
+        self._date = self._today()
+        self._file = open(self.active_path(), 'ab')
+        self._size = self._file.tell()
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _roll_date(self) -> None:
+        if self._file is not None and self._date != self._today():
+            self._rotate()
+
+    def _rotate(self) -> None:
+        """Close the active segment, rename it to its sequence number and compress it"""
+        path = self.active_path()
+        self._close_file()
+        self._seal(path, self._date)
+        self._size = 0
+
+    def _seal(self, path: str, date: str) -> None:
+        sequence = 1 + max(
+            (int(match.group(2)) for match in map(_SEGMENT_NAME.match, os.listdir(self.log_dir))
+             if match and match.group(1) == date and match.group(2)),
+            default=0,
+        )
+        closed_path = os.path.join(self.log_dir, f'audit-{date}.{sequence:03d}.jsonl')
+        os.replace(path, closed_path)
+        if self.compress:
+            with open(closed_path, 'rb') as src, gzip.open(f'{closed_path}.gz', 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(closed_path)
+        self.segments += 1
+
+    def _compress_leftovers(self) -> None:
+        """Seal active segments of earlier dates left by previous processes
+
+        Only dates before today: today's file may still be appended to by
+        another process (e.g. the TS logger).
+        """
+        try:
+            names = os.listdir(self.log_dir)
+        except OSError:
+            return
+        today = self._today()
+        for name in names:
+            match = _SEGMENT_NAME.match(name)
+            if match and not match.group(2) and not match.group(3) and match.group(1) < today:
+                try:
+                    self._seal(os.path.join(self.log_dir, name), match.group(1))
+                except OSError as error:
+                    self.last_error = f"{type(error).__name__}: {error}"
+
+
+def segment_paths(log_dir: Optional[str] = None) -> List[str]:
+    """Audit log segments in chronological order (closed before active per date)"""
+    log_dir = log_dir or DEFAULT_LOG_DIR
+    try:
+        names = os.listdir(log_dir)
+    except FileNotFoundError:
+        return []
+
+    keyed = []
+    for name in names:
+        match = _SEGMENT_NAME.match(name)
+        if match:
+            sequence = int(match.group(2)) if match.group(2) else float('inf')
+            keyed.append(((match.group(1), sequence), name))
+    return [os.path.join(log_dir, name) for _, name in sorted(keyed)]
+
+
+def read_entries(log_dir: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Every AuditLogEntry in the directory, compressed segments included"""
+    for path in segment_paths(log_dir):
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
@@ -0,0 +1,327 @@
+"""
+Case Ingest - 케이스 폴더 증분 인제스트 (Python)
+src/cases/ingest.ts와 같은 index.jsonl을 만들되, 바뀐 케이스만 다시 파싱
+
+케이스 파일의 mtime/크기/해시를 manifest에 보관하고, 내용이 바뀐 케이스만 스레드 풀에서
+case.yaml을 파싱합니다. index.jsonl은 새 케이스는 뒤에 추가하고, 수정/삭제가 있으면
+처음 바뀐 줄부터만 다시 씁니다.
+
+Usage:
+    python -m web.triage_engine index-cases
+"""
+
+import hashlib
+import json
+import os
+import re
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CASES_DIR = os.path.join(ROOT_DIR, 'data', 'cases')
+
+# Same rule as isCaseDirectory() in src/cases/ingest.ts
+CASE_DIR_NAME = re.compile(r'^\d{4}-\d{2}-\d{2}_')
+
+CASE_FILES = ('case.yaml', 'request.md', 'response.md')
+MANIFEST_NAME = '.manifest.json'
+INDEX_NAME = 'index.jsonl'
+
+# name -> [mtime_ns, size, sha256]; files missing from the folder are absent
+FileState = Dict[str, List[Any]]
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def parallel_map(fn: Callable[[T], R], items: Sequence[T], workers: Optional[int] = None) -> List[R]:
+    """fn over items on a thread pool (file reads and YAML parsing), in order"""
+    if len(items) <= 1 or workers == 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, items))
+
+
+def case_dirs(cases_dir: str) -> List[str]:
+    """Case folder names in index order (same filter as isCaseDirectory)"""
+    return sorted(
+        name for name in os.listdir(cases_dir)
+        if CASE_DIR_NAME.match(name) and os.path.isdir(os.path.join(cases_dir, name))
+    )
+
+
+def _file_state(case_dir: str, previous: FileState) -> FileState:
+    """Current signature of the case files; hashes only files whose stat changed"""
+    state: FileState = {}
+    for name in CASE_FILES:
+        path = os.path.join(case_dir, name)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        known = previous.get(name)
+        if known is not None and known[0] == st.st_mtime_ns and known[1] == st.st_size:
+            state[name] = known
+            continue
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        state[name] = [st.st_mtime_ns, st.st_size, digest]
+    return state
+
+
+def _same_content(a: Optional[FileState], b: FileState) -> bool:
+    if a is None or a.keys() != b.keys():
+        return False
+    return all(a[name][2] == b[name][2] for name in b)
+
+
+def parse_case_entry(case_dir: str) -> Optional[Dict[str, Any]]:
+    """CaseIndexEntry for one folder (caseToIndexEntry); None if case.yaml is unusable"""
+    try:  # imported as part of the ``web`` package
+        from .rubric_snapshot import parse_yaml
+    except ImportError:
+        from rubric_snapshot import parse_yaml
+
+    try:
+        with open(os.path.join(case_dir, 'case.yaml'), 'r', encoding='utf-8') as f:
+            case = parse_yaml(f.read())
+    except ImportError:
+        raise
+    except Exception:  # unreadable file, yaml.YAMLError
+        return None
+    if not isinstance(case, dict) or not case.get('case_id'):
+        return None
+
+    entry = {
+        'case_id': str(case['case_id']),
+        'path': os.path.basename(os.path.normpath(case_dir)),
+        'date': str(case['date']) if case.get('date') is not None else None,
+        'team': case.get('team'),
+        'decision': case.get('decision'),
+        'rule_codes': list(case.get('rule_codes') or []),
+        'title': case.get('title'),
+        'indexed_at': _now_iso(),
+    }
+    # JSON.stringify() drops undefined fields; keep the lines identical
+    return {key: value for key, value in entry.items() if value is not None}
+
+
+def _now_iso() -> str:
+    """new Date().toISOString() format"""
+    now = datetime.now(timezone.utc)
+    return now.strftime('%Y-%m-%dT%H:%M:%S.') + f'{now.microsecond // 1000:03d}Z'
+
+
+def _index_line(entry: Dict[str, Any]) -> bytes:
+    """JSON.stringify() layout, so TS and Python writers produce the same lines"""
+    return (json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+class IngestResult:
+    """What one ingest() call changed"""
+
+    __slots__ = ('added', 'updated', 'removed', 'unchanged', 'failed', 'rewritten_from')
+
+    def __init__(self) -> None:
+        self.added: List[str] = []  # folder names
+        self.updated: List[str] = []
+        self.removed: List[str] = []
+        self.unchanged = 0
+        self.failed: List[str] = []  # case.yaml missing or malformed
+        self.rewritten_from: Optional[int] = None  # index byte offset, None if untouched
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+
+class CaseIngestor:
+    """Keep ``index.jsonl`` in sync with the case folders, re-parsing only changes
+
+    The manifest (``.manifest.json`` in the cases directory) records each
+    case file's mtime, size and sha256. A folder whose files all keep their
+    stat is skipped without reading; one whose stat changed is re-hashed,
+    and only a content change triggers a re-parse. Entries stay in folder
+    order, so new (later-dated) cases are usually a pure append.
+    """
+
+    def __init__(
+        self,
+        cases_dir: str = DEFAULT_CASES_DIR,
+        index_path: Optional[str] = None,
+        manifest_path: Optional[str] = None,
+        workers: Optional[int] = None,
+    ):
+        self.cases_dir = cases_dir
+        self.index_path = index_path or os.path.join(cases_dir, INDEX_NAME)
+        self.manifest_path = manifest_path or os.path.join(cases_dir, MANIFEST_NAME)
+        self.workers = workers
+
+    def ingest(self) -> IngestResult:
+        result = IngestResult()
+        manifest = self._read_manifest()
+        lines = self._read_index()  # path -> raw line, in file order
+        names = case_dirs(self.cases_dir)
+
+        states = parallel_map(
+            lambda name: _file_state(
+                os.path.join(self.cases_dir, name), manifest.get(name, {})
+            ),
+            names, self.workers,
+        )
+        to_parse = [
+            name for name, state in zip(names, states)
+            if name not in lines or not _same_content(manifest.get(name), state)
+        ]
+        entries = dict(zip(to_parse, parallel_map(
+            lambda name: parse_case_entry(os.path.join(self.cases_dir, name)),
+            to_parse, self.workers,
+        )))
+
+        new_manifest = {}
+        new_lines: Dict[str, bytes] = {}
+        for name, state in zip(names, states):
+            new_manifest[name] = state
+            if name not in entries:
+                new_lines[name] = lines[name]
+                result.unchanged += 1
+                continue
+            entry = entries[name]
+            if entry is None:
+                result.failed.append(name)
+                continue
+            line = _index_line(entry)
+            if name not in lines:
+                result.added.append(name)
+            elif _strip_indexed_at(lines[name]) != _strip_indexed_at(line):
+                result.updated.append(name)
+            else:
+                line = lines[name]  # content touched but entry identical
+                result.unchanged += 1
+            new_lines[name] = line
+        result.removed = [name for name in lines if name not in new_lines]
+
+        self._patch_index(lines, new_lines, result)
+        self._write_manifest(new_manifest)
+        return result
+
+    # ----------------------------------------------------------
+    # index.jsonl
+    # ----------------------------------------------------------
+
+    def _read_index(self) -> Dict[str, bytes]:
+        lines: Dict[str, bytes] = {}
+        try:
+            with open(self.index_path, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        if not line.endswith(b'\n'):
+                            line += b'\n'
+                        lines[json.loads(line)['path']] = line
+        except FileNotFoundError:
+            pass
+        return lines
+
+    def _patch_index(
+        self, old: Dict[str, bytes], new: Dict[str, bytes], result: IngestResult
+    ) -> None:
+        """Rewrite index.jsonl only from the first line that differs"""
+        old_items = list(old.items())
+        new_items = list(new.items())
+        common = 0
+        offset = 0
+        for (old_name, old_line), (new_name, new_line) in zip(old_items, new_items):
+            if old_name != new_name or old_line != new_line:
+                break
+            common += 1
+            offset += len(old_line)
+        if common == len(old_items) == len(new_items):
+            return
+
+        mode = 'r+b' if os.path.exists(self.index_path) else 'wb'
+        with open(self.index_path, mode) as f:
+            f.seek(offset)
+            f.truncate()
+            f.writelines(line for _, line in new_items[common:])
+        result.rewritten_from = offset
+
+    # ----------------------------------------------------------
+    # Manifest
+    # ----------------------------------------------------------
+
+    def _read_manifest(self) -> Dict[str, FileState]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_manifest(self, manifest: Dict[str, FileState]) -> None:
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+
+def _strip_indexed_at(line: bytes) -> Dict[str, Any]:
+    entry = json.loads(line)
+    entry.pop('indexed_at', None)
+    return entry
+
+
+class CaseCatalog:
+    """In-memory lookup over index.jsonl entries: by case_id, rule code and date
+
+    Entries without a case_id are skipped; undated ones sort first and are
+    left out of date-range queries.
+    """
+
+    def __init__(self, entries: Iterable[Dict[str, Any]]):
+        self.entries = sorted(
+            (entry for entry in entries if entry.get('case_id')),
+            key=lambda entry: (entry.get('date') or '', entry['case_id']),
+        )
+        self._by_id = {entry['case_id']: entry for entry in self.entries}
+        self._by_rule: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in self.entries:
+            for code in entry.get('rule_codes') or ():
+                self._by_rule.setdefault(code, []).append(entry)
+        self._dated = [entry for entry in self.entries if entry.get('date')]
+        self._dates = [entry['date'] for entry in self._dated]
+
+    @classmethod
+    def load(cls, index_path: Optional[str] = None) -> 'CaseCatalog':
+        index_path = index_path or os.path.join(DEFAULT_CASES_DIR, INDEX_NAME)
+        entries = []
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                entries = [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            pass
+        return cls(entries)
+
+    def get(self, case_id: str) -> Optional[Dict[str, Any]]:
+        return self._by_id.get(case_id)
+
+    def with_rule(self, code: str) -> List[Dict[str, Any]]:
+        """Cases tagged with a rule code, oldest first"""
+        return list(self._by_rule.get(code, ()))
+
+    def between(self, since: Optional[str] = None, until: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Cases dated in [since, until] (YYYY-MM-DD, inclusive), oldest first"""
+        start = bisect_left(self._dates, since) if since is not None else 0
+        end = bisect_right(self._dates, until) if until is not None else len(self._dates)
+        return self._dated[start:end]
+
+    def rule_codes(self) -> List[Tuple[str, int]]:
+        """(code, case count), most used first"""
+        return sorted(((code, len(cases)) for code, cases in self._by_rule.items()),
+                      key=lambda item: (-item[1], item[0]))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, case_id: str) -> bool:
+        return case_id in self._by_id
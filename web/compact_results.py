@@ -0,0 +1,351 @@
+"""
+Compact Results - 대량 배치용 메모리 절약형 triage 결과
+flag 코드·질문·가드레일을 문자열 대신 컴파일된 rubric 테이블의 정수 ID로 저장하고,
+전체 텍스트는 직렬화/출력 시점에만 복원
+
+``CompactTriageOutput``은 결과 하나를 ``__slots__``와 정수 ID로, ``ResultBatch``는 많은 결과를
+array 열(column)로 보관합니다. 두 형태 모두 ``to_output()``/``to_dict()``로 원래
+TriageOutput과 같은 결과를 돌려줍니다.
+
+Usage:
+    batch = engine.triage_many(inputs, compact=True)   # ResultBatch
+    for item in batch:
+        print(item.routing, item.flag_codes)
+    python -m web.triage_engine batch inputs.jsonl --compact -o results.jsonl
+"""
+
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+try:  # imported as part of the ``web`` package (python -m web.triage_engine)
+    from .compiled_rubric import CompiledRubric
+    from .triage_engine import (
+        DetectedRedFlag, SimilarCase, TriageOutput, output_to_dict,
+    )
+except ImportError:  # imported from web/ directly (streamlit run, tests)
+    from compiled_rubric import CompiledRubric
+    from triage_engine import DetectedRedFlag, SimilarCase, TriageOutput, output_to_dict
+
+NEXT_STEPS = ('LEGAL_REVIEW', 'PROCEED_WITH_GUARDRAILS')
+
+# (flag id, keyword ids, spans flattened as start, end, keyword id, ...)
+CompactFlag = Tuple[int, Tuple[int, ...], Tuple[int, ...]]
+
+
+def _timestamp_us(timestamp: str) -> Union[int, str]:
+    """Naive ISO timestamp -> microseconds since 1970-01-01; anything else stays text
+
+    Exact round trip for the datetime.now().isoformat() stamps triage() writes.
+    """
+    from datetime import datetime, timedelta
+
+    try:
+        moment = datetime.fromisoformat(timestamp)
+    except ValueError:
+        return timestamp
+    if moment.tzinfo is not None:
+        return timestamp
+    return (moment - datetime(1970, 1, 1)) // timedelta(microseconds=1)
+
+
+def _timestamp_text(timestamp: Union[int, str]) -> str:
+    from datetime import datetime, timedelta
+
+    if isinstance(timestamp, str):
+        return timestamp
+    return (datetime(1970, 1, 1) + timedelta(microseconds=timestamp)).isoformat()
+
+
+class CompactTriageOutput:
+    """TriageOutput holding rubric ids instead of rubric strings
+
+    ``flags``, ``question_ids`` and ``guardrail_ids`` index into
+    ``rubric.red_flags``, ``rubric.questions`` and ``rubric.guardrails``;
+    each flag's keyword ids index into that flag's ``keywords``. Not a
+    dataclass: it keeps ``__slots__`` (millions may be held at once) and
+    leaves the rubric out of repr/eq.
+    """
+
+    __slots__ = (
+        'rubric', 'routing_id', 'confidence', 'next_step_id', 'timestamp', 'input_hash',
+        'flags', 'question_ids', 'guardrail_ids', 'similar_cases', 'trace',
+    )
+    _fields = __slots__[1:]  # repr/eq without the rubric itself
+
+    def __init__(
+        self,
+        rubric: CompiledRubric,
+        routing_id: int,
+        confidence: float,
+        next_step_id: int,
+        timestamp: Union[int, str],  # microseconds since 1970-01-01 (naive) or the raw text
+        input_hash: str,
+        flags: Tuple[CompactFlag, ...],
+        question_ids: Tuple[int, ...],
+        guardrail_ids: Tuple[int, ...],
+        similar_cases: Optional[List[SimilarCase]] = None,
+        trace: Optional[Dict[str, Any]] = None,
+    ):
+        self.rubric = rubric
+        self.routing_id = routing_id
+        self.confidence = confidence
+        self.next_step_id = next_step_id
+        self.timestamp = timestamp
+        self.input_hash = input_hash
+        self.flags = flags
+        self.question_ids = question_ids
+        self.guardrail_ids = guardrail_ids
+        self.similar_cases = similar_cases or None
+        self.trace = trace
+
+    def __repr__(self) -> str:
+        args = ', '.join(f'{name}={getattr(self, name)!r}' for name in self._fields)
+        return f'{type(self).__name__}({args})'
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.fields() == other.fields()
+
+    __hash__ = None  # mutable
+
+    @classmethod
+    def from_output(cls, result: TriageOutput, rubric: CompiledRubric) -> 'CompactTriageOutput':
+        return cls(rubric, *encode(result, rubric))
+
+    def fields(self) -> tuple:
+        """Constructor arguments after ``rubric`` (picklable without the rubric)"""
+        return tuple(getattr(self, name) for name in self._fields)
+
+    @property
+    def routing(self) -> str:
+        return self.rubric.result_tables().routings[self.routing_id]
+
+    @property
+    def recommended_next_step(self) -> str:
+        return NEXT_STEPS[self.next_step_id]
+
+    @property
+    def flag_codes(self) -> List[str]:
+        red_flags = self.rubric.red_flags
+        return [red_flags[flag_id].code for flag_id, _, _ in self.flags]
+
+    def to_output(self) -> TriageOutput:
+        """Resolve ids back to the full TriageOutput"""
+        rubric = self.rubric
+        red_flags = []
+        for flag_id, keyword_ids, spans in self.flags:
+            flag = rubric.red_flags[flag_id]
+            keywords = flag.keywords
+            red_flags.append(DetectedRedFlag(
+                code=flag.code,
+                reason=flag.reason,
+                matched_keywords=[keywords[k][0] for k in keyword_ids],
+                severity=flag.severity,
+                matched_spans=[
+                    (spans[i], spans[i + 1], keywords[spans[i + 2]][0])
+                    for i in range(0, len(spans), 3)
+                ],
+            ))
+        return TriageOutput(
+            routing=self.routing,
+            confidence=self.confidence,
+            red_flags=red_flags,
+            missing_info_questions=[rubric.questions[i].question for i in self.question_ids],
+            safe_guardrails=[rubric.guardrails[i].text for i in self.guardrail_ids],
+            recommended_next_step=self.recommended_next_step,
+            timestamp=_timestamp_text(self.timestamp),
+            input_hash=self.input_hash,
+            rubric_version=rubric.version,
+            rubric_digest=rubric.digest,
+            similar_cases=list(self.similar_cases or ()),
+            trace=self.trace,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return output_to_dict(self.to_output())
+
+
+def encode(result: TriageOutput, rubric: CompiledRubric) -> tuple:
+    """CompactTriageOutput fields (after ``rubric``) for one result of that rubric"""
+    if result.rubric_digest and rubric.digest and result.rubric_digest != rubric.digest:
+        raise ValueError(
+            f"result was triaged with rubric {result.rubric_digest[:12]}, "
+            f"not {rubric.digest[:12]}"
+        )
+    tables = rubric.result_tables()
+    flags = []
+    previous = -1
+    for detected in result.red_flags:
+        # Flags come out in rubric order, so a repeated code takes its next index
+        flag_id = next(i for i in tables.flag_ids[detected.code] if i > previous)
+        previous = flag_id
+        keyword_ids = tables.keyword_ids[flag_id]
+        spans = []
+        for start, end, keyword in detected.matched_spans:
+            spans += (start, end, keyword_ids[keyword])
+        flags.append((
+            flag_id,
+            tuple(keyword_ids[keyword] for keyword in detected.matched_keywords),
+            tuple(spans),
+        ))
+    return (
+        tables.routings.index(result.routing),
+        result.confidence,
+        NEXT_STEPS.index(result.recommended_next_step),
+        _timestamp_us(result.timestamp),
+        result.input_hash,
+        tuple(flags),
+        tuple(tables.question_ids[question] for question in result.missing_info_questions),
+        tuple(tables.guardrail_ids[text] for text in result.safe_guardrails),
+        result.similar_cases or None,
+        result.trace,
+    )
+
+
+class ResultBatch:
+    """Many results of one compiled rubric, stored column-wise in arrays
+
+    Variable-length parts (flags, their keywords and spans, questions,
+    guardrails) are flattened into one array each, with a running end
+    offset per item (or per flag). Rare per-item extras — similar cases,
+    traces, timestamps or hashes in an unexpected format — go to dicts.
+    """
+
+    def __init__(self, rubric: CompiledRubric):
+        self.rubric = rubric
+        self._routing = bytearray()
+        self._next_step = bytearray()
+        self._confidence = array('d')
+        self._timestamp = array('q')
+        self._hash = bytearray()  # 8 bytes per item (16 hex digit input_hash)
+        self._flag_end = array('I')
+        self._flag_ids = array('H')
+        self._keyword_end = array('I')  # per flag entry
+        self._keyword_ids = array('H')
+        self._span_end = array('I')  # per flag entry, in values (3 per span)
+        self._spans = array('I')
+        self._question_end = array('I')
+        self._question_ids = array('H')
+        self._guardrail_end = array('I')
+        self._guardrail_ids = array('H')
+        self._extras: Dict[int, Tuple[Optional[List[SimilarCase]], Optional[Dict[str, Any]]]] = {}
+        self._odd: Dict[int, Tuple[Optional[str], Optional[str]]] = {}  # (timestamp, input_hash)
+
+    def __len__(self) -> int:
+        return len(self._routing)
+
+    def append(self, result: Union[TriageOutput, CompactTriageOutput]) -> None:
+        if isinstance(result, CompactTriageOutput):
+            if result.rubric is not self.rubric and result.rubric.digest != self.rubric.digest:
+                raise ValueError("result belongs to a different rubric")
+            self.append_fields(result.fields())
+        else:
+            self.append_fields(encode(result, self.rubric))
+
+    def extend(self, results: Any) -> None:
+        for result in results:
+            self.append(result)
+
+    def append_fields(self, fields: tuple) -> None:
+        """Append one encode() tuple (what compact pool workers send back)"""
+        (routing_id, confidence, next_step_id, timestamp, input_hash,
+         flags, question_ids, guardrail_ids, similar_cases, trace) = fields
+        index = len(self._routing)
+
+        odd_timestamp = odd_hash = None
+        if isinstance(timestamp, str):
+            odd_timestamp, timestamp = timestamp, 0
+        try:
+            packed = bytes.fromhex(input_hash)
+        except ValueError:
+            packed = b''
+        if len(packed) != 8:
+            odd_hash, packed = input_hash, bytes(8)
+        if odd_timestamp is not None or odd_hash is not None:
+            self._odd[index] = (odd_timestamp, odd_hash)
+        if similar_cases or trace is not None:
+            self._extras[index] = (similar_cases, trace)
+
+        for flag_id, keyword_ids, spans in flags:
+            self._flag_ids.append(flag_id)
+            self._keyword_ids.extend(keyword_ids)
+            self._keyword_end.append(len(self._keyword_ids))
+            self._spans.extend(spans)
+            self._span_end.append(len(self._spans))
+        self._question_ids.extend(question_ids)
+        self._guardrail_ids.extend(guardrail_ids)
+
+        self._routing.append(routing_id)
+        self._next_step.append(next_step_id)
+        self._confidence.append(confidence)
+        self._timestamp.append(timestamp)
+        self._hash += packed
+        self._flag_end.append(len(self._flag_ids))
+        self._question_end.append(len(self._question_ids))
+        self._guardrail_end.append(len(self._guardrail_ids))
+
+    def __getitem__(self, index: int) -> CompactTriageOutput:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('ResultBatch index out of range')
+
+        flag_start = self._flag_end[index - 1] if index else 0
+        flags = []
+        for f in range(flag_start, self._flag_end[index]):
+            keyword_start = self._keyword_end[f - 1] if f else 0
+            span_start = self._span_end[f - 1] if f else 0
+            flags.append((
+                self._flag_ids[f],
+                tuple(self._keyword_ids[keyword_start:self._keyword_end[f]]),
+                tuple(self._spans[span_start:self._span_end[f]]),
+            ))
+        question_start = self._question_end[index - 1] if index else 0
+        guardrail_start = self._guardrail_end[index - 1] if index else 0
+
+        timestamp: Union[int, str] = self._timestamp[index]
+        input_hash = self._hash[index * 8:index * 8 + 8].hex()
+        odd_timestamp, odd_hash = self._odd.get(index, (None, None))
+        similar_cases, trace = self._extras.get(index, (None, None))
+        return CompactTriageOutput(
+            self.rubric,
+            self._routing[index],
+            self._confidence[index],
+            self._next_step[index],
+            odd_timestamp if odd_timestamp is not None else timestamp,
+            odd_hash if odd_hash is not None else input_hash,
+            tuple(flags),
+            tuple(self._question_ids[question_start:self._question_end[index]]),
+            tuple(self._guardrail_ids[guardrail_start:self._guardrail_end[index]]),
+            similar_cases,
+            trace,
+        )
+
+    def __iter__(self) -> Iterator[CompactTriageOutput]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def outputs(self) -> Iterator[TriageOutput]:
+        """Full TriageOutput per item, resolved one at a time"""
+        for item in self:
+            yield item.to_output()
+
+    def routing_counts(self) -> Dict[str, int]:
+        routings = self.rubric.result_tables().routings
+        counts = {routing: self._routing.count(i) for i, routing in enumerate(routings)}
+        return {routing: count for routing, count in counts.items() if count}
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the array columns (the dict extras not included)"""
+        columns = (
+            self._routing, self._next_step, self._confidence, self._timestamp, self._hash,
+            self._flag_end, self._flag_ids, self._keyword_end, self._keyword_ids,
+            self._span_end, self._spans, self._question_end, self._question_ids,
+            self._guardrail_end, self._guardrail_ids,
+        )
+        return sum(
+            len(column) * (column.itemsize if isinstance(column, array) else 1)
+            for column in columns
+        )
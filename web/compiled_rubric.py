@@ -0,0 +1,405 @@
+"""
+Compiled Rubric - rubric.yaml을 로드 시점에 한 번만 전처리
+키워드 정규화, 질문 트리거, 가드레일 조건 디스패치 테이블을 미리 계산
+red flag 키워드, trigger_if_contains, 가드레일 용어를 하나의 오토마톤으로 묶어
+설명문 TextIndex를 한 번만 스캔
+"""
+
+from bisect import bisect_right
+from itertools import accumulate
+from typing import (
+    Any, Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple,
+)
+
+try:  # imported as part of the ``web`` package (python -m web.triage_engine)
+    from .keyword_matcher import KeywordAutomaton
+    from .text_index import TextIndex, compact_keyword
+except ImportError:  # imported from web/ directly (streamlit run, tests)
+    from keyword_matcher import KeywordAutomaton
+    from text_index import TextIndex, compact_keyword
+
+
+# Guardrail predicate: (input_data, found_terms, flag_codes) -> include?
+GuardrailPredicate = Callable[[Any, FrozenSet[str], FrozenSet[str]], bool]
+
+Span = Tuple[int, int]
+Exclusions = Tuple[List[int], List[int]]  # sorted starts, running max of ends
+
+# question_templates[].category -> TriageInput field
+CATEGORY_FIELDS = {
+    'exposure': 'exposure',
+    'data_usage': 'data_usage',
+    'revenue_model': 'revenue_model',
+    'external_communication': 'external_communication',
+    'cross_border': 'cross_border',
+}
+
+MEDICAL_AD_FLAG_CODES = frozenset([
+    'PROCEDURE_MENTION', 'MEDICAL_CLAIM', 'EFFECT_GUARANTEE',
+    'NO_SIDE_EFFECT_DISCLOSURE', 'EXAGGERATED_MEDICAL_CLAIM',
+])
+
+# Description terms the guardrail predicates look for
+MARKETING_TERMS = ('마케팅', '광고', 'marketing')
+USER_CONTENT_TERMS = ('ugc', '사용자 생성', '댓글', '리뷰')
+TERMS_UPDATE_TERMS = ('약관', '정책 변경', 'terms')
+GUARDRAIL_TERMS = MARKETING_TERMS + USER_CONTENT_TERMS + TERMS_UPDATE_TERMS
+
+# Matching rules (lengths are of the compacted keyword):
+# - short keywords must not straddle a folded separator, so "가장" does not
+#   match "이 가 장점" once spaces are removed
+# - short ASCII words must sit on word boundaries, so "only" does not match
+#   "commonly" (a trailing plural "s" is still accepted)
+SHORT_KEYWORD_LEN = 2
+WORD_KEYWORD_LEN = 4
+
+
+def _pattern_rule(pattern: str) -> Tuple[bool, bool]:
+    """(no_straddle, word_boundary) for one compacted pattern"""
+    return (
+        len(pattern) <= SHORT_KEYWORD_LEN,
+        len(pattern) <= WORD_KEYWORD_LEN and pattern.isascii() and pattern.isalnum(),
+    )
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+
+def _on_word_boundary(text: str, start: int, end: int) -> bool:
+    if start > 0 and _is_word_char(text[start - 1]):
+        return False
+    if end < len(text) and _is_word_char(text[end]):
+        if text[end] != 's':
+            return False
+        return end + 1 == len(text) or not _is_word_char(text[end + 1])
+    return True
+
+
+def match_allowed(
+    index: TextIndex, pattern: str, start: int, end: int
+) -> Optional[Span]:
+    """Normalized span of a compact-text occurrence, or None if a rule rejects it"""
+    no_straddle, word_boundary = _pattern_rule(pattern)
+    span_start, span_end = index.normalized_span(start, end)
+    if no_straddle and span_end - span_start != end - start:
+        return None
+    if word_boundary and not _on_word_boundary(index.normalized, span_start, span_end):
+        return None
+    return span_start, span_end
+
+
+def _contains_any(found_terms: FrozenSet[str], terms: Tuple[str, ...]) -> bool:
+    return not found_terms.isdisjoint(terms)
+
+
+def _flag_predicate(code: str) -> GuardrailPredicate:
+    """Guardrail that fires when a single red flag code was detected"""
+    return lambda input_data, found_terms, flag_codes: code in flag_codes
+
+
+def _data_collection(input_data, found_terms, flag_codes):
+    return (
+        input_data.data_usage in ('collects', 'unclear') or
+        'PII_COLLECTION' in flag_codes
+    )
+
+
+def _marketing(input_data, found_terms, flag_codes):
+    return (
+        _contains_any(found_terms, MARKETING_TERMS) or
+        'EXAGGERATED_AD' in flag_codes or
+        'CELEBRITY_MEDICAL_ENDORSEMENT' in flag_codes
+    )
+
+
+def _user_content(input_data, found_terms, flag_codes):
+    return (
+        _contains_any(found_terms, USER_CONTENT_TERMS) or
+        'USER_CONTENT_LIABILITY' in flag_codes
+    )
+
+
+def _terms_update(input_data, found_terms, flag_codes):
+    return _contains_any(found_terms, TERMS_UPDATE_TERMS)
+
+
+def _refund(input_data, found_terms, flag_codes):
+    return (
+        input_data.revenue_model in ('paid_once', 'subscription') or
+        'PAYMENT_HANDLING' in flag_codes
+    )
+
+
+def _medical_ad(input_data, found_terms, flag_codes):
+    return not MEDICAL_AD_FLAG_CODES.isdisjoint(flag_codes)
+
+
+# safe_guardrails[].condition -> predicate
+GUARDRAIL_PREDICATES: Dict[str, GuardrailPredicate] = {
+    'data_collection': _data_collection,
+    'marketing': _marketing,
+    'user_content': _user_content,
+    'terms_update': _terms_update,
+    'refund': _refund,
+    # Medical ad specific guardrails
+    'medical_ad_general': _medical_ad,
+    'individual_variance': _medical_ad,
+    'side_effect_disclosure': _medical_ad,
+    'medical_consultation_required': _medical_ad,
+    'before_after_restriction': _flag_predicate('BEFORE_AFTER_PHOTO'),
+    'review_restriction': _flag_predicate('PATIENT_TESTIMONIAL'),
+    'price_event_restriction': _flag_predicate('PRICE_DISCOUNT_EVENT'),
+    'gift_restriction': _flag_predicate('GIFT_INCENTIVE'),
+    'superlative_removal': _flag_predicate('COMPARATIVE_SUPERIORITY'),
+    'guarantee_removal': _flag_predicate('EFFECT_GUARANTEE'),
+    'endorsement_disclosure': _flag_predicate('CELEBRITY_MEDICAL_ENDORSEMENT'),
+    'ugc_monitoring': _flag_predicate('USER_CONTENT_LIABILITY'),
+    'review_incentive_prohibition': _flag_predicate('REVIEW_MANIPULATION'),
+}
+
+
+def validate_rubric(data: Any) -> Dict[str, Any]:
+    """Validate parsed rubric.yaml (same checks as src/rubric-loader.ts)"""
+    if not isinstance(data, dict):
+        raise ValueError('Invalid rubric: not a mapping')
+
+    if not data.get('version') or not isinstance(data['version'], str):
+        raise ValueError('Invalid rubric: missing version')
+
+    for section in ('red_flags', 'question_templates', 'safe_guardrails'):
+        if not isinstance(data.get(section), list):
+            raise ValueError(f'Invalid rubric: {section} must be an array')
+
+    if not isinstance(data.get('routing_policy'), dict):
+        raise ValueError('Invalid rubric: missing routing_policy')
+
+    for index, flag in enumerate(data['red_flags']):
+        if not isinstance(flag, dict) or not all(
+            flag.get(key) for key in ('code', 'keywords', 'reason', 'severity')
+        ) or not isinstance(flag['keywords'], list):
+            raise ValueError(f'Invalid red_flag at index {index}')
+        if not isinstance(flag.get('exclude_phrases', []), list):
+            raise ValueError(f'Invalid red_flag at index {index}')
+
+    for index, template in enumerate(data['question_templates']):
+        if not isinstance(template, dict) or not all(
+            template.get(key) for key in ('category', 'question', 'options')
+        ):
+            raise ValueError(f'Invalid question_template at index {index}')
+
+    for index, guardrail in enumerate(data['safe_guardrails']):
+        if not isinstance(guardrail, dict) or not all(
+            guardrail.get(key) for key in ('condition', 'text')
+        ):
+            raise ValueError(f'Invalid guardrail at index {index}')
+
+    return data
+
+
+class CompiledRedFlag(NamedTuple):
+    code: str
+    reason: str
+    severity: str
+    keywords: Tuple[Tuple[str, int], ...]  # (original keyword, automaton id)
+    exclude_ids: Tuple[int, ...]  # exclude_phrases whose span cancels a keyword hit
+
+
+class CompiledQuestion(NamedTuple):
+    question: str
+    unknown_field: Optional[str]  # TriageInput field checked by trigger_if_unknown
+    trigger_ids: Tuple[int, ...]  # automaton ids of trigger_if_contains
+
+
+class CompiledGuardrail(NamedTuple):
+    condition: str
+    text: str
+    predicate: Optional[GuardrailPredicate]
+
+
+class ResultTables(NamedTuple):
+    """Reverse lookups from result strings to positions in the compiled rubric"""
+    routings: Tuple[str, ...]  # 'TYPE_1', 'TYPE_2', then any other routing_policy values
+    flag_ids: Dict[str, Tuple[int, ...]]  # code -> indices into red_flags (codes may repeat)
+    keyword_ids: Tuple[Dict[str, int], ...]  # per flag: keyword -> index into its keywords
+    question_ids: Dict[str, int]  # question text -> index into questions
+    guardrail_ids: Dict[str, int]  # guardrail text -> index into guardrails
+
+
+class KeywordHits:
+    """Accepted occurrences of every pattern in one description
+
+    Spans are [start, end) in ``index.normalized``; use
+    ``index.original_span`` to map them back to the caller's text.
+    """
+
+    __slots__ = ('index', 'spans')
+
+    def __init__(self, index: TextIndex, spans: Dict[int, List[Span]]):
+        self.index = index
+        self.spans = spans
+
+    def __contains__(self, pattern_id: int) -> bool:
+        return pattern_id in self.spans
+
+    def exclusions(self, pattern_ids: Iterable[int]) -> Optional[Exclusions]:
+        """Spans of the given (exclude phrase) patterns, prepared for outside()"""
+        excluded = sorted(
+            span for pattern_id in pattern_ids for span in self.spans.get(pattern_id, ())
+        )
+        if not excluded:
+            return None
+        starts = [start for start, _ in excluded]
+        reach = list(accumulate((end for _, end in excluded), max))
+        return starts, reach
+
+    def outside(self, pattern_id: int, excluded: Optional[Exclusions]) -> List[Span]:
+        """Spans of pattern_id not contained in any excluded span"""
+        spans = self.spans.get(pattern_id, [])
+        if excluded is None or not spans:
+            return spans
+        starts, reach = excluded
+        kept = []
+        for start, end in spans:
+            # Among excluded spans starting at or before start, the furthest end
+            i = bisect_right(starts, start)
+            if not i or reach[i - 1] < end:
+                kept.append((start, end))
+        return kept
+
+
+class CompiledRubric:
+    """Rubric preprocessed once at load time so triage() only does lookups"""
+
+    def __init__(
+        self,
+        rubric: Dict[str, Any],
+        digest: str = '',
+        automaton: Optional[KeywordAutomaton] = None,
+    ):
+        self.rubric = rubric
+        self.digest = digest  # SHA-256 of the rubric file content
+        self.version = str(rubric.get('version', ''))
+
+        # A prebuilt automaton (from a rubric snapshot) is only looked up
+        if automaton is None:
+            self.automaton = KeywordAutomaton()
+            add_pattern = self.automaton.add
+        else:
+            self.automaton = automaton
+            add_pattern = automaton.pattern_id
+
+        def keyword_id(keyword: str) -> int:
+            return add_pattern(compact_keyword(keyword))
+
+        self.red_flags: List[CompiledRedFlag] = [
+            CompiledRedFlag(
+                code=flag['code'],
+                reason=flag['reason'],
+                severity=flag['severity'],
+                keywords=tuple(
+                    (keyword, keyword_id(keyword))
+                    for keyword in flag.get('keywords', [])
+                ),
+                exclude_ids=tuple(
+                    keyword_id(phrase) for phrase in flag.get('exclude_phrases') or []
+                ),
+            )
+            for flag in rubric.get('red_flags', [])
+        ]
+
+        self.questions: List[CompiledQuestion] = [
+            CompiledQuestion(
+                question=template['question'],
+                unknown_field=(
+                    CATEGORY_FIELDS.get(template.get('category'))
+                    if template.get('trigger_if_unknown') else None
+                ),
+                trigger_ids=tuple(
+                    keyword_id(keyword)
+                    for keyword in template.get('trigger_if_contains') or []
+                ),
+            )
+            for template in rubric.get('question_templates', [])
+        ]
+
+        self.guardrail_term_ids: Dict[str, int] = {
+            term: keyword_id(term) for term in GUARDRAIL_TERMS
+        }
+        if automaton is None:
+            self.automaton.build()
+
+        # Pattern-id lookups one triage makes against the scan hits (at most)
+        self.keyword_checks = (
+            sum(len(flag.keywords) for flag in self.red_flags) +
+            sum(len(template.trigger_ids) for template in self.questions) +
+            len(self.guardrail_term_ids)
+        )
+
+        self.guardrails: List[CompiledGuardrail] = [
+            CompiledGuardrail(
+                condition=guardrail.get('condition', ''),
+                text=guardrail['text'],
+                predicate=GUARDRAIL_PREDICATES.get(guardrail.get('condition', '')),
+            )
+            for guardrail in rubric.get('safe_guardrails', [])
+        ]
+
+        policy = rubric.get('routing_policy', {})
+        self.default_routing = policy.get('default', 'TYPE_1')
+        self.confidence_threshold = policy.get('confidence_threshold', 0.7)
+        self.missing_info_action = policy.get('missing_info_action', 'TYPE_1')
+        self._result_tables: Optional[ResultTables] = None
+
+    def result_tables(self) -> ResultTables:
+        """Interned id tables for compact results (built on first use)"""
+        tables = self._result_tables
+        if tables is None:
+            routings = ['TYPE_1', 'TYPE_2']
+            for routing in (self.default_routing, self.missing_info_action):
+                if routing not in routings:
+                    routings.append(routing)
+            flag_ids: Dict[str, Tuple[int, ...]] = {}
+            for index, flag in enumerate(self.red_flags):
+                flag_ids[flag.code] = flag_ids.get(flag.code, ()) + (index,)
+            # Duplicate texts map to one index; either resolves to the same string
+            tables = self._result_tables = ResultTables(
+                routings=tuple(routings),
+                flag_ids=flag_ids,
+                keyword_ids=tuple(
+                    {keyword: index for index, (keyword, _) in enumerate(flag.keywords)}
+                    for flag in self.red_flags
+                ),
+                question_ids={
+                    template.question: index for index, template in enumerate(self.questions)
+                },
+                guardrail_ids={
+                    guardrail.text: index for index, guardrail in enumerate(self.guardrails)
+                },
+            )
+        return tables
+
+    def scan(self, text: str) -> KeywordHits:
+        """Index text once and collect every accepted pattern occurrence"""
+        index = TextIndex(text)
+        return self.accept(index, self.automaton.iter_matches(index.compact))
+
+    def accept(
+        self, index: TextIndex, occurrences: Iterable[Tuple[int, int]]
+    ) -> KeywordHits:
+        """Apply the matching rules to raw (end, pattern_id) compact-text occurrences"""
+        patterns = self.automaton.patterns
+        spans: Dict[int, List[Span]] = {}
+
+        for end, pattern_id in occurrences:
+            pattern = patterns[pattern_id]
+            span = match_allowed(index, pattern, end - len(pattern), end)
+            if span is not None:
+                spans.setdefault(pattern_id, []).append(span)
+
+        return KeywordHits(index, spans)
+
+    def found_guardrail_terms(self, hits: KeywordHits) -> FrozenSet[str]:
+        return frozenset(
+            term for term, term_id in self.guardrail_term_ids.items() if term_id in hits
+        )
@@ -0,0 +1,364 @@
+"""
+Document Triage - 긴 문서(캠페인 브리프, PDF 추출 텍스트, 발표 자료) 청크 단위 트리아지
+텍스트를 겹치는 청크로 나눠 하나의 키워드 오토마톤에 흘려 보내고, 결과를 섹션별로 묶어
+섹션·원문 오프셋과 함께 반환
+
+청크 경계(최장 키워드 길이 + 경계 규칙 문맥만큼 겹침)에 걸친 키워드도 빠짐없이 한 번만 집계되어
+flag·질문·가드레일·라우팅은 같은 텍스트의 TriageEngine.triage()와 동일합니다.
+``routing_only=True``이면 critical flag가 확정되어 라우팅이 정해지는 즉시 스캔을 멈춥니다.
+
+Usage:
+    python -m web.triage_engine document brief.txt [--routing-only] [-e public]
+"""
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+try:  # imported as part of the ``web`` package (python -m web.triage_engine)
+    from .compiled_rubric import KeywordHits, Span, match_allowed
+    from .incremental import CONTEXT_AFTER
+    from .text_index import TextIndex, cluster_start
+    from .triage_engine import DetectedRedFlag, TriageEngine, TriageInput, TriageOutput
+except ImportError:  # imported from web/ directly (streamlit run, tests)
+    from compiled_rubric import KeywordHits, Span, match_allowed
+    from incremental import CONTEXT_AFTER
+    from text_index import TextIndex, cluster_start
+    from triage_engine import DetectedRedFlag, TriageEngine, TriageInput, TriageOutput
+
+DEFAULT_CHUNK_CHARS = 64 * 1024
+MIN_CHUNK_CHARS = 1024
+
+# Section starts: markdown headings, 제N장/조 style articles, slide/page markers
+_HEADING = re.compile(
+    r'^[ \t\f]*('
+    r'#{1,6}[ \t]+\S[^\n]*'
+    r'|제[ \t]*\d+[ \t]*[편장절조][^\n]*'
+    r'|(?:slide|page|슬라이드|페이지)[ \t]*\d+\b[^\n]*'
+    r')$',
+    re.MULTILINE | re.IGNORECASE,
+)
+_PAGE_BREAK = '\f'  # pdftotext separates pages with form feeds
+
+
+@dataclass
+class DocumentSection:
+    index: int
+    title: str  # heading line, 'page N' after a form feed, '' before the first heading
+    start: int  # [start, end) character offsets into the document
+    end: int
+    red_flags: List[DetectedRedFlag]  # the document's flags, restricted to this section
+
+
+@dataclass
+class DocumentResult:
+    output: TriageOutput
+    sections: List[DocumentSection]
+    chunks: int
+    scanned_chars: int
+    stopped_early: bool  # routing_only scan ended at a confirmed critical flag
+
+
+class _DocumentIndex:
+    """The part of TextIndex the triage steps read, for a text never indexed whole"""
+
+    __slots__ = ('_original', '_compact_parts')
+
+    def __init__(self, original: Dict[Span, Span], compact_parts: Optional[List[str]]):
+        self._original = original
+        self._compact_parts = compact_parts
+
+    def original_span(self, start: int, end: int) -> Span:
+        return self._original[(start, end)]
+
+    @property
+    def compact(self) -> str:  # precedent search only
+        return ''.join(self._compact_parts or ())
+
+
+class DocumentScanner:
+    """Feed a long text piece by piece; scan it window by window
+
+    Each window is normalized and run through the rubric automaton on its
+    own. Consecutive windows overlap by the longest pattern plus one
+    character of boundary context, and a window only keeps ("owns")
+    occurrences ending in its new part, at least CONTEXT_AFTER compact
+    characters before its end, so every occurrence is judged once, with
+    the same context as in a whole-text scan. Spans are kept in whole-text
+    normalized offsets, so exclusions and flags work unchanged.
+    """
+
+    def __init__(
+        self,
+        engine: TriageEngine,
+        chunk_chars: int = DEFAULT_CHUNK_CHARS,
+        routing_only: bool = False,
+    ):
+        import hashlib
+
+        self.engine = engine
+        self.compiled = engine.compiled
+        self.chunk_chars = max(chunk_chars, MIN_CHUNK_CHARS)
+        self.routing_only = routing_only
+        self.chunks = 0
+        self.scanned_chars = 0
+        self.stopped_early = False
+
+        self._max_pattern = max(map(len, self.compiled.automaton.patterns), default=0)
+        self._hash = hashlib.sha256()
+        self._length = 0
+        self._buffer = ''  # text from the current window start on
+        self._window_start = 0  # document offset of _buffer[0]
+        self._new_start = 0  # _buffer offset of the text no window has scanned yet
+        self._own_from = 0  # compact chars at the window start owned by the previous one
+        self._norm_base = 0  # document normalized / compact offsets of _buffer[0]
+        self._compact_base = 0
+        self._reach = 1  # chunk multiplier, grown while a window has too little content
+
+        self._spans: Dict[int, List[Span]] = {}
+        self._original: Dict[Span, Span] = {}
+        self._compact_starts: Dict[Span, int] = {}
+        self._compact_parts: Optional[List[str]] = [] if engine.precedents is not None else None
+        self._sections: List[Tuple[int, str]] = []  # (start, title)
+        self._lines_from = 0  # document offset of the first line not yet searched for headings
+        self._pages = 1
+
+    def feed(self, text: str) -> None:
+        self._hash.update(text.encode())
+        self._length += len(text)
+        if self.stopped_early:
+            return  # only hashed, so input_hash still covers the whole document
+        self._buffer += text
+        while (
+            not self.stopped_early and
+            len(self._buffer) - self._new_start >= self.chunk_chars * self._reach and
+            self._scan_window(final=False)
+        ):
+            pass
+
+    def finish(self, input_data: TriageInput) -> DocumentResult:
+        """Triage the fed text; input_data supplies the optional fields
+
+        ``input_data.description`` is not read, so it may be left empty
+        when the text was streamed in.
+        """
+        if not self.stopped_early:
+            self._scan_window(final=True)
+        hits = KeywordHits(_DocumentIndex(self._original, self._compact_parts), self._spans)
+        output = self.engine._triage(
+            input_data, self.compiled, hits, input_hash=self._hash.hexdigest()[:16]
+        )
+        if self.engine.audit_log is not None:
+            self.engine.audit_log.log(output)
+        return DocumentResult(
+            output=output,
+            sections=self._attribute(output.red_flags),
+            chunks=self.chunks,
+            scanned_chars=self.scanned_chars,
+            stopped_early=self.stopped_early,
+        )
+
+    def _scan_window(self, final: bool) -> bool:
+        buffer = self._buffer
+        new_start = self._new_start
+        if final:
+            cut = len(buffer)
+        else:
+            # End the window at a line break (else a space) past half a chunk
+            limit = new_start + self.chunk_chars * self._reach
+            lower = new_start + self.chunk_chars * self._reach // 2
+            cut = buffer.rfind('\n', lower, limit) + 1 or buffer.rfind(' ', lower, limit) + 1
+            cut = cluster_start(buffer, cut or limit)
+
+        window = TextIndex(buffer[:cut])
+        compact = window.compact
+        own_from = self._own_from
+        own_to = len(compact) if final else len(compact) - CONTEXT_AFTER
+        if not final and own_to - own_from <= self._max_pattern:
+            self._reach *= 2  # mostly separators: wait for a longer window
+            return False
+        self._reach = 1
+
+        compiled = self.compiled
+        patterns = compiled.automaton.patterns
+        norm_base = self._norm_base
+        window_start = self._window_start
+        for end, pattern_id in compiled.automaton.iter_matches(compact):
+            if end <= own_from or end > own_to:
+                continue
+            pattern = patterns[pattern_id]
+            span = match_allowed(window, pattern, end - len(pattern), end)
+            if span is None:
+                continue
+            key = (span[0] + norm_base, span[1] + norm_base)
+            self._spans.setdefault(pattern_id, []).append(key)
+            start, stop = window.original_span(*span)
+            self._original[key] = (start + window_start, stop + window_start)
+            self._compact_starts[key] = end - len(pattern) + self._compact_base
+        if self._compact_parts is not None:
+            self._compact_parts.append(compact[own_from:own_to])
+        self._find_sections(buffer, cut, final)
+        self.chunks += 1
+        self.scanned_chars = window_start + cut
+
+        if final:
+            self._buffer = ''
+            self._new_start = 0
+            return True
+
+        # Next window starts one char before the earliest unowned occurrence could
+        s = max(own_to - self._max_pattern, 0)
+        next_start = window.original_span(*window.normalized_span(s, s + 1))[0]
+        norm_offset = window.normalized_offset(next_start)
+        compact_offset = window.compact_offset(norm_offset)
+        self._buffer = buffer[next_start:]
+        self._window_start += next_start
+        self._new_start = cut - next_start
+        self._norm_base += norm_offset
+        self._compact_base += compact_offset
+        self._own_from = own_to - compact_offset
+
+        if self.routing_only and self._critical_confirmed():
+            self.stopped_early = True
+            self._buffer = ''
+        return True
+
+    def _critical_confirmed(self) -> bool:
+        """A critical flag is detected and no later text can exclude its hit
+
+        An exclude phrase containing a hit starts at or before it and is at
+        most the longest pattern long, so once the owned text reaches that
+        far past the hit's start, the hit stands.
+        """
+        hits = KeywordHits(None, self._spans)
+        owned_end = self._compact_base + self._own_from
+        reach = self._max_pattern
+        for flag in self.compiled.red_flags:
+            if flag.severity != 'critical':
+                continue
+            excluded = hits.exclusions(flag.exclude_ids) if flag.exclude_ids else None
+            for _, keyword_id in flag.keywords:
+                for span in hits.outside(keyword_id, excluded):
+                    if not flag.exclude_ids or self._compact_starts[span] + reach <= owned_end:
+                        return True
+        return False
+
+    def _find_sections(self, buffer: str, cut: int, final: bool) -> None:
+        """Record headings and page breaks on the complete lines of buffer[:cut]"""
+        lo = self._lines_from - self._window_start
+        if lo < 0:  # the rest of an over-long line left the buffer: skip it
+            lo = buffer.find('\n', 0, cut) + 1 or cut
+        hi = cut if final else buffer.rfind('\n', lo, cut) + 1 or lo
+        self._lines_from = self._window_start + hi
+        text, offset = buffer[lo:hi], self._window_start + lo
+
+        found = [(match.start(1), match.group(1).strip()) for match in _HEADING.finditer(text)]
+        position = text.find(_PAGE_BREAK)
+        while position != -1:
+            self._pages += 1
+            found.append((position + 1, f'page {self._pages}'))
+            position = text.find(_PAGE_BREAK, position + 1)
+        found.sort()
+        for i, (start, title) in enumerate(found):
+            # A page break right before a heading adds no section of its own
+            if (title.startswith('page ') and i + 1 < len(found) and
+                    not text[start:found[i + 1][0]].strip()):
+                continue
+            self._sections.append((start + offset, title))
+
+    def _attribute(self, red_flags: List[DetectedRedFlag]) -> List[DocumentSection]:
+        sections = self._sections
+        if not sections or sections[0][0] > 0:
+            sections = [(0, '')] + sections
+        starts = [start for start, _ in sections]
+
+        per_section: List[List[DetectedRedFlag]] = [[] for _ in sections]
+        for flag in red_flags:
+            grouped: Dict[int, List[Any]] = {}
+            for span in flag.matched_spans:
+                grouped.setdefault(bisect_right(starts, span[0]) - 1, []).append(span)
+            for index, spans in grouped.items():
+                keywords = {keyword for _, _, keyword in spans}
+                per_section[index].append(DetectedRedFlag(
+                    code=flag.code,
+                    reason=flag.reason,
+                    matched_keywords=[k for k in flag.matched_keywords if k in keywords],
+                    severity=flag.severity,
+                    matched_spans=spans,
+                ))
+
+        ends = starts[1:] + [self._length]
+        return [
+            DocumentSection(index, title, start, end, flags)
+            for index, ((start, title), end, flags) in enumerate(zip(sections, ends, per_section))
+        ]
+
+
+def triage_document(
+    engine: TriageEngine,
+    input_data: TriageInput,
+    chunk_chars: int = DEFAULT_CHUNK_CHARS,
+    routing_only: bool = False,
+) -> DocumentResult:
+    """Document-mode triage of input_data.description"""
+    scanner = DocumentScanner(engine, chunk_chars, routing_only)
+    text = input_data.description
+    for start in range(0, len(text), scanner.chunk_chars):
+        scanner.feed(text[start:start + scanner.chunk_chars])
+    return scanner.finish(input_data)
+
+
+def triage_document_file(
+    engine: TriageEngine,
+    path: str,
+    chunk_chars: int = DEFAULT_CHUNK_CHARS,
+    routing_only: bool = False,
+    **fields: Optional[str],
+) -> DocumentResult:
+    """Document-mode triage of a UTF-8 text file, read chunk by chunk
+
+    ``fields`` are the optional TriageInput fields (exposure, ...).
+    """
+    scanner = DocumentScanner(engine, chunk_chars, routing_only)
+    with open(path, encoding='utf-8', errors='replace', newline='') as f:
+        while True:
+            piece = f.read(scanner.chunk_chars)
+            if not piece:
+                break
+            scanner.feed(piece)
+    return scanner.finish(TriageInput(description='', **fields))
+
+
+def result_to_dict(result: DocumentResult) -> Dict[str, Any]:
+    """output_to_dict() payload plus a ``document`` block with the sections"""
+    try:  # imported as part of the ``web`` package
+        from .triage_engine import output_to_dict
+    except ImportError:
+        from triage_engine import output_to_dict
+
+    payload = output_to_dict(result.output)
+    payload['document'] = {
+        'chunks': result.chunks,
+        'scanned_chars': result.scanned_chars,
+        'stopped_early': result.stopped_early,
+        'sections': [
+            {
+                'index': section.index,
+                'title': section.title,
+                'start': section.start,
+                'end': section.end,
+                'red_flags': [
+                    {
+                        'code': flag.code,
+                        'severity': flag.severity,
+                        'matched_keywords': flag.matched_keywords,
+                        'matched_spans': [list(span) for span in flag.matched_spans],
+                    }
+                    for flag in section.red_flags
+                ],
+            }
+            for section in result.sections
+        ],
+    }
+    return payload
@@ -0,0 +1,164 @@
+"""
+Incremental Triage - 편집 세션 단위 증분 재트리아지
+이전 스캔 결과를 세션에 보관하고, 바뀐 구간(+최장 키워드 길이 창)만 다시 스캔
+
+출력은 전체 재실행(TriageEngine.triage)과 동일 (timestamp 제외)
+"""
+
+from operator import itemgetter
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+try:  # imported as part of the ``web`` package (python -m web.triage_engine)
+    from .compiled_rubric import CompiledRubric, KeywordHits, Span, match_allowed
+    from .text_index import IndexEdit, TextIndex
+    from .triage_engine import TriageEngine, TriageInput, TriageOutput
+except ImportError:  # imported from web/ directly (streamlit run, tests)
+    from compiled_rubric import CompiledRubric, KeywordHits, Span, match_allowed
+    from text_index import IndexEdit, TextIndex
+    from triage_engine import TriageEngine, TriageInput, TriageOutput
+
+if TYPE_CHECKING:
+    from metrics import StageTrace
+
+# (end, pattern_id) in compact text as iter_matches yields it, plus the
+# occurrence's normalized span and whether the matching rules accepted it
+Occurrence = Tuple[int, int, int, int, bool]
+
+# Normalized chars around a span that match_allowed looks at (word boundary
+# before, plural "s" + boundary after)
+CONTEXT_BEFORE = 1
+CONTEXT_AFTER = 2
+
+
+class IncrementalSession:
+    """Per-editor triage state that re-scans only what changed
+
+    Raw automaton occurrences over the compact text are kept between
+    calls together with their accepted/rejected verdict. On an edit:
+
+    - occurrences entirely inside the unchanged compact prefix or suffix
+      are reused (suffix ones shifted); only a window around the changed
+      region, widened by the longest pattern, goes through the automaton
+    - a reused verdict stands when the occurrence and its boundary context
+      lie in the unchanged *normalized* prefix/suffix; otherwise it is
+      re-checked, since spacing edits flip the rules without changing the
+      compact text
+
+    Flags, questions and guardrails are then rebuilt from the spans,
+    which is cheap. A rubric swap resets the session. Otherwise a call
+    behaves like ``engine.triage()``: result cache, metrics, audit log
+    and submission store all apply (a cache hit skips the scan).
+    """
+
+    def __init__(self, engine: TriageEngine):
+        self.engine = engine
+        self.rescanned_chars = 0  # compact chars scanned by the last call
+        self._compiled: Optional[CompiledRubric] = None
+        self._max_pattern = 0
+        self._index: Optional[TextIndex] = None
+        self._occurrences: List[Occurrence] = []
+
+    def reset(self) -> None:
+        self._compiled = None
+        self._index = None
+        self._occurrences = []
+
+    def triage(self, input_data: TriageInput) -> TriageOutput:
+        return self.engine._triage_with(input_data, self._triage)
+
+    def _triage(
+        self,
+        input_data: TriageInput,
+        compiled: CompiledRubric,
+        trace: Optional['StageTrace'] = None,
+    ) -> TriageOutput:
+        """TriageEngine._triage over the occurrences updated for this edit"""
+        if compiled is not self._compiled:
+            self.reset()
+            self._compiled = compiled
+            self._max_pattern = max(map(len, compiled.automaton.patterns), default=0)
+
+        previous = self._index
+        if previous is None:
+            index, edit = TextIndex(input_data.description), None
+        else:
+            index, edit = TextIndex.after_edit(previous, input_data.description)
+        self._occurrences = self._update(compiled, index, edit)
+        self._index = index
+
+        spans: Dict[int, List[Span]] = {}
+        for _, pattern_id, span_start, span_end, accepted in self._occurrences:
+            if accepted:
+                spans.setdefault(pattern_id, []).append((span_start, span_end))
+        hits = KeywordHits(index, spans)
+        if trace is not None:
+            trace.mark('scan')
+        return self.engine._triage(input_data, compiled, hits, trace=trace)
+
+    def _update(
+        self, compiled: CompiledRubric, index: TextIndex, edit: Optional[IndexEdit]
+    ) -> List[Occurrence]:
+        patterns = compiled.automaton.patterns
+        compact = index.compact
+
+        def check(end: int, pattern_id: int) -> Occurrence:
+            pattern = patterns[pattern_id]
+            start = end - len(pattern)
+            span_start, span_end = index.normalized_span(start, end)
+            accepted = match_allowed(index, pattern, start, end) is not None
+            return end, pattern_id, span_start, span_end, accepted
+
+        if edit is None:
+            self.rescanned_chars = len(compact)
+            return [check(end, pattern_id) for end, pattern_id in
+                    compiled.automaton.iter_matches(compact)]
+        previous = self._index
+        if previous.normalized == index.normalized:
+            self.rescanned_chars = 0
+            return self._occurrences
+
+        prefix, suffix = edit.compact_prefix, edit.compact_suffix
+        old_suffix_start = len(previous.compact) - suffix
+        new_suffix_start = len(compact) - suffix
+        shift = len(compact) - len(previous.compact)
+
+        norm_prefix = edit.normalized_prefix
+        old_norm_suffix_start = len(previous.normalized) - edit.normalized_suffix
+        norm_shift = len(index.normalized) - len(previous.normalized)
+
+        kept_prefix = []
+        kept_suffix = []
+        for occurrence in self._occurrences:
+            end, pattern_id, span_start, span_end, _ = occurrence
+            if end <= prefix:
+                if span_end + CONTEXT_AFTER <= norm_prefix:
+                    kept_prefix.append(occurrence)
+                else:
+                    kept_prefix.append(check(end, pattern_id))
+            elif end - len(patterns[pattern_id]) >= old_suffix_start:
+                if span_start - CONTEXT_BEFORE >= old_norm_suffix_start:
+                    kept_suffix.append((
+                        end + shift, pattern_id,
+                        span_start + norm_shift, span_end + norm_shift, occurrence[4],
+                    ))
+                else:
+                    kept_suffix.append(check(end + shift, pattern_id))
+
+        # Any occurrence touching the changed region starts no earlier than
+        # prefix - (longest - 1) and ends no later than suffix start + (longest - 1)
+        reach = max(self._max_pattern - 1, 0)
+        window_start = max(prefix - reach, 0)
+        window_end = min(new_suffix_start + reach, len(compact))
+        self.rescanned_chars = window_end - window_start
+
+        rescanned = []
+        for end, pattern_id in compiled.automaton.iter_matches(compact[window_start:window_end]):
+            end += window_start
+            if end <= prefix or end - len(patterns[pattern_id]) >= new_suffix_start:
+                continue  # already kept from the previous scan
+            rescanned.append(check(end, pattern_id))
+
+        # Order by end like a full scan, so per-pattern span lists match it
+        occurrences = kept_prefix + rescanned + kept_suffix
+        occurrences.sort(key=itemgetter(0))
+        return occurrences
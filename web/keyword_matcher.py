@@ -0,0 +1,182 @@
+"""
+Keyword Matcher - Aho-Corasick multi-pattern automaton
+rubric 키워드 전체를 하나의 오토마톤으로 컴파일하여 설명문을 한 번만 스캔
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over (already lowered) keywords"""
+
+    def __init__(self, patterns: Iterable[str] = ()):
+        self.patterns: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._own: Optional[List[List[int]]] = [[]]  # ids of patterns ending at each state
+        self._out: List[List[int]] = [[]]  # _own plus the outputs along failure links
+        self._alphabet: Set[str] = set()
+        self._empty_ids: List[int] = []
+        self._built = False
+
+        for pattern in patterns:
+            self.add(pattern)
+        self.build()
+
+    def add(self, pattern: str) -> int:
+        """Register a pattern and return its id (duplicates share one id)"""
+        if pattern in self._ids:
+            return self._ids[pattern]
+
+        own = self._own_outputs()
+        pattern_id = len(self.patterns)
+        self.patterns.append(pattern)
+        self._ids[pattern] = pattern_id
+        self._built = False
+
+        # '' in text is always True - mirror str.__contains__
+        if not pattern:
+            self._empty_ids.append(pattern_id)
+            return pattern_id
+
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                own.append([])
+                self._out.append([])
+                self._goto[state][ch] = next_state
+            state = next_state
+        own[state].append(pattern_id)
+        self._alphabet.update(pattern)
+        return pattern_id
+
+    def to_tables(self) -> Dict[str, Any]:
+        """Built automaton as plain containers (marshal/pickle friendly)"""
+        if not self._built:
+            self.build()
+        return {
+            'patterns': self.patterns,
+            'goto': self._goto,
+            'fail': self._fail,
+            'out': self._out,
+            'alphabet': self._alphabet,
+            'empty_ids': self._empty_ids,
+        }
+
+    @classmethod
+    def from_tables(cls, tables: Dict[str, Any]) -> 'KeywordAutomaton':
+        """Restore an automaton saved with to_tables() without rebuilding it"""
+        automaton = cls.__new__(cls)
+        automaton.patterns = list(tables['patterns'])
+        automaton._ids = {p: i for i, p in enumerate(automaton.patterns)}
+        automaton._goto = tables['goto']
+        automaton._fail = tables['fail']
+        automaton._out = tables['out']
+        automaton._own = None  # derived from the patterns if add() is ever called
+        automaton._alphabet = set(tables['alphabet'])
+        automaton._empty_ids = list(tables['empty_ids'])
+        automaton._built = True
+        return automaton
+
+    def pattern_id(self, pattern: str) -> int:
+        """Look up the id of a registered pattern"""
+        return self._ids[pattern]
+
+    def _own_outputs(self) -> List[List[int]]:
+        """Per-state ids of the patterns ending there (before any merging)"""
+        if self._own is None:
+            own: List[List[int]] = [[] for _ in self._goto]
+            for pattern_id, pattern in enumerate(self.patterns):
+                if not pattern:
+                    continue
+                state = 0
+                for ch in pattern:
+                    state = self._goto[state][ch]
+                own[state].append(pattern_id)
+            self._own = own
+        return self._own
+
+    def build(self) -> None:
+        """Compute failure links (BFS) and merge outputs along them
+
+        Starts over from each state's own patterns, so building again
+        after add() does not merge the previous build's outputs twice.
+        """
+        self._fail = [0] * len(self._goto)
+        self._out = [list(ids) for ids in self._own_outputs()]
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+        self._built = True
+
+    def search(self, text: str) -> Set[int]:
+        """Return ids of all patterns occurring in text (single pass)"""
+        if not self._built:
+            self.build()
+
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        alphabet = self._alphabet
+
+        found: Set[int] = set(self._empty_ids)
+        state = 0
+        for ch in text:
+            if ch not in alphabet:
+                state = 0
+                continue
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+
+        return found
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (end, pattern_id) for every occurrence; end is exclusive
+
+        Empty patterns have no position and are never yielded.
+        """
+        if not self._built:
+            self.build()
+
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        alphabet = self._alphabet
+
+        state = 0
+        for index, ch in enumerate(text):
+            if ch not in alphabet:
+                state = 0
+                continue
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                end = index + 1
+                for pattern_id in out[state]:
+                    yield end, pattern_id
+
+    def __len__(self) -> int:
+        return len(self.patterns)
@@ -0,0 +1,393 @@
+"""
+Metrics - triage 단계별 계측 (Python)
+단계별 소요 시간, 키워드 비교/매칭 수, 캐시 적중을 카운터·히스토그램 레지스트리에 기록
+
+``TriageEngine(metrics=TriageMetrics())``로 켜면 각 결과에 호출별 trace가 붙고, 레지스트리는
+Prometheus text 형식으로 내보냅니다. 끄면(기본값) triage()는 계측 코드를 거치지 않습니다.
+``profile_every=N``이면 N번째 요청마다 cProfile(또는 pyinstrument)로 프로파일을 남깁니다.
+
+Usage:
+    python -m web.triage_engine --metrics serve      # GET /metrics
+    python -m web.triage_engine --metrics --profile-every 1000 --profile-dir prof batch in.jsonl
+"""
+
+import os
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from triage_engine import TriageEngine, TriageInput, TriageOutput, TriageStep
+
+# Seconds; triage stages run from microseconds (routing) to tens of ms (long scans)
+DEFAULT_BUCKETS = (
+    0.00001, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0,
+)
+
+# Stages marked by TriageEngine, in pipeline order
+STAGES = (
+    'cache_lookup', 'rubric', 'hash', 'scan', 'red_flags', 'questions', 'guardrails', 'routing',
+    'precedents', 'cache_store', 'decode',
+)
+
+PROFILERS = ('cprofile', 'pyinstrument')
+
+Labels = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Labels, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if value == int(value) else repr(value)
+
+
+class Counter:
+    """Monotonic counter, optionally split by label values"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, labels: Labels = ()) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}'
+            for labels, value in items
+        ]
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics), optionally labeled"""
+
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum]
+        self._values: Dict[Labels, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def count(self, labels: Labels = ()) -> int:
+        state = self._values.get(labels)
+        return sum(state[0]) if state is not None else 0
+
+    def sum(self, labels: Labels = ()) -> float:
+        state = self._values.get(labels)
+        return state[1] if state is not None else 0.0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(
+                (labels, (list(counts), total)) for labels, (counts, total) in self._values.items()
+            )
+        lines = []
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float('inf') else f'le="{bound!r}"'
+                lines.append(
+                    f'{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}'
+                )
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f'{self.name}_sum{label_text} {_format_value(total)}')
+            lines.append(f'{self.name}_count{label_text} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+    """Named counters and histograms, exported in Prometheus text format"""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, help_text, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram, name, help_text, labelnames, buckets)
+
+    def _register(self, cls: type, name: str, *args: Any) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def get(self, name: str) -> Any:
+        return self._metrics[name]
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            lines.append(f'# HELP {name} {metric.help}')
+            lines.append(f'# TYPE {name} {metric.kind}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+class StageTrace:
+    """Per-call stage timings, filled in by TriageEngine as it goes"""
+
+    __slots__ = ('stages', 'cache', 'keyword_hits', 'keyword_checks', '_last')
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, float] = {}  # stage -> seconds
+        self.cache = 'off'  # 'off' | 'hit' | 'miss'
+        self.keyword_hits = 0  # accepted automaton matches
+        self.keyword_checks = 0  # keyword/trigger lookups against those matches
+        self._last = perf_counter()
+
+    def mark(self, stage: str) -> None:
+        """Attribute the time since the previous mark to stage"""
+        now = perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self._last
+        self._last = now
+
+
+class TriageMetrics:
+    """Instrumentation for TriageEngine.triage: registry, traces and sampled profiles
+
+    Every call records its stage timings, keyword counts and cache outcome
+    in ``registry`` and, with ``attach_trace``, on ``TriageOutput.trace``.
+    Outputs triaged in worker processes carry their trace back, and the
+    parent feeds it to ``record_trace`` so one registry covers the pool.
+
+    With ``profile_every`` > 0, every Nth call runs under ``profiler``;
+    the profile is written to ``profile_dir`` (``.prof`` for cProfile,
+    ``.html`` for pyinstrument) and/or handed to ``on_profile``.
+    """
+
+    def __init__(
+        self,
+        registry: Optional[MetricsRegistry] = None,
+        attach_trace: bool = True,
+        profile_every: int = 0,
+        profiler: str = 'cprofile',
+        profile_dir: Optional[str] = None,
+        on_profile: Optional[Callable[[Any, 'TriageOutput'], None]] = None,
+    ):
+        if profiler not in PROFILERS:
+            raise ValueError(f"profiler must be one of {PROFILERS}, got {profiler!r}")
+        if profile_every and profiler == 'pyinstrument':
+            import importlib.util
+
+            if importlib.util.find_spec('pyinstrument') is None:
+                raise ValueError("profiler 'pyinstrument' needs `pip install pyinstrument`")
+
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.attach_trace = attach_trace
+        self.profile_every = profile_every
+        self.profiler = profiler
+        self.profile_dir = profile_dir
+        self.on_profile = on_profile
+        self.profile_paths: List[str] = []  # written by this process, oldest first
+
+        self._calls = 0
+        self._calls_lock = threading.Lock()
+
+        registry = self.registry
+        self.requests = registry.counter(
+            'legal_triage_requests_total', 'Triage calls by routing', ('routing',)
+        )
+        self.seconds = registry.histogram(
+            'legal_triage_seconds', 'End-to-end triage() wall time in seconds'
+        )
+        self.stage_seconds = registry.histogram(
+            'legal_triage_stage_seconds', 'Wall time per triage stage in seconds', ('stage',)
+        )
+        self.cache_lookups = registry.counter(
+            'legal_triage_cache_lookups_total', 'Result cache lookups by outcome', ('result',)
+        )
+        self.keyword_hits = registry.counter(
+            'legal_triage_keyword_hits_total', 'Accepted rubric keyword occurrences'
+        )
+        self.keyword_checks = registry.counter(
+            'legal_triage_keyword_checks_total',
+            'Keyword and trigger lookups made against the matches',
+        )
+        self.profiles = registry.counter(
+            'legal_triage_profiles_total', 'Sampled calls captured by the profiler'
+        )
+
+    def options(self) -> Dict[str, Any]:
+        """Constructor arguments that rebuild this configuration in a worker process"""
+        return {
+            'attach_trace': True,  # the parent records from the trace
+            'profile_every': self.profile_every,
+            'profiler': self.profiler,
+            'profile_dir': self.profile_dir,
+        }
+
+    def run(
+        self,
+        engine: 'TriageEngine',
+        input_data: 'TriageInput',
+        triage: Optional['TriageStep'] = None,
+    ) -> 'TriageOutput':
+        """engine._triage_cached with tracing (and profiling when sampled)"""
+        profiler = None
+        if self.profile_every:
+            with self._calls_lock:
+                self._calls += 1
+                sampled = self._calls % self.profile_every == 0
+            if sampled:
+                profiler = self._start_profiler()
+
+        trace = StageTrace()
+        start = trace._last
+        try:
+            result = engine._triage_cached(input_data, trace, triage)
+        finally:
+            total = perf_counter() - start
+            if profiler is not None:
+                profiler.stop() if self.profiler == 'pyinstrument' else profiler.disable()
+
+        payload = self.trace_dict(trace, total)
+        if profiler is not None:
+            payload['profile'] = self._save_profile(profiler, result)
+        self.record_trace(payload, result.routing)
+        if self.attach_trace:
+            result.trace = payload
+        return result
+
+    @staticmethod
+    def trace_dict(trace: StageTrace, total: float) -> Dict[str, Any]:
+        return {
+            'total': total,
+            'stages': dict(trace.stages),
+            'cache': trace.cache,
+            'keyword_hits': trace.keyword_hits,
+            'keyword_checks': trace.keyword_checks,
+        }
+
+    def record_trace(self, trace: Dict[str, Any], routing: str) -> None:
+        """Add one call's trace (local or from a worker process) to the registry"""
+        self.requests.inc(labels=(routing,))
+        self.seconds.observe(trace['total'])
+        for stage, seconds in trace['stages'].items():
+            self.stage_seconds.observe(seconds, (stage,))
+        if trace['cache'] != 'off':
+            self.cache_lookups.inc(labels=(trace['cache'],))
+        if trace['keyword_hits']:
+            self.keyword_hits.inc(trace['keyword_hits'])
+        if trace['keyword_checks']:
+            self.keyword_checks.inc(trace['keyword_checks'])
+        if trace.get('profile') is not None:
+            self.profiles.inc()
+
+    def render(self) -> str:
+        return self.registry.render()
+
+    def summary_lines(self) -> List[str]:
+        """Mean wall time per stage, for CLI runs (stderr)"""
+        calls = self.seconds.count()
+        if not calls:
+            return ['metrics: no triage calls']
+        lines = [f"metrics: {calls} calls, mean {self.seconds.sum() / calls * 1e3:.3f} ms"]
+        for stage in STAGES:
+            count = self.stage_seconds.count((stage,))
+            if count:
+                mean_us = self.stage_seconds.sum((stage,)) / count * 1e6
+                lines.append(f"  {stage:<13} {mean_us:>10.1f} us  ({count} calls)")
+        hits = self.cache_lookups.value(('hit',))
+        lookups = hits + self.cache_lookups.value(('miss',))
+        if lookups:
+            lines.append(f"  cache hits   {int(hits)}/{int(lookups)}")
+        lines.append(
+            f"  keywords     {int(self.keyword_hits.value())} hits, "
+            f"{int(self.keyword_checks.value())} checks"
+        )
+        if self.profile_paths:
+            lines.append(f"  profiles     {len(self.profile_paths)} in {self.profile_dir}")
+        elif self.profiles.value():
+            lines.append(f"  profiles     {int(self.profiles.value())}")
+        return lines
+
+    # ----------------------------------------------------------
+    # Sampled profiling
+    # ----------------------------------------------------------
+
+    def _start_profiler(self) -> Any:
+        if self.profiler == 'pyinstrument':
+            from pyinstrument import Profiler
+
+            profiler = Profiler()
+            profiler.start()
+            return profiler
+
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def _save_profile(self, profiler: Any, result: 'TriageOutput') -> Optional[str]:
+        path = None
+        if self.profile_dir is not None:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            stem = f"triage-{os.getpid()}-{self._calls}-{result.input_hash or 'unknown'}"
+            if self.profiler == 'pyinstrument':
+                path = os.path.join(self.profile_dir, f'{stem}.html')
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(profiler.output_html())
+            else:
+                path = os.path.join(self.profile_dir, f'{stem}.prof')
+                profiler.dump_stats(path)
+            self.profile_paths.append(path)
+        if self.on_profile is not None:
+            self.on_profile(profiler, result)
+        return path if path is not None else ''
@@ -0,0 +1,321 @@
+"""
+N-gram Index - 정규화 텍스트(TextIndex.compact)의 문자 bigram 역색인
+키워드/부분 문자열을 포함할 수 있는 문서만 빠르게 추려 내는 후보 검색용 (최종 판정은 호출 측 스캔)
+
+한글은 음절 하나가 곧 문자이므로 2-gram이면 두 글자 키워드까지 정확히 걸러지고, 한 글자 키워드는
+그 글자로 시작하는 bigram 키 범위로 찾습니다 (문서 끝 글자는 종료 표시와 짝지어 색인).
+색인은 mmap으로 여는 불변 세그먼트 파일들이며, 추가된 문서는 flush()할 때 새 세그먼트가 됩니다.
+
+Usage:
+    index = NgramIndex('corpus.ngrams')
+    index.add([TextIndex(text).compact for text in texts]); index.flush()
+    docs = index.lookup(['전후사진', '피'])  # 후보 문서 번호 (오름차순)
+"""
+
+import json
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+INDEX_FORMAT = 1
+MAX_SEGMENTS = 8
+
+_CHAR_BITS = 21  # every code point fits
+_SEGMENT_MAGIC = b'NGX1'
+_SEGMENT_HEADER = struct.Struct('<4sIII')  # magic, distinct grams, postings, first doc
+
+
+def gram_keys(compact: str) -> array:
+    """Sorted distinct bigram keys of a compact text, last char paired with 0"""
+    codes = list(map(ord, compact))
+    if not codes:
+        return array('Q')
+    shifted = [code << _CHAR_BITS for code in codes]
+    keys = set(map(int.__or__, shifted, codes[1:]))
+    keys.add(shifted[-1])
+    return array('Q', sorted(keys))
+
+
+def pattern_keys(pattern: str) -> List[int]:
+    """Bigram keys every compact text containing pattern (len >= 2) has"""
+    codes = list(map(ord, pattern))
+    return sorted({a << _CHAR_BITS | b for a, b in zip(codes, codes[1:])})
+
+
+def _write_postings(path: str, first_doc: int, postings: Dict[int, array]) -> None:
+    """Sorted gram keys, offsets into the doc id postings, postings"""
+    keys = array('Q', sorted(postings))
+    offsets = array('I', [0])
+    docs = array('I')
+    for key in keys:
+        docs.extend(postings[key])
+        offsets.append(len(docs))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_SEGMENT_HEADER.pack(_SEGMENT_MAGIC, len(keys), len(docs), first_doc))
+        for column in (keys, offsets, docs):
+            column.tofile(f)
+    os.replace(tmp_path, path)
+
+
+class Segment:
+    """Read-only view of a segment file (zero-copy memoryviews over mmap)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        magic, n_keys, n_postings, self.first_doc = _SEGMENT_HEADER.unpack_from(view)
+        if magic != _SEGMENT_MAGIC:
+            raise ValueError(f"not an n-gram segment: {path}")
+
+        position = _SEGMENT_HEADER.size
+        self.keys = view[position:position + 8 * n_keys].cast('Q')
+        position += 8 * n_keys
+        self.offsets = view[position:position + 4 * (n_keys + 1)].cast('I')
+        position += 4 * (n_keys + 1)
+        self.docs = view[position:position + 4 * n_postings].cast('I')
+
+    def postings(self, key: int) -> memoryview:
+        i = bisect_left(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            return self.docs[0:0]
+        return self.docs[self.offsets[i]:self.offsets[i + 1]]
+
+    def key_range(self, low: int, high: int) -> Iterable[memoryview]:
+        """Postings of every key in [low, high)"""
+        for i in range(bisect_left(self.keys, low), bisect_left(self.keys, high)):
+            yield self.docs[self.offsets[i]:self.offsets[i + 1]]
+
+
+class _Pending:
+    """Docs added since the last flush, searchable like a segment"""
+
+    def __init__(self, first_doc: int):
+        self.first_doc = first_doc
+        self.count = 0
+        self.postings: Dict[int, array] = {}
+        self._keys: Optional[List[int]] = None
+
+    def add(self, keys: array) -> None:
+        doc = self.first_doc + self.count
+        self.count += 1
+        for key in keys:
+            posting = self.postings.get(key)
+            if posting is None:
+                posting = self.postings[key] = array('I')
+                self._keys = None
+            posting.append(doc)
+
+    def postings_of(self, key: int) -> Sequence[int]:
+        return self.postings.get(key, ())
+
+    def key_range(self, low: int, high: int) -> Iterable[Sequence[int]]:
+        if self._keys is None:
+            self._keys = sorted(self.postings)
+        keys = self._keys
+        for i in range(bisect_left(keys, low), bisect_left(keys, high)):
+            yield self.postings[keys[i]]
+
+
+class NgramIndex:
+    """Candidate documents for substring queries over compact texts
+
+    Documents are numbered 0, 1, ... in the order they are added. A query
+    returns every document that could contain the pattern (all of its
+    bigrams occur), so callers confirm hits with their own matcher.
+
+    Layout of ``index_dir``: ``meta.json`` (version, document count,
+    segment names) and ``seg-NNNNN.bin`` segments covering consecutive
+    document ranges, merged into one when there are more than
+    MAX_SEGMENTS.
+    """
+
+    def __init__(self, index_dir: str):
+        self.index_dir = index_dir
+        self.version = -1
+        self.segments: List[Segment] = []
+        self._stored = 0
+        self._pending = _Pending(0)
+        self.reload()
+
+    def __len__(self) -> int:
+        return self._stored + self._pending.count
+
+    def add(self, compacts: Iterable[str]) -> range:
+        """Index compact texts (in memory until flush); returns their doc ids"""
+        first = len(self)
+        for compact in compacts:
+            self._pending.add(gram_keys(compact))
+        return range(first, len(self))
+
+    def add_grams(self, docs_grams: Iterable[array]) -> range:
+        """add() for gram_keys() computed elsewhere (e.g. in worker processes)"""
+        first = len(self)
+        for keys in docs_grams:
+            self._pending.add(keys)
+        return range(first, len(self))
+
+    def flush(self) -> None:
+        """Write pending documents as a new segment
+
+        Tail segments are then merged while the one before the last is no
+        larger than the last (a binary counter over flush batches), so
+        each document is rewritten O(log n) times and a corpus of n
+        batches keeps O(log n) segments.
+        """
+        pending = self._pending
+        if not pending.count:
+            return
+        os.makedirs(self.index_dir, exist_ok=True)
+        meta = self._read_meta()
+        name = f"seg-{meta['version'] + 1:05d}.bin"
+        _write_postings(os.path.join(self.index_dir, name), pending.first_doc, pending.postings)
+        meta.update(
+            version=meta['version'] + 1,
+            docs=pending.first_doc + pending.count,
+            segments=meta['segments'] + [name],
+        )
+        self._write_meta(meta)
+        self.segments.append(Segment(os.path.join(self.index_dir, name)))
+        self.version = meta['version']
+        self._stored = meta['docs']
+        self._pending = _Pending(self._stored)
+
+        sizes = self._segment_sizes()
+        start = len(sizes) - 1
+        while start > 0 and sizes[start - 1] <= sum(sizes[start:]):
+            start -= 1
+        if len(sizes) - start > 1:
+            self.merge(start)
+        if len(self.segments) > MAX_SEGMENTS:
+            self.merge()
+
+    def merge(self, start: int = 0) -> None:
+        """Merge segments[start:] into one"""
+        merged = self.segments[start:]
+        if len(merged) < 2:
+            return
+        postings: Dict[int, array] = {}
+        for segment in merged:  # consecutive doc ranges: postings stay sorted
+            offsets, docs = segment.offsets, segment.docs
+            for i, key in enumerate(segment.keys):
+                posting = postings.get(key)
+                if posting is None:
+                    posting = postings[key] = array('I')
+                posting.extend(docs[offsets[i]:offsets[i + 1]])
+
+        meta = self._read_meta()
+        name = f"seg-{meta['version'] + 1:05d}.bin"
+        _write_postings(os.path.join(self.index_dir, name), merged[0].first_doc, postings)
+        old_segments = meta['segments'][start:]
+        meta.update(version=meta['version'] + 1, segments=meta['segments'][:start] + [name])
+        self._write_meta(meta)
+        self.segments[start:] = [Segment(os.path.join(self.index_dir, name))]
+        self.version = meta['version']
+        for old in old_segments:  # still mapped by open readers: fine on POSIX
+            try:
+                os.remove(os.path.join(self.index_dir, old))
+            except OSError:
+                pass
+
+    def reload(self) -> bool:
+        """Reopen the segments if another process flushed or merged; True if it did
+
+        Pending (unflushed) documents of this instance are dropped, so only
+        read-only instances should reload.
+        """
+        for _ in range(3):  # a merge may delete a segment between meta read and open
+            meta = self._read_meta()
+            if meta['version'] == self.version:
+                return False
+            try:
+                segments = [
+                    Segment(os.path.join(self.index_dir, name)) for name in meta['segments']
+                ]
+            except FileNotFoundError:
+                continue
+            self.segments = segments
+            self.version = meta['version']
+            self._stored = meta['docs']
+            self._pending = _Pending(self._stored)
+            return True
+        return False
+
+    def _segment_sizes(self) -> List[int]:
+        starts = [segment.first_doc for segment in self.segments] + [self._stored]
+        return [end - start for start, end in zip(starts, starts[1:])]
+
+    def clear(self) -> None:
+        """Drop every document and segment file"""
+        meta = self._read_meta()
+        for name in meta['segments']:
+            try:
+                os.remove(os.path.join(self.index_dir, name))
+            except FileNotFoundError:
+                pass
+        if os.path.isdir(self.index_dir):
+            meta.update(version=meta['version'] + 1, docs=0, segments=[])
+            self._write_meta(meta)
+        self.segments = []
+        self._stored = 0
+        self._pending = _Pending(0)
+
+    # ----------------------------------------------------------
+    # Query
+    # ----------------------------------------------------------
+
+    def candidates(self, pattern: str) -> List[int]:
+        """Sorted ids of documents that may contain pattern (a compact keyword)"""
+        if not pattern:
+            return list(range(len(self)))
+        found: List[int] = []
+        for part in (*self.segments, self._pending):
+            if len(pattern) == 1:
+                low = ord(pattern) << _CHAR_BITS
+                docs = set()
+                for posting in part.key_range(low, low + (1 << _CHAR_BITS)):
+                    docs.update(posting)
+            else:
+                get = part.postings if isinstance(part, Segment) else part.postings_of
+                lists = sorted((get(key) for key in pattern_keys(pattern)), key=len)
+                docs = set(lists[0])
+                for posting in lists[1:]:
+                    if not docs:
+                        break
+                    docs.intersection_update(posting)
+            found.extend(sorted(docs))
+        return found
+
+    def lookup(self, patterns: Iterable[str]) -> List[int]:
+        """Sorted ids of documents that may contain any of the patterns"""
+        docs = set()
+        for pattern in set(patterns):
+            docs.update(self.candidates(pattern))
+        return sorted(docs)
+
+    # ----------------------------------------------------------
+    # Storage
+    # ----------------------------------------------------------
+
+    def _read_meta(self) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self.index_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            meta = None
+        if meta is None or meta.get('format') != INDEX_FORMAT:
+            return {'format': INDEX_FORMAT, 'version': 0, 'docs': 0, 'segments': []}
+        return meta
+
+    def _write_meta(self, meta: Dict[str, Any]) -> None:
+        path = os.path.join(self.index_dir, 'meta.json')
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,151 @@
+"""
+Streaming Triage Pipeline - JSONL in, JSONL out with bounded memory
+레코드를 한 줄씩 읽어 트리아지하고 즉시 기록 (체크포인트로 중단 지점부터 재개)
+"""
+
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+
+try:  # imported as part of the ``web`` package (python -m web.triage_engine)
+    from .triage_engine import TriageEngine, input_from_dict, output_to_dict
+except ImportError:  # imported from web/ directly (streamlit run, tests)
+    from triage_engine import TriageEngine, input_from_dict, output_to_dict
+
+
+# (line number, byte offset just past the line, payload)
+Position = Tuple[int, int, Dict[str, Any]]
+
+
+@dataclass
+class StreamCheckpoint:
+    line: int = 0  # input lines consumed
+    input_offset: int = 0  # input bytes consumed
+    output_offset: int = 0  # output bytes written
+
+    def save(self, path: str) -> None:
+        """Write checkpoint atomically (tmp file + rename)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(asdict(self), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'StreamCheckpoint':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(**json.load(f))
+
+
+def read_records(
+    stream: BinaryIO, start_line: int = 0, start_offset: int = 0
+) -> Iterator[Position]:
+    """Lazily yield JSON records from a binary JSONL stream
+
+    Blank lines are skipped; malformed lines are reported on stderr and
+    skipped so one bad export row does not stop a multi-gigabyte run.
+    """
+    line_no = start_line
+    offset = start_offset
+
+    for raw in stream:
+        line_no += 1
+        offset += len(raw)
+        if not raw.strip():
+            continue
+        try:
+            record = json.loads(raw)
+        except ValueError as error:
+            print(f"line {line_no}: invalid JSON ({error})", file=sys.stderr)
+            continue
+        yield line_no, offset, record
+
+
+def triage_records(engine: TriageEngine, records: Iterator[Position]) -> Iterator[Position]:
+    """Triage each record and yield the serialized TriageOutput"""
+    for line_no, offset, record in records:
+        try:
+            input_data = input_from_dict(record)
+        except (ValueError, TypeError) as error:
+            print(f"line {line_no}: {error}", file=sys.stderr)
+            continue
+
+        payload = output_to_dict(engine.triage(input_data))
+        if 'request_id' in record:
+            payload = {'request_id': record['request_id'], **payload}
+        yield line_no, offset, payload
+
+
+def run_stream(
+    engine: TriageEngine,
+    input_path: str = '-',
+    output_path: str = '-',
+    checkpoint_path: Optional[str] = None,
+    checkpoint_every: int = 1000,
+    resume: bool = False,
+    start_line: int = 0,
+    start_offset: int = 0,
+) -> int:
+    """Stream input_path through the engine into output_path
+
+    With ``resume`` the run restarts from ``checkpoint_path``: the input is
+    re-positioned (seek for files, line skip for stdin) and the output file
+    is truncated to the last checkpointed record so nothing is duplicated.
+    Without it the output is rewritten; ``start_line`` alone skips that
+    many input lines, ``start_offset`` seeks (``start_line`` then only
+    numbers the lines). Returns the number of records written.
+    """
+    checkpoint = StreamCheckpoint(line=start_line, input_offset=start_offset)
+    resumed = False
+    if resume and checkpoint_path and os.path.exists(checkpoint_path):
+        checkpoint = StreamCheckpoint.load(checkpoint_path)
+        resumed = True
+
+    src = sys.stdin.buffer if input_path == '-' else open(input_path, 'rb')
+    try:
+        if not checkpoint.input_offset:
+            # --start-line alone: skip lines whatever the input (the offset is unknown)
+            for _ in range(checkpoint.line):
+                checkpoint.input_offset += len(src.readline())
+        elif src.seekable():
+            src.seek(checkpoint.input_offset)
+        else:
+            for _ in range(checkpoint.line):
+                src.readline()
+
+        if output_path == '-':
+            dst = sys.stdout.buffer
+        elif resumed:
+            dst = open(output_path, 'ab')
+            dst.truncate(checkpoint.output_offset)
+            dst.seek(checkpoint.output_offset)
+        else:
+            dst = open(output_path, 'wb')
+
+        try:
+            written = 0
+            records = read_records(src, checkpoint.line, checkpoint.input_offset)
+            for line_no, offset, payload in triage_records(engine, records):
+                dst.write(json.dumps(payload, ensure_ascii=False).encode('utf-8') + b'\n')
+                written += 1
+                checkpoint.line = line_no
+                checkpoint.input_offset = offset
+
+                if checkpoint_path and written % checkpoint_every == 0:
+                    dst.flush()
+                    checkpoint.output_offset = dst.tell() if dst.seekable() else 0
+                    checkpoint.save(checkpoint_path)
+
+            dst.flush()
+            if checkpoint_path:
+                checkpoint.output_offset = dst.tell() if dst.seekable() else 0
+                checkpoint.save(checkpoint_path)
+        finally:
+            if dst is not sys.stdout.buffer:
+                dst.close()
+    finally:
+        if src is not sys.stdin.buffer:
+            src.close()
+
+    return written
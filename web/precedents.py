@@ -0,0 +1,511 @@
+"""
+Precedent Index - 과거 법무 케이스 유사도 검색
+data/cases/*/case.yaml + request.md를 문자 n-gram TF-IDF 벡터로 색인, 새 입력과 비슷한 케이스 top-k
+
+색인은 mmap으로 여는 바이너리 세그먼트(역색인)들과 케이스 메타데이터로 구성됩니다.
+케이스가 추가/변경되면 해당 케이스만 새 세그먼트로 추가하고, 세그먼트가 많아지면 병합합니다.
+
+Usage:
+    python -m web.triage_engine index-cases [--cases-dir data/cases] [--full]
+"""
+
+import heapq
+import json
+import math
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+try:  # imported as part of the ``web`` package (python -m web.triage_engine)
+    from .case_ingest import DEFAULT_CASES_DIR, case_dirs, parallel_map
+    from .text_index import TextIndex
+except ImportError:  # imported from web/ directly (streamlit run, tests)
+    from case_ingest import DEFAULT_CASES_DIR, case_dirs, parallel_map
+    from text_index import TextIndex
+
+DEFAULT_INDEX_DIR = os.path.join(DEFAULT_CASES_DIR, '.precedents')
+
+INDEX_FORMAT = 1
+GRAM_SIZES = (2, 3)  # characters of the compact text (Hangul syllables)
+FEATURE_BITS = 20
+DOC_FEATURES = 128  # strongest features kept per case
+QUERY_FEATURES = 64  # strongest features looked up per query
+CHAMPIONS = 512  # highest-weighted postings read per query feature and segment
+RESCORE_FACTOR = 8  # candidates rescored exactly per requested result
+RESCORE_MIN = 32
+MAX_SEGMENTS = 8
+
+_SEGMENT_MAGIC = b'PRX1'
+_SEGMENT_HEADER = struct.Struct('<4sIII')  # magic, distinct features, postings, cases
+
+Features = List[Tuple[int, float]]  # (feature id, weight) sorted by feature id
+
+
+class CaseDocument(NamedTuple):
+    """One case as indexed: metadata shown to reviewers plus the searched text"""
+    case_id: str
+    path: str  # folder name under the cases directory
+    title: str
+    date: str
+    decision: str  # legal's routing decision
+    rule_codes: List[str]
+    text: str
+    signature: List[int]  # mtime_ns/size of the files text was read from
+
+
+def gram_counts(compact: str) -> Counter:
+    """Hashed character n-gram counts of TextIndex.compact text
+
+    Grams are hashed with crc32 over UTF-16 slices, so features are stable
+    across processes (unlike hash()) and never need a vocabulary.
+    """
+    data = compact.encode('utf-16-le')
+    crc32 = zlib.crc32
+    mask = ((1 << FEATURE_BITS) - 1).__and__
+    counts: Counter = Counter()
+    for size in GRAM_SIZES:
+        width = 2 * size
+        counts.update(map(mask, map(crc32, [
+            data[i:i + width] for i in range(0, len(data) - width + 1, 2)
+        ])))
+    return counts
+
+
+def weigh(counts: Counter, df: Sequence[int], n_docs: int, limit: int) -> Features:
+    """Sublinear TF-IDF of the `limit` strongest features, L2-normalized"""
+    log = math.log
+    scale = n_docs + 1
+    weighted = [
+        ((1 + log(tf)) * (log(scale / (df[feature] + 1)) + 1), feature)
+        for feature, tf in counts.items()
+    ]
+    top = heapq.nlargest(limit, weighted)
+    norm = math.sqrt(sum(weight * weight for weight, _ in top)) or 1.0
+    return sorted((feature, weight / norm) for weight, feature in top)
+
+
+def case_signature(case_dir: str) -> List[int]:
+    signature = []
+    for name in ('case.yaml', 'request.md'):
+        try:
+            st = os.stat(os.path.join(case_dir, name))
+        except FileNotFoundError:
+            signature.extend((0, 0))
+        else:
+            signature.extend((st.st_mtime_ns, st.st_size))
+    return signature
+
+
+def load_case(case_dir: str) -> Optional[CaseDocument]:
+    """Read one case folder; None when case.yaml is missing or malformed"""
+    try:  # imported as part of the ``web`` package
+        from .rubric_snapshot import parse_yaml
+    except ImportError:
+        from rubric_snapshot import parse_yaml
+
+    signature = case_signature(case_dir)
+    try:
+        with open(os.path.join(case_dir, 'case.yaml'), 'r', encoding='utf-8') as f:
+            case = parse_yaml(f.read())
+    except ImportError:
+        raise
+    except Exception:  # unreadable file, yaml.YAMLError
+        return None
+    if not isinstance(case, dict) or not case.get('case_id'):
+        return None
+
+    parts = [case.get('title'), case.get('summary')]
+    parts.extend(case.get('prohibited_expressions') or [])
+    try:
+        with open(os.path.join(case_dir, 'request.md'), 'r', encoding='utf-8') as f:
+            parts.append(f.read())
+    except OSError:
+        pass
+
+    return CaseDocument(
+        case_id=str(case['case_id']),
+        path=os.path.basename(os.path.normpath(case_dir)),
+        title=str(case.get('title') or ''),
+        date=str(case.get('date') or ''),
+        decision=str(case.get('decision') or ''),
+        rule_codes=list(case.get('rule_codes') or []),
+        text='\n'.join(str(part) for part in parts if part),
+        signature=signature,
+    )
+
+
+# ============================================================
+# Segments: immutable inverted-index files, memory-mapped
+# ============================================================
+
+def write_segment(path: str, vectors: Dict[int, Features]) -> None:
+    """Case vectors (doc -> features) stored both ways
+
+    Inverted: sorted feature keys with offsets into (doc, weight) postings,
+    each list ordered by descending weight (impact order). Forward: sorted
+    doc ids with offsets into (feature, weight) for exact rescoring.
+    """
+    postings: Dict[int, List[Tuple[float, int]]] = {}
+    doc_ids = array('I', sorted(vectors))
+    doc_offsets = array('I', [0])
+    doc_features = array('I')
+    doc_weights = array('f')
+    for doc in doc_ids:
+        for feature, weight in vectors[doc]:
+            postings.setdefault(feature, []).append((weight, doc))
+            doc_features.append(feature)
+            doc_weights.append(weight)
+        doc_offsets.append(len(doc_features))
+
+    keys = array('I', sorted(postings))
+    offsets = array('I', [0])
+    docs = array('I')
+    weights = array('f')
+    for feature in keys:
+        for weight, doc in sorted(postings[feature], reverse=True):
+            docs.append(doc)
+            weights.append(weight)
+        offsets.append(len(docs))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_SEGMENT_HEADER.pack(_SEGMENT_MAGIC, len(keys), len(docs), len(doc_ids)))
+        for column in (keys, offsets, docs, weights,
+                       doc_ids, doc_offsets, doc_features, doc_weights):
+            column.tofile(f)
+    os.replace(tmp_path, path)
+
+
+class Segment:
+    """Read-only view of a segment file (zero-copy memoryviews over mmap)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        magic, n_keys, n_postings, n_docs = _SEGMENT_HEADER.unpack_from(view)
+        if magic != _SEGMENT_MAGIC:
+            raise ValueError(f"not a precedent segment: {path}")
+
+        position = _SEGMENT_HEADER.size
+
+        def take(code: str, count: int) -> memoryview:
+            nonlocal position
+            size = 4 * count
+            column = view[position:position + size].cast(code)
+            position += size
+            return column
+
+        self.keys = take('I', n_keys)
+        self.offsets = take('I', n_keys + 1)
+        self.docs = take('I', n_postings)
+        self.weights = take('f', n_postings)
+        self.doc_ids = take('I', n_docs)
+        self.doc_offsets = take('I', n_docs + 1)
+        self.doc_features = take('I', n_postings)
+        self.doc_weights = take('f', n_postings)
+
+    def postings(self, feature: int, limit: int) -> Tuple[memoryview, memoryview]:
+        """The `limit` highest-weighted (docs, weights) of a feature"""
+        i = bisect_left(self.keys, feature)
+        if i == len(self.keys) or self.keys[i] != feature:
+            return self.docs[0:0], self.weights[0:0]
+        start = self.offsets[i]
+        end = min(self.offsets[i + 1], start + limit)
+        return self.docs[start:end], self.weights[start:end]
+
+    def vector(self, doc: int) -> Optional[Features]:
+        i = bisect_left(self.doc_ids, doc)
+        if i == len(self.doc_ids) or self.doc_ids[i] != doc:
+            return None
+        start, end = self.doc_offsets[i], self.doc_offsets[i + 1]
+        return list(zip(self.doc_features[start:end], self.doc_weights[start:end]))
+
+    def vectors(self) -> Iterable[Tuple[int, Features]]:
+        for doc in self.doc_ids:
+            yield doc, self.vector(doc)
+
+
+class _Snapshot:
+    """Everything a query reads; replaced as a whole on update"""
+
+    def __init__(
+        self,
+        version: int,
+        n_docs: int,
+        df: Sequence[int],
+        segments: List[Segment],
+        docs: Dict[int, Dict[str, Any]],
+    ):
+        self.version = version
+        self.n_docs = n_docs  # live cases (idf)
+        self.df = df
+        self.segments = segments
+        self.docs = docs  # doc id -> metadata of live cases
+
+
+class PrecedentIndex:
+    """Top-k similar past cases by cosine over character n-gram TF-IDF
+
+    Queries read only the CHAMPIONS highest-weighted postings per feature
+    (impact-ordered lists) to pick candidates, then rescore those exactly
+    from the stored case vectors, so latency stays flat as the corpus grows.
+
+    Layout of ``index_dir``:
+
+    - ``meta.json``: version, next doc id, live case count, segment names
+    - ``cases.jsonl``: one line per indexed case (doc id, metadata,
+      signature) and ``{"deleted": doc}`` tombstones for replaced cases
+    - ``df.bin``: document frequency per hashed feature
+    - ``seg-NNNNN.bin``: inverted-index segments (see write_segment)
+
+    Case vectors keep the idf they were indexed with; document frequencies
+    only grow on incremental updates (replaced cases are not subtracted),
+    and ``update(full=True)`` rebuilds everything from scratch.
+    """
+
+    def __init__(self, index_dir: str = DEFAULT_INDEX_DIR):
+        self.index_dir = index_dir
+        self._snapshot = self._open()
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    def __len__(self) -> int:
+        return len(self._snapshot.docs)
+
+    # ----------------------------------------------------------
+    # Query
+    # ----------------------------------------------------------
+
+    def search(self, text: str, k: int = 3) -> List[Tuple[float, Dict[str, Any]]]:
+        return self.search_compact(TextIndex(text).compact, k)
+
+    def search_compact(self, compact: str, k: int = 3) -> List[Tuple[float, Dict[str, Any]]]:
+        """(score, case metadata) for the k most similar cases, best first"""
+        snapshot = self._snapshot
+        if not snapshot.docs or not compact:
+            return []
+
+        query = weigh(gram_counts(compact), snapshot.df, snapshot.n_docs, QUERY_FEATURES)
+        live = snapshot.docs
+        segments = snapshot.segments
+
+        # Candidates: partial scores over each feature's champion list
+        partial: Dict[int, float] = {}
+        get = partial.get
+        for segment in segments:
+            for feature, query_weight in query:
+                docs, weights = segment.postings(feature, CHAMPIONS)
+                for doc, weight in zip(docs, weights):
+                    partial[doc] = get(doc, 0.0) + query_weight * weight
+        candidates = heapq.nlargest(
+            max(RESCORE_FACTOR * k, RESCORE_MIN),
+            (doc for doc in partial if doc in live),
+            key=partial.__getitem__,
+        )
+
+        # Exact cosine of the candidates from their stored vectors
+        query_weights = dict(query)
+        scored = []
+        for doc in candidates:
+            for segment in segments:
+                vector = segment.vector(doc)
+                if vector is not None:
+                    score = sum(query_weights.get(feature, 0.0) * weight
+                                for feature, weight in vector)
+                    scored.append((score, doc))
+                    break
+        best = heapq.nlargest(k, scored)
+        return [(round(score, 4), live[doc]) for score, doc in best]
+
+    # ----------------------------------------------------------
+    # Maintenance
+    # ----------------------------------------------------------
+
+    def update(
+        self, cases_dir: str = DEFAULT_CASES_DIR, full: bool = False, workers: Optional[int] = None
+    ) -> int:
+        """Index new and changed case folders, drop removed ones; returns cases indexed
+
+        Changed folders are read on a thread pool (file I/O and YAML parsing).
+        """
+        if full:
+            self._clear()
+        indexed = {meta['path']: (doc, meta['signature'])
+                   for doc, meta in self._snapshot.docs.items()}
+
+        found = {name: case_signature(os.path.join(cases_dir, name))
+                 for name in case_dirs(cases_dir)}
+
+        changed = [name for name, signature in found.items()
+                   if indexed.get(name, (None, None))[1] != signature]
+        deleted = [doc for name, (doc, _) in indexed.items()
+                   if name not in found or name in changed]
+        documents = [
+            document for document in parallel_map(
+                load_case, [os.path.join(cases_dir, name) for name in changed], workers
+            )
+            if document is not None
+        ]
+        if documents or deleted:
+            self.add(documents, deleted)
+        return len(documents)
+
+    def add(self, documents: Sequence[CaseDocument], deleted: Iterable[int] = ()) -> None:
+        """Index documents as one new segment and tombstone deleted doc ids"""
+        os.makedirs(self.index_dir, exist_ok=True)
+        snapshot = self._snapshot
+        meta = self._read_meta()
+        deleted = [doc for doc in deleted if doc in snapshot.docs]
+
+        counts = [gram_counts(TextIndex(document.text).compact) for document in documents]
+        df = self._read_df()
+        document_frequency: Counter = Counter()
+        for doc_counts in counts:
+            document_frequency.update(doc_counts.keys())
+        for feature, n in document_frequency.items():
+            df[feature] += n
+        n_docs = len(snapshot.docs) - len(deleted) + len(documents)
+
+        vectors: Dict[int, Features] = {}
+        lines = [json.dumps({'deleted': doc}) for doc in deleted]
+        next_doc = meta['next_doc']
+        for document, doc_counts in zip(documents, counts):
+            doc = next_doc
+            next_doc += 1
+            vectors[doc] = weigh(doc_counts, df, n_docs, DOC_FEATURES)
+            record = document._asdict()
+            del record['text']
+            record['doc'] = doc
+            lines.append(json.dumps(record, ensure_ascii=False))
+
+        segments = list(meta['segments'])
+        if vectors:
+            name = f"seg-{meta['version'] + 1:05d}.bin"
+            write_segment(os.path.join(self.index_dir, name), vectors)
+            segments.append(name)
+        self._write_df(df)
+        with open(os.path.join(self.index_dir, 'cases.jsonl'), 'a', encoding='utf-8') as f:
+            f.writelines(line + '\n' for line in lines)
+
+        meta.update(version=meta['version'] + 1, next_doc=next_doc, segments=segments)
+        self._write_meta(meta)
+        self._snapshot = self._open()
+        if len(segments) > MAX_SEGMENTS:
+            self.compact()
+
+    def compact(self) -> None:
+        """Merge all segments into one, dropping deleted cases"""
+        snapshot = self._snapshot
+        meta = self._read_meta()
+        live = snapshot.docs
+        vectors = {
+            doc: vector
+            for segment in snapshot.segments
+            for doc, vector in segment.vectors()
+            if doc in live
+        }
+
+        name = f"seg-{meta['version'] + 1:05d}.bin"
+        write_segment(os.path.join(self.index_dir, name), vectors)
+        self._rewrite_cases(live)
+        old_segments = meta['segments']
+        meta.update(version=meta['version'] + 1, segments=[name])
+        self._write_meta(meta)
+        self._snapshot = self._open()
+        for old in old_segments:  # still mapped by readers of the old snapshot: fine on POSIX
+            try:
+                os.remove(os.path.join(self.index_dir, old))
+            except OSError:
+                pass
+
+    # ----------------------------------------------------------
+    # Storage
+    # ----------------------------------------------------------
+
+    def _open(self) -> _Snapshot:
+        meta = self._read_meta()
+        docs: Dict[int, Dict[str, Any]] = {}
+        try:
+            with open(os.path.join(self.index_dir, 'cases.jsonl'), 'r', encoding='utf-8') as f:
+                for line in f:
+                    record = json.loads(line)
+                    if 'deleted' in record:
+                        docs.pop(record['deleted'], None)
+                    elif record['doc'] < meta['next_doc']:  # ignore a torn append
+                        docs[record['doc']] = record
+        except FileNotFoundError:
+            pass
+
+        df: Sequence[int] = _zero_df()
+        df_path = os.path.join(self.index_dir, 'df.bin')
+        if meta['segments'] and os.path.exists(df_path):
+            with open(df_path, 'rb') as f:
+                df = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)).cast('I')
+        segments = [Segment(os.path.join(self.index_dir, name)) for name in meta['segments']]
+        return _Snapshot(meta['version'], len(docs), df, segments, docs)
+
+    def _read_meta(self) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self.index_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            meta = None
+        if (meta is None or meta.get('format') != INDEX_FORMAT
+                or meta.get('feature_bits') != FEATURE_BITS):
+            return {'format': INDEX_FORMAT, 'feature_bits': FEATURE_BITS,
+                    'version': 0, 'next_doc': 0, 'segments': []}
+        return meta
+
+    def _write_meta(self, meta: Dict[str, Any]) -> None:
+        _write_atomic(os.path.join(self.index_dir, 'meta.json'), json.dumps(meta).encode())
+
+    def _read_df(self) -> array:
+        df = array('I')
+        path = os.path.join(self.index_dir, 'df.bin')
+        if self._read_meta()['segments'] and os.path.exists(path):
+            with open(path, 'rb') as f:
+                df.frombytes(f.read())
+        if len(df) != 1 << FEATURE_BITS:
+            df = _zero_df()
+        return df
+
+    def _write_df(self, df: array) -> None:
+        _write_atomic(os.path.join(self.index_dir, 'df.bin'), df.tobytes())
+
+    def _rewrite_cases(self, docs: Dict[int, Dict[str, Any]]) -> None:
+        data = ''.join(
+            json.dumps(record, ensure_ascii=False) + '\n' for record in docs.values()
+        ).encode('utf-8')
+        _write_atomic(os.path.join(self.index_dir, 'cases.jsonl'), data)
+
+    def _clear(self) -> None:
+        meta = self._read_meta()
+        os.makedirs(self.index_dir, exist_ok=True)
+        for name in ['cases.jsonl', 'df.bin', *meta['segments']]:
+            try:
+                os.remove(os.path.join(self.index_dir, name))
+            except FileNotFoundError:
+                pass
+        meta['segments'] = []
+        self._write_meta(meta)
+        self._snapshot = self._open()
+
+
+def _zero_df() -> array:
+    return array('I', bytes(4 << FEATURE_BITS))
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
@@ -0,0 +1,363 @@
+"""
+Regression - 루브릭 변경 회귀 검사 (Python)
+data/cases 전체와 라벨링된 JSONL 세트를 TriageEngine으로 재생하고 저장된 기준선과 비교
+
+케이스는 generateTests.ts와 같은 입력(summary + 금지 표현 3개)과 기대값(decision, rule_codes)을 쓰고,
+라벨 세트는 TriageInput 필드에 ``expected_routing``/``expected_codes``를 더한 JSONL입니다 (라벨 없는
+줄은 기준선 비교에만 사용). 워커 프로세스는 (routing, confidence, 코드)만 돌려보냅니다.
+
+Usage:
+    python -m web.triage_engine regress [labeled.jsonl ...] --update-baseline
+    python -m web.triage_engine regress --proposal data/rubric-update-proposal.yaml
+"""
+
+import json
+import os
+import time
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+try:  # imported as part of the ``web`` package (python -m web.triage_engine)
+    from .case_ingest import DEFAULT_CASES_DIR, INDEX_NAME
+    from .triage_engine import BatchStats, TriageEngine, TriageInput, TriageOutput, input_from_dict
+except ImportError:  # imported from web/ directly (streamlit run, tests)
+    from case_ingest import DEFAULT_CASES_DIR, INDEX_NAME
+    from triage_engine import BatchStats, TriageEngine, TriageInput, TriageOutput, input_from_dict
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE_PATH = os.path.join(ROOT_DIR, 'data', 'regression-baseline.json')
+
+# (routing, confidence, red flag codes in rubric order)
+Outcome = Tuple[str, float, Tuple[str, ...]]
+
+
+class LabeledItem(NamedTuple):
+    item_id: str  # 'case:<case_id>' or '<set file name>:<id or line number>'
+    input: TriageInput
+    expected_routing: Optional[str] = None
+    expected_codes: Tuple[str, ...] = ()
+
+
+# ============================================================
+# Item sources
+# ============================================================
+
+def case_description(case: Dict[str, Any]) -> str:
+    """generateTestCase() input: summary plus up to three prohibited expressions"""
+    description = str(case.get('summary') or '')
+    expressions = [str(expr) for expr in case.get('prohibited_expressions') or []]
+    if expressions:
+        description += f" (키워드: {', '.join(expressions[:3])})"
+    return description.replace('\n', ' ')
+
+
+def load_cases(cases_dir: str = DEFAULT_CASES_DIR) -> List[LabeledItem]:
+    """Every indexed case with a decision, in index.jsonl order"""
+    try:  # imported as part of the ``web`` package
+        from .rubric_snapshot import parse_yaml
+    except ImportError:
+        from rubric_snapshot import parse_yaml
+
+    items = []
+    try:
+        with open(os.path.join(cases_dir, INDEX_NAME), 'r', encoding='utf-8') as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return items
+
+    for entry in entries:
+        try:
+            with open(os.path.join(cases_dir, entry['path'], 'case.yaml'), 'r', encoding='utf-8') as f:
+                case = parse_yaml(f.read())
+        except ImportError:
+            raise
+        except Exception:  # unreadable file, yaml.YAMLError
+            continue
+        if not isinstance(case, dict) or not case.get('decision'):
+            continue
+        items.append(LabeledItem(
+            item_id=f"case:{case.get('case_id') or entry['case_id']}",
+            input=TriageInput(description=case_description(case)),
+            expected_routing=case['decision'],
+            expected_codes=tuple(case.get('rule_codes') or ()),
+        ))
+    return items
+
+
+def load_labeled(path: str) -> List[LabeledItem]:
+    """TriageInput records with optional ``id``, ``expected_routing`` and ``expected_codes``"""
+    name = os.path.basename(path)
+    items = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            items.append(LabeledItem(
+                item_id=f"{name}:{record.get('id', line_number)}",
+                input=input_from_dict(record),
+                expected_routing=record.get('expected_routing'),
+                expected_codes=tuple(record.get('expected_codes') or ()),
+            ))
+    return items
+
+
+# ============================================================
+# Replay (one engine per worker process, compact results)
+# ============================================================
+
+def outcome_of(result: TriageOutput) -> Outcome:
+    return (result.routing, result.confidence, tuple(flag.code for flag in result.red_flags))
+
+
+_worker_engine: Optional[TriageEngine] = None
+
+
+def _init_worker(rubric_path: Optional[str]) -> None:
+    global _worker_engine
+    _worker_engine = TriageEngine(rubric_path)
+
+
+def _outcomes_in_worker(inputs: Sequence[TriageInput]) -> List[Outcome]:
+    triage = _worker_engine.triage
+    return [outcome_of(triage(input_data)) for input_data in inputs]
+
+
+def replay(
+    items: Sequence[LabeledItem],
+    rubric_path: Optional[str] = None,
+    workers: Optional[int] = None,
+    chunksize: int = 500,
+) -> Tuple[List[Outcome], BatchStats]:
+    """Outcomes of every item, in order, and the run's throughput
+
+    Unlike ``TriageEngine.triage_many`` only outcome tuples cross the
+    process boundary, which keeps large labeled sets CPU-bound. No result
+    cache or audit log is involved.
+    """
+    inputs = [item.input for item in items]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = [inputs[i:i + chunksize] for i in range(0, len(inputs), chunksize)]
+    workers = max(1, min(workers, len(chunks)))
+
+    start = time.perf_counter()
+    if workers == 1:
+        engine = TriageEngine(rubric_path)
+        outcomes = [outcome_of(engine.triage(input_data)) for input_data in inputs]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(rubric_path,)
+        ) as pool:
+            outcomes = [
+                outcome for chunk in pool.map(_outcomes_in_worker, chunks) for outcome in chunk
+            ]
+    stats = BatchStats(count=len(inputs), workers=workers, elapsed=time.perf_counter() - start)
+    return outcomes, stats
+
+
+# ============================================================
+# Baseline
+# ============================================================
+
+def read_baseline(path: str = DEFAULT_BASELINE_PATH) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_baseline(
+    items: Sequence[LabeledItem],
+    outcomes: Sequence[Outcome],
+    engine: TriageEngine,
+    path: str = DEFAULT_BASELINE_PATH,
+) -> None:
+    """Store outcomes keyed by item id (no timestamps, so reruns diff cleanly)"""
+    payload = {
+        'rubric_version': engine.compiled.version,
+        'rubric_digest': engine.rubric_digest,
+        'outcomes': {
+            item.item_id: [routing, confidence, list(codes)]
+            for item, (routing, confidence, codes) in zip(items, outcomes)
+        },
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=1, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+# ============================================================
+# Report
+# ============================================================
+
+class RegressionReport:
+    """Label checks and baseline diff of one replay"""
+
+    __slots__ = (
+        'items', 'labeled', 'stats', 'false_negatives', 'over_escalations', 'missing_codes',
+        'baseline_version', 'flips', 'flag_diffs', 'new_items', 'dropped_items',
+    )
+
+    def __init__(self, items: int, labeled: int, stats: BatchStats):
+        self.items = items
+        self.labeled = labeled  # items with an expected routing
+        self.stats = stats
+        self.false_negatives: List[str] = []  # expected TYPE_1, routed TYPE_2
+        self.over_escalations: List[str] = []  # expected TYPE_2, routed TYPE_1
+        self.missing_codes: List[Tuple[str, List[str]]] = []  # expected codes not detected
+        self.baseline_version: Optional[str] = None  # None: no baseline to diff against
+        self.flips: List[Tuple[str, str, str]] = []  # (id, baseline routing, routing)
+        self.flag_diffs: List[Tuple[str, List[str], List[str]]] = []  # (id, added, removed)
+        self.new_items = 0
+        self.dropped_items = 0
+
+    @property
+    def new_false_negatives(self) -> List[str]:
+        """Items the baseline sent to legal review that now skip it"""
+        return [item_id for item_id, old, new in self.flips if old == 'TYPE_1' and new == 'TYPE_2']
+
+    def passed(self, strict: bool = False) -> bool:
+        """No false negative against labels or baseline; with strict, no difference at all"""
+        if self.false_negatives or self.new_false_negatives:
+            return False
+        if strict:
+            return not (self.over_escalations or self.missing_codes or self.flips or self.flag_diffs)
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'items': self.items,
+            'labeled': self.labeled,
+            'elapsed': self.stats.elapsed,
+            'throughput': self.stats.throughput,
+            'workers': self.stats.workers,
+            'false_negatives': self.false_negatives,
+            'over_escalations': self.over_escalations,
+            'missing_codes': [list(entry) for entry in self.missing_codes],
+            'baseline_version': self.baseline_version,
+            'flips': [list(entry) for entry in self.flips],
+            'flag_diffs': [list(entry) for entry in self.flag_diffs],
+            'new_items': self.new_items,
+            'dropped_items': self.dropped_items,
+        }
+
+
+def compare(
+    items: Sequence[LabeledItem],
+    outcomes: Sequence[Outcome],
+    stats: BatchStats,
+    baseline: Optional[Dict[str, Any]] = None,
+) -> RegressionReport:
+    report = RegressionReport(
+        len(items), sum(1 for item in items if item.expected_routing), stats
+    )
+    for item, (routing, _, codes) in zip(items, outcomes):
+        if item.expected_routing == 'TYPE_1' and routing == 'TYPE_2':
+            report.false_negatives.append(item.item_id)
+        elif item.expected_routing == 'TYPE_2' and routing == 'TYPE_1':
+            report.over_escalations.append(item.item_id)
+        missing = [code for code in item.expected_codes if code not in codes]
+        if missing:
+            report.missing_codes.append((item.item_id, missing))
+
+    if baseline is None:
+        return report
+
+    report.baseline_version = baseline.get('rubric_version')
+    previous = baseline['outcomes']
+    seen = 0
+    for item, (routing, _, codes) in zip(items, outcomes):
+        old = previous.get(item.item_id)
+        if old is None:
+            report.new_items += 1
+            continue
+        seen += 1
+        old_routing, _, old_codes = old
+        if old_routing != routing:
+            report.flips.append((item.item_id, old_routing, routing))
+        added = [code for code in codes if code not in old_codes]
+        removed = [code for code in old_codes if code not in codes]
+        if added or removed:
+            report.flag_diffs.append((item.item_id, added, removed))
+    report.dropped_items = len(previous) - seen
+    return report
+
+
+def format_report(report: RegressionReport, limit: int = 20) -> Iterator[str]:
+    stats = report.stats
+    yield (
+        f"replayed {report.items} items ({report.labeled} labeled) in {stats.elapsed:.2f}s "
+        f"({stats.throughput:.1f} items/s, workers={stats.workers})"
+    )
+
+    def section(title: str, rows: List[str]) -> Iterator[str]:
+        yield f"{title}: {len(rows)}"
+        for row in rows[:limit]:
+            yield f"  {row}"
+        if len(rows) > limit:
+            yield f"  ... and {len(rows) - limit} more"
+
+    yield from section('false negatives (TYPE_1 -> TYPE_2)', report.false_negatives)
+    yield from section('over-escalations (TYPE_2 -> TYPE_1)', report.over_escalations)
+    yield from section('missing expected codes', [
+        f"{item_id}: {', '.join(codes)}" for item_id, codes in report.missing_codes
+    ])
+
+    if report.baseline_version is None:
+        yield 'baseline: none (run with --update-baseline to store one)'
+        return
+    yield (
+        f"baseline: rubric v{report.baseline_version} "
+        f"({report.new_items} new, {report.dropped_items} dropped items)"
+    )
+    yield from section('routing flips', [
+        f"{item_id}: {old} -> {new}" for item_id, old, new in report.flips
+    ])
+    yield from section('flag diffs', [
+        f"{item_id}: " + ' '.join([f'+{code}' for code in added] + [f'-{code}' for code in removed])
+        for item_id, added, removed in report.flag_diffs
+    ])
+
+
+# ============================================================
+# Rubric update proposals (applyProposal without writing rubric.yaml)
+# ============================================================
+
+def apply_proposal(rubric: Dict[str, Any], proposal: Dict[str, Any]) -> Dict[str, Any]:
+    """Rubric with a RubricUpdateProposal applied, as applyProposal() would save it"""
+    import copy
+
+    rubric = copy.deepcopy(rubric)
+    flags = {flag['code']: flag for flag in rubric['red_flags']}
+    for modification in proposal.get('modified_red_flags') or []:
+        flag = flags.get(modification['code'])
+        if flag is not None:
+            flag['keywords'].extend(modification.get('added_keywords') or [])
+    rubric['red_flags'].extend(proposal.get('new_red_flags') or [])
+    rubric.setdefault('safe_guardrails', []).extend(proposal.get('new_guardrails') or [])
+    major, minor = str(rubric['version']).split('.')[:2]
+    rubric['version'] = f"{major}.{int(minor) + 1}"
+    return rubric
+
+
+def write_proposed_rubric(rubric_path: str, proposal_path: str, output_path: str) -> str:
+    """Write rubric_path with the proposal applied to output_path"""
+    import yaml
+
+    try:  # imported as part of the ``web`` package
+        from .rubric_snapshot import parse_yaml
+    except ImportError:
+        from rubric_snapshot import parse_yaml
+
+    with open(rubric_path, 'r', encoding='utf-8') as f:
+        rubric = parse_yaml(f.read())
+    with open(proposal_path, 'r', encoding='utf-8') as f:
+        proposal = parse_yaml(f.read()) or {}
+    with open(output_path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(apply_proposal(rubric, proposal), f, allow_unicode=True, sort_keys=False)
+    return output_path
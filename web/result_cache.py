@@ -0,0 +1,118 @@
+"""
+Result Cache - 동일 입력 재트리아지 방지 (opt-in)
+메모리 LRU + 선택적 sqlite 디스크 백엔드, rubric 변경 시 자동 무효화
+"""
+
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class ResultCache:
+    """LRU cache of serialized TriageOutput payloads
+
+    Entries are tagged with the rubric content digest that produced them.
+    The first lookup made with a different digest (rubric file changed)
+    evicts every entry of the old rubric, in memory and on disk.
+    """
+
+    def __init__(self, maxsize: int = 1024, path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._rubric_digest: Optional[str] = None
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        if path is not None:
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'key TEXT PRIMARY KEY, rubric_digest TEXT NOT NULL, payload TEXT NOT NULL)'
+            )
+            self._db.commit()
+
+    def get(self, key: str, rubric_digest: str) -> Optional[Dict[str, Any]]:
+        """Return the cached payload (a fresh copy) or None"""
+        with self._lock:
+            self._check_rubric(rubric_digest)
+
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+            elif self._db is not None:
+                row = self._db.execute(
+                    'SELECT payload FROM results WHERE key = ?', (key,)
+                ).fetchone()
+                if row is not None:
+                    payload = json.loads(row[0])
+                    self._remember(key, payload)
+
+            if payload is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return json.loads(json.dumps(payload))
+
+    def put(self, key: str, rubric_digest: str, payload: Dict[str, Any]) -> None:
+        with self._lock:
+            self._check_rubric(rubric_digest)
+            self._remember(key, payload)
+
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO results (key, rubric_digest, payload) '
+                    'VALUES (?, ?, ?)',
+                    (key, rubric_digest, json.dumps(payload, ensure_ascii=False)),
+                )
+                self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM results')
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self._entries),
+        }
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _remember(self, key: str, payload: Dict[str, Any]) -> None:
+        self._entries[key] = payload
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _check_rubric(self, rubric_digest: str) -> None:
+        """Evict entries produced by any other rubric"""
+        if rubric_digest == self._rubric_digest:
+            return
+
+        self._entries.clear()
+        if self._db is not None:
+            self._db.execute(
+                'DELETE FROM results WHERE rubric_digest != ?', (rubric_digest,)
+            )
+            self._db.commit()
+        self._rubric_digest = rubric_digest
+
+    def __len__(self) -> int:
+        return len(self._entries)
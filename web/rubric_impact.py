@@ -0,0 +1,444 @@
+"""
+Rubric Impact - 루브릭 변경 제안의 과거 입력 영향 시뮬레이션 (Python)
+저장된 입력 코퍼스(JSONL) 중 바뀐 키워드를 포함할 수 있는 입력만 n-gram 역색인으로 골라
+현재/제안 루브릭으로 병렬 재평가하고 routing flip과 flag 증감을 보고
+
+키워드·제외 구절·질문 트리거의 추가/삭제는 그 문자열이 든 입력의 결과만 바꿀 수 있어 해당 입력만 다시
+돌립니다. flag의 severity가 바뀌면 그 flag의 모든 키워드가, routing_policy나 trigger_if_unknown 질문이
+바뀌면 코퍼스 전체가 재평가 대상입니다. 코퍼스 색인(<코퍼스>.ngrams/)은 처음 한 번 만들고, 이후에는
+파일 끝에 추가된 줄만 색인합니다.
+
+Usage:
+    python -m web.triage_engine impact history.jsonl --proposal data/rubric-update-proposal.yaml
+    python -m web.triage_engine impact history.jsonl --proposed-rubric rubric-next.yaml --json
+"""
+
+import json
+import os
+import time
+import zlib
+from array import array
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+try:  # imported as part of the ``web`` package (python -m web.triage_engine)
+    from .compiled_rubric import CompiledRubric
+    from .ngram_index import NgramIndex, gram_keys
+    from .regression import LabeledItem, Outcome, outcome_of
+    from .text_index import TextIndex
+    from .triage_engine import BatchStats, TriageEngine, input_from_dict
+except ImportError:  # imported from web/ directly (streamlit run, tests)
+    from compiled_rubric import CompiledRubric
+    from ngram_index import NgramIndex, gram_keys
+    from regression import LabeledItem, Outcome, outcome_of
+    from text_index import TextIndex
+    from triage_engine import BatchStats, TriageEngine, input_from_dict
+
+INDEX_BATCH = 50_000  # corpus lines per index segment
+_TAIL_BYTES = 4096  # indexed bytes checksummed to notice a rewritten corpus
+
+
+class RubricDelta(NamedTuple):
+    """What a rubric change can affect"""
+    terms: Tuple[str, ...]  # compact patterns whose presence decides whether an input may change
+    everything: Optional[str] = None  # reason every input must be re-evaluated
+
+
+def _patterns(compiled: CompiledRubric, ids: Sequence[int]) -> frozenset:
+    patterns = compiled.automaton.patterns
+    return frozenset(patterns[i] for i in ids)
+
+
+def rubric_delta(current: CompiledRubric, proposed: CompiledRubric) -> RubricDelta:
+    """Terms added, removed or re-weighted between two compiled rubrics
+
+    Only red flags, questions and routing_policy shape an outcome
+    (routing, confidence, flag codes); guardrails and reasons do not.
+    """
+    for name in ('default_routing', 'confidence_threshold', 'missing_info_action'):
+        if getattr(current, name) != getattr(proposed, name):
+            return RubricDelta((), f"routing_policy {name} changed")
+
+    terms = set()
+
+    # Red flags, grouped by code (codes may repeat)
+    def flag_shapes(compiled: CompiledRubric) -> Dict[str, List[Tuple[str, frozenset, frozenset]]]:
+        shapes: Dict[str, List[Tuple[str, frozenset, frozenset]]] = {}
+        for flag in compiled.red_flags:
+            shapes.setdefault(flag.code, []).append((
+                flag.severity,
+                _patterns(compiled, [keyword_id for _, keyword_id in flag.keywords]),
+                _patterns(compiled, flag.exclude_ids),
+            ))
+        return shapes
+
+    old_flags, new_flags = flag_shapes(current), flag_shapes(proposed)
+    for code in old_flags.keys() | new_flags.keys():
+        old, new = old_flags.get(code, []), new_flags.get(code, [])
+        if old == new:
+            continue
+        if len(old) == len(new) == 1 and old[0][0] == new[0][0]:
+            (_, old_keywords, old_excludes), = old
+            (_, new_keywords, new_excludes), = new
+            terms |= old_keywords ^ new_keywords
+            terms |= old_excludes ^ new_excludes
+        else:  # added, removed, re-weighted or re-split: any of its keywords may matter
+            for _, keywords, _ in old + new:
+                terms |= keywords
+
+    # Questions: only the number asked reaches routing
+    def question_shapes(compiled: CompiledRubric) -> Dict[Tuple[str, Optional[str]], List[frozenset]]:
+        shapes: Dict[Tuple[str, Optional[str]], List[frozenset]] = {}
+        for template in compiled.questions:
+            key = (template.question, template.unknown_field)
+            shapes.setdefault(key, []).append(_patterns(compiled, template.trigger_ids))
+        return shapes
+
+    old_questions, new_questions = question_shapes(current), question_shapes(proposed)
+    for key in old_questions.keys() | new_questions.keys():
+        old, new = old_questions.get(key, []), new_questions.get(key, [])
+        if old == new:
+            continue
+        if len(old) != len(new) and key[1] is not None:
+            return RubricDelta((), f"question on missing {key[1]} added or removed")
+        for i in range(max(len(old), len(new))):
+            old_triggers = old[i] if i < len(old) else frozenset()
+            new_triggers = new[i] if i < len(new) else frozenset()
+            terms |= old_triggers ^ new_triggers
+
+    if '' in terms:  # a keyword that normalizes to nothing matches every input
+        return RubricDelta((), "empty keyword")
+    return RubricDelta(tuple(sorted(terms)))
+
+
+# ============================================================
+# Corpus (JSONL of TriageInput records) with its n-gram index
+# ============================================================
+
+def _empty_state() -> Dict[str, Any]:
+    return {'size': 0, 'newlines': 0, 'docs': 0, 'tail_crc': 0}
+
+
+def _grams_of_lines(lines: Sequence[bytes]) -> List[Optional[array]]:
+    """gram_keys of each record's description; None for a line that is not a TriageInput"""
+    grams: List[Optional[array]] = []
+    for line in lines:
+        try:
+            input_data = input_from_dict(json.loads(line))
+        except (ValueError, TypeError, AttributeError):
+            grams.append(None)
+            continue
+        grams.append(gram_keys(TextIndex(input_data.description).compact))
+    return grams
+
+
+class CorpusIndex:
+    """A JSONL corpus, its n-gram index and the file position of every indexed record
+
+    Layout of ``index_dir`` (default ``<corpus>.ngrams``): the NgramIndex
+    files, ``lines.bin`` (byte offset and line number per doc) and
+    ``corpus.json`` (indexed size and a checksum of its last bytes). A
+    corpus that only grew is indexed from where the last run stopped;
+    any other change rebuilds the index.
+    """
+
+    def __init__(self, corpus_path: str, index_dir: Optional[str] = None):
+        self.corpus_path = corpus_path
+        self.index_dir = index_dir or f"{corpus_path}.ngrams"
+        self.name = os.path.basename(corpus_path)
+        self.index = NgramIndex(self.index_dir)
+        self._offsets = array('Q')
+        self._line_numbers = array('I')
+        state = self._read_state()
+        if state is not None and len(self.index) == state['docs']:
+            with open(os.path.join(self.index_dir, 'lines.bin'), 'rb') as f:
+                self._offsets.fromfile(f, state['docs'])
+                self._line_numbers.fromfile(f, state['docs'])
+            self._state = state
+        else:  # missing, or an update was interrupted between segment and state writes
+            self.index.clear()
+            self._state = _empty_state()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def update(self, workers: Optional[int] = None) -> int:
+        """Index records appended since the last update; returns records indexed"""
+        state = self._state
+        size = os.path.getsize(self.corpus_path)
+        if state['size'] and (
+            size < state['size'] or self._tail_crc(state['size']) != state['tail_crc']
+        ):  # rewritten, not appended to
+            self.index.clear()
+            del self._offsets[:], self._line_numbers[:]
+            state = self._state = _empty_state()
+        if size == state['size']:
+            return 0
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        pool = None
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            pool = ProcessPoolExecutor(max_workers=workers)
+        added = 0
+        try:
+            for positions, lines in self._read_batches(state):
+                if pool is None:
+                    grams = _grams_of_lines(lines)
+                else:
+                    step = -(-len(lines) // workers)
+                    grams = [
+                        keys
+                        for part in pool.map(_grams_of_lines, [
+                            lines[i:i + step] for i in range(0, len(lines), step)
+                        ])
+                        for keys in part
+                    ]
+                for (offset, line_number), keys in zip(positions, grams):
+                    if keys is not None:
+                        self._offsets.append(offset)
+                        self._line_numbers.append(line_number)
+                        added += 1
+                self.index.add_grams(keys for keys in grams if keys is not None)
+                self.index.flush()
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        state.update(docs=len(self._offsets), tail_crc=self._tail_crc(state['size']))
+        self._write_state()
+        return added
+
+    def read(self, docs: Sequence[int]) -> List[LabeledItem]:
+        """Corpus records of the given doc ids, as regression items"""
+        items = []
+        with open(self.corpus_path, 'rb') as f:
+            for doc in docs:
+                f.seek(self._offsets[doc])
+                record = json.loads(f.readline())
+                line_number = self._line_numbers[doc]
+                items.append(LabeledItem(
+                    item_id=f"{self.name}:{record.get('id', line_number)}",
+                    input=input_from_dict(record),
+                ))
+        return items
+
+    def _read_batches(
+        self, state: Dict[str, Any]
+    ) -> Iterator[Tuple[List[Tuple[int, int]], List[bytes]]]:
+        """(byte offset, line number) and bytes of non-blank lines, INDEX_BATCH at a time
+
+        Advances state['size'] and state['newlines'] past the lines read. A
+        last line without a newline is read only if it is complete JSON,
+        so a record still being written is picked up by the next update.
+        """
+        positions: List[Tuple[int, int]] = []
+        lines: List[bytes] = []
+        offset, newlines = state['size'], state['newlines']
+        with open(self.corpus_path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                terminated = line.endswith(b'\n')
+                if not terminated:
+                    try:
+                        json.loads(line)
+                    except ValueError:
+                        break
+                if line.strip():
+                    positions.append((offset, newlines + 1))
+                    lines.append(line)
+                offset += len(line)
+                newlines += terminated
+                if len(lines) == INDEX_BATCH:
+                    yield positions, lines
+                    positions, lines = [], []
+        if lines:
+            yield positions, lines
+        state.update(size=offset, newlines=newlines)
+
+    def _tail_crc(self, size: int) -> int:
+        with open(self.corpus_path, 'rb') as f:
+            f.seek(max(0, size - _TAIL_BYTES))
+            return zlib.crc32(f.read(min(size, _TAIL_BYTES)))
+
+    def _read_state(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.index_dir, 'corpus.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_state(self) -> None:
+        os.makedirs(self.index_dir, exist_ok=True)
+        lines_path = os.path.join(self.index_dir, 'lines.bin')
+        with open(f"{lines_path}.tmp", 'wb') as f:
+            self._offsets.tofile(f)
+            self._line_numbers.tofile(f)
+        os.replace(f"{lines_path}.tmp", lines_path)
+        state_path = os.path.join(self.index_dir, 'corpus.json')
+        with open(f"{state_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(self._state, f)
+        os.replace(f"{state_path}.tmp", state_path)
+
+
+# ============================================================
+# Simulation (both rubrics in each worker, outcome pairs only)
+# ============================================================
+
+_worker_engines: Optional[Tuple[TriageEngine, TriageEngine]] = None
+
+
+def _init_worker(current_path: Optional[str], proposed_path: str) -> None:
+    global _worker_engines
+    _worker_engines = (TriageEngine(current_path), TriageEngine(proposed_path))
+
+
+def _outcome_pairs(
+    engines: Tuple[TriageEngine, TriageEngine], inputs: Sequence[Any]
+) -> List[Tuple[Outcome, Outcome]]:
+    current, proposed = engines
+    return [
+        (outcome_of(current.triage(input_data)), outcome_of(proposed.triage(input_data)))
+        for input_data in inputs
+    ]
+
+
+def _outcome_pairs_in_worker(inputs: Sequence[Any]) -> List[Tuple[Outcome, Outcome]]:
+    return _outcome_pairs(_worker_engines, inputs)
+
+
+class ImpactReport:
+    """Routing flips and flag deltas of a proposal over a corpus"""
+
+    __slots__ = (
+        'corpus_items', 'candidates', 'terms', 'everything', 'lookup_seconds', 'stats',
+        'flips', 'flag_diffs',
+    )
+
+    def __init__(
+        self, corpus_items: int, delta: RubricDelta, candidates: int, lookup_seconds: float,
+        stats: BatchStats,
+    ):
+        self.corpus_items = corpus_items
+        self.terms = delta.terms
+        self.everything = delta.everything
+        self.candidates = candidates  # inputs re-evaluated
+        self.lookup_seconds = lookup_seconds
+        self.stats = stats
+        self.flips: List[Tuple[str, str, str]] = []  # (id, current routing, proposed routing)
+        self.flag_diffs: List[Tuple[str, List[str], List[str]]] = []  # (id, added, removed)
+
+    def flip_counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for _, old, new in self.flips:
+            key = f"{old} -> {new}"
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def flag_deltas(self) -> Dict[str, List[int]]:
+        """code -> [inputs gaining it, inputs losing it]"""
+        deltas: Dict[str, List[int]] = {}
+        for _, added, removed in self.flag_diffs:
+            for code in added:
+                deltas.setdefault(code, [0, 0])[0] += 1
+            for code in removed:
+                deltas.setdefault(code, [0, 0])[1] += 1
+        return deltas
+
+    @property
+    def new_false_negatives(self) -> List[str]:
+        """Inputs the current rubric sends to legal review that the proposal would not"""
+        return [item_id for item_id, old, new in self.flips if old == 'TYPE_1' and new == 'TYPE_2']
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'corpus_items': self.corpus_items,
+            'terms': list(self.terms),
+            'everything': self.everything,
+            'candidates': self.candidates,
+            'lookup_seconds': self.lookup_seconds,
+            'elapsed': self.stats.elapsed,
+            'workers': self.stats.workers,
+            'flip_counts': self.flip_counts(),
+            'flag_deltas': self.flag_deltas(),
+            'flips': [list(entry) for entry in self.flips],
+            'flag_diffs': [list(entry) for entry in self.flag_diffs],
+        }
+
+
+def simulate(
+    corpus: CorpusIndex,
+    proposed_path: str,
+    current_path: Optional[str] = None,
+    workers: Optional[int] = None,
+    chunksize: int = 500,
+) -> ImpactReport:
+    """Re-evaluate the corpus inputs a proposed rubric can affect, under both rubrics
+
+    The corpus index must be up to date (CorpusIndex.update).
+    """
+    engines = (TriageEngine(current_path), TriageEngine(proposed_path))
+    delta = rubric_delta(engines[0].compiled, engines[1].compiled)
+
+    start = time.perf_counter()
+    if delta.everything is not None:
+        docs: Sequence[int] = range(len(corpus))
+    else:
+        docs = corpus.index.lookup(delta.terms)
+    items = corpus.read(docs)
+    lookup_seconds = time.perf_counter() - start
+
+    inputs = [item.input for item in items]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = [inputs[i:i + chunksize] for i in range(0, len(inputs), chunksize)]
+    workers = max(1, min(workers, len(chunks)))
+
+    start = time.perf_counter()
+    if workers == 1:
+        pairs = _outcome_pairs(engines, inputs)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(current_path, proposed_path),
+        ) as pool:
+            pairs = [pair for chunk in pool.map(_outcome_pairs_in_worker, chunks) for pair in chunk]
+    stats = BatchStats(count=len(inputs), workers=workers, elapsed=time.perf_counter() - start)
+
+    report = ImpactReport(len(corpus), delta, len(items), lookup_seconds, stats)
+    for item, ((old_routing, _, old_codes), (routing, _, codes)) in zip(items, pairs):
+        if old_routing != routing:
+            report.flips.append((item.item_id, old_routing, routing))
+        added = [code for code in codes if code not in old_codes]
+        removed = [code for code in old_codes if code not in codes]
+        if added or removed:
+            report.flag_diffs.append((item.item_id, added, removed))
+    return report
+
+
+def format_impact(report: ImpactReport, limit: int = 20) -> Iterator[str]:
+    scope = (
+        f"all inputs ({report.everything})" if report.everything is not None
+        else f"{len(report.terms)} changed terms"
+    )
+    yield (
+        f"corpus: {report.corpus_items} inputs; {scope} -> {report.candidates} candidates "
+        f"looked up in {report.lookup_seconds:.2f}s, re-evaluated in {report.stats.elapsed:.2f}s "
+        f"(workers={report.stats.workers})"
+    )
+    yield f"routing flips: {len(report.flips)}"
+    for transition, count in sorted(report.flip_counts().items()):
+        yield f"  {transition}: {count}"
+    for item_id, old, new in report.flips[:limit]:
+        yield f"    {item_id}: {old} -> {new}"
+    if len(report.flips) > limit:
+        yield f"    ... and {len(report.flips) - limit} more"
+    deltas = report.flag_deltas()
+    yield f"flag deltas: {len(report.flag_diffs)} inputs"
+    for code, (gained, lost) in sorted(deltas.items()):
+        yield f"  {code}: +{gained} -{lost}"
+    if report.new_false_negatives:
+        yield f"new false negatives (TYPE_1 -> TYPE_2): {len(report.new_false_negatives)}"
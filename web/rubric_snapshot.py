@@ -0,0 +1,89 @@
+"""
+Rubric Snapshot - 검증·컴파일된 rubric을 marshal 바이너리로 저장
+YAML 내용 해시가 일치하면 PyYAML 파싱과 오토마톤 빌드를 건너뜀
+
+Usage:
+    python -m web.triage_engine compile-rubric [--rubric rubric.yaml]
+"""
+
+import marshal
+import os
+from typing import Any, Dict, Optional
+
+try:  # imported as part of the ``web`` package (python -m web.triage_engine)
+    from .compiled_rubric import CompiledRubric, validate_rubric
+    from .keyword_matcher import KeywordAutomaton
+except ImportError:  # imported from web/ directly (streamlit run, tests)
+    from compiled_rubric import CompiledRubric, validate_rubric
+    from keyword_matcher import KeywordAutomaton
+
+# Bump when the snapshot layout or CompiledRubric/KeywordAutomaton tables change
+SNAPSHOT_FORMAT = 2
+SNAPSHOT_SUFFIX = '.snapshot'
+
+
+def snapshot_path_for(rubric_path: str) -> str:
+    """Snapshot lives next to the YAML (rubric.yaml -> rubric.yaml.snapshot)"""
+    return rubric_path + SNAPSHOT_SUFFIX
+
+
+def parse_yaml(text: str) -> Any:
+    """yaml.safe_load, using the libyaml C loader when available"""
+    import yaml
+
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return yaml.load(text, Loader=loader)
+
+
+def compile_rubric_content(content: bytes) -> CompiledRubric:
+    """Parse, validate and compile raw rubric.yaml bytes"""
+    import hashlib
+
+    rubric = validate_rubric(parse_yaml(content.decode('utf-8')))
+    return CompiledRubric(rubric, digest=hashlib.sha256(content).hexdigest())
+
+
+def write_snapshot(rubric_path: str, snapshot_path: Optional[str] = None) -> str:
+    """Validate and compile rubric_path, then write its snapshot atomically"""
+    snapshot_path = snapshot_path or snapshot_path_for(rubric_path)
+    with open(rubric_path, 'rb') as f:
+        compiled = compile_rubric_content(f.read())
+
+    payload = {
+        'format': SNAPSHOT_FORMAT,
+        'marshal_version': marshal.version,
+        'digest': compiled.digest,
+        'rubric': compiled.rubric,
+        'automaton': compiled.automaton.to_tables(),
+    }
+
+    tmp_path = f"{snapshot_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        marshal.dump(payload, f)
+    os.replace(tmp_path, snapshot_path)
+    return snapshot_path
+
+
+def load_snapshot(snapshot_path: str, digest: str) -> Optional[CompiledRubric]:
+    """Compiled rubric from snapshot, or None if missing, stale or unreadable"""
+    try:
+        with open(snapshot_path, 'rb') as f:
+            payload: Dict[str, Any] = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if not isinstance(payload, dict) or (
+        payload.get('format') != SNAPSHOT_FORMAT or
+        payload.get('marshal_version') != marshal.version or
+        payload.get('digest') != digest
+    ):
+        return None
+
+    try:
+        return CompiledRubric(
+            payload['rubric'],
+            digest=digest,
+            automaton=KeywordAutomaton.from_tables(payload['automaton']),
+        )
+    except KeyError:  # written by a build with different matching rules
+        return None
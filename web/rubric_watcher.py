@@ -0,0 +1,72 @@
+"""
+Rubric Watcher - rubric.yaml 변경 감지 후 무중단 재로드
+파일 mtime/inode/size 폴링, 변경 시 백그라운드에서 재파싱·재컴파일 후 교체
+"""
+
+import os
+import threading
+from typing import Any, Optional, Tuple
+
+FileSignature = Tuple[int, int, int]  # (st_mtime_ns, st_ino, st_size)
+
+
+def file_signature(path: str) -> Optional[FileSignature]:
+    """Cheap change detector; None if the file is missing (mid-rename)"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_ino, st.st_size)
+
+
+class RubricWatcher:
+    """Poll engine.rubric_path and call engine.reload_rubric() on change
+
+    Editors and deploy scripts often replace the file via rename, which
+    changes the inode but not necessarily the mtime, so both are tracked.
+    A rejected (malformed) rubric is retried only after the file changes
+    again; the engine keeps serving the previous rubric meanwhile.
+    """
+
+    def __init__(self, engine: Any, interval: float = 2.0):
+        self.engine = engine
+        self.interval = interval
+        self.reload_count = 0
+        self._signature = file_signature(engine.rubric_path)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self) -> bool:
+        """Reload if the file changed; True when a new rubric was swapped in"""
+        signature = file_signature(self.engine.rubric_path)
+        if signature is None or signature == self._signature:
+            return False
+
+        self._signature = signature
+        previous_digest = self.engine.rubric_digest
+        if not self.engine.reload_rubric():
+            return False
+        if self.engine.rubric_digest == previous_digest:
+            return False
+
+        self.reload_count += 1
+        return True
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name='rubric-watcher', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
@@ -3,8 +3,17 @@ Legal Triage - Streamlit Web App
 의료광고/법무 리스크 분류 시스템
 """
 
+import html
+import json
+import os
+
 import streamlit as st
-from triage_engine import TriageEngine, TriageInput
+from audit_logger import AuditLogger
+from case_ingest import DEFAULT_CASES_DIR, INDEX_NAME, CaseCatalog
+from incremental import IncrementalSession
+from precedents import PrecedentIndex
+from result_cache import ResultCache
+from triage_engine import TriageEngine, TriageInput, output_to_dict
 
 # Page config
 st.set_page_config(
@@ -16,9 +25,62 @@ st.set_page_config(
 # Initialize engine
 @st.cache_resource
 def get_engine():
-    return TriageEngine()
+    # Similar past cases from an index built by `index-cases`: LEGAL_TRIAGE_PRECEDENTS=DIR
+    # (opened read-only; the app never builds or merges segments)
+    precedents_dir = os.environ.get("LEGAL_TRIAGE_PRECEDENTS")
+    precedents = PrecedentIndex(precedents_dir) if precedents_dir else None
+    # Audit logging writes files, so it is opt-in: LEGAL_TRIAGE_AUDIT_LOG=DIR
+    audit_log_dir = os.environ.get("LEGAL_TRIAGE_AUDIT_LOG")
+    audit_log = AuditLogger(audit_log_dir) if audit_log_dir else None
+    engine = TriageEngine(
+        cache=ResultCache(maxsize=512), audit_log=audit_log, precedents=precedents
+    )
+    engine.watch_rubric()  # pick up approved rubric.yaml changes without a restart
+    return engine
+
+CASE_INDEX_PATH = os.path.join(DEFAULT_CASES_DIR, INDEX_NAME)
+
+
+@st.cache_resource(max_entries=1)
+def get_catalog(index_mtime_ns):
+    # Read-only; index.jsonl is updated by `index-cases`. Keyed on its mtime so
+    # a rerun only stats the file and a re-index is picked up without a restart
+    return CaseCatalog.load(CASE_INDEX_PATH)
+
+
+def case_index_mtime_ns():
+    try:
+        return os.stat(CASE_INDEX_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
 
 engine = get_engine()
+catalog = get_catalog(case_index_mtime_ns())
+
+SEVERITY_RANK = {"low": 1, "medium": 2, "high": 3, "critical": 4}
+
+
+def highlight_description(description, red_flags):
+    """Description as HTML with matched spans marked by their worst severity"""
+    ranks = [0] * len(description)
+    for flag in red_flags:
+        rank = SEVERITY_RANK.get(flag.severity, 1)
+        for start, end, _keyword in flag.matched_spans:
+            for i in range(start, end):
+                ranks[i] = max(ranks[i], rank)
+
+    severity_by_rank = {rank: severity for severity, rank in SEVERITY_RANK.items()}
+    parts = []
+    start = 0
+    for i in range(1, len(description) + 1):
+        if i == len(description) or ranks[i] != ranks[start]:
+            chunk = html.escape(description[start:i])
+            if ranks[start]:
+                chunk = f'<mark class="span-{severity_by_rank[ranks[start]]}">{chunk}</mark>'
+            parts.append(chunk)
+            start = i
+    return ''.join(parts).replace("\n", "<br>")
 
 # Custom CSS
 st.markdown("""
@@ -59,6 +121,16 @@ st.markdown("""
     margin: 2px;
     display: inline-block;
 }
+.highlighted-description {
+    padding: 10px;
+    border: 1px solid #ddd;
+    border-radius: 5px;
+    line-height: 1.8;
+}
+.span-critical { background-color: #ff6b6b; color: white; }
+.span-high { background-color: #ffa502; color: white; }
+.span-medium { background-color: #ffd93d; color: black; }
+.span-low { background-color: #c8e6c9; color: black; }
 .confidence-bar {
     height: 20px;
     border-radius: 10px;
@@ -172,8 +244,10 @@ with col2:
             cross_border=cross_border,
         )
 
-        # Run triage
-        result = engine.triage(input_data)
+        # Run triage (re-scans only what changed since this session's last run)
+        if 'triage_session' not in st.session_state:
+            st.session_state.triage_session = IncrementalSession(engine)
+        result = st.session_state.triage_session.triage(input_data)
 
         # Display routing result
         if result.routing == "TYPE_1":
@@ -201,6 +275,11 @@ with col2:
         # Red flags
         if result.red_flags:
             st.subheader("🚩 탐지된 Red Flags")
+            st.markdown(
+                '<div class="highlighted-description">'
+                f'{highlight_description(description, result.red_flags)}</div>',
+                unsafe_allow_html=True,
+            )
             for flag in result.red_flags:
                 severity_emoji = {
                     "critical": "🔴",
@@ -232,6 +311,19 @@ with col2:
                 else:
                     st.success(guardrail)
 
+        # Similar past cases
+        if result.similar_cases:
+            st.subheader("📚 유사 과거 케이스")
+            for case in result.similar_cases:
+                entry = catalog.get(case.case_id) or {}
+                team = f", {entry['team']}" if entry.get('team') else ""
+                st.write(
+                    f"**{case.title}** ({case.date}{team}) — 판정 {case.decision}, "
+                    f"유사도 {case.score:.2f}"
+                )
+                if case.rule_codes:
+                    st.caption(", ".join(case.rule_codes))
+
         # Next step
         st.subheader("➡️ 다음 단계")
         if result.recommended_next_step == "LEGAL_REVIEW":
@@ -241,24 +333,7 @@ with col2:
 
         # JSON output
         with st.expander("📄 JSON 출력 (API 연동용)"):
-            import json
-            output_dict = {
-                "routing": result.routing,
-                "confidence": result.confidence,
-                "red_flags": [
-                    {
-                        "code": f.code,
-                        "reason": f.reason,
-                        "matched_keywords": f.matched_keywords,
-                        "severity": f.severity,
-                    }
-                    for f in result.red_flags
-                ],
-                "missing_info_questions": result.missing_info_questions,
-                "safe_guardrails": result.safe_guardrails,
-                "recommended_next_step": result.recommended_next_step,
-                "timestamp": result.timestamp,
-            }
+            output_dict = output_to_dict(result)
             st.code(json.dumps(output_dict, ensure_ascii=False, indent=2), language="json")
 
     elif analyze_btn and not description:
@@ -0,0 +1,363 @@
+"""
+Submission Store - 트리아지한 설명문 원문 보관소와 n-gram 역색인 (Python, 선택 기능)
+"이 표현을 쓴 과거 제출 건 전부" 검색용: 새 행정처분·가이드라인이 특정 문구(예: "내돈내산")를 금지하면
+그 문구가 들어간 과거 입력과 당시 TriageOutput을 함께 찾습니다
+
+감사 로그는 원문 없이 해시만 남기므로, 원문이 필요한 경우에만 --store로 켭니다. 저장 폴더는 소유자 전용
+(0700)으로 만들고, 다른 사용자가 접근할 수 있는 폴더는 열지 않습니다. triage()는 큐에 넣기만 하고
+(가득 차면 버리고 ``dropped`` 증가), 백그라운드 스레드가 기록과 색인을 맡습니다.
+
+Usage:
+    python -m web.triage_engine --store .legal-triage-store batch inputs.jsonl -o out.jsonl
+    python -m web.triage_engine --store .legal-triage-store search 내돈내산
+    python -m web.triage_engine --store .legal-triage-store search 협찬 광고 --any --limit 20
+"""
+
+import atexit
+import json
+import os
+import queue
+import stat
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:  # imported as part of the ``web`` package (python -m web.triage_engine)
+    from .ngram_index import NgramIndex, gram_keys
+    from .text_index import TextIndex, compact_keyword
+    from .triage_engine import (
+        INPUT_FIELDS, TriageInput, TriageOutput, output_from_dict, output_to_dict,
+    )
+except ImportError:  # imported from web/ directly (streamlit run, tests)
+    from ngram_index import NgramIndex, gram_keys
+    from text_index import TextIndex, compact_keyword
+    from triage_engine import (
+        INPUT_FIELDS, TriageInput, TriageOutput, output_from_dict, output_to_dict,
+    )
+
+DEFAULT_STORE_DIR = os.path.join(os.getcwd(), '.legal-triage-store')
+RECORDS_NAME = 'records.jsonl'
+OFFSETS_NAME = 'offsets.bin'
+INDEX_NAME = 'ngrams'
+
+_STOP = object()
+
+
+@dataclass
+class StoredSubmission:
+    doc: int  # position in the store (append order)
+    input: TriageInput
+    output: TriageOutput
+    spans: List[Tuple[int, int]]  # [start, end) of each query term in input.description
+
+
+def _check_private(path: str) -> None:
+    """Refuse a store directory other users can read (like ssh does for keys)"""
+    if os.name != 'posix':
+        return
+    mode = os.stat(path).st_mode
+    if mode & (stat.S_IRWXG | stat.S_IRWXO):
+        raise PermissionError(
+            f"{path} is accessible by other users (mode {stat.S_IMODE(mode):o}); "
+            f"run: chmod 700 {path}"
+        )
+
+
+class SubmissionStore:
+    """Append-only store of triaged inputs with their outputs, searchable by substring
+
+    Layout of ``store_dir``:
+
+    - ``records.jsonl``: ``{"input": {...}, "output": output_to_dict()}``
+      per triaged input, in triage order (the line number is the doc id)
+    - ``offsets.bin``: byte offset of every record
+    - ``ngrams/``: NgramIndex over each description's compact text
+
+    One process writes (``writable=True``, guarded by a lock file); any
+    number of read-only instances may search concurrently. Records the
+    writer has not indexed yet are matched by a direct scan, so readers
+    see every written record. Terms match like rubric keywords do: on
+    the normalized text with separators removed ("내돈 내산" finds
+    "내돈내산"), without word-boundary rules.
+    """
+
+    def __init__(
+        self,
+        store_dir: Optional[str] = None,
+        writable: bool = True,
+        flush_every: int = 10_000,
+        queue_size: int = 10_000,
+    ):
+        self.store_dir = store_dir or DEFAULT_STORE_DIR
+        self.writable = writable
+        self.flush_every = flush_every
+        self.written = 0
+        self.dropped = 0
+        self.last_error: Optional[str] = None
+
+        if writable:
+            os.makedirs(self.store_dir, mode=0o700, exist_ok=True)
+            os.makedirs(os.path.join(self.store_dir, INDEX_NAME), mode=0o700, exist_ok=True)
+        _check_private(self.store_dir)
+        self._records_path = os.path.join(self.store_dir, RECORDS_NAME)
+        self._offsets_path = os.path.join(self.store_dir, OFFSETS_NAME)
+        self._lock = threading.Lock()  # writer thread vs. searches of this instance
+        self._offsets = array('Q')
+        self.index = NgramIndex(os.path.join(self.store_dir, INDEX_NAME))
+        self._closed = True
+        if not writable:
+            self._load_offsets()
+            return
+
+        import fcntl
+
+        self._lock_file = open(os.path.join(self.store_dir, 'writer.lock'), 'w')
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._lock_file.close()
+            raise RuntimeError(f"{self.store_dir} is open for writing in another process")
+        self._recover()
+        self._unflushed = 0
+        fd = os.open(self._records_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        self._records = os.fdopen(fd, 'ab')
+        fd = os.open(self._offsets_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        self._offsets_file = os.fdopen(fd, 'ab')
+
+        self._closed = False
+        self._queue: 'queue.Queue[Any]' = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name='submission-store', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    # ----------------------------------------------------------
+    # Producer side (called from triage paths, never blocks)
+    # ----------------------------------------------------------
+
+    def add(self, input_data: TriageInput, result: Union[TriageOutput, Dict[str, Any]]) -> bool:
+        """Queue one input with its TriageOutput (or output_to_dict() payload)"""
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait((input_data, result))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        return True
+
+    def sync(self) -> None:
+        """Wait until everything queued so far is written and searchable"""
+        if not self._closed:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Write what is queued, index it and release the writer lock"""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(_STOP)
+        self._thread.join()
+        with self._lock:
+            self.index.flush()
+        self._records.close()
+        self._offsets_file.close()
+        self._lock_file.close()
+
+    # ----------------------------------------------------------
+    # Writer thread
+    # ----------------------------------------------------------
+
+    def _run(self) -> None:
+        get = self._queue.get
+        get_nowait = self._queue.get_nowait
+        stop = False
+        while not stop:
+            batch = [get()]
+            while len(batch) < 512:
+                try:
+                    batch.append(get_nowait())
+                except queue.Empty:
+                    break
+            if _STOP in batch:
+                del batch[batch.index(_STOP):]
+                stop = True
+            if batch:
+                self._write(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+
+    def _write(self, batch: List[Tuple[TriageInput, Any]]) -> None:
+        try:
+            lines = []
+            grams = []
+            for input_data, result in batch:
+                payload = result if isinstance(result, dict) else output_to_dict(result)
+                record = {
+                    'input': {
+                        name: getattr(input_data, name) for name in INPUT_FIELDS
+                        if getattr(input_data, name) is not None
+                    },
+                    'output': payload,
+                }
+                lines.append((json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8'))
+                grams.append(gram_keys(TextIndex(input_data.description).compact))
+
+            position = self._records.tell()
+            offsets = array('Q')
+            for line in lines:
+                offsets.append(position)
+                position += len(line)
+            self._records.write(b''.join(lines))
+            self._records.flush()
+            offsets.tofile(self._offsets_file)
+            self._offsets_file.flush()
+
+            with self._lock:
+                self._offsets.extend(offsets)
+                self.index.add_grams(grams)
+                self._unflushed += len(grams)
+                if self._unflushed >= self.flush_every:
+                    self.index.flush()
+                    self._unflushed = 0
+                self.written += len(batch)
+        except Exception as error:  # disk full, permissions: never reach triage()
+            self.last_error = f"{type(error).__name__}: {error}"
+            with self._lock:
+                self.dropped += len(batch)
+
+    def _recover(self) -> None:
+        """Make offsets and index agree with records.jsonl after an unclean exit"""
+        self._load_offsets()
+        offsets = self._offsets
+        try:
+            size = os.path.getsize(self._records_path)
+        except FileNotFoundError:
+            size = 0
+        while offsets and offsets[-1] >= size:
+            offsets.pop()
+        os.close(os.open(self._records_path, os.O_WRONLY | os.O_CREAT, 0o600))
+        with open(self._records_path, 'rb') as f:
+            position = 0
+            if offsets:
+                f.seek(offsets[-1])
+                line = f.readline()
+                if line.endswith(b'\n'):
+                    position = offsets[-1] + len(line)
+                else:
+                    position = offsets.pop()
+            f.seek(position)
+            for line in f:  # records written after their offsets were lost
+                if not line.endswith(b'\n'):
+                    break
+                offsets.append(position)
+                position += len(line)
+        if position < size:  # a torn last line
+            os.truncate(self._records_path, position)
+        fd = os.open(self._offsets_path, os.O_WRONLY | os.O_TRUNC | os.O_CREAT, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            offsets.tofile(f)
+
+        if len(self.index) > len(offsets):
+            self.index.clear()
+        if len(self.index) < len(offsets):
+            for doc, record in self._read(range(len(self.index), len(offsets))):
+                self.index.add([TextIndex(record['input']['description']).compact])
+            self.index.flush()
+
+    # ----------------------------------------------------------
+    # Query
+    # ----------------------------------------------------------
+
+    def search(
+        self,
+        terms: Union[str, Sequence[str]],
+        match_all: bool = True,
+        limit: Optional[int] = 100,
+    ) -> List[StoredSubmission]:
+        """Stored submissions containing all (or any) of the terms, newest first"""
+        if isinstance(terms, str):
+            terms = [terms]
+        patterns = sorted({compact_keyword(term) for term in terms})
+        if not patterns or '' in patterns:
+            raise ValueError("search terms must not be blank")
+
+        with self._lock:
+            if not self.writable:
+                self._refresh()
+            indexed = len(self.index)
+            total = len(self._offsets)
+            per_pattern = [set(self.index.candidates(pattern)) for pattern in patterns]
+        if match_all:
+            docs = set.intersection(*per_pattern)
+        else:
+            docs = set.union(*per_pattern)
+        docs.update(range(indexed, total))  # written by the writer process, not flushed yet
+        if not docs:
+            return []
+
+        found = []
+        for doc, record in self._read(sorted(docs, reverse=True)):
+            description = record['input']['description']
+            index = TextIndex(description)
+            spans = []
+            matched = 0
+            for pattern in patterns:
+                pattern_spans = _find_all(index, pattern)
+                matched += bool(pattern_spans)
+                spans.extend(pattern_spans)
+            if matched == len(patterns) or (matched and not match_all):
+                found.append(StoredSubmission(
+                    doc=doc,
+                    input=TriageInput(**record['input']),
+                    output=output_from_dict(record['output']),
+                    spans=sorted(spans),
+                ))
+                if limit is not None and len(found) >= limit:
+                    break
+        return found
+
+    def _read(self, docs: Iterable[int]) -> Iterable[Tuple[int, Dict[str, Any]]]:
+        offsets = self._offsets
+        with open(self._records_path, 'rb') as f:
+            for doc in docs:
+                f.seek(offsets[doc])
+                yield doc, json.loads(f.readline())
+
+    def _load_offsets(self) -> None:
+        try:
+            with open(self._offsets_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        self._offsets.frombytes(data[:len(data) - len(data) % 8])
+
+    def _refresh(self) -> None:
+        """Pick up records and segments written since this reader opened"""
+        self.index.reload()
+        try:
+            size = os.path.getsize(self._offsets_path)
+        except FileNotFoundError:
+            return
+        known = len(self._offsets)
+        if size // 8 > known:
+            with open(self._offsets_path, 'rb') as f:
+                f.seek(8 * known)
+                data = f.read(8 * (size // 8 - known))
+            self._offsets.frombytes(data)
+
+
+def _find_all(index: TextIndex, pattern: str) -> List[Tuple[int, int]]:
+    """Original-text spans of every occurrence of pattern in index.compact"""
+    compact = index.compact
+    spans = []
+    start = compact.find(pattern)
+    while start != -1:
+        spans.append(index.original_span(*index.normalized_span(start, start + len(pattern))))
+        start = compact.find(pattern, start + 1)
+    return spans
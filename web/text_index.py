@@ -0,0 +1,277 @@
+"""
+Text Index - 한국어 인지 정규화 및 오프셋 맵
+설명문 1건당 한 번 생성하여 키워드/질문 트리거/가드레일 검사가 공유
+
+정규화 단계:
+  1. Unicode NFKC (전각 문자, 호환 자모, NFD 한글 조합형 -> 완성형)
+  2. 소문자화
+  3. 공백·구분 기호 제거 ("전 후 사진", "전후-사진", "before/after" -> 붙여 쓰기)
+각 단계의 문자 위치는 원문 오프셋으로 역매핑되어 UI 하이라이트에 사용됨
+"""
+
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+# Separators folded away between keyword characters (applied after NFKC, so
+# full-width forms such as '／' or '－' are covered too). '%', '+', '.' are
+# kept: they carry meaning in keywords like "100%", "1+1", "No.1".
+_WHITESPACE = (  # str.isspace(), i.e. what \s matches
+    '\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680'
+    '\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a'
+    '\u2028\u2029\u202f\u205f\u3000'
+)
+_SEPARATOR_CHARS = _WHITESPACE + '_/&·・-\u2010\u2011\u2012\u2013\u2014\u2015\u2212'
+_SEPARATOR_SET = frozenset(_SEPARATOR_CHARS)
+_SEPARATORS = re.compile(f"[{re.escape(_SEPARATOR_CHARS)}]+")
+_CONTENT_RUNS = re.compile(f"[^{re.escape(_SEPARATOR_CHARS)}]+")
+
+
+def _joins_previous(ch: str) -> bool:
+    """Combining marks and Hangul medial/final jamo belong to the previous char"""
+    return (
+        '\u1160' <= ch <= '\u11ff' or  # conjoining jungseong/jongseong
+        '\ud7b0' <= ch <= '\ud7ff' or  # Hangul Jamo Extended-B
+        unicodedata.combining(ch) != 0
+    )
+
+
+def _normalize(text: str) -> Tuple[str, Optional[List[int]], Optional[List[int]]]:
+    """NFKC + lower; returns (normalized, orig_starts, orig_ends)
+
+    The offset lists map each normalized char back to the original
+    [start, end) it came from: itself when its cluster was unchanged, the
+    whole cluster otherwise. They are None when the mapping is the
+    identity, which is the common case (already-NFKC text).
+    """
+    # str.lower() is context free except for final sigma, which the
+    # per-cluster path below never sees; keep both paths identical
+    if (text.isascii() or unicodedata.is_normalized('NFKC', text)) and 'Σ' not in text:
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            return lowered, None, None
+
+    pieces: List[str] = []
+    starts: List[int] = []
+    ends: List[int] = []
+    i, n = 0, len(text)
+    while i < n:
+        j = i + 1
+        while j < n and _joins_previous(text[j]):
+            j += 1
+        cluster = text[i:j]
+        composed = unicodedata.normalize('NFKC', cluster)
+        piece = composed.lower()
+        pieces.append(piece)
+        if composed == cluster and len(piece) == len(cluster):
+            # only case-folded: map 1:1, as the fast path does
+            starts.extend(range(i, j))
+            ends.extend(range(i + 1, j + 1))
+        else:
+            starts.extend([i] * len(piece))
+            ends.extend([j] * len(piece))
+        i = j
+
+    return ''.join(pieces), starts, ends
+
+
+def common_affixes(old: str, new: str) -> Tuple[int, int]:
+    """Lengths of the common prefix and (non-overlapping) common suffix
+
+    Binary search over slice comparisons keeps the per-character work in C.
+    """
+    limit = min(len(old), len(new))
+
+    low, high = 0, limit
+    while low < high:
+        mid = (low + high + 1) // 2
+        if old[:mid] == new[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    prefix = low
+
+    low, high = 0, limit - prefix
+    while low < high:
+        mid = (low + high + 1) // 2
+        if old[len(old) - mid:] == new[len(new) - mid:]:
+            low = mid
+        else:
+            high = mid - 1
+    return prefix, low
+
+
+def _shifted(values: Sequence[int], offset: int) -> List[int]:
+    return list(map(offset.__add__, values)) if offset else list(values)
+
+
+def cluster_start(text: str, index: int) -> int:
+    """index, moved back to the start of its character cluster
+
+    Text cut there normalizes to the same chars as the whole text does
+    (see document.DocumentScanner).
+    """
+    while 0 < index < len(text) and _joins_previous(text[index]):
+        index -= 1
+    return index
+
+
+def compact_keyword(keyword: str) -> str:
+    """Keyword in the same form as TextIndex.compact"""
+    return _SEPARATORS.sub('', unicodedata.normalize('NFKC', keyword).lower())
+
+
+class IndexEdit(NamedTuple):
+    """Unchanged prefix/suffix lengths between two indexes (see after_edit)"""
+    normalized_prefix: int
+    normalized_suffix: int
+    compact_prefix: int
+    compact_suffix: int
+
+
+class TextIndex:
+    """Normalized views of one description with offset maps
+
+    - ``normalized``: NFKC + lowercase, same layout as the input otherwise
+    - ``compact``: ``normalized`` with separators removed (matched against)
+    - ``tokens``: separator-delimited runs as (start, end) in ``normalized``
+    """
+
+    __slots__ = ('text', 'normalized', 'compact',
+                 '_compact_pos', '_orig_starts', '_orig_ends', '_tokens')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.normalized, self._orig_starts, self._orig_ends = _normalize(text)
+        self.compact = _SEPARATORS.sub('', self.normalized)
+        self._tokens: Optional[List[Tuple[int, int]]] = None
+
+        # compact index -> normalized index (None when nothing was folded)
+        if len(self.compact) == len(self.normalized):
+            self._compact_pos: Optional[List[int]] = None
+        else:
+            self._compact_pos = [
+                i for i, ch in enumerate(self.normalized) if ch not in _SEPARATOR_SET
+            ]
+
+    @classmethod
+    def after_edit(cls, previous: 'TextIndex', text: str) -> Tuple['TextIndex', IndexEdit]:
+        """Index of text built by re-normalizing only what differs from previous
+
+        Equal to TextIndex(text); unchanged regions of the previous index are
+        reused, so the cost follows the size of the edit rather than the text
+        (apart from C-level slicing and offset shifting).
+        """
+        old = previous.text
+        prefix, suffix = common_affixes(old, text)
+
+        # Re-normalize whole clusters: back up to a starter in both texts
+        while prefix > 0 and (
+            (prefix < len(text) and _joins_previous(text[prefix])) or
+            (prefix < len(old) and _joins_previous(old[prefix]))
+        ):
+            prefix -= 1
+        while suffix > 0 and _joins_previous(text[len(text) - suffix]):
+            suffix -= 1
+        old_end = len(old) - suffix
+        new_end = len(text) - suffix
+
+        middle, mid_starts, mid_ends = _normalize(text[prefix:new_end])
+
+        old_starts = previous._orig_starts
+        if old_starts is None:
+            norm_prefix, norm_old_end = prefix, old_end
+        else:
+            norm_prefix = bisect_left(old_starts, prefix)
+            norm_old_end = bisect_left(old_starts, old_end)
+        normalized = previous.normalized[:norm_prefix] + middle + previous.normalized[norm_old_end:]
+
+        old_pos = previous._compact_pos
+        if old_pos is None:
+            compact_prefix, compact_old_end = norm_prefix, norm_old_end
+        else:
+            compact_prefix = bisect_left(old_pos, norm_prefix)
+            compact_old_end = bisect_left(old_pos, norm_old_end)
+        compact = (
+            previous.compact[:compact_prefix] +
+            _SEPARATORS.sub('', middle) +
+            previous.compact[compact_old_end:]
+        )
+
+        index = cls.__new__(cls)
+        index.text = text
+        index.normalized = normalized
+        index.compact = compact
+        index._tokens = None
+
+        shift = len(text) - len(old)
+        if old_starts is None and mid_starts is None:
+            index._orig_starts = index._orig_ends = None
+        else:
+            old_ends = previous._orig_ends
+            if old_starts is None:
+                old_starts = range(len(previous.normalized))
+                old_ends = range(1, len(previous.normalized) + 1)
+            if mid_starts is None:
+                mid_starts = range(len(middle))
+                mid_ends = range(1, len(middle) + 1)
+            index._orig_starts = (
+                list(old_starts[:norm_prefix]) + _shifted(mid_starts, prefix) +
+                _shifted(old_starts[norm_old_end:], shift)
+            )
+            index._orig_ends = (
+                list(old_ends[:norm_prefix]) + _shifted(mid_ends, prefix) +
+                _shifted(old_ends[norm_old_end:], shift)
+            )
+
+        if len(compact) == len(normalized):
+            index._compact_pos = None
+        else:
+            if old_pos is None:
+                old_pos = range(len(previous.normalized))
+            mid_pos = [
+                norm_prefix + i for i, ch in enumerate(middle) if ch not in _SEPARATOR_SET
+            ]
+            index._compact_pos = (
+                list(old_pos[:compact_prefix]) + mid_pos +
+                _shifted(old_pos[compact_old_end:], len(normalized) - len(previous.normalized))
+            )
+
+        edit = IndexEdit(
+            normalized_prefix=norm_prefix,
+            normalized_suffix=len(previous.normalized) - norm_old_end,
+            compact_prefix=compact_prefix,
+            compact_suffix=len(previous.compact) - compact_old_end,
+        )
+        return index, edit
+
+    @property
+    def tokens(self) -> List[Tuple[int, int]]:
+        if self._tokens is None:
+            self._tokens = [run.span() for run in _CONTENT_RUNS.finditer(self.normalized)]
+        return self._tokens
+
+    def normalized_offset(self, original: int) -> int:
+        """First normalized index produced at or after an original cluster start"""
+        if self._orig_starts is None:
+            return original
+        return bisect_left(self._orig_starts, original)
+
+    def compact_offset(self, normalized: int) -> int:
+        """Compact chars before a normalized index"""
+        if self._compact_pos is None:
+            return normalized
+        return bisect_left(self._compact_pos, normalized)
+
+    def normalized_span(self, start: int, end: int) -> Tuple[int, int]:
+        """compact [start, end) -> normalized [start, end)"""
+        if self._compact_pos is None:
+            return start, end
+        return self._compact_pos[start], self._compact_pos[end - 1] + 1
+
+    def original_span(self, start: int, end: int) -> Tuple[int, int]:
+        """normalized [start, end) -> original text [start, end)"""
+        if self._orig_starts is None:
+            return start, end
+        return self._orig_starts[start], self._orig_ends[end - 1]
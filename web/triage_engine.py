@@ -1,26 +1,77 @@
 """
 Legal Triage Engine - Python port for Streamlit
 Core classification logic (conservative approach)
+
+Import path is kept lean for CLI hooks and pre-commit checks: yaml,
+hashlib, datetime, json, sqlite3 and the process pool are imported on
+first use, never at module import. The result types stay dataclasses.
 """
 
-import hashlib
-from datetime import datetime
-from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any
-from pathlib import Path
-import yaml
+import os
+import sys
+import time
+from _thread import allocate_lock as _allocate_lock
+from dataclasses import dataclass, field, fields
+from typing import (
+    TYPE_CHECKING, Optional, List, Dict, Any, Callable, Iterable, IO, Tuple, Union,
+)
+
+try:  # imported as part of the ``web`` package (python -m web.triage_engine)
+    from .compiled_rubric import CompiledRubric, KeywordHits
+    from .rubric_snapshot import compile_rubric_content, load_snapshot, snapshot_path_for
+except ImportError:  # imported from web/ directly (streamlit run, tests)
+    from compiled_rubric import CompiledRubric, KeywordHits
+    from rubric_snapshot import compile_rubric_content, load_snapshot, snapshot_path_for
+
+if TYPE_CHECKING:
+    import argparse
+    from audit_logger import AuditLogger
+    from compact_results import ResultBatch
+    from metrics import StageTrace, TriageMetrics
+    from precedents import PrecedentIndex
+    from result_cache import ResultCache
+    from rubric_watcher import RubricWatcher
+    from submission_store import SubmissionStore
+
+DEFAULT_RUBRIC_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rubric.yaml"
+)
+
+
+# (start, end, keyword): [start, end) character offsets into the description
+MatchedSpan = Tuple[int, int, str]
+
+# TriageEngine._triage or a stand-in: (input, compiled rubric, trace=...) -> output
+TriageStep = Callable[..., 'TriageOutput']
 
 
 @dataclass
 class DetectedRedFlag:
+    """One red flag found in the description"""
+
     code: str
     reason: str
     matched_keywords: List[str]
     severity: str  # 'critical' | 'high' | 'medium' | 'low'
+    matched_spans: List[MatchedSpan] = field(default_factory=list)
+
+
+@dataclass
+class SimilarCase:
+    """Past case that reads alike (see precedents.PrecedentIndex)"""
+
+    case_id: str
+    title: str
+    date: str
+    decision: str  # legal's routing decision for the case
+    rule_codes: List[str]
+    score: float  # cosine similarity, 0..1
 
 
 @dataclass
 class TriageInput:
+    """Description plus the optional context fields from the form/CLI"""
+
     description: str
     exposure: Optional[str] = None  # 'public' | 'members_only' | 'specific_group' | 'internal_test'
     data_usage: Optional[str] = None  # 'collects' | 'no_collection' | 'unclear'
@@ -31,6 +82,8 @@ class TriageInput:
 
 @dataclass
 class TriageOutput:
+    """Result of one triage() call"""
+
     routing: str  # 'TYPE_1' | 'TYPE_2'
     confidence: float
     red_flags: List[DetectedRedFlag]
@@ -39,42 +92,366 @@ class TriageOutput:
     recommended_next_step: str  # 'LEGAL_REVIEW' | 'PROCEED_WITH_GUARDRAILS'
     timestamp: str
     input_hash: str = ""
+    rubric_version: str = ""
+    rubric_digest: str = ""
+    similar_cases: List[SimilarCase] = field(default_factory=list)
+    trace: Optional[Dict[str, Any]] = None  # per-call stage timings (metrics.TriageMetrics)
+
+
+@dataclass
+class BatchStats:
+    """Timing of one triage_many() call"""
+
+    count: int
+    workers: int
+    elapsed: float  # seconds
+
+    @property
+    def throughput(self) -> float:
+        """Inputs per second"""
+        return self.count / self.elapsed if self.elapsed > 0 else 0.0
+
+
+INPUT_FIELDS = tuple(f.name for f in fields(TriageInput))
+
+
+def input_from_dict(record: Dict[str, Any]) -> TriageInput:
+    """Build TriageInput from a JSON record (unknown keys are ignored)
+
+    CMS exports without ``description`` ({request_id, title, body}) are
+    triaged on title and body joined by a blank line.
+    """
+    values = {name: record.get(name) for name in INPUT_FIELDS}
+    if values['description'] is None and ('title' in record or 'body' in record):
+        values['description'] = '\n\n'.join(
+            part for part in (record.get('title'), record.get('body')) if part
+        )
+    if not isinstance(values['description'], str):
+        raise ValueError("record has no 'description' string")
+    return TriageInput(**values)
+
+
+def output_to_dict(result: TriageOutput) -> Dict[str, Any]:
+    """Serialize TriageOutput (same payload as the Streamlit JSON panel)"""
+    payload = {
+        "routing": result.routing,
+        "confidence": result.confidence,
+        "red_flags": [
+            {
+                "code": f.code,
+                "reason": f.reason,
+                "matched_keywords": f.matched_keywords,
+                "severity": f.severity,
+                "matched_spans": [list(span) for span in f.matched_spans],
+            }
+            for f in result.red_flags
+        ],
+        "missing_info_questions": result.missing_info_questions,
+        "safe_guardrails": result.safe_guardrails,
+        "recommended_next_step": result.recommended_next_step,
+        "timestamp": result.timestamp,
+        "input_hash": result.input_hash,
+        "rubric_version": result.rubric_version,
+        "rubric_digest": result.rubric_digest,
+        "similar_cases": [
+            {
+                "case_id": c.case_id,
+                "title": c.title,
+                "date": c.date,
+                "decision": c.decision,
+                "rule_codes": c.rule_codes,
+                "score": c.score,
+            }
+            for c in result.similar_cases
+        ],
+    }
+    if result.trace is not None:
+        payload["trace"] = result.trace
+    return payload
+
+
+def output_from_dict(payload: Dict[str, Any]) -> TriageOutput:
+    """Rebuild TriageOutput from output_to_dict() payload"""
+    return TriageOutput(
+        routing=payload["routing"],
+        confidence=payload["confidence"],
+        red_flags=[
+            DetectedRedFlag(
+                code=f["code"],
+                reason=f["reason"],
+                matched_keywords=f["matched_keywords"],
+                severity=f["severity"],
+                matched_spans=[tuple(span) for span in f.get("matched_spans", [])],
+            )
+            for f in payload["red_flags"]
+        ],
+        missing_info_questions=payload["missing_info_questions"],
+        safe_guardrails=payload["safe_guardrails"],
+        recommended_next_step=payload["recommended_next_step"],
+        timestamp=payload["timestamp"],
+        input_hash=payload.get("input_hash", ""),
+        rubric_version=payload.get("rubric_version", ""),
+        rubric_digest=payload.get("rubric_digest", ""),
+        similar_cases=[SimilarCase(**c) for c in payload.get("similar_cases", [])],
+        trace=payload.get("trace"),
+    )
+
+
+def _read_rubric(rubric_path: str) -> Tuple[Optional[CompiledRubric], str, bytes]:
+    """(current snapshot or None, SHA-256 digest, content) of a rubric file
+
+    The one place the engine reads rubric.yaml, for both the constructor
+    and hot reload, so the digest used in cache keys is computed the same
+    way on both paths.
+    """
+    import hashlib
+
+    with open(rubric_path, 'rb') as f:
+        content = f.read()
+
+    digest = hashlib.sha256(content).hexdigest()
+    return load_snapshot(snapshot_path_for(rubric_path), digest), digest, content
 
 
 class TriageEngine:
     """Triage Engine - Conservative classification"""
 
-    def __init__(self, rubric_path: Optional[str] = None):
+    def __init__(
+        self,
+        rubric_path: Optional[str] = None,
+        cache: Optional['ResultCache'] = None,
+        audit_log: Optional['AuditLogger'] = None,
+        precedents: Optional['PrecedentIndex'] = None,
+        similar_k: int = 3,
+        metrics: Optional['TriageMetrics'] = None,
+        submissions: Optional['SubmissionStore'] = None,
+    ):
         if rubric_path is None:
-            rubric_path = str(Path(__file__).parent.parent / "rubric.yaml")
-        self.rubric = self._load_rubric(rubric_path)
+            rubric_path = DEFAULT_RUBRIC_PATH
+        self.rubric_path = rubric_path
+        self.cache = cache
+        self.audit_log = audit_log
+        self.precedents = precedents
+        self.similar_k = similar_k
+        self.metrics = metrics
+        self.submissions = submissions
+        self.last_batch_stats: Optional[BatchStats] = None
+        self.last_reload_error: Optional[str] = None
+        self._watcher = None
+        # Every per-call read goes through this one reference, so a reload
+        # swaps the whole rubric atomically and in-flight calls keep theirs.
+        # Without a current snapshot, YAML parsing is deferred to first use
+        # so that cache hits never pay for (or import) PyYAML.
+        self._compiled: Optional[CompiledRubric] = None
+        self._compile_lock = _allocate_lock()
+        self._pending_content: Optional[bytes] = None
+        self._pending_digest = ''
+        self._open_rubric(rubric_path)
+
+    @property
+    def compiled(self) -> CompiledRubric:
+        compiled = self._compiled
+        if compiled is None:
+            with self._compile_lock:
+                if self._compiled is None:
+                    self._compiled = compile_rubric_content(self._pending_content)
+                    self._pending_content = None
+                compiled = self._compiled
+        return compiled
+
+    @property
+    def rubric(self) -> Dict[str, Any]:
+        return self.compiled.rubric
+
+    @property
+    def rubric_digest(self) -> str:
+        compiled = self._compiled
+        return compiled.digest if compiled is not None else self._pending_digest
+
+    def _open_rubric(self, rubric_path: str) -> None:
+        """Read rubric.yaml; use its snapshot if current, else compile lazily"""
+        compiled, digest, content = _read_rubric(rubric_path)
+        if compiled is None:
+            self._pending_content = content
+            self._pending_digest = digest
+        else:
+            self._compiled = compiled
+
+    def reload_rubric(self) -> bool:
+        """Re-read the rubric file and swap it in; keep the old one if invalid"""
+        try:
+            compiled, digest, content = _read_rubric(self.rubric_path)
+            if compiled is None:
+                compiled = compile_rubric_content(content)
+        except Exception as error:  # malformed YAML, failed validation, I/O
+            self.last_reload_error = f"{type(error).__name__}: {error}"
+            return False
 
-    def _load_rubric(self, rubric_path: str) -> Dict[str, Any]:
-        """Load rubric.yaml configuration"""
-        with open(rubric_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        self.last_reload_error = None
+        if digest != self.rubric_digest:
+            with self._compile_lock:
+                self._compiled = compiled
+                self._pending_content = None
+        return True
+
+    def watch_rubric(self, interval: float = 2.0) -> 'RubricWatcher':
+        """Start polling the rubric file and hot-reload it on change"""
+        try:  # imported as part of the ``web`` package
+            from .rubric_watcher import RubricWatcher
+        except ImportError:
+            from rubric_watcher import RubricWatcher
+
+        if self._watcher is None:
+            self._watcher = RubricWatcher(self, interval=interval)
+        self._watcher.start()
+        return self._watcher
 
     def triage(self, input_data: TriageInput) -> TriageOutput:
-        """Main triage function"""
+        """Main triage function (served from the result cache when enabled)"""
+        return self._triage_with(input_data, self._triage)
+
+    def _triage_with(self, input_data: TriageInput, triage: 'TriageStep') -> TriageOutput:
+        """triage() with ``triage`` in place of _triage on a cache miss
+
+        Lets incremental.IncrementalSession reuse its previous scan while
+        keeping the result cache, metrics, audit log and submission store.
+        """
+        if self.metrics is None:
+            result = self._triage_cached(input_data, triage=triage)
+        else:
+            result = self.metrics.run(self, input_data, triage)
+        if self.audit_log is not None:
+            self.audit_log.log(result)
+        if self.submissions is not None:
+            self.submissions.add(input_data, result)
+        return result
+
+    def _triage_cached(
+        self,
+        input_data: TriageInput,
+        trace: Optional['StageTrace'] = None,
+        triage: Optional['TriageStep'] = None,
+    ) -> TriageOutput:
+        if triage is None:
+            triage = self._triage
+        if self.cache is None:
+            return triage(input_data, self.compiled, trace=trace)
+
+        digest = self.rubric_digest
+        key = self._cache_key(input_data, digest)
+        payload = self.cache.get(key, digest)
+        if trace is not None:
+            trace.mark('cache_lookup')
+            trace.cache = 'miss' if payload is None else 'hit'
+        if payload is not None:
+            from datetime import datetime
+
+            # Same decision, but a cached result is never served with a stale timestamp
+            payload["timestamp"] = datetime.now().isoformat()
+            result = output_from_dict(payload)
+            if trace is not None:
+                trace.mark('decode')
+            return result
+
+        compiled = self.compiled
+        if compiled.digest != digest:  # rubric swapped since the lookup
+            key = self._cache_key(input_data, compiled.digest)
+        result = triage(input_data, compiled, trace=trace)
+        self.cache.put(key, compiled.digest, output_to_dict(result))
+        if trace is not None:
+            trace.mark('cache_store')
+        return result
+
+    def _cache_key(self, input_data: TriageInput, rubric_digest: str) -> str:
+        """Input hash + optional fields + rubric content digest
+
+        The digest covers the whole rubric file, so it pins the rubric
+        version too without having to parse the YAML on a cache hit.
+        """
+        import hashlib
+        import json
+
+        parts = [hashlib.sha256(input_data.description.encode()).hexdigest()]
+        parts.extend(getattr(input_data, name) for name in INPUT_FIELDS[1:])
+        parts.append(rubric_digest)
+        if self.precedents is not None:  # similar_cases depend on the index too
+            parts.append(f"precedents:{self.precedents.version}:{self.similar_k}")
+        return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+    def _triage(
+        self,
+        input_data: TriageInput,
+        compiled: CompiledRubric,
+        hits: Optional[KeywordHits] = None,
+        trace: Optional['StageTrace'] = None,
+        input_hash: Optional[str] = None,
+    ) -> TriageOutput:
+        """Run the five triage steps against one compiled rubric
+
+        ``hits`` (and ``input_hash``) may be supplied by a caller that
+        already scanned (and hashed) the description, see
+        incremental.IncrementalSession and document.DocumentScanner.
+        ``trace`` collects per-stage wall time when metrics are enabled.
+        """
+        from datetime import datetime
+
+        mark = trace.mark if trace is not None else _skip_mark
+        mark('rubric')  # first-use compile of a lazily loaded rubric lands here
         timestamp = datetime.now().isoformat()
-        input_hash = self._hash_input(input_data.description)
+        if input_hash is None:
+            input_hash = self._hash_input(input_data.description)
+        mark('hash')
+
+        # One normalized index + automaton pass shared by steps 1-3
+        if hits is None:
+            hits = compiled.scan(input_data.description)
+        mark('scan')
 
         # Step 1: Red flag detection
-        detected_flags = self._detect_red_flags(input_data.description)
+        detected_flags = self._detect_red_flags(input_data.description, compiled, hits)
+        mark('red_flags')
 
         # Step 2: Generate missing info questions
-        missing_questions = self._generate_missing_info_questions(input_data)
+        missing_questions = self._generate_missing_info_questions(
+            input_data, compiled, hits
+        )
+        mark('questions')
 
         # Step 3: Determine guardrails
-        guardrails = self._determine_guardrails(input_data, detected_flags)
+        guardrails = self._determine_guardrails(
+            input_data, detected_flags, compiled, hits
+        )
+        mark('guardrails')
 
         # Step 4: Calculate routing (conservative approach)
         routing, confidence = self._calculate_routing(
-            detected_flags, missing_questions, input_data
+            detected_flags, missing_questions, input_data, compiled
         )
 
         # Step 5: Determine next step
         next_step = self._determine_next_step(routing, confidence)
+        mark('routing')
+
+        # Past cases that read alike (reuses the normalized text of the scan)
+        similar_cases = []
+        if self.precedents is not None:
+            similar_cases = [
+                SimilarCase(
+                    case_id=case['case_id'],
+                    title=case['title'],
+                    date=case['date'],
+                    decision=case['decision'],
+                    rule_codes=case['rule_codes'],
+                    score=score,
+                )
+                for score, case in self.precedents.search_compact(
+                    hits.index.compact, self.similar_k
+                )
+            ]
+            mark('precedents')
+        if trace is not None:
+            trace.keyword_hits = sum(len(spans) for spans in hits.spans.values())
+            trace.keyword_checks = compiled.keyword_checks
 
         return TriageOutput(
             routing=routing,
@@ -85,173 +462,218 @@ class TriageEngine:
             recommended_next_step=next_step,
             timestamp=timestamp,
             input_hash=input_hash,
+            rubric_version=compiled.version,
+            rubric_digest=compiled.digest,
+            similar_cases=similar_cases,
+        )
+
+    def triage_many(
+        self,
+        inputs: Iterable[TriageInput],
+        workers: Optional[int] = None,
+        chunksize: Optional[int] = None,
+        compact: bool = False,
+    ) -> 'Union[List[TriageOutput], ResultBatch]':
+        """Triage many inputs across a process pool (results in input order)
+
+        Each worker loads the rubric once at start-up; only inputs and
+        outputs cross the process boundary. Throughput of the run is kept
+        in ``last_batch_stats``.
+
+        ``compact=True`` returns a compact_results.ResultBatch instead of a
+        list: results are kept as rubric ids in arrays (and workers send
+        back ids only), for runs too large to hold as TriageOutput objects.
+        """
+        inputs = list(inputs)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = max(1, min(workers, len(inputs)))
+
+        start = time.perf_counter()
+        if compact:
+            results = self._triage_many_compact(inputs, workers, chunksize)
+        elif workers == 1:
+            results = [self.triage(input_data) for input_data in inputs]
+        else:
+            if chunksize is None:
+                chunksize = max(1, len(inputs) // (workers * 4))
+            with self._worker_pool(workers) as pool:
+                results = list(pool.map(_triage_in_worker, inputs, chunksize=chunksize))
+            if self.metrics is not None:  # fold worker traces into this registry
+                for result in results:
+                    self.metrics.record_trace(result.trace, result.routing)
+            if self.audit_log is not None:  # workers have no logger of their own
+                for result in results:
+                    self.audit_log.log(result)
+            if self.submissions is not None:
+                for input_data, result in zip(inputs, results):
+                    self.submissions.add(input_data, result)
+
+        self.last_batch_stats = BatchStats(
+            count=len(inputs), workers=workers, elapsed=time.perf_counter() - start
+        )
+        return results
+
+    def _triage_many_compact(
+        self, inputs: List[TriageInput], workers: int, chunksize: Optional[int]
+    ) -> 'ResultBatch':
+        try:  # imported as part of the ``web`` package
+            from .compact_results import CompactTriageOutput, ResultBatch
+        except ImportError:
+            from compact_results import CompactTriageOutput, ResultBatch
+
+        batch = ResultBatch(self.compiled)
+        if workers == 1:
+            for input_data in inputs:  # each full result is dropped once encoded
+                batch.append(self.triage(input_data))
+            return batch
+
+        if chunksize is None:
+            chunksize = max(1, len(inputs) // (workers * 4))
+        digest = batch.rubric.digest
+        record = (
+            self.metrics is not None or self.audit_log is not None
+            or self.submissions is not None
+        )
+        with self._worker_pool(workers) as pool:
+            for input_data, (worker_digest, fields) in zip(inputs, pool.map(
+                _triage_compact_in_worker, inputs, chunksize=chunksize
+            )):
+                if worker_digest != digest:
+                    raise ValueError("rubric file changed during the batch; rerun it")
+                batch.append_fields(fields)
+                if record:
+                    item = CompactTriageOutput(batch.rubric, *fields)
+                    if self.metrics is not None:
+                        self.metrics.record_trace(item.trace, item.routing)
+                    if self.audit_log is not None or self.submissions is not None:
+                        result = item.to_output()
+                        if self.audit_log is not None:
+                            self.audit_log.log(result)
+                        if self.submissions is not None:
+                            self.submissions.add(input_data, result)
+        return batch
+
+    def _worker_pool(self, workers: int) -> Any:
+        """ProcessPoolExecutor whose workers mirror this engine's settings"""
+        from concurrent.futures import ProcessPoolExecutor
+
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(
+                self.rubric_path,
+                self.cache.path if self.cache is not None else None,
+                None,
+                self.precedents.index_dir if self.precedents is not None else None,
+                self.metrics.options() if self.metrics is not None else None,
+            ),
         )
 
-    def _detect_red_flags(self, description: str) -> List[DetectedRedFlag]:
-        """Detect red flags via keyword matching"""
-        normalized_desc = description.lower()
+    def _detect_red_flags(
+        self,
+        description: str,
+        compiled: Optional[CompiledRubric] = None,
+        hits: Optional[KeywordHits] = None,
+    ) -> List[DetectedRedFlag]:
+        """Detect red flags via keyword matching (single automaton pass)
+
+        Each flag carries the (start, end, keyword) spans found by that same
+        pass, as offsets into ``description``.
+        """
+        compiled = compiled or self.compiled
+        if hits is None:
+            hits = compiled.scan(description)
+        original_span = hits.index.original_span
         detected = []
 
-        for flag in self.rubric.get('red_flags', []):
+        for flag in compiled.red_flags:
+            excluded = hits.exclusions(flag.exclude_ids) if flag.exclude_ids else None
             matched_keywords = []
-
-            for keyword in flag.get('keywords', []):
-                if keyword.lower() in normalized_desc:
+            matched_spans = []
+            for keyword, keyword_id in flag.keywords:
+                spans = hits.outside(keyword_id, excluded)
+                if spans:
                     matched_keywords.append(keyword)
+                    matched_spans.extend(
+                        original_span(start, end) + (keyword,) for start, end in spans
+                    )
 
             if matched_keywords:
+                matched_spans.sort()
                 detected.append(DetectedRedFlag(
-                    code=flag['code'],
-                    reason=flag['reason'],
+                    code=flag.code,
+                    reason=flag.reason,
                     matched_keywords=matched_keywords,
-                    severity=flag['severity'],
+                    severity=flag.severity,
+                    matched_spans=matched_spans,
                 ))
 
         return detected
 
-    def _generate_missing_info_questions(self, input_data: TriageInput) -> List[str]:
+    def _generate_missing_info_questions(
+        self,
+        input_data: TriageInput,
+        compiled: Optional[CompiledRubric] = None,
+        hits: Optional[KeywordHits] = None,
+    ) -> List[str]:
         """Generate questions for missing information"""
+        compiled = compiled or self.compiled
+        if hits is None:
+            hits = compiled.scan(input_data.description)
         questions = []
-        normalized_desc = input_data.description.lower()
-
-        for template in self.rubric.get('question_templates', []):
-            should_ask = False
 
+        for template in compiled.questions:
             # trigger_if_unknown: ask if field not provided
-            if template.get('trigger_if_unknown'):
-                should_ask = self._is_category_missing(template['category'], input_data)
+            should_ask = (
+                template.unknown_field is not None and
+                getattr(input_data, template.unknown_field, None) is None
+            )
 
             # trigger_if_contains: ask if description contains keywords
-            if template.get('trigger_if_contains'):
-                for keyword in template['trigger_if_contains']:
-                    if keyword.lower() in normalized_desc:
-                        should_ask = True
-                        break
+            if not should_ask:
+                should_ask = any(
+                    trigger_id in hits for trigger_id in template.trigger_ids
+                )
 
             if should_ask:
-                questions.append(template['question'])
+                questions.append(template.question)
 
         return questions
 
-    def _is_category_missing(self, category: str, input_data: TriageInput) -> bool:
-        """Check if category field is missing"""
-        category_mapping = {
-            'exposure': 'exposure',
-            'data_usage': 'data_usage',
-            'revenue_model': 'revenue_model',
-            'external_communication': 'external_communication',
-            'cross_border': 'cross_border',
-        }
-
-        field_name = category_mapping.get(category)
-        if not field_name:
-            return False
-
-        return getattr(input_data, field_name, None) is None
-
     def _determine_guardrails(
-        self, input_data: TriageInput, detected_flags: List[DetectedRedFlag]
+        self,
+        input_data: TriageInput,
+        detected_flags: List[DetectedRedFlag],
+        compiled: Optional[CompiledRubric] = None,
+        hits: Optional[KeywordHits] = None,
     ) -> List[str]:
-        """Determine applicable guardrails"""
-        guardrails = []
-        normalized_desc = input_data.description.lower()
-        flag_codes = [f.code for f in detected_flags]
-
-        for guardrail in self.rubric.get('safe_guardrails', []):
-            should_include = False
-            condition = guardrail.get('condition', '')
-
-            # Condition-based guardrail matching
-            if condition == 'data_collection':
-                should_include = (
-                    input_data.data_usage in ('collects', 'unclear') or
-                    'PII_COLLECTION' in flag_codes
-                )
-
-            elif condition == 'marketing':
-                should_include = (
-                    '마케팅' in normalized_desc or
-                    '광고' in normalized_desc or
-                    'marketing' in normalized_desc or
-                    'EXAGGERATED_AD' in flag_codes or
-                    'CELEBRITY_MEDICAL_ENDORSEMENT' in flag_codes
-                )
-
-            elif condition == 'user_content':
-                should_include = (
-                    'ugc' in normalized_desc or
-                    '사용자 생성' in normalized_desc or
-                    '댓글' in normalized_desc or
-                    '리뷰' in normalized_desc or
-                    'USER_CONTENT_LIABILITY' in flag_codes
-                )
-
-            elif condition == 'terms_update':
-                should_include = (
-                    '약관' in normalized_desc or
-                    '정책 변경' in normalized_desc or
-                    'terms' in normalized_desc
-                )
-
-            elif condition == 'refund':
-                should_include = (
-                    input_data.revenue_model in ('paid_once', 'subscription') or
-                    'PAYMENT_HANDLING' in flag_codes
-                )
-
-            # Medical ad specific guardrails
-            elif condition in ('medical_ad_general', 'individual_variance',
-                             'side_effect_disclosure', 'medical_consultation_required'):
-                should_include = any(
-                    code in flag_codes for code in [
-                        'PROCEDURE_MENTION', 'MEDICAL_CLAIM', 'EFFECT_GUARANTEE',
-                        'NO_SIDE_EFFECT_DISCLOSURE', 'EXAGGERATED_MEDICAL_CLAIM'
-                    ]
-                )
-
-            elif condition == 'before_after_restriction':
-                should_include = 'BEFORE_AFTER_PHOTO' in flag_codes
-
-            elif condition == 'review_restriction':
-                should_include = 'PATIENT_TESTIMONIAL' in flag_codes
-
-            elif condition == 'price_event_restriction':
-                should_include = 'PRICE_DISCOUNT_EVENT' in flag_codes
-
-            elif condition == 'gift_restriction':
-                should_include = 'GIFT_INCENTIVE' in flag_codes
-
-            elif condition == 'superlative_removal':
-                should_include = 'COMPARATIVE_SUPERIORITY' in flag_codes
-
-            elif condition == 'guarantee_removal':
-                should_include = 'EFFECT_GUARANTEE' in flag_codes
-
-            elif condition == 'endorsement_disclosure':
-                should_include = 'CELEBRITY_MEDICAL_ENDORSEMENT' in flag_codes
-
-            elif condition == 'ugc_monitoring':
-                should_include = 'USER_CONTENT_LIABILITY' in flag_codes
-
-            elif condition == 'review_incentive_prohibition':
-                should_include = 'REVIEW_MANIPULATION' in flag_codes
-
-            if should_include:
-                guardrails.append(guardrail['text'])
-
-        return guardrails
+        """Determine applicable guardrails (condition -> predicate dispatch)"""
+        compiled = compiled or self.compiled
+        if hits is None:
+            hits = compiled.scan(input_data.description)
+        found_terms = compiled.found_guardrail_terms(hits)
+        flag_codes = frozenset(f.code for f in detected_flags)
+
+        return [
+            guardrail.text
+            for guardrail in compiled.guardrails
+            if guardrail.predicate is not None and
+            guardrail.predicate(input_data, found_terms, flag_codes)
+        ]
 
     def _calculate_routing(
         self,
         detected_flags: List[DetectedRedFlag],
         missing_questions: List[str],
-        input_data: TriageInput
+        input_data: TriageInput,
+        compiled: Optional[CompiledRubric] = None,
     ) -> tuple:
         """Calculate final routing and confidence (conservative approach)"""
-        policy = self.rubric.get('routing_policy', {})
-        default_routing = policy.get('default', 'TYPE_1')
-        confidence_threshold = policy.get('confidence_threshold', 0.7)
-        missing_info_action = policy.get('missing_info_action', 'TYPE_1')
+        compiled = compiled or self.compiled
+        default_routing = compiled.default_routing
+        confidence_threshold = compiled.confidence_threshold
+        missing_info_action = compiled.missing_info_action
 
         # Critical severity -> always TYPE_1
         has_critical = any(f.severity == 'critical' for f in detected_flags)
@@ -309,8 +731,641 @@ class TriageEngine:
 
     def _hash_input(self, description: str) -> str:
         """Hash input for privacy"""
+        import hashlib
+
         return hashlib.sha256(description.encode()).hexdigest()[:16]
 
     def get_rubric(self) -> Dict[str, Any]:
         """Get rubric (for testing)"""
         return self.rubric
+
+
+def _skip_mark(stage: str) -> None:
+    """Stage marker used when metrics are off"""
+
+
+# ============================================================
+# Process pool workers (one engine per worker process)
+# ============================================================
+
+_worker_engine: Optional[TriageEngine] = None
+
+
+def _init_worker(
+    rubric_path: str,
+    cache_path: Optional[str] = None,
+    watch_interval: Optional[float] = None,
+    precedents_dir: Optional[str] = None,
+    metrics_options: Optional[Dict[str, Any]] = None,
+) -> None:
+    global _worker_engine
+    try:  # imported as part of the ``web`` package
+        from .precedents import PrecedentIndex
+        from .result_cache import ResultCache
+    except ImportError:
+        from precedents import PrecedentIndex
+        from result_cache import ResultCache
+
+    cache = ResultCache(path=cache_path) if cache_path is not None else None
+    precedents = PrecedentIndex(precedents_dir) if precedents_dir is not None else None
+    metrics = None
+    if metrics_options is not None:  # outputs carry their trace back to the parent
+        try:
+            from .metrics import TriageMetrics
+        except ImportError:
+            from metrics import TriageMetrics
+        metrics = TriageMetrics(**metrics_options)
+    _worker_engine = TriageEngine(rubric_path, cache=cache, precedents=precedents, metrics=metrics)
+    if watch_interval is not None:  # long-lived workers (serve) follow rubric edits
+        _worker_engine.watch_rubric(watch_interval)
+
+
+def _triage_in_worker(input_data: TriageInput) -> TriageOutput:
+    return _worker_engine.triage(input_data)
+
+
+def _triage_compact_in_worker(input_data: TriageInput) -> Tuple[str, tuple]:
+    """(rubric digest, compact_results.encode fields): ids only cross the pool"""
+    try:  # imported as part of the ``web`` package
+        from .compact_results import encode
+    except ImportError:
+        from compact_results import encode
+
+    result = _worker_engine.triage(input_data)
+    compiled = _worker_engine.compiled
+    return compiled.digest, encode(result, compiled)
+
+
+# ============================================================
+# CLI: python -m web.triage_engine <command>
+# ============================================================
+
+def _open_text(path: str, mode: str) -> IO[str]:
+    """Open path for text I/O ('-' means stdin/stdout)"""
+    if path == '-':
+        return sys.stdin if 'r' in mode else sys.stdout
+    return open(path, mode, encoding='utf-8')
+
+
+def _read_inputs(stream: IO[str]) -> List[TriageInput]:
+    import json
+
+    return [input_from_dict(json.loads(line)) for line in stream if line.strip()]
+
+
+def _run_batch(engine: TriageEngine, args: 'argparse.Namespace') -> int:
+    import json
+
+    src = _open_text(args.input, 'r')
+    try:
+        inputs = _read_inputs(src)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+
+    results = engine.triage_many(
+        inputs, workers=args.workers, chunksize=args.chunksize, compact=args.compact
+    )
+
+    dst = _open_text(args.output, 'w')
+    try:
+        for result in results:
+            payload = result.to_dict() if args.compact else output_to_dict(result)
+            dst.write(json.dumps(payload, ensure_ascii=False) + '\n')
+    finally:
+        if dst is not sys.stdout:
+            dst.close()
+
+    stats = engine.last_batch_stats
+    print(
+        f"triaged {stats.count} inputs in {stats.elapsed:.2f}s "
+        f"({stats.throughput:.1f} inputs/s, workers={stats.workers})",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def _run_stream(engine: TriageEngine, args: 'argparse.Namespace') -> int:
+    try:  # imported as part of the ``web`` package
+        from .pipeline import run_stream
+    except ImportError:
+        from pipeline import run_stream
+
+    written = run_stream(
+        engine,
+        input_path=args.input,
+        output_path=args.output,
+        checkpoint_path=args.checkpoint,
+        checkpoint_every=args.checkpoint_every,
+        resume=args.resume,
+        start_line=args.start_line,
+        start_offset=args.start_offset,
+    )
+    print(f"triaged {written} inputs", file=sys.stderr)
+    if engine.cache is not None:
+        stats = engine.cache.stats()
+        print(
+            f"cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']:.0%} hit rate)",
+            file=sys.stderr,
+        )
+    return 0
+
+
+def _run_document(engine: TriageEngine, args: 'argparse.Namespace') -> int:
+    import json
+
+    try:  # imported as part of the ``web`` package
+        from .document import DEFAULT_CHUNK_CHARS, result_to_dict, triage_document_file
+    except ImportError:
+        from document import DEFAULT_CHUNK_CHARS, result_to_dict, triage_document_file
+
+    result = triage_document_file(
+        engine,
+        args.input,
+        chunk_chars=args.chunk_chars or DEFAULT_CHUNK_CHARS,
+        routing_only=args.routing_only,
+        **{field: getattr(args, field) for field in INPUT_FIELDS[1:]},
+    )
+    print(json.dumps(result_to_dict(result), ensure_ascii=False, indent=2))
+    print(
+        f"scanned {result.scanned_chars} chars in {result.chunks} chunks, "
+        f"{len(result.sections)} sections"
+        + (' (stopped at a critical flag)' if result.stopped_early else ''),
+        file=sys.stderr,
+    )
+    return 0
+
+
+def _report_metrics(metrics: 'TriageMetrics', path: Optional[str]) -> None:
+    """Stage summary on stderr; the full registry to path when given"""
+    for line in metrics.summary_lines():
+        print(line, file=sys.stderr)
+    if path is not None:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(metrics.render())
+        print(f"wrote {path}", file=sys.stderr)
+
+
+def _run_stats(args: 'argparse.Namespace') -> int:
+    import json
+
+    try:  # imported as part of the ``web`` package
+        from .audit_analytics import AuditAnalytics, format_summary
+    except ImportError:
+        from audit_analytics import AuditAnalytics, format_summary
+
+    summary = AuditAnalytics(args.log_dir).summary(args.since, args.until)
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    else:
+        for line in format_summary(summary):
+            print(line)
+    return 0
+
+
+def _run_index_cases(args: 'argparse.Namespace') -> int:
+    try:  # imported as part of the ``web`` package
+        from .case_ingest import CaseIngestor
+        from .precedents import DEFAULT_CASES_DIR, DEFAULT_INDEX_DIR, PrecedentIndex
+    except ImportError:
+        from case_ingest import CaseIngestor
+        from precedents import DEFAULT_CASES_DIR, DEFAULT_INDEX_DIR, PrecedentIndex
+
+    cases_dir = args.cases_dir or DEFAULT_CASES_DIR
+    start = time.perf_counter()
+    ingest = CaseIngestor(cases_dir, workers=args.workers).ingest()
+    print(
+        f"index.jsonl: {len(ingest.added)} added, {len(ingest.updated)} updated, "
+        f"{len(ingest.removed)} removed, {ingest.unchanged} unchanged",
+        file=sys.stderr,
+    )
+    for name in ingest.failed:
+        print(f"[WARN] case.yaml missing or malformed: {name}", file=sys.stderr)
+
+    index = PrecedentIndex(args.index_dir or DEFAULT_INDEX_DIR)
+    indexed = index.update(cases_dir, full=args.full, workers=args.workers)
+    print(
+        f"indexed {indexed} new or changed cases in {time.perf_counter() - start:.2f}s "
+        f"({len(index)} cases in {index.index_dir})",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def _run_check_anonymization(args: 'argparse.Namespace') -> int:
+    try:  # imported as part of the ``web`` package
+        from .anonymize import AnonymizationScanner, check_case, format_case, format_results
+        from .case_ingest import DEFAULT_CASES_DIR
+    except ImportError:
+        from anonymize import AnonymizationScanner, check_case, format_case, format_results
+        from case_ingest import DEFAULT_CASES_DIR
+
+    print('=== Anonymization Check ===\n')
+    if args.case_dir:
+        case_path = os.path.abspath(args.case_dir)
+        results = check_case(case_path)
+        for line in format_case(case_path, results):
+            print(line)
+        return 0 if all(result.passed for result in results) else 1
+
+    scanner = AnonymizationScanner(args.cases_dir or DEFAULT_CASES_DIR, workers=args.workers)
+    results = scanner.check_all()
+    for line in format_results(results):
+        print(line)
+    passed = all(result.passed for file_results in results.values() for result in file_results)
+    print('\n=== Summary ===')
+    print(f"Total cases: {len(results)}")
+    print(f"Status: {'ALL PASSED' if passed else 'SOME FAILED'}")
+    return 0 if passed else 1
+
+
+def _run_regress(args: 'argparse.Namespace') -> int:
+    import json
+
+    try:  # imported as part of the ``web`` package
+        from . import regression
+    except ImportError:
+        import regression
+
+    rubric_path = args.rubric or DEFAULT_RUBRIC_PATH
+    items = [] if args.no_cases else regression.load_cases(args.cases_dir or regression.DEFAULT_CASES_DIR)
+    for path in args.sets:
+        items.extend(regression.load_labeled(path))
+
+    proposed_path = None
+    if args.proposal:
+        import tempfile
+
+        fd, proposed_path = tempfile.mkstemp(suffix='.yaml', prefix='rubric-proposed-')
+        os.close(fd)
+        rubric_path = regression.write_proposed_rubric(rubric_path, args.proposal, proposed_path)
+    try:
+        outcomes, stats = regression.replay(
+            items, rubric_path, workers=args.workers, chunksize=args.chunksize
+        )
+        baseline_path = args.baseline or regression.DEFAULT_BASELINE_PATH
+        if args.update_baseline:
+            regression.write_baseline(items, outcomes, TriageEngine(rubric_path), baseline_path)
+            print(f"wrote {baseline_path} ({len(items)} items)", file=sys.stderr)
+            return 0
+    finally:
+        if proposed_path is not None:
+            os.remove(proposed_path)
+
+    report = regression.compare(items, outcomes, stats, regression.read_baseline(baseline_path))
+    if args.json:
+        print(json.dumps(report.to_dict(), ensure_ascii=False, indent=2))
+    else:
+        for line in regression.format_report(report):
+            print(line)
+    return 0 if report.passed(strict=args.strict) else 1
+
+
+def _run_impact(args: 'argparse.Namespace') -> int:
+    import json
+
+    try:  # imported as part of the ``web`` package
+        from . import regression, rubric_impact
+    except ImportError:
+        import regression
+        import rubric_impact
+
+    start = time.perf_counter()
+    corpus = rubric_impact.CorpusIndex(args.corpus, args.index_dir)
+    indexed = corpus.update(workers=args.workers)
+    print(
+        f"indexed {indexed} new inputs in {time.perf_counter() - start:.2f}s "
+        f"({len(corpus)} inputs in {corpus.index_dir})",
+        file=sys.stderr,
+    )
+
+    rubric_path = args.rubric or DEFAULT_RUBRIC_PATH
+    proposed_path = args.proposed_rubric
+    if args.proposal:
+        import tempfile
+
+        fd, proposed_path = tempfile.mkstemp(suffix='.yaml', prefix='rubric-proposed-')
+        os.close(fd)
+        regression.write_proposed_rubric(rubric_path, args.proposal, proposed_path)
+    try:
+        report = rubric_impact.simulate(
+            corpus, proposed_path, rubric_path, workers=args.workers, chunksize=args.chunksize
+        )
+    finally:
+        if args.proposal:
+            os.remove(proposed_path)
+
+    if args.json:
+        print(json.dumps(report.to_dict(), ensure_ascii=False, indent=2))
+    else:
+        for line in rubric_impact.format_impact(report):
+            print(line)
+    return 0
+
+
+def _run_search(args: 'argparse.Namespace') -> int:
+    import json
+
+    try:  # imported as part of the ``web`` package
+        from .submission_store import DEFAULT_STORE_DIR, SubmissionStore
+    except ImportError:
+        from submission_store import DEFAULT_STORE_DIR, SubmissionStore
+
+    store_dir = args.store or DEFAULT_STORE_DIR
+    if not os.path.isdir(store_dir):
+        print(f"no submission store at {store_dir} (triage with --store first)", file=sys.stderr)
+        return 1
+    start = time.perf_counter()
+    try:
+        store = SubmissionStore(store_dir, writable=False)
+    except PermissionError as error:
+        print(str(error), file=sys.stderr)
+        return 1
+    try:
+        found = store.search(args.terms, match_all=not args.any, limit=args.limit)
+    except ValueError as error:
+        print(str(error), file=sys.stderr)
+        return 2
+    for item in found:
+        if args.json:
+            print(json.dumps({
+                'doc': item.doc,
+                'input': {
+                    name: getattr(item.input, name) for name in INPUT_FIELDS
+                    if getattr(item.input, name) is not None
+                },
+                'output': output_to_dict(item.output),
+                'spans': item.spans,
+            }, ensure_ascii=False))
+        else:
+            description = item.input.description
+            first, last = item.spans[0]
+            snippet = description[max(0, first - 30):last + 30].replace('\n', ' ')
+            print(f"#{item.doc}  {item.output.routing:<8} {item.output.input_hash[:12]}  {snippet}")
+    print(f"{len(found)} submissions in {time.perf_counter() - start:.3f}s", file=sys.stderr)
+    return 0
+
+
+def _run_serve(engine: TriageEngine, args: 'argparse.Namespace') -> int:
+    import asyncio
+
+    try:  # imported as part of the ``web`` package
+        from .triage_service import TriageService, serve
+    except ImportError:
+        from triage_service import TriageService, serve
+
+    service = TriageService(
+        engine,
+        workers=args.workers,
+        max_batch=args.max_batch,
+        max_delay=args.max_delay_ms / 1000,
+        queue_size=args.queue_size,
+        timeout=args.timeout,
+    )
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    try:  # imported as part of the ``web`` package
+        from .result_cache import ResultCache
+        from .rubric_snapshot import write_snapshot
+    except ImportError:
+        from result_cache import ResultCache
+        from rubric_snapshot import write_snapshot
+
+    parser = argparse.ArgumentParser(
+        prog='python -m web.triage_engine',
+        description='Legal Triage Engine (Python)',
+    )
+    parser.add_argument('--rubric', default=None, help='rubric.yaml path')
+    parser.add_argument('--cache', default=None,
+                        help='sqlite result cache path (reuse results for duplicate inputs)')
+    parser.add_argument('--audit-log', default=None, metavar='DIR',
+                        help='write privacy-safe audit log segments to DIR')
+    parser.add_argument('--precedents', default=None, metavar='DIR',
+                        help='add similar past cases from this precedent index to each result')
+    parser.add_argument('--store', default=None, metavar='DIR',
+                        help='keep triaged inputs with their results in a searchable store '
+                             '(owner-only DIR)')
+    parser.add_argument('--metrics', action='store_true',
+                        help='time each triage stage (GET /metrics for serve, summary on stderr)')
+    parser.add_argument('--metrics-out', default=None, metavar='FILE',
+                        help='write Prometheus text metrics to FILE after batch/stream')
+    parser.add_argument('--profile-every', type=int, default=0, metavar='N',
+                        help='profile every Nth triage call (implies --metrics)')
+    parser.add_argument('--profiler', choices=('cprofile', 'pyinstrument'), default='cprofile',
+                        help='profiler for sampled calls (default: cprofile)')
+    parser.add_argument('--profile-dir', default=None, metavar='DIR',
+                        help='write sampled profiles to DIR (.prof / .html)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    batch = subparsers.add_parser('batch', help='triage a JSONL file across a process pool')
+    batch.add_argument('input', help="JSONL file of TriageInput records ('-' for stdin)")
+    batch.add_argument('-o', '--output', default='-', help="JSONL output ('-' for stdout)")
+    batch.add_argument('-w', '--workers', type=int, default=None,
+                       help='worker processes (default: CPU count)')
+    batch.add_argument('--chunksize', type=int, default=None,
+                       help='inputs per task sent to a worker')
+    batch.add_argument('--compact', action='store_true',
+                       help='hold results as rubric ids until written (large runs)')
+
+    stream = subparsers.add_parser('stream', help='triage a JSONL stream with bounded memory')
+    stream.add_argument('input', nargs='?', default='-',
+                        help="JSONL file of TriageInput records ('-' for stdin)")
+    stream.add_argument('-o', '--output', default='-', help="JSONL output ('-' for stdout)")
+    stream.add_argument('--checkpoint', default=None, help='checkpoint file path')
+    stream.add_argument('--checkpoint-every', type=int, default=1000,
+                        help='records between checkpoints')
+    stream.add_argument('--resume', action='store_true',
+                        help='resume from the checkpoint file')
+    stream.add_argument('--start-line', type=int, default=0,
+                        help='skip this many input lines (stdin)')
+    stream.add_argument('--start-offset', type=int, default=0,
+                        help='start at this input byte offset (files)')
+
+    document = subparsers.add_parser(
+        'document', help='triage one long text file in overlapping chunks, per section'
+    )
+    document.add_argument('input', help='UTF-8 text file (brief, PDF text, slide notes)')
+    document.add_argument('--chunk-chars', type=int, default=None,
+                          help='characters per scan window (default: 65536)')
+    document.add_argument('--routing-only', action='store_true',
+                          help='stop scanning once a critical flag fixes the routing')
+    for field in INPUT_FIELDS[1:]:
+        document.add_argument(f"--{field.replace('_', '-')}", default=None)
+
+    subparsers.add_parser(
+        'compile-rubric', help='write a precompiled snapshot next to rubric.yaml'
+    )
+
+    index_cases = subparsers.add_parser(
+        'index-cases', help='update index.jsonl and the precedent index from data/cases'
+    )
+    index_cases.add_argument('--cases-dir', default=None, help='case folders (default: data/cases)')
+    index_cases.add_argument('--index-dir', default=None,
+                             help='index directory (default: data/cases/.precedents)')
+    index_cases.add_argument('--full', action='store_true',
+                             help='rebuild the precedent index from scratch')
+    index_cases.add_argument('-w', '--workers', type=int, default=None,
+                             help='threads reading case folders')
+
+    check_anonymization = subparsers.add_parser(
+        'check-anonymization', help='scan case files for personal data (npm run case:anonymize)'
+    )
+    check_anonymization.add_argument('case_dir', nargs='?', default=None,
+                                     help='check one case folder (default: every indexed case)')
+    check_anonymization.add_argument('--cases-dir', default=None,
+                                     help='case folders (default: data/cases)')
+    check_anonymization.add_argument('-w', '--workers', type=int, default=None,
+                                     help='worker processes (default: CPU count)')
+
+    regress = subparsers.add_parser(
+        'regress', help='replay data/cases and labeled JSONL sets, diff against a baseline'
+    )
+    regress.add_argument('sets', nargs='*',
+                         help='labeled JSONL sets (TriageInput + expected_routing/expected_codes)')
+    regress.add_argument('--cases-dir', default=None, help='case folders (default: data/cases)')
+    regress.add_argument('--no-cases', action='store_true', help='replay only the given sets')
+    regress.add_argument('--baseline', default=None,
+                         help='baseline file (default: data/regression-baseline.json)')
+    regress.add_argument('--update-baseline', action='store_true',
+                         help='store this run as the baseline instead of diffing')
+    regress.add_argument('--proposal', default=None,
+                         help='apply a rubric update proposal (applyProposal) before replaying')
+    regress.add_argument('--strict', action='store_true',
+                         help='fail on any flip, flag diff or label mismatch, not only false negatives')
+    regress.add_argument('--json', action='store_true', help='print the report as JSON')
+    regress.add_argument('-w', '--workers', type=int, default=None,
+                         help='worker processes (default: CPU count)')
+    regress.add_argument('--chunksize', type=int, default=500,
+                         help='items per task sent to a worker')
+
+    impact = subparsers.add_parser(
+        'impact', help='routing flips a rubric proposal would cause over a stored input corpus'
+    )
+    impact.add_argument('corpus', help='JSONL of past TriageInput records')
+    proposed = impact.add_mutually_exclusive_group(required=True)
+    proposed.add_argument('--proposal', default=None,
+                          help='rubric update proposal YAML (applied like applyProposal)')
+    proposed.add_argument('--proposed-rubric', default=None, help='edited rubric.yaml')
+    impact.add_argument('--index-dir', default=None,
+                        help='corpus n-gram index (default: <corpus>.ngrams)')
+    impact.add_argument('--json', action='store_true', help='print the report as JSON')
+    impact.add_argument('-w', '--workers', type=int, default=None,
+                        help='worker processes (default: CPU count)')
+    impact.add_argument('--chunksize', type=int, default=500,
+                        help='inputs per worker task')
+
+    search = subparsers.add_parser(
+        'search', help='past submissions (in --store) whose description contains the terms'
+    )
+    search.add_argument('terms', nargs='+', help='substrings to look for (spacing is ignored)')
+    search.add_argument('--any', action='store_true',
+                        help='match submissions containing any term (default: all terms)')
+    search.add_argument('--limit', type=int, default=100, help='most results, newest first')
+    search.add_argument('--json', action='store_true', help='print results as JSONL')
+
+    stats = subparsers.add_parser('stats', help='summarize audit logs (cached rollups)')
+    stats.add_argument('--log-dir', default=None,
+                       help='audit log directory (default: .legal-triage-logs)')
+    stats.add_argument('--since', default=None, help='first day (YYYY-MM-DD)')
+    stats.add_argument('--until', default=None, help='last day (YYYY-MM-DD)')
+    stats.add_argument('--json', action='store_true', help='print the rollups as JSON')
+
+    serve = subparsers.add_parser('serve', help='run the micro-batching HTTP service')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8080)
+    serve.add_argument('-w', '--workers', type=int, default=0,
+                       help='worker processes (default: 0, triage on one thread in-process)')
+    serve.add_argument('--max-batch', type=int, default=32,
+                       help='most requests dispatched together')
+    serve.add_argument('--max-delay-ms', type=float, default=2.0,
+                       help='longest wait for a batch to fill')
+    serve.add_argument('--queue-size', type=int, default=1024,
+                       help='waiting requests before new ones get 503')
+    serve.add_argument('--timeout', type=float, default=2.0,
+                       help='per-request timeout in seconds (504 after)')
+
+    args = parser.parse_args(argv)
+    if args.command == 'compile-rubric':
+        snapshot_path = write_snapshot(args.rubric or DEFAULT_RUBRIC_PATH)
+        print(f"wrote {snapshot_path}", file=sys.stderr)
+        return 0
+    if args.command == 'stats':
+        return _run_stats(args)
+    if args.command == 'index-cases':
+        return _run_index_cases(args)
+    if args.command == 'check-anonymization':
+        return _run_check_anonymization(args)
+    if args.command == 'regress':
+        return _run_regress(args)
+    if args.command == 'impact':
+        return _run_impact(args)
+    if args.command == 'search':
+        return _run_search(args)
+
+    cache = ResultCache(path=args.cache) if args.cache else None
+    audit_log = None
+    if args.audit_log:
+        try:  # imported as part of the ``web`` package
+            from .audit_logger import AuditLogger
+        except ImportError:
+            from audit_logger import AuditLogger
+        audit_log = AuditLogger(args.audit_log)
+    precedents = None
+    if args.precedents:
+        try:  # imported as part of the ``web`` package
+            from .precedents import PrecedentIndex
+        except ImportError:
+            from precedents import PrecedentIndex
+        precedents = PrecedentIndex(args.precedents)
+    metrics = None
+    if args.metrics or args.metrics_out or args.profile_every:
+        try:  # imported as part of the ``web`` package
+            from .metrics import TriageMetrics
+        except ImportError:
+            from metrics import TriageMetrics
+        try:
+            metrics = TriageMetrics(
+                profile_every=args.profile_every,
+                profiler=args.profiler,
+                profile_dir=args.profile_dir,
+            )
+        except ValueError as error:
+            parser.error(str(error))
+    submissions = None
+    if args.store:
+        try:  # imported as part of the ``web`` package
+            from .submission_store import SubmissionStore
+        except ImportError:
+            from submission_store import SubmissionStore
+        try:
+            submissions = SubmissionStore(args.store)
+        except (PermissionError, RuntimeError) as error:
+            parser.error(str(error))
+    engine = TriageEngine(
+        args.rubric, cache=cache, audit_log=audit_log, precedents=precedents, metrics=metrics,
+        submissions=submissions,
+    )
+
+    if args.command in ('batch', 'stream'):
+        status = _run_batch(engine, args) if args.command == 'batch' else _run_stream(engine, args)
+        if metrics is not None:
+            _report_metrics(metrics, args.metrics_out)
+        return status
+    if args.command == 'document':
+        return _run_document(engine, args)
+    if args.command == 'serve':
+        return _run_serve(engine, args)
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
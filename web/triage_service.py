@@ -0,0 +1,395 @@
+"""
+Triage Service - asyncio HTTP 서비스 (마이크로 배치)
+동시 요청을 짧은 대기 시간 동안 모아 워커 풀에 한 번에 전달
+
+Endpoints:
+    POST /triage   TriageInput JSON -> Streamlit JSON 패널과 동일한 payload
+    GET  /healthz  상태, rubric 버전/다이제스트, 대기열 길이
+    GET  /metrics  Prometheus text 형식 계측 지표 (--metrics 로 켰을 때)
+
+Usage:
+    python -m web.triage_engine serve --port 8080 --workers 4
+"""
+
+import asyncio
+import json
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+try:  # imported as part of the ``web`` package (python -m web.triage_engine)
+    from .triage_engine import (
+        TriageEngine, TriageInput, _init_worker, input_from_dict, output_to_dict,
+    )
+    from . import triage_engine as _engine_module
+except ImportError:  # imported from web/ directly (streamlit run, tests)
+    from triage_engine import (
+        TriageEngine, TriageInput, _init_worker, input_from_dict, output_to_dict,
+    )
+    import triage_engine as _engine_module
+
+MAX_BODY_BYTES = 1 << 20
+MAX_HEADER_BYTES = 16 << 10
+
+REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    411: 'Length Required', 413: 'Payload Too Large', 500: 'Internal Server Error',
+    503: 'Service Unavailable', 504: 'Gateway Timeout',
+}
+
+Pending = Tuple[TriageInput, 'asyncio.Future[Dict[str, Any]]']
+
+
+def _triage_batch(engine: TriageEngine, inputs: List[TriageInput]) -> List[Dict[str, Any]]:
+    return [output_to_dict(engine.triage(input_data)) for input_data in inputs]
+
+
+def _triage_batch_in_worker(inputs: List[TriageInput]) -> List[Dict[str, Any]]:
+    return _triage_batch(_engine_module._worker_engine, inputs)
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class TriageService:
+    """Micro-batching front end for TriageEngine
+
+    Requests wait at most ``max_delay`` seconds for up to ``max_batch``
+    others before their batch is dispatched. At most ``workers`` batches
+    run at once; beyond ``queue_size`` waiting requests new ones get 503
+    immediately instead of queueing without bound. A request that is not
+    answered within ``timeout`` seconds gets 504.
+
+    ``workers=0`` triages on a single thread in this process (the engine's
+    result cache and rubric watcher apply directly); otherwise each worker
+    process loads its own engine and watches the rubric itself.
+    """
+
+    def __init__(
+        self,
+        engine: TriageEngine,
+        workers: int = 0,
+        max_batch: int = 32,
+        max_delay: float = 0.002,
+        queue_size: int = 1024,
+        timeout: float = 2.0,
+        watch_interval: Optional[float] = 2.0,
+    ):
+        self.engine = engine
+        self.workers = workers
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.watch_interval = watch_interval
+
+        self.requests = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.batches = 0
+
+        self._queue: Optional['asyncio.Queue[Pending]'] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._executor: Optional[Executor] = None
+        self._batcher: Optional['asyncio.Task[None]'] = None
+        self._in_flight: Set['asyncio.Task[None]'] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    # ----------------------------------------------------------
+    # Lifecycle
+    # ----------------------------------------------------------
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080) -> asyncio.AbstractServer:
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._slots = asyncio.Semaphore(max(1, self.workers))
+        if self.workers > 0:
+            cache = self.engine.cache
+            precedents = self.engine.precedents
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(
+                    self.engine.rubric_path,
+                    cache.path if cache is not None else None,
+                    self.watch_interval,
+                    precedents.index_dir if precedents is not None else None,
+                    self.engine.metrics.options() if self.engine.metrics is not None else None,
+                ),
+            )
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='triage')
+        if self.watch_interval is not None:
+            self.engine.watch_rubric(self.watch_interval)
+
+        self._batcher = asyncio.create_task(self._run_batcher())
+        self._server = await asyncio.start_server(
+            self._handle_connection, host, port, limit=MAX_HEADER_BYTES
+        )
+        return self._server
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    # ----------------------------------------------------------
+    # Micro-batching
+    # ----------------------------------------------------------
+
+    async def submit(self, input_data: TriageInput) -> Dict[str, Any]:
+        """Queue one input and wait for its output dict"""
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((input_data, future))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise HTTPError(503, 'triage queue is full, retry later') from None
+
+        try:
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise HTTPError(504, f'triage did not finish within {self.timeout}s') from None
+
+    async def _run_batcher(self) -> None:
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            # Give concurrent requests max_delay to arrive, then take what is
+            # there without blocking (a cancelled get() could drop an item)
+            if self.max_delay > 0 and queue.qsize() < self.max_batch - 1:
+                await asyncio.sleep(self.max_delay)
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            await self._slots.acquire()
+            task = asyncio.create_task(self._dispatch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _dispatch(self, batch: List[Pending]) -> None:
+        try:
+            # Requests that already timed out are not worth triaging
+            batch = [(input_data, future) for input_data, future in batch if not future.done()]
+            if not batch:
+                return
+            inputs = [input_data for input_data, _ in batch]
+            loop = asyncio.get_running_loop()
+            self.batches += 1
+            try:
+                if self.workers > 0:
+                    outputs = await loop.run_in_executor(
+                        self._executor, _triage_batch_in_worker, inputs
+                    )
+                    metrics = self.engine.metrics  # fold worker traces into this registry
+                    if metrics is not None:
+                        for output in outputs:
+                            metrics.record_trace(output['trace'], output['routing'])
+                    audit_log = self.engine.audit_log  # workers have no logger of their own
+                    if audit_log is not None:
+                        for output in outputs:
+                            audit_log.log_dict(output)
+                    submissions = self.engine.submissions
+                    if submissions is not None:
+                        for input_data, output in zip(inputs, outputs):
+                            submissions.add(input_data, output)
+                else:
+                    outputs = await loop.run_in_executor(
+                        self._executor, _triage_batch, self.engine, inputs
+                    )
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                return
+
+            for (_, future), output in zip(batch, outputs):
+                if not future.done():
+                    future.set_result(output)
+        finally:
+            self._slots.release()
+
+    # ----------------------------------------------------------
+    # HTTP
+    # ----------------------------------------------------------
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            'status': 'ok',
+            'rubric_version': self.engine.compiled.version,
+            'rubric_digest': self.engine.rubric_digest,
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'requests': self.requests,
+            'rejected': self.rejected,
+            'timed_out': self.timed_out,
+            'batches': self.batches,
+            'audit_dropped': (
+                self.engine.audit_log.dropped if self.engine.audit_log is not None else 0
+            ),
+            'store_dropped': (
+                self.engine.submissions.dropped if self.engine.submissions is not None else 0
+            ),
+        }
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, 413, {'error': 'headers too large'}, False)
+                    return
+
+                try:
+                    method, path, version, headers = self._parse_head(head)
+                    keep_alive = (
+                        headers.get('connection', '').lower() != 'close'
+                        if version == 'HTTP/1.1'
+                        else headers.get('connection', '').lower() == 'keep-alive'
+                    )
+                    body = await self._read_body(reader, headers)
+                    status, payload = await self._route(method, path, body)
+                except HTTPError as exc:
+                    status, payload, keep_alive = exc.status, {'error': exc.message}, False
+                except asyncio.IncompleteReadError:
+                    return
+
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    return
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _parse_head(head: bytes) -> Tuple[str, str, str, Dict[str, str]]:
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, path, version = lines[0].split(' ', 2)
+        except ValueError:
+            raise HTTPError(400, 'malformed request line') from None
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+        return method, path.split('?', 1)[0], version, headers
+
+    @staticmethod
+    async def _read_body(reader: asyncio.StreamReader, headers: Dict[str, str]) -> bytes:
+        if 'transfer-encoding' in headers:
+            raise HTTPError(411, 'chunked bodies are not supported, send Content-Length')
+        try:
+            length = int(headers.get('content-length', '0'))
+        except ValueError:
+            raise HTTPError(400, 'invalid Content-Length') from None
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, f'body exceeds {MAX_BODY_BYTES} bytes')
+        return await reader.readexactly(length) if length else b''
+
+    async def _route(
+        self, method: str, path: str, body: bytes
+    ) -> Tuple[int, Union[Dict[str, Any], str]]:
+        if path == '/healthz':
+            if method != 'GET':
+                raise HTTPError(405, 'use GET')
+            return 200, self.health()
+
+        if path == '/metrics':
+            if method != 'GET':
+                raise HTTPError(405, 'use GET')
+            if self.engine.metrics is None:
+                raise HTTPError(404, 'metrics are off (start with --metrics)')
+            return 200, self.engine.metrics.render()
+
+        if path == '/triage':
+            if method != 'POST':
+                raise HTTPError(405, 'use POST')
+            self.requests += 1
+            try:
+                input_data = input_from_dict(json.loads(body))
+            except (ValueError, TypeError, AttributeError) as exc:
+                raise HTTPError(400, f'invalid TriageInput: {exc}') from None
+            try:
+                return 200, await self.submit(input_data)
+            except HTTPError:
+                raise
+            except Exception as exc:
+                raise HTTPError(500, f'triage failed: {exc}') from None
+
+        raise HTTPError(404, f'no route for {path}')
+
+    @staticmethod
+    async def _respond(
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: Union[Dict[str, Any], str],
+        keep_alive: bool,
+    ) -> None:
+        if isinstance(payload, str):  # Prometheus exposition text
+            body = payload.encode('utf-8')
+            content_type = 'text/plain; version=0.0.4; charset=utf-8'
+        else:
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            content_type = 'application/json; charset=utf-8'
+        head = [
+            f'HTTP/1.1 {status} {REASONS.get(status, "")}',
+            f'Content-Type: {content_type}',
+            f'Content-Length: {len(body)}',
+            'Connection: keep-alive' if keep_alive else 'Connection: close',
+        ]
+        if status == 503:
+            head.append('Retry-After: 1')
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+async def serve(service: TriageService, host: str, port: int) -> None:
+    """Run until cancelled (Ctrl-C or SIGTERM), then shut the worker pool down"""
+    import signal
+
+    server = await service.start(host, port)
+    try:
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGTERM, asyncio.current_task().cancel
+        )
+    except NotImplementedError:  # Windows
+        pass
+    print(
+        f"triage service on http://{host}:{service.port} "
+        f"(workers={service.workers}, max_batch={service.max_batch}, "
+        f"rubric {service.engine.compiled.version})",
+        file=sys.stderr,
+    )
+    try:
+        async with server:
+            await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await service.close()